@@ -0,0 +1,100 @@
+"""Time to solve two-stage stochastic capacitated facility location problems
+with the extensive formulation, including the variables of all scenarios,
+and with Benders decomposition in multi-cut and single-cut modes, with
+subproblems optimized in this process and in a pool of worker processes
+
+usage: python benders.py [number of scenarios ...]
+"""
+
+from sys import argv
+import multiprocessing
+import random
+import time
+from mip import Model, Benders, BendersSubproblem, xsum, BINARY
+
+SCENARIOS = [10, 50, 200]
+FACILITIES = 10
+CUSTOMERS = 40
+
+
+def instance(ns: int):
+    rnd = random.Random(ns)
+    f = [rnd.randint(500, 1000) for i in range(FACILITIES)]
+    u = [rnd.randint(100, 200) for i in range(FACILITIES)]
+    c = [[rnd.randint(1, 30) for j in range(CUSTOMERS)] for i in range(FACILITIES)]
+    d = [[rnd.randint(5, 25) for j in range(CUSTOMERS)] for s in range(ns)]
+    return f, u, c, d
+
+
+def scenario(u, c, demand):
+    nf, nc = len(u), len(demand)
+    m = Model(solver_name="CBC")
+    x = [[m.add_var() for j in range(nc)] for i in range(nf)]
+    m.objective = xsum(c[i][j] * x[i][j] for i in range(nf) for j in range(nc))
+    for j in range(nc):
+        m += xsum(x[i][j] for i in range(nf)) >= demand[j]
+    coupling = []
+    for i in range(nf):
+        constr = m.add_constr(xsum(x[i][j] for j in range(nc)) <= 0)
+        coupling.append((constr.idx, i, -u[i]))
+    return m, coupling
+
+
+def extensive(f, u, c, d):
+    nf, nc, ns = len(f), len(c[0]), len(d)
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    y = [m.add_var(var_type=BINARY, obj=f[i]) for i in range(nf)]
+    for s in range(ns):
+        x = [[m.add_var(obj=c[i][j] / ns) for j in range(nc)] for i in range(nf)]
+        for j in range(nc):
+            m += xsum(x[i][j] for i in range(nf)) >= d[s][j]
+        for i in range(nf):
+            m += xsum(x[i][j] for j in range(nc)) <= u[i] * y[i]
+    m.optimize()
+    return m.objective_value, ""
+
+
+def benders(f, u, c, d, multi_cut: bool, workers: int):
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    for i in range(len(f)):
+        m.add_var(var_type=BINARY, obj=f[i])
+    subs = [BendersSubproblem(*scenario(u, c, ds), weight=1 / len(d)) for ds in d]
+    with Benders(m, subs, multi_cut=multi_cut, workers=workers) as b:
+        b.optimize()
+    return (
+        m.objective_value,
+        "calls: {} cuts: {} subproblems: {:.2f}s".format(
+            b.calls, b.optimality_cuts + b.feasibility_cuts, b.subproblem_time
+        ),
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in argv[1:]] or SCENARIOS
+    cpus = multiprocessing.cpu_count()
+    f = open("benders.csv", "w")
+    f.write("scenarios,method,workers,time,objective\n")
+    for ns in sizes:
+        data = instance(ns)
+        methods = [("extensive", 1, lambda: extensive(*data))]
+        for workers in sorted({1, cpus}):
+            methods.append(
+                ("multi-cut", workers, lambda w=workers: benders(*data, True, w))
+            )
+            methods.append(
+                ("single-cut", workers, lambda w=workers: benders(*data, False, w))
+            )
+        for (name, workers, run) in methods:
+            st = time.time()
+            obj, info = run()
+            ttime = time.time() - st
+            f.write("{},{},{},{:.2f},{}\n".format(ns, name, workers, ttime, obj))
+            f.flush()
+            print(
+                "{} scenarios {} workers: {} time: {:.2f}s obj: {} {}".format(
+                    ns, name, workers, ttime, obj, info
+                )
+            )
+    f.close()
@@ -0,0 +1,88 @@
+"""Measures the overhead of reading the LP solution inside a cut callback for
+TSP instances of increasing size. The generator does not add any cut, it only
+reads the solution and checks which variables are fractional, so that the
+search is the same in both modes:
+
+    vars: values queried one by one through model.vars (Var.x)
+    context: values read from the numpy arrays in model.context
+
+usage: python callback_overhead.py [vars|context]
+"""
+
+from sys import argv
+from itertools import product
+from random import seed, randint
+from math import sqrt
+import time
+from mip import Model, xsum, BINARY, minimize, ConstrsGenerator
+
+N = range(20, 101, 20)
+MAX_NODES = 50
+
+
+class ReadSolution(ConstrsGenerator):
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.calls = 0
+        self.time = 0.0
+        self.n_frac = 0
+
+    def generate_constrs(self, model: Model):
+        st = time.perf_counter()
+        if self.mode == "vars":
+            frac = [
+                v.idx
+                for v in model.vars
+                if v.var_type != "C" and abs(v.x - round(v.x)) > 1e-6
+            ]
+        else:
+            frac = model.context.fractional_idx()
+        self.time += time.perf_counter() - st
+        self.calls += 1
+        self.n_frac += len(frac)
+
+
+def tsp_model(n: int) -> Model:
+    V = set(range(n))
+    seed(0)
+    p = [(randint(1, 100), randint(1, 100)) for i in V]
+    Arcs = [(i, j) for (i, j) in product(V, V) if i != j]
+    c = [
+        [round(sqrt((p[i][0] - p[j][0]) ** 2 + (p[i][1] - p[j][1]) ** 2)) for j in V]
+        for i in V
+    ]
+
+    model = Model()
+    model.verbose = 0
+    x = [[model.add_var(var_type=BINARY) for j in V] for i in V]
+    y = [model.add_var() for i in V]
+    model.objective = minimize(xsum(c[i][j] * x[i][j] for (i, j) in Arcs))
+    for i in V:
+        model += xsum(x[i][j] for j in V - {i}) == 1
+        model += xsum(x[j][i] for j in V - {i}) == 1
+    for i, j in product(V - {0}, V - {0}):
+        if i != j:
+            model += y[i] - (n + 1) * x[i][j] >= y[j] - n
+
+    return model
+
+
+mode = argv[1] if len(argv) > 1 else "context"
+f = open("callback-overhead-{}.csv".format(mode), "w")
+f.write("n,cols,calls,solve_time,callback_time,time_per_call\n")
+for n in N:
+    model = tsp_model(n)
+    gen = ReadSolution(mode)
+    model.cuts_generator = gen
+    st = time.perf_counter()
+    model.optimize(max_nodes=MAX_NODES)
+    solve_time = time.perf_counter() - st
+    per_call = gen.time / max(gen.calls, 1)
+    f.write(
+        "{},{},{},{:.4f},{:.4f},{:.6f}\n".format(
+            n, model.num_cols, gen.calls, solve_time, gen.time, per_call
+        )
+    )
+    f.flush()
+    print("n={} calls={} time per call: {:.6f}s".format(n, gen.calls, per_call))
+f.close()
@@ -0,0 +1,122 @@
+"""Time to optimize the linear programming relaxation of cutting stock
+problems with column generation, comparing a hand-written loop, which
+re-optimizes the master problem from scratch and adds columns one by one,
+with ColumnGeneration, with and without dual smoothing. The time spent in
+the pricing problems, solved by dynamic programming, is reported separately.
+
+usage: python colgen.py [number of items ...]
+"""
+
+from sys import argv
+import random
+import time
+from mip import Model, Column, ColumnsGenerator, ColumnGeneration
+
+SIZES = [25, 50, 100]
+L = 1000
+
+
+def instance(n: int):
+    rnd = random.Random(n)
+    w = [rnd.randint(L // 20, L // 3) for i in range(n)]
+    b = [rnd.randint(1, 100) for i in range(n)]
+    return w, b
+
+
+# time spent solving pricing problems, which is the same for all methods
+pricing_time = 0.0
+
+
+def knapsack(w, profits):
+    """most profitable pattern, solved by dynamic programming"""
+    global pricing_time
+    st = time.time()
+    best = [0.0] * (L + 1)
+    last = [-1] * (L + 1)
+    items = [(i, w[i], profits[i]) for i in range(len(w)) if profits[i] > 1e-9]
+    for c in range(1, L + 1):
+        best[c], last[c] = best[c - 1], -1
+        for (i, wi, p) in items:
+            if wi <= c and best[c - wi] + p > best[c] + 1e-12:
+                best[c], last[c] = best[c - wi] + p, i
+    pattern, c = {}, L
+    while c > 0:
+        if last[c] == -1:
+            c -= 1
+        else:
+            pattern[last[c]] = pattern.get(last[c], 0) + 1
+            c -= w[last[c]]
+    pricing_time += time.time() - st
+    return pattern
+
+
+class Pricing(ColumnsGenerator):
+    def __init__(self, w):
+        super().__init__()
+        self.w = w
+
+    def generate_columns(self, model, duals):
+        pattern = knapsack(self.w, duals.tolist())
+        return [(1, list(pattern.keys()), list(pattern.values()))]
+
+
+def master(w, b, persistent: bool = False) -> Model:
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    m.persistent_lp = persistent
+    for i in range(len(w)):
+        m.add_constr(m.add_var(obj=1) * (L // w[i]) >= b[i])
+    return m
+
+
+def loop(w, b):
+    m = master(w, b)
+    iterations = 0
+    while True:
+        m.optimize(relax=True)
+        iterations += 1
+        duals = [c.pi for c in m.constrs]
+        pattern = knapsack(w, duals)
+        if sum(duals[i] * q for (i, q) in pattern.items()) <= 1 + 1e-6:
+            return m, iterations
+        constrs = [m.constrs[i] for i in pattern]
+        m.add_var(obj=1, column=Column(constrs, list(pattern.values())))
+
+
+def driver(w, b, smoothing: float):
+    m = master(w, b)
+    cg = ColumnGeneration(m, Pricing(w), smoothing=smoothing)
+    cg.optimize()
+    return m, cg.iterations
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in argv[1:]] or SIZES
+    f = open("colgen.csv", "w")
+    f.write("items,method,time,pricing_time,iterations,columns,objective\n")
+    for n in sizes:
+        w, b = instance(n)
+        methods = [
+            ("loop", lambda: loop(w, b)),
+            ("driver", lambda: driver(w, b, 0.0)),
+            ("driver-smoothing", lambda: driver(w, b, 0.5)),
+        ]
+        for (name, run) in methods:
+            pricing_time = 0.0
+            st = time.time()
+            m, iterations = run()
+            ttime = time.time() - st
+            columns = m.num_cols - n
+            f.write(
+                "{},{},{:.3f},{:.3f},{},{},{}\n".format(
+                    n, name, ttime, pricing_time, iterations, columns, m.objective_value
+                )
+            )
+            f.flush()
+            print(
+                "{} items {} time: {:.3f}s (pricing {:.3f}s) iterations: {} "
+                "columns: {} obj: {:.4f}".format(
+                    n, name, ttime, pricing_time, iterations, columns, m.objective_value
+                )
+            )
+    f.close()
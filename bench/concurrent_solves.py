@@ -0,0 +1,50 @@
+"""Throughput of independent optimizations of MIPLIB instances in test/data
+using a pool of threads or of processes with an increasing number of
+workers. In CBC only the linear programming relaxations are solved
+concurrently by threads, branch-and-cut searches in the same process are
+serialized.
+
+usage: python concurrent_solves.py [mip|lp] [threads|processes]
+"""
+
+from sys import argv
+from os.path import dirname, join
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import time
+from mip import Model
+
+INSTANCES = ["egout", "flugpl", "khb05250", "lseu", "fiber", "dcmulti"]
+WORKERS = [1, 2, 4, 8]
+REPEAT = 4
+
+
+def solve(args):
+    instance, relax = args
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    m.read(join(dirname(__file__), "..", "test", "data", instance + ".mps.gz"))
+    m.optimize(relax=relax)
+    return m.objective_value
+
+
+if __name__ == "__main__":
+    mode = argv[1] if len(argv) > 1 else "mip"
+    pool = argv[2] if len(argv) > 2 else "threads"
+    relax = mode == "lp"
+    Executor = ThreadPoolExecutor if pool == "threads" else ProcessPoolExecutor
+    tasks = [(inst, relax) for inst in INSTANCES] * REPEAT
+    f = open("concurrent-solves-{}-{}.csv".format(mode, pool), "w")
+    f.write("workers,time,solves_per_second\n")
+    for workers in WORKERS:
+        with Executor(workers) as executor:
+            st = time.time()
+            list(executor.map(solve, tasks))
+            ttime = time.time() - st
+        f.write("{},{:.2f},{:.3f}\n".format(workers, ttime, len(tasks) / ttime))
+        f.flush()
+        print(
+            "workers={} time: {:.2f}s solves/s: {:.3f}".format(
+                workers, ttime, len(tasks) / ttime
+            )
+        )
+    f.close()
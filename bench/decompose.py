@@ -0,0 +1,66 @@
+"""Time to optimize models with independent regions, each one a facility
+location problem, linked only by the objective function, optimizing the
+models as a whole and with decompose=True, which optimizes each region as
+a separate model in worker processes
+
+usage: python decompose.py [number of regions ...]
+"""
+
+from sys import argv
+import random
+import time
+from mip import Model, xsum, BINARY
+
+REGIONS = [4, 8]
+FACILITIES = 8
+CUSTOMERS = 30
+
+
+def build(nr: int) -> Model:
+    rnd = random.Random(nr)
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    for r in range(nr):
+        y = [
+            m.add_var(var_type=BINARY, obj=rnd.randint(200, 500))
+            for i in range(FACILITIES)
+        ]
+        x = [
+            [m.add_var(obj=rnd.randint(1, 50)) for j in range(CUSTOMERS)]
+            for i in range(FACILITIES)
+        ]
+        for j in range(CUSTOMERS):
+            m += xsum(x[i][j] for i in range(FACILITIES)) == 1
+        for i in range(FACILITIES):
+            m += xsum(x[i]) <= CUSTOMERS // 3 * y[i]
+            for j in range(CUSTOMERS):
+                m += x[i][j] <= y[i]
+    return m
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in argv[1:]] or REGIONS
+    f = open("decompose.csv", "w")
+    f.write("regions,method,components,time,objective\n")
+    for nr in sizes:
+        m = build(nr)
+        st = time.time()
+        m.optimize()
+        ttime = time.time() - st
+        res = [("direct", 1, ttime, m.objective_value)]
+
+        m = build(nr)
+        st = time.time()
+        comps = m.components()
+        m.optimize(decompose=True)
+        ttime = time.time() - st
+        res.append(("decompose", comps.num_components, ttime, m.objective_value))
+        for (name, ncomps, ttime, obj) in res:
+            f.write("{},{},{},{:.2f},{}\n".format(nr, name, ncomps, ttime, obj))
+            f.flush()
+            print(
+                "{} regions {}: {} components time: {:.2f}s obj: {}".format(
+                    nr, name, ncomps, ttime, obj
+                )
+            )
+    f.close()
@@ -0,0 +1,60 @@
+"""Time to detect the bordered block-diagonal structure of multiple knapsack
+models, where items can be packed in at most one knapsack and the total
+weight is limited, with the number of blocks, of linking constraints and
+the score of the structure found
+
+usage: python detect_blocks.py [number of knapsacks ...]
+"""
+
+from sys import argv
+import random
+import time
+from mip import Model, xsum, BINARY, MAXIMIZE
+
+KNAPSACKS = [20, 100]
+ITEMS = 200
+
+
+def build(nk: int) -> Model:
+    rnd = random.Random(nk)
+    m = Model(sense=MAXIMIZE, solver_name="CBC")
+    m.verbose = 0
+    w = [rnd.randint(5, 50) for i in range(ITEMS)]
+    x = [
+        [m.add_var(var_type=BINARY, obj=rnd.randint(1, 100)) for i in range(ITEMS)]
+        for k in range(nk)
+    ]
+    for k in range(nk):
+        m += xsum(w[i] * x[k][i] for i in range(ITEMS)) <= rnd.randint(100, 300)
+        # items conflicting in each knapsack
+        for i in range(0, ITEMS, 2):
+            m += x[k][i] + x[k][i + 1] <= 1
+    for i in range(ITEMS):
+        m += xsum(x[k][i] for k in range(nk)) <= 1
+    m += xsum(w[i] * x[k][i] for k in range(nk) for i in range(ITEMS)) <= 100 * nk
+    return m
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in argv[1:]] or KNAPSACKS
+    f = open("detect_blocks.csv", "w")
+    f.write("knapsacks,rows,cols,time,blocks,linking,score\n")
+    for nk in sizes:
+        m = build(nk)
+        st = time.time()
+        bbd = m.detect_blocks(max_linking=0.5)
+        ttime = time.time() - st
+        nl = len(bbd.linking_rows)
+        f.write(
+            "{},{},{},{:.3f},{},{},{:.4f}\n".format(
+                nk, m.num_rows, m.num_cols, ttime, bbd.num_blocks, nl, bbd.score
+            )
+        )
+        f.flush()
+        print(
+            "{} knapsacks ({} rows {} cols): {} blocks {} linking rows "
+            "score: {:.4f} time: {:.3f}s".format(
+                nk, m.num_rows, m.num_cols, bbd.num_blocks, nl, bbd.score, ttime
+            )
+        )
+    f.close()
@@ -0,0 +1,125 @@
+"""Measures the overhead of an incumbent updater in CBC for TSP instances of
+increasing size. Three modes are available:
+
+    none: no incumbent updater
+    noop: updater that only reads the new solution and returns None
+    2opt: updater that improves each new tour with the 2-opt neighborhood
+
+usage: python incumbent_updater.py [none|noop|2opt]
+"""
+
+from sys import argv
+from itertools import product
+from random import seed, randint
+from math import sqrt
+import time
+from mip import Model, xsum, BINARY, minimize, IncumbentUpdater
+
+N = range(20, 101, 20)
+MAX_NODES = 200
+
+
+class TwoOpt(IncumbentUpdater):
+    def __init__(self, model: Model, n: int, c, improve: bool):
+        super().__init__(model)
+        self.n = n
+        self.c = c
+        self.improve = improve
+        self.calls = 0
+        self.improved = 0
+        self.time = 0.0
+
+    def update_incumbent_x(self, objective_value, best_bound, x):
+        st = time.perf_counter()
+        self.calls += 1
+        result = None
+        if self.improve:
+            result = self.two_opt(x)
+        self.time += time.perf_counter() - st
+        return result
+
+    def two_opt(self, x):
+        n, c = self.n, self.c
+        succ = x[: n * n].reshape(n, n).argmax(axis=1)
+        tour = [0]
+        while len(tour) < n:
+            tour.append(int(succ[tour[-1]]))
+        improved = False
+        found = True
+        while found:
+            found = False
+            for i in range(n - 1):
+                for j in range(i + 2, n if i else n - 1):
+                    a, b = tour[i], tour[i + 1]
+                    d, e = tour[j], tour[(j + 1) % n]
+                    if c[a][d] + c[b][e] < c[a][b] + c[d][e]:
+                        tour[i + 1 : j + 1] = reversed(tour[i + 1 : j + 1])
+                        found = improved = True
+        if not improved:
+            return None
+        self.improved += 1
+        sol = [0.0] * (n * n + n)
+        for k in range(n):
+            sol[tour[k] * n + tour[(k + 1) % n]] = 1.0
+            # MTZ potentials: the k-th city after the depot gets n - k
+            if k:
+                sol[n * n + tour[k]] = n - k
+        return sol
+
+
+def tsp_model(n: int):
+    V = set(range(n))
+    seed(0)
+    p = [(randint(1, 100), randint(1, 100)) for i in V]
+    Arcs = [(i, j) for (i, j) in product(V, V) if i != j]
+    c = [
+        [round(sqrt((p[i][0] - p[j][0]) ** 2 + (p[i][1] - p[j][1]) ** 2)) for j in V]
+        for i in V
+    ]
+
+    model = Model()
+    model.verbose = 0
+    x = [[model.add_var(var_type=BINARY) for j in V] for i in V]
+    y = [model.add_var() for i in V]
+    model.objective = minimize(xsum(c[i][j] * x[i][j] for (i, j) in Arcs))
+    for i in V:
+        model += x[i][i] == 0
+        model += xsum(x[i][j] for j in V - {i}) == 1
+        model += xsum(x[j][i] for j in V - {i}) == 1
+    for i, j in product(V - {0}, V - {0}):
+        if i != j:
+            model += y[i] - (n + 1) * x[i][j] >= y[j] - n
+
+    return model, c
+
+
+mode = argv[1] if len(argv) > 1 else "noop"
+f = open("incumbent-updater-{}.csv".format(mode), "w")
+f.write("n,calls,improved,solve_time,updater_time,time_per_call,obj\n")
+for n in N:
+    model, c = tsp_model(n)
+    upd = TwoOpt(model, n, c, mode == "2opt")
+    if mode != "none":
+        model.incumbent_updater = upd
+    st = time.perf_counter()
+    model.optimize(max_nodes=MAX_NODES)
+    solve_time = time.perf_counter() - st
+    per_call = upd.time / max(upd.calls, 1)
+    f.write(
+        "{},{},{},{:.4f},{:.4f},{:.6f},{}\n".format(
+            n,
+            upd.calls,
+            upd.improved,
+            solve_time,
+            upd.time,
+            per_call,
+            model.objective_value,
+        )
+    )
+    f.flush()
+    print(
+        "n={} calls={} improved={} solve time: {:.3f}s obj: {}".format(
+            n, upd.calls, upd.improved, solve_time, model.objective_value
+        )
+    )
+f.close()
@@ -0,0 +1,63 @@
+"""Bound of the Lagrangian relaxation of generalized assignment problems,
+dualizing the constraints that assign each job to one machine, with the
+Polyak and the volume methods, compared with the linear programming
+relaxation and the optimal cost
+
+usage: python lagrangian.py [number of jobs ...]
+"""
+
+from sys import argv
+import random
+import time
+from mip import Model, xsum, BINARY, MAXIMIZE, LagrangianRelaxation
+
+JOBS = [30, 60]
+MACHINES = 5
+ITERATIONS = 200
+
+
+def build(nj: int):
+    rnd = random.Random(nj)
+    m = Model(sense=MAXIMIZE, solver_name="CBC")
+    m.verbose = 0
+    x = [
+        [m.add_var(var_type=BINARY, obj=rnd.randint(5, 30)) for j in range(nj)]
+        for i in range(MACHINES)
+    ]
+    for i in range(MACHINES):
+        w = [rnd.randint(5, 25) for j in range(nj)]
+        m += xsum(w[j] * x[i][j] for j in range(nj)) <= sum(w) // MACHINES
+    constrs = [
+        m.add_constr(xsum(x[i][j] for i in range(MACHINES)) <= 1) for j in range(nj)
+    ]
+    return m, constrs
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in argv[1:]] or JOBS
+    f = open("lagrangian.csv", "w")
+    f.write("jobs,method,iterations,time,bound\n")
+    for nj in sizes:
+        m, constrs = build(nj)
+        st = time.time()
+        m.optimize(relax=True)
+        lp = sum(v.obj * v.x for v in m.vars)
+        res = [("lp", 1, time.time() - st, lp)]
+        st = time.time()
+        m.optimize()
+        res.append(("mip", 1, time.time() - st, m.objective_value))
+        for method in ["polyak", "volume"]:
+            m, constrs = build(nj)
+            st = time.time()
+            with LagrangianRelaxation(m, constrs, method=method) as lr:
+                lr.optimize(max_iterations=ITERATIONS)
+            res.append((method, lr.iterations, time.time() - st, lr.bound))
+        for (name, iterations, ttime, bound) in res:
+            f.write("{},{},{},{:.2f},{:.4f}\n".format(nj, name, iterations, ttime, bound))
+            f.flush()
+            print(
+                "{} jobs {}: {} iterations time: {:.2f}s bound: {:.4f}".format(
+                    nj, name, iterations, ttime, bound
+                )
+            )
+    f.close()
@@ -0,0 +1,101 @@
+"""Time to re-optimize linear programs after small changes, solving them
+from scratch and with Model.persistent_lp, where each optimization starts
+from the basis of the previous one: (i) constraints cutting the optimal
+solution of the linear programming relaxation of MIPLIB instances and (ii)
+columns added to the master problem of a cutting stock problem, as in
+column generation.
+
+usage: python lp_resolve.py [instance ...]
+"""
+
+from sys import argv
+from os.path import dirname, join
+import random
+import time
+from mip import Model, Column, OptimizationStatus, xsum
+
+INSTANCES = ["air05", "p0201", "fiber", "lseu"]
+ROUNDS = 30
+
+
+def read(instance: str) -> Model:
+    m = Model(solver_name="CBC")
+    m.read(join(dirname(__file__), "..", "test", "data", instance + ".mps.gz"))
+    m.verbose = 0
+    return m
+
+
+def add_rows(instance: str, persistent: bool):
+    """adds constraints cutting the solution of the relaxation, stopping if
+    the relaxation becomes infeasible"""
+    m = read(instance)
+    m.persistent_lp = persistent
+    m.optimize(relax=True)
+    rnd = random.Random(0)
+    for _ in range(ROUNDS):
+        if m.status != OptimizationStatus.OPTIMAL:
+            break
+        support = [v for v in m.vars if v.x >= 1e-6]
+        sample = rnd.sample(support, min(len(support), 20))
+        m += xsum(sample) <= 0.95 * sum(v.x for v in sample)
+        m.optimize(relax=True)
+    return m
+
+
+def add_columns(persistent: bool, n: int = 300):
+    """adds random cutting patterns to the master problem of a cutting stock
+    problem, querying the dual values after each optimization"""
+    rnd = random.Random(1)
+    length = 1000
+    w = [rnd.randint(50, 400) for i in range(n)]
+    b = [rnd.randint(1, 20) for i in range(n)]
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    m.persistent_lp = persistent
+    lam = [m.add_var(obj=1) for i in range(n)]
+    constrs = [m.add_constr(lam[i] * (length // w[i]) >= b[i]) for i in range(n)]
+    m.optimize(relax=True)
+    for _ in range(ROUNDS * 5):
+        cap, pattern = length, {}
+        for i in rnd.sample(range(n), n):
+            if w[i] <= cap and rnd.random() < 0.3:
+                pattern[i] = rnd.randint(1, cap // w[i])
+                cap -= pattern[i] * w[i]
+        m.add_var(obj=1, column=Column([constrs[i] for i in pattern], pattern.values()))
+        m.optimize(relax=True)
+        [c.pi for c in constrs]
+    return m
+
+
+def report(f, problem: str, persistent: bool, ttime: float, m: Model):
+    log = m.lp_solve_log
+    resolve = sum(info.time for info in log[1:])
+    iterations = sum(info.iterations or 0 for info in log[1:])
+    f.write(
+        "{},{},{:.3f},{:.3f},{},{}\n".format(
+            problem, int(persistent), ttime, resolve, iterations, m.objective_value
+        )
+    )
+    f.flush()
+    print(
+        "{} persistent={} time: {:.3f}s re-optimizations: {:.3f}s "
+        "iterations: {} obj: {}".format(
+            problem, persistent, ttime, resolve, iterations, m.objective_value
+        )
+    )
+
+
+if __name__ == "__main__":
+    instances = argv[1:] or INSTANCES
+    f = open("lp-resolve.csv", "w")
+    f.write("problem,persistent,time,resolve_time,resolve_iterations,objective\n")
+    for instance in instances:
+        for persistent in [False, True]:
+            st = time.time()
+            m = add_rows(instance, persistent)
+            report(f, instance, persistent, time.time() - st, m)
+    for persistent in [False, True]:
+        st = time.time()
+        m = add_columns(persistent)
+        report(f, "cutting-stock", persistent, time.time() - st, m)
+    f.close()
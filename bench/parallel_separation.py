@@ -0,0 +1,40 @@
+"""Measures the cost of dispatching one round of separation tasks to the
+worker processes of ParallelConstrsGenerator for solutions of increasing
+size. The separator does not generate any row, so the time measured is the
+time to copy the solution to the shared memory buffer, send the tasks and
+gather the results.
+
+usage: python parallel_separation.py [processes]
+"""
+
+from sys import argv
+import time
+import numpy as np
+from mip import ParallelConstrsGenerator
+
+N = [10 ** k for k in range(3, 8)]
+ROUNDS = 50
+
+
+def empty_separator(x, task, data):
+    return []
+
+
+processes = int(argv[1]) if len(argv) > 1 else 4
+f = open("parallel-separation-{}.csv".format(processes), "w")
+f.write("n,tasks,time_per_round\n")
+for n in N:
+    x = np.random.rand(n)
+    tasks = list(range(processes))
+    with ParallelConstrsGenerator(
+        empty_separator, tasks, processes=processes, timeout=60
+    ) as gen:
+        gen.separate(x)  # starts the worker processes
+        st = time.perf_counter()
+        for r in range(ROUNDS):
+            gen.separate(x)
+        per_round = (time.perf_counter() - st) / ROUNDS
+    f.write("{},{},{:.6f}\n".format(n, len(tasks), per_round))
+    f.flush()
+    print("n={} time per round: {:.6f}s".format(n, per_round))
+f.close()
@@ -0,0 +1,70 @@
+"""Time to solve MIPLIB instances in test/data with each configuration of a
+portfolio and with all configurations running in parallel processes,
+sharing the best solution found
+
+usage: python portfolio.py [instance ...]
+"""
+
+from sys import argv
+from os.path import dirname, join
+import time
+from mip import Model, OptimizationStatus
+
+INSTANCES = ["air05", "mas76", "p0201", "fiber"]
+CONFIGS = [
+    {"seed": 0},
+    {"seed": 1},
+    {"seed": 2},
+    {"emphasis": 1, "seed": 3},
+    {"emphasis": 2, "seed": 4},
+    {"cuts": 2, "seed": 5},
+    {"preprocess": 0, "seed": 6},
+    {"cuts": 0, "seed": 7},
+]
+MAX_SECONDS = 600
+
+
+def read(instance: str) -> Model:
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    m.read(join(dirname(__file__), "..", "test", "data", instance + ".mps.gz"))
+    return m
+
+
+if __name__ == "__main__":
+    instances = argv[1:] or INSTANCES
+    f = open("portfolio.csv", "w")
+    f.write("instance,config,time,status,objective_value\n")
+    for instance in instances:
+        for (k, config) in enumerate(CONFIGS):
+            m = read(instance)
+            for (name, value) in config.items():
+                setattr(m, name, value)
+            st = time.time()
+            status = m.optimize(max_seconds=MAX_SECONDS)
+            ttime = time.time() - st
+            f.write(
+                "{},{},{:.2f},{},{}\n".format(
+                    instance, k, ttime, status.name, m.objective_value
+                )
+            )
+            f.flush()
+            print("{} config {} time: {:.2f}s {}".format(instance, k, ttime, status))
+
+        m = read(instance)
+        st = time.time()
+        result = m.optimize_portfolio(CONFIGS, max_seconds=MAX_SECONDS)
+        ttime = time.time() - st
+        f.write(
+            "{},portfolio,{:.2f},{},{}\n".format(
+                instance, ttime, result.status.name, result.objective_value
+            )
+        )
+        f.flush()
+        print(
+            "{} portfolio time: {:.2f}s {} winner: {}".format(
+                instance, ttime, result.status, result.index
+            )
+        )
+        assert result.status != OptimizationStatus.ERROR
+    f.close()
@@ -0,0 +1,70 @@
+"""Time to presolve and optimize facility location models in which part of
+the facilities are closed, or must be opened, and demands are repeated in
+proportional constraints, as in models generated from data with redundant
+rows, optimizing the models directly and after Model.presolve
+
+usage: python presolve.py [number of facilities ...]
+"""
+
+from sys import argv
+import random
+import time
+from mip import Model, xsum, BINARY
+
+FACILITIES = [20, 40]
+CUSTOMERS = 80
+
+
+def build(nf: int) -> Model:
+    rnd = random.Random(nf)
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    y = [m.add_var(var_type=BINARY, obj=rnd.randint(200, 500)) for i in range(nf)]
+    x = [
+        [m.add_var(obj=rnd.randint(1, 50)) for j in range(CUSTOMERS)] for i in range(nf)
+    ]
+    for j in range(CUSTOMERS):
+        m += xsum(x[i][j] for i in range(nf)) == 1
+        # the same constraint scaled, e.g., written in other units
+        m += xsum(2 * x[i][j] for i in range(nf)) == 2
+    for i in range(nf):
+        m += xsum(x[i]) <= CUSTOMERS * y[i]
+        for j in range(CUSTOMERS):
+            m += x[i][j] <= y[i]
+        r = rnd.random()
+        if r < 0.3:
+            m += y[i] <= 0
+        elif r < 0.4:
+            m += y[i] >= 1
+    return m
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in argv[1:]] or FACILITIES
+    f = open("presolve.csv", "w")
+    f.write("facilities,method,rows,cols,time,objective\n")
+    for nf in sizes:
+        m = build(nf)
+        st = time.time()
+        m.optimize()
+        ttime = time.time() - st
+        res = [("direct", m.num_rows, m.num_cols, ttime, m.objective_value)]
+
+        m = build(nf)
+        st = time.time()
+        pre = m.presolve()
+        pre.optimize()
+        ttime = time.time() - st
+        red = pre.reduced
+        res.append(
+            ("presolve", red.num_rows, red.num_cols, ttime, pre.solution.objective_value)
+        )
+        for (name, rows, cols, ttime, obj) in res:
+            f.write("{},{},{},{},{:.2f},{}\n".format(nf, name, rows, cols, ttime, obj))
+            f.flush()
+            print(
+                "{} facilities {}: {} rows {} cols time: {:.2f}s obj: {}".format(
+                    nf, name, rows, cols, ttime, obj
+                )
+            )
+    f.close()
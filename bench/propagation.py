@@ -0,0 +1,103 @@
+"""Time to propagate bounds in facility location models written with big-M
+constraints x[i][j] <= M y[i], and the linear programming relaxation and the
+time to optimize the models directly and with the strengthened constraints
+x[i][j] <= d[j] y[i] added as cuts in the root node
+
+usage: python propagation.py [number of facilities ...]
+"""
+
+from sys import argv
+import random
+import time
+from mip import Model, xsum, LinExpr, BINARY, ConstrsGenerator
+
+FACILITIES = [10, 20]
+CUSTOMERS = 40
+BIG_M = 10000
+
+
+class RootPropagation(ConstrsGenerator):
+    root_only = True
+
+    def generate_constrs(self, model: Model):
+        model.propagate_bounds()
+
+
+class MaxOpen(ConstrsGenerator):
+    """lazy constraints disable the pre-processing of CBC, which would
+    otherwise reduce the big-M coefficients before the cuts are separated"""
+
+    def __init__(self, y, limit: int):
+        super().__init__()
+        self.y, self.limit = y, limit
+
+    def generate_constrs(self, model: Model):
+        y = model.translate(self.y)
+        if sum(v.x for v in y) >= self.limit + 0.5:
+            model += xsum(y) <= self.limit
+
+
+def build(nf: int) -> Model:
+    rnd = random.Random(nf)
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    y = [m.add_var(var_type=BINARY, obj=rnd.randint(200, 500)) for i in range(nf)]
+    x = [
+        [m.add_var(obj=rnd.randint(1, 50)) for j in range(CUSTOMERS)] for i in range(nf)
+    ]
+    d = [rnd.randint(5, 20) for j in range(CUSTOMERS)]
+    for j in range(CUSTOMERS):
+        m += xsum(x[i][j] for i in range(nf)) == d[j]
+    for i in range(nf):
+        for j in range(CUSTOMERS):
+            m += x[i][j] <= BIG_M * y[i]
+    m.lazy_constrs_generator = MaxOpen(y, nf // 2)
+    return m
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in argv[1:]] or FACILITIES
+    f = open("propagation.csv", "w")
+    f.write("facilities,method,reduced,lp,time,objective\n")
+    for nf in sizes:
+        m = build(nf)
+        m.optimize(relax=True)
+        lp = m.objective_value
+        st = time.time()
+        m.optimize()
+        ttime = time.time() - st
+        res = [("direct", 0, lp, ttime, m.objective_value)]
+
+        m = build(nf)
+        st = time.time()
+        prop = m.propagate_bounds()
+        ptime = time.time() - st
+        indptr, indices, coefs, senses, rhs = prop.rows()
+        print(
+            "{} facilities: {} bounds tightened, {} coefficients reduced "
+            "in {:.3f}s".format(nf, prop.tightened_bounds, prop.coefs_reduced, ptime)
+        )
+        for k in range(len(rhs)):
+            row = slice(indptr[k], indptr[k + 1])
+            cols = [m.vars[j] for j in indices[row].tolist()]
+            m += LinExpr(cols, coefs[row].tolist(), -float(rhs[k]), senses[k])
+        m.optimize(relax=True)
+        lp = m.objective_value
+
+        m = build(nf)
+        m.cuts_generator = RootPropagation()
+        st = time.time()
+        m.optimize()
+        ttime = time.time() - st
+        res.append(("propagation", prop.coefs_reduced, lp, ttime, m.objective_value))
+        for (name, reduced, lp, ttime, obj) in res:
+            f.write(
+                "{},{},{},{:.2f},{:.2f},{}\n".format(nf, name, reduced, lp, ttime, obj)
+            )
+            f.flush()
+            print(
+                "{} facilities {}: lp: {:.2f} time: {:.2f}s obj: {}".format(
+                    nf, name, lp, ttime, obj
+                )
+            )
+    f.close()
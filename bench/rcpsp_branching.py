@@ -0,0 +1,70 @@
+"""Effect of problem specific branching priorities, informed with
+Model.set_branch_priorities, in the resource constrained project scheduling
+instances of test/data. Modes:
+
+    none: CBC default branching
+    start: integer start time variables S_j = sum(t x_jt) are added and
+        selected first for branching, the earliest jobs first
+
+usage: python rcpsp_branching.py [none|start] [instance files]
+"""
+
+from sys import argv, path
+from glob import glob
+from os.path import basename, dirname, join
+import json
+import time
+from mip import INTEGER, xsum
+from mip.cbc import cbclib
+
+path.append(join(dirname(__file__), "..", "test"))
+from mip_rcpsp import create_mip  # noqa: E402
+
+MAX_SECONDS = 300
+
+
+mode = argv[1] if len(argv) > 1 else "start"
+instances = argv[2:] or sorted(
+    glob(join(dirname(__file__), "..", "test", "data", "rcpsp-1*.json"))
+)
+f = open("rcpsp-branching-{}.csv".format(mode), "w")
+f.write("instance,nodes,time,obj,bound\n")
+for inst in instances:
+    with open(inst, "r") as finst:
+        data = json.load(finst)
+    J = data["J"]
+    model = create_mip("CBC", J, data["d"], data["S"], data["c"], data["r"], data["EST"])
+    model.verbose = 0
+    if mode == "start":
+        starts = []
+        for j in J:
+            xj = [v for v in model.vars if v.name.startswith("x({},".format(j))]
+            tj = [int(v.name.split(",")[1][:-1]) for v in xj]
+            s = model.add_var(
+                "S({})".format(j), lb=min(tj), ub=max(tj), var_type=INTEGER
+            )
+            model += s == xsum(t * v for (t, v) in zip(tj, xj))
+            starts.append(s)
+        priority = [1000] * model.num_cols
+        direction = [0] * model.num_cols
+        for k, s in enumerate(starts):
+            priority[s.idx] = 1 + k
+            direction[s.idx] = -1
+        model.set_branch_priorities(priority, direction)
+
+    st = time.time()
+    model.optimize(max_seconds=MAX_SECONDS)
+    ttime = time.time() - st
+    nodes = cbclib.Cbc_getNodeCount(model.solver._model)
+    f.write(
+        "{},{},{:.2f},{},{}\n".format(
+            basename(inst), nodes, ttime, model.objective_value, model.objective_bound
+        )
+    )
+    f.flush()
+    print(
+        "{} nodes: {} time: {:.2f}s obj: {}".format(
+            basename(inst), nodes, ttime, model.objective_value
+        )
+    )
+f.close()
@@ -0,0 +1,90 @@
+"""Time to optimize a sequence of facility location models in which most
+models are repeated, as in pipelines that rebuild models from data that did
+not change, without cache and with caches in memory, in a directory and in
+a SQLite database. Also reports the time to compute the fingerprint of the
+models.
+
+usage: python solve_cache.py [number of models ...]
+"""
+
+from sys import argv
+import os
+import random
+import shutil
+import tempfile
+import time
+from mip import Model, SolveCache, xsum, BINARY
+
+MODELS = [20, 100]
+DISTINCT = 5
+FACILITIES = 15
+CUSTOMERS = 60
+
+
+def build(seed: int) -> Model:
+    rnd = random.Random(seed)
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    y = [
+        m.add_var(var_type=BINARY, obj=rnd.randint(200, 500)) for i in range(FACILITIES)
+    ]
+    x = [
+        [m.add_var(obj=rnd.randint(1, 50)) for j in range(CUSTOMERS)]
+        for i in range(FACILITIES)
+    ]
+    for j in range(CUSTOMERS):
+        m += xsum(x[i][j] for i in range(FACILITIES)) == 1
+    for i in range(FACILITIES):
+        for j in range(CUSTOMERS):
+            m += x[i][j] <= y[i]
+    return m
+
+
+def run(seeds, cache):
+    total, fp_time = 0.0, 0.0
+    for s in seeds:
+        m = build(s)
+        if cache is None:
+            m.optimize()
+            total += m.objective_value
+        else:
+            st = time.time()
+            m.fingerprint()
+            fp_time += time.time() - st
+            total += cache.optimize(m).objective_value
+    return total, fp_time
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in argv[1:]] or MODELS
+    tmp = tempfile.mkdtemp()
+    f = open("solve_cache.csv", "w")
+    f.write("models,cache,time,hits,objective\n")
+    try:
+        for n in sizes:
+            seeds = [random.Random(n + k).randrange(DISTINCT) for k in range(n)]
+            caches = [
+                ("none", lambda: None),
+                ("memory", lambda: SolveCache()),
+                ("directory", lambda: SolveCache(os.path.join(tmp, "d{}".format(n)))),
+                ("sqlite", lambda: SolveCache(os.path.join(tmp, "c{}.db".format(n)))),
+            ]
+            for (name, create) in caches:
+                cache = create()
+                st = time.time()
+                obj, fp_time = run(seeds, cache)
+                ttime = time.time() - st
+                hits = cache.hits if cache is not None else 0
+                f.write("{},{},{:.2f},{},{}\n".format(n, name, ttime, hits, obj))
+                f.flush()
+                print(
+                    "{} models cache: {} time: {:.2f}s hits: {} "
+                    "fingerprints: {:.2f}s obj: {}".format(
+                        n, name, ttime, hits, fp_time, obj
+                    )
+                )
+                if cache is not None:
+                    cache.close()
+    finally:
+        shutil.rmtree(tmp)
+    f.close()
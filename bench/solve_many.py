@@ -0,0 +1,65 @@
+"""Throughput of the optimization of many small knapsack models: sequential
+optimization in this process and solve_many with models built in the worker
+processes or sent as arrays, with an increasing number of workers and
+different chunk sizes.
+
+usage: python solve_many.py [number of models]
+"""
+
+from sys import argv
+from functools import partial
+import time
+from mip import Model, xsum, solve_many, BINARY, CBC, MAXIMIZE
+
+WORKERS = [1, 2, 4, 8]
+CHUNK_SIZES = [1, 8, 32]
+
+
+def build(seed: int, n: int = 30) -> Model:
+    w = [(17 * i + seed) % 89 + 10 for i in range(n)]
+    p = [w[i] + (31 * i + seed) % 23 for i in range(n)]
+    m = Model(sense=MAXIMIZE, solver_name=CBC)
+    m.verbose = 0
+    x = [m.add_var(var_type=BINARY) for i in range(n)]
+    m.objective = xsum(p[i] * x[i] for i in range(n))
+    m += xsum(w[i] * x[i] for i in range(n)) <= sum(w) // 3
+    m += xsum(w[i] * x[i] for i in range(0, n, 2)) <= sum(w) // 5
+    return m
+
+
+def report(f, method: str, workers: int, chunk_size: int, n_models: int, ttime):
+    f.write(
+        "{},{},{},{:.2f},{:.3f}\n".format(
+            method, workers, chunk_size, ttime, n_models / ttime
+        )
+    )
+    f.flush()
+    print(
+        "{} workers={} chunk_size={} time: {:.2f}s solves/s: {:.3f}".format(
+            method, workers, chunk_size, ttime, n_models / ttime
+        )
+    )
+
+
+if __name__ == "__main__":
+    n_models = int(argv[1]) if len(argv) > 1 else 400
+    f = open("solve-many.csv", "w")
+    f.write("method,workers,chunk_size,time,solves_per_second\n")
+
+    st = time.time()
+    for seed in range(n_models):
+        build(seed).optimize()
+    report(f, "sequential", 1, 1, n_models, time.time() - st)
+
+    for workers in WORKERS:
+        for chunk_size in CHUNK_SIZES:
+            st = time.time()
+            tasks = (partial(build, seed) for seed in range(n_models))
+            list(solve_many(tasks, workers=workers, chunk_size=chunk_size))
+            report(f, "builders", workers, chunk_size, n_models, time.time() - st)
+
+            st = time.time()
+            models = (build(seed) for seed in range(n_models))
+            list(solve_many(models, workers=workers, chunk_size=chunk_size))
+            report(f, "models", workers, chunk_size, n_models, time.time() - st)
+    f.close()
@@ -0,0 +1,77 @@
+"""Time to optimize a transportation problem for many scenarios of plant
+capacities, changing the right hand side of each constraint and optimizing
+the model again, and with Model.sweep in this process and in a pool of
+worker processes
+
+usage: python sweep.py [number of scenarios ...]
+"""
+
+from sys import argv
+import multiprocessing
+import random
+import time
+from mip import Model, xsum
+
+SCENARIOS = [100, 500]
+PLANTS = 50
+CUSTOMERS = 200
+
+
+def instance(ns: int):
+    rnd = random.Random(ns)
+    c = [[rnd.randint(1, 100) for j in range(CUSTOMERS)] for i in range(PLANTS)]
+    d = [rnd.randint(10, 50) for j in range(CUSTOMERS)]
+    cap = sum(d) * 2 / PLANTS
+    u = [[rnd.uniform(0.6, 1.4) * cap for i in range(PLANTS)] for s in range(ns)]
+    return c, d, u
+
+
+def build(c, d):
+    m = Model(solver_name="CBC")
+    m.verbose = 0
+    x = [[m.add_var(obj=c[i][j]) for j in range(CUSTOMERS)] for i in range(PLANTS)]
+    capacity = [m.add_constr(xsum(x[i]) <= 0) for i in range(PLANTS)]
+    for j in range(CUSTOMERS):
+        m += xsum(x[i][j] for i in range(PLANTS)) >= d[j]
+    return m, capacity
+
+
+def loop(c, d, u):
+    m, capacity = build(c, d)
+    total = 0.0
+    for us in u:
+        for (constr, value) in zip(capacity, us):
+            constr.rhs = value
+        m.optimize()
+        total += m.objective_value
+    return total
+
+
+def sweep(c, d, u, workers: int):
+    m, capacity = build(c, d)
+    res = m.sweep(rhs_matrix=u, rhs_idx=[r.idx for r in capacity], workers=workers)
+    return res.objective_value.sum()
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in argv[1:]] or SCENARIOS
+    cpus = multiprocessing.cpu_count()
+    f = open("sweep.csv", "w")
+    f.write("scenarios,method,workers,time,objective\n")
+    for ns in sizes:
+        data = instance(ns)
+        methods = [("loop", 1, lambda: loop(*data))]
+        for workers in sorted({1, cpus}):
+            methods.append(("sweep", workers, lambda w=workers: sweep(*data, w)))
+        for (name, workers, run) in methods:
+            st = time.time()
+            obj = run()
+            ttime = time.time() - st
+            f.write("{},{},{},{:.2f},{}\n".format(ns, name, workers, ttime, obj))
+            f.flush()
+            print(
+                "{} scenarios {} workers: {} time: {:.2f}s total obj: {}".format(
+                    ns, name, workers, ttime, obj
+                )
+            )
+    f.close()
@@ -5,7 +5,7 @@
 Simple column generation implementation for a Cutting Stock Problem
 """
 
-from mip import Model, xsum, Column, CONTINUOUS, INTEGER
+from mip import Model, xsum, ColumnsGenerator, ColumnGeneration, INTEGER
 
 L = 250  # bar length
 m = 4  # number of requests
@@ -25,61 +25,45 @@ constraints = []
 for i in range(m):
     constraints.append(master.add_constr(lambdas[i] >= b[i], name='i_%d' % (i + 1)))
 
-# creating the pricing problem
-pricing = Model()
 
-# creating pricing variables
-a = [pricing.add_var(obj=0, var_type=INTEGER, name='a_%d' % (i + 1)) for i in range(m)]
+class Pricing(ColumnsGenerator):
+    """finds the cutting pattern with the smallest reduced cost solving a
+    knapsack problem"""
 
-# creating pricing constraint
-pricing += xsum(w[i] * a[i] for i in range(m)) <= L, 'bar_length'
+    def __init__(self):
+        super().__init__()
+        # creating the pricing problem
+        self.pricing = Model()
+        self.pricing.verbose = 0
 
-new_vars = True
-while new_vars:
+        # creating pricing variables
+        self.a = [self.pricing.add_var(obj=0, var_type=INTEGER, name='a_%d' % (i + 1))
+                  for i in range(m)]
 
-    ##########
-    # STEP 1: solving restricted master problem
-    ##########
+        # creating pricing constraint
+        self.pricing += xsum(w[i] * self.a[i] for i in range(m)) <= L, 'bar_length'
 
-    master.optimize()
+    def generate_columns(self, model, duals):
+        # updating pricing objective with dual values from master
+        self.pricing.objective = 1 - xsum(duals[constraints[i].idx] * self.a[i]
+                                          for i in range(m))
+        self.pricing.optimize()
 
-    ##########
-    # STEP 2: updating pricing objective with dual values from master
-    ##########
+        pattern = [round(self.a[i].x) for i in range(m)]
+        print('Pricing solution: z = {:.3} a = {}'.format(
+            self.pricing.objective_value, pattern))
 
-    pricing += 1 - xsum(constraints[i].pi * a[i] for i in range(m))
+        # the column of the new pattern, only added to the master if its
+        # reduced cost is negative
+        items = [i for i in range(m) if pattern[i] > 0]
+        name = 'lambda_' + '_'.join(str(q) for q in pattern)
+        return [(1, [constraints[i].idx for i in items], [pattern[i] for i in items],
+                 name)]
 
-    # solving pricing problem
-    pricing.optimize()
 
-    # printing pricing solution
-    z_val = pricing.objective_value
-    print('Pricing solution:')
-    print('    z =  {z_val}'.format(**locals()))
-    print('    a = ', end='')
-    print([v.x for v in pricing.vars])
-    print('')
-
-    ##########
-    # STEP 3: adding the new columns (if any is obtained with negative reduced cost)
-    ##########
-
-    # checking if columns with negative reduced cost were produced and
-    # adding them into the restricted master problem
-    if pricing.objective_value < - 1e-5:
-        pattern = [a[i].x for i in range(m)]
-        column = Column(constraints, pattern)
-        lambdas.append(master.add_var(obj=1, column=column,
-                                      name='lambda_%d' % (len(lambdas) + 1)))
-
-        print('new pattern = {pattern}'.format(**locals()))
-
-    # if no column with negative reduced cost was produced, then linear
-    # relaxation of the restricted master problem is solved
-    else:
-        new_vars = False
-
-    pricing.write('pricing.lp')
+cg = ColumnGeneration(master, Pricing())
+cg.optimize()
+lambdas += cg.columns
 
 # printing the solution
 print('')
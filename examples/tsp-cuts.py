@@ -31,11 +31,9 @@ class SubTourCutGenerator(ConstrsGenerator):
                     cut = xsum(1.0*v for v, fm in aInS) <= len(S)-1
                     cp.add(cut)
                     if len(cp.cuts) > 256:
-                        for cut in cp.cuts:
-                            model += cut
+                        model += cp
                         return
-        for cut in cp.cuts:
-            model += cut
+        model += cp
 
 
 n = 30  # number of points
@@ -1,12 +1,24 @@
 from mip.constants import *
 from mip.solver import Solver
 from mip.callbacks import *
-from mip.log import ProgressLog
+from mip.parallel import ParallelConstrsGenerator
+from mip.log import ProgressLog, ProgressEvent, ProgressStream, LPSolveInfo
 from mip.lists import ConstrList, VarList, VConstrList, VVarList
 from mip.exceptions import *
 from mip.ndarray import LinExprTensor
 from mip.entities import Column, Constr, LinExpr, Var, ConflictGraph
 from mip.model import *
+from mip.arrays import ModelArrays
+from mip.batch import Solution, SolvePool, solve_many
+from mip.portfolio import PortfolioResult
+from mip.sweep import SweepResult
+from mip.cache import SolveCache
+from mip.presolve import Presolve
+from mip.propagation import BoundPropagation
+from mip.decompose import Components, BlockStructure
+from mip.colgen import ColumnGeneration
+from mip.benders import Benders, BendersSubproblem
+from mip.lagrangian import LagrangianRelaxation
 
 __version__ = VERSION
 name = "mip"
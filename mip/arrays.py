@@ -0,0 +1,237 @@
+"""Compact representation of models in numpy arrays"""
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+import mip
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+
+class ModelArrays:
+    """Data of a model (variables, constraints and objective function) stored
+    in numpy arrays, with the constraint matrix in the compressed sparse row
+    (CSR) format. This representation can be pickled and sent to other
+    processes much faster than model objects and is used to solve models in
+    worker processes, see :func:`~mip.solve_many`::
+
+        data = ModelArrays.from_model(m)
+        m2 = data.to_model()
+
+    Constraint :code:`i` is :code:`sum(coefs[k] * x[indices[k]]) senses[i]
+    rhs[i]`, for :code:`k` in :code:`range(indptr[i], indptr[i + 1])`.
+
+    Attributes:
+        obj(numpy.ndarray): objective function coefficients
+        lb(numpy.ndarray): lower bounds of the variables
+        ub(numpy.ndarray): upper bounds of the variables
+        var_type(numpy.ndarray): types of the variables, CONTINUOUS ("C"),
+            BINARY ("B") or INTEGER ("I")
+        indptr(numpy.ndarray): start of each constraint in
+            :attr:`indices` and :attr:`coefs`, with one extra element with
+            the number of non-zeros
+        indices(numpy.ndarray): variable indices of the non-zeros
+        coefs(numpy.ndarray): coefficients of the non-zeros
+        senses(numpy.ndarray): constraint senses, LESS_OR_EQUAL ("<"),
+            GREATER_OR_EQUAL (">") or EQUAL ("=")
+        rhs(numpy.ndarray): right hand sides of the constraints
+        sense(str): objective function sense, MINIMIZE or MAXIMIZE
+        objective_const(float): constant of the objective function
+        name(str): model name
+        var_names(Optional[List[str]]): variable names, only if requested
+        constr_names(Optional[List[str]]): constraint names, only if
+            requested
+    """
+
+    def __init__(
+        self,
+        obj,
+        lb,
+        ub,
+        var_type,
+        indptr,
+        indices,
+        coefs,
+        senses,
+        rhs,
+        sense: str = mip.MINIMIZE,
+        objective_const: float = 0.0,
+        name: str = "",
+        var_names: Optional[List[str]] = None,
+        constr_names: Optional[List[str]] = None,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use ModelArrays"
+            )
+        self.obj = np.asarray(obj, dtype=np.float64)
+        self.lb = np.asarray(lb, dtype=np.float64)
+        self.ub = np.asarray(ub, dtype=np.float64)
+        self.var_type = np.asarray(var_type, dtype="U1")
+        self.indptr = np.asarray(indptr, dtype=np.int32)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.coefs = np.asarray(coefs, dtype=np.float64)
+        self.senses = np.asarray(senses, dtype="U1")
+        self.rhs = np.asarray(rhs, dtype=np.float64)
+        self.sense = sense
+        self.objective_const = objective_const
+        self.name = name
+        self.var_names = var_names
+        self.constr_names = constr_names
+
+        n, m = len(self.obj), len(self.rhs)
+        if not (len(self.lb) == len(self.ub) == len(self.var_type) == n):
+            raise ValueError("All variable arrays must have the same length")
+        if len(self.senses) != m or len(self.indptr) != m + 1:
+            raise ValueError("Invalid dimensions of the constraint arrays")
+        if len(self.indices) != len(self.coefs) or self.indptr[-1] != len(
+            self.coefs
+        ):
+            raise ValueError("Invalid number of non-zeros")
+        if len(self.indices) and (self.indices.min() < 0 or self.indices.max() >= n):
+            raise ValueError("Invalid variable index in constraints")
+
+    @property
+    def num_cols(self) -> int:
+        """number of variables
+
+        :rtype: int
+        """
+        return len(self.obj)
+
+    @property
+    def num_rows(self) -> int:
+        """number of constraints
+
+        :rtype: int
+        """
+        return len(self.rhs)
+
+    @property
+    def num_nz(self) -> int:
+        """number of non-zeros in the constraint matrix
+
+        :rtype: int
+        """
+        return len(self.coefs)
+
+    @classmethod
+    def from_model(cls, model: "mip.Model", names: bool = False) -> "ModelArrays":
+        """Stores the data of a model in arrays
+
+        Args:
+            model(mip.Model): model
+            names(bool): if the names of variables and constraints should
+                be stored
+
+        :rtype: mip.ModelArrays
+        """
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use ModelArrays"
+            )
+        mvars = model.vars
+        obj, lb, ub, var_type, indptr, indices, coefs, senses, rhs = (
+            model.solver.get_arrays()
+        )
+        return cls(
+            obj,
+            lb,
+            ub,
+            var_type,
+            indptr,
+            indices,
+            coefs,
+            senses,
+            rhs,
+            sense=model.sense,
+            objective_const=model.objective_const,
+            name=model.name,
+            var_names=[v.name for v in mvars] if names else None,
+            constr_names=[c.name for c in model.constrs] if names else None,
+        )
+
+    def fingerprint(self, params: Optional[Dict[str, Any]] = None) -> str:
+        """Hash of the data of the model, which does not depend on names nor
+        on the order of the variables within each constraint, so that
+        identical models built in different ways have the same fingerprint.
+        Computed with :mod:`hashlib` on the arrays, it is stable across
+        processes and Python versions.
+
+        Args:
+            params(Dict[str, Any]): other values included in the hash, e.g.,
+                solver settings
+
+        :rtype: str
+        """
+        # coefficients are sorted by variable within each constraint and
+        # negative zeros are replaced by zeros
+        rows = np.repeat(np.arange(self.num_rows), np.diff(self.indptr))
+        order = np.lexsort((self.indices, rows))
+        h = hashlib.blake2b(digest_size=20)
+        h.update(
+            repr(
+                (self.num_cols, self.num_rows, self.sense, self.objective_const + 0.0)
+            ).encode("utf-8")
+        )
+        for a in (self.obj, self.lb, self.ub, self.coefs[order], self.rhs):
+            h.update((a + 0.0).astype("<f8").tobytes())
+        for a in (self.indptr, self.indices[order]):
+            h.update(a.astype("<i4").tobytes())
+        for a in (self.var_type, self.senses):
+            h.update("".join(a.tolist()).encode("utf-8"))
+        if params:
+            h.update(repr(sorted(params.items())).encode("utf-8"))
+        return h.hexdigest()
+
+    def to_model(self, solver_name: str = "") -> "mip.Model":
+        """Creates a model with this data
+
+        Args:
+            solver_name(str): solver of the new model
+
+        :rtype: mip.Model
+        """
+        model = mip.Model(self.name, self.sense, solver_name)
+        n, var_names = self.num_cols, self.var_names
+        is_int = self.var_type != mip.CONTINUOUS
+        lb = np.where(self.var_type == mip.BINARY, 0.0, self.lb)
+        ub = np.where(self.var_type == mip.BINARY, 1.0, self.ub)
+        # variables are added in runs of continuous or integer variables,
+        # without coefficients in constraints, which are added by rows
+        bounds = (np.flatnonzero(np.diff(is_int)) + 1).tolist()
+        runs = zip([0] + bounds, bounds + [n]) if n else []
+        for (s, e) in runs:
+            model.add_vars_csc(
+                self.obj[s:e],
+                np.zeros(e - s + 1, dtype=np.int32),
+                [],
+                [],
+                lb[s:e],
+                ub[s:e],
+                mip.INTEGER if is_int[s] else mip.CONTINUOUS,
+                var_names[s:e] if var_names else None,
+            )
+        model.objective_const = self.objective_const
+        model.add_constrs_csr(
+            self.indptr,
+            self.indices,
+            self.coefs,
+            self.senses,
+            self.rhs,
+            self.constr_names,
+        )
+        return model
+
+
+def _best_bounds(obj, lb, ub, sense: str) -> "np.ndarray":
+    """optimal values of variables that appear in no constraint: the bound
+    that is best for the objective function or, for variables not in the
+    objective function, the value closest to zero within their bounds"""
+    cost = obj if sense == mip.MINIMIZE else -obj
+    return np.where(cost > 0, lb, np.where(cost < 0, ub, np.clip(0.0, lb, ub)))
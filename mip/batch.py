@@ -0,0 +1,428 @@
+"""Optimization of many independent models in a pool of worker processes"""
+import logging
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, Optional, Union
+import mip
+from mip.arrays import ModelArrays
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+# state of a worker process: solver used when models are created from
+# arrays, decided in the first task
+_worker = {}
+
+# interval, in seconds, between checks of the cancel token while waiting
+# for results
+CANCEL_POLL = 0.05
+
+
+class Solution:
+    """Snapshot of the results of an optimization, which remains available
+    after the model is modified or destroyed and can be sent to other
+    processes. Returned by :func:`~mip.solve_many`.
+
+    Attributes:
+        index(int): position of the model in the sequence of models informed
+            to :func:`~mip.solve_many`
+        status(mip.OptimizationStatus): optimization status, ERROR if the
+            model could not be built or optimized
+        objective_value(Optional[float]): cost of the best solution found
+        objective_bound(Optional[float]): bound of the objective function
+        x(Optional[numpy.ndarray]): values of the variables, indexed by
+            variable index, in the best solution found
+        num_solutions(int): number of solutions found
+        time(float): time, in seconds, to build and optimize the model
+        error(Optional[str]): description of the error, when the
+            optimization failed
+    """
+
+    def __init__(
+        self,
+        index: int = -1,
+        status: mip.OptimizationStatus = mip.OptimizationStatus.OTHER,
+        objective_value: Optional[float] = None,
+        objective_bound: Optional[float] = None,
+        x: Optional["np.ndarray"] = None,
+        num_solutions: int = 0,
+        time: float = 0.0,
+        error: Optional[str] = None,
+    ):
+        self.index = index
+        self.status = status
+        self.objective_value = objective_value
+        self.objective_bound = objective_bound
+        self.x = x
+        self.num_solutions = num_solutions
+        self.time = time
+        self.error = error
+
+    @classmethod
+    def from_model(cls, model: "mip.Model", index: int = -1) -> "Solution":
+        """Stores the results of the last optimization of a model
+
+        Args:
+            model(mip.Model): optimized model
+            index(int): identification of the model
+
+        :rtype: mip.Solution
+        """
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use Solution"
+            )
+        x = None
+        if model.num_solutions:
+            x = np.fromiter((v.x for v in model.vars), np.float64, model.num_cols)
+        return cls(
+            index,
+            model.status,
+            model.objective_value,
+            model.objective_bound,
+            x,
+            model.num_solutions,
+        )
+
+    @property
+    def failed(self) -> bool:
+        """if the model could not be built or optimized
+
+        :rtype: bool
+        """
+        return self.error is not None
+
+    def __repr__(self) -> str:
+        return "Solution(index={}, status={}, objective_value={}{})".format(
+            self.index,
+            self.status.name,
+            self.objective_value,
+            "" if self.error is None else ", error={!r}".format(self.error),
+        )
+
+
+def _solve_task(index: int, task, timeout: float, kwargs: dict) -> Solution:
+    start = perf_counter()
+    try:
+        if isinstance(task, ModelArrays):
+            model = task.to_model(_worker["solver_name"])
+            model.verbose = 0
+        else:
+            model = task()
+        # the solver is selected only once in each worker
+        _worker["solver_name"] = model.solver_name
+        if timeout < mip.INF:
+            max_seconds = max(timeout - (perf_counter() - start), 0.0)
+            kwargs = dict(kwargs)
+            kwargs["max_seconds"] = min(kwargs.get("max_seconds", mip.INF), max_seconds)
+        model.optimize(**kwargs)
+        solution = Solution.from_model(model, index)
+    except Exception as e:
+        solution = Solution(
+            index,
+            mip.OptimizationStatus.ERROR,
+            error="{}: {}".format(type(e).__name__, e),
+        )
+    solution.time = perf_counter() - start
+    return solution
+
+
+def _worker_main(conn, solver_name: str):
+    _worker["solver_name"] = solver_name
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+        chunk, timeout, kwargs = msg
+        for (index, task) in chunk:
+            conn.send(_solve_task(index, task, timeout, kwargs))
+
+
+class _Worker:
+    """worker process, tasks sent to it and time when the current task
+    started"""
+
+    def __init__(self, ctx, solver_name: str):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, solver_name), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.pending = deque()
+        self.started = 0.0
+
+    def stop(self, force: bool = False):
+        if not force:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                force = True
+            self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+class SolvePool:
+    """Pool of worker processes that optimize independent models. Worker
+    processes are created in the first call of :meth:`solve_many` and kept
+    until :meth:`close` is called, so that the cost of starting processes
+    and loading the solver library is paid only once::
+
+        with SolvePool(workers=8) as pool:
+            for sol in pool.solve_many(models, chunk_size=16, timeout=10):
+                print(sol.index, sol.status, sol.objective_value)
+
+    Args:
+        workers(int): number of worker processes, by default the number of
+            CPUs
+        solver_name(str): solver used in models informed as
+            :class:`~mip.Model` or :class:`~mip.ModelArrays`, by default the
+            same as :class:`~mip.Model`
+        start_method(str): start method of the worker processes, see
+            :func:`multiprocessing.get_context`
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        solver_name: str = "",
+        start_method: Optional[str] = None,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use SolvePool"
+            )
+        self.workers = workers or multiprocessing.cpu_count()
+        self.solver_name = solver_name
+        self.start_method = start_method
+        self.__ctx = multiprocessing.get_context(start_method)
+        self.__workers = []
+
+    def close(self):
+        """terminates the worker processes"""
+        for w in self.__workers:
+            w.stop()
+        self.__workers = []
+
+    def __enter__(self) -> "SolvePool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __replace(self, w: _Worker, error: str, retry: deque) -> Solution:
+        """terminates a worker whose current task failed, the remaining
+        tasks sent to it are sent again to other workers"""
+        w.stop(force=True)
+        self.__workers[self.__workers.index(w)] = _Worker(self.__ctx, self.solver_name)
+        index, _ = w.pending.popleft()
+        retry.extendleft(reversed(w.pending))
+        return Solution(
+            index,
+            mip.OptimizationStatus.ERROR,
+            time=perf_counter() - w.started,
+            error=error,
+        )
+
+    def solve_many(
+        self,
+        models: Iterable[Union["mip.Model", ModelArrays, Callable[[], "mip.Model"]]],
+        chunk_size: int = 1,
+        timeout: float = mip.INF,
+        grace: float = 5.0,
+        cancel_token: Optional["mip.CancelToken"] = None,
+        **kwargs
+    ) -> Iterator[Solution]:
+        """Optimizes models in the worker processes, returning their
+        :class:`~mip.Solution` as soon as each optimization finishes, not
+        necessarily in the order of the models.
+
+        Each model can be informed as:
+
+        * a function without arguments (or a :func:`functools.partial`)
+          that builds the model, called in the worker process. This is the
+          fastest option, since only the function is sent;
+        * a :class:`~mip.ModelArrays`, sent as a few numpy arrays;
+        * a :class:`~mip.Model`, converted to :class:`~mip.ModelArrays`.
+
+        Functions must be picklable, i.e., defined at module level. Models
+        are read from :code:`models` only when there are idle workers, so it
+        can be a generator of a very large number of models.
+
+        Failures do not interrupt the other optimizations: if a model
+        cannot be built or optimized, or if the worker process crashes, its
+        solution has status ERROR and a description of the error.
+
+        Args:
+            models: sequence of models, see above
+            chunk_size(int): number of models sent together to a worker,
+                larger chunks reduce the communication overhead for very
+                small models
+            timeout(float): maximum time, in seconds, to build and optimize
+                each model. It is informed to the solver as the time limit
+                and the worker process is terminated if a model takes more
+                than :code:`timeout + grace` seconds
+            grace(float): extra time for the solver to stop after the time
+                limit, see above
+            cancel_token(mip.CancelToken): when this token is cancelled, the
+                optimizations running are terminated, without returning
+                their solutions, and the remaining models are not optimized
+
+            Other arguments are passed to :meth:`~mip.Model.optimize`.
+
+        :rtype: Iterator[mip.Solution]
+        """
+        if chunk_size < 1:
+            raise mip.InvalidParameter("chunk_size should be at least one")
+        while len(self.__workers) < self.workers:
+            self.__workers.append(_Worker(self.__ctx, self.solver_name))
+
+        items = enumerate(models)
+        retry = deque()
+
+        def next_chunk() -> list:
+            chunk = []
+            while retry and len(chunk) < chunk_size:
+                chunk.append(retry.popleft())
+            for (index, model) in items:
+                if isinstance(model, mip.Model):
+                    model = ModelArrays.from_model(model)
+                elif not (isinstance(model, ModelArrays) or callable(model)):
+                    raise TypeError("Invalid model type: {}".format(type(model)))
+                chunk.append((index, model))
+                if len(chunk) == chunk_size:
+                    break
+            return chunk
+
+        try:
+            while True:
+                if cancel_token is not None and cancel_token.cancelled:
+                    return
+                for (i, w) in enumerate(self.__workers):
+                    if not w.pending:
+                        chunk = next_chunk()
+                        if not chunk:
+                            break
+                        if not w.process.is_alive():
+                            w.stop(force=True)
+                            w = _Worker(self.__ctx, self.solver_name)
+                            self.__workers[i] = w
+                        w.conn.send((chunk, timeout, kwargs))
+                        w.pending.extend(chunk)
+                        w.started = perf_counter()
+                busy = [w for w in self.__workers if w.pending]
+                if not busy:
+                    return
+
+                wait_time = None
+                if timeout < mip.INF:
+                    deadline = min(w.started for w in busy) + timeout + grace
+                    wait_time = max(deadline - perf_counter(), 0.0)
+                if cancel_token is not None:
+                    wait_time = (
+                        CANCEL_POLL if wait_time is None else min(wait_time, CANCEL_POLL)
+                    )
+                ready = wait(
+                    [w.conn for w in busy] + [w.process.sentinel for w in busy],
+                    wait_time,
+                )
+
+                for w in busy:
+                    if w.conn in ready:
+                        try:
+                            solution = w.conn.recv()
+                        except EOFError:
+                            yield self.__replace(
+                                w,
+                                "Worker process terminated with exit code {}".format(
+                                    w.process.exitcode
+                                ),
+                                retry,
+                            )
+                            continue
+                        w.pending.popleft()
+                        w.started = perf_counter()
+                        yield solution
+                    elif w.process.sentinel in ready:
+                        # process finished and all its messages were read
+                        w.process.join()
+                        yield self.__replace(
+                            w,
+                            "Worker process terminated with exit code {}".format(
+                                w.process.exitcode
+                            ),
+                            retry,
+                        )
+                    elif perf_counter() - w.started > timeout + grace:
+                        yield self.__replace(w, "Timeout", retry)
+        finally:
+            # results of tasks still running would be mixed with the results
+            # of the next call
+            for (i, w) in enumerate(self.__workers):
+                if w.pending:
+                    w.stop(force=True)
+                    self.__workers[i] = _Worker(self.__ctx, self.solver_name)
+
+
+def solve_many(
+    models: Iterable[Union["mip.Model", ModelArrays, Callable[[], "mip.Model"]]],
+    workers: Optional[int] = None,
+    chunk_size: int = 1,
+    timeout: float = mip.INF,
+    solver_name: str = "",
+    **kwargs
+) -> Iterator[Solution]:
+    """Optimizes many independent models in a pool of worker processes,
+    returning their :class:`~mip.Solution` as soon as each optimization
+    finishes. Example, with models built in the worker processes::
+
+        def build(store):
+            m = Model()
+            ...
+            return m
+
+        results = {}
+        for sol in solve_many(partial(build, s) for s in stores):
+            results[stores[sol.index]] = sol
+
+    The worker processes are terminated when all models are optimized, use
+    a :class:`~mip.SolvePool` to keep them between calls. See
+    :meth:`SolvePool.solve_many` for the description of the arguments.
+
+    Args:
+        models: sequence of models, functions that build models or
+            :class:`~mip.ModelArrays`
+        workers(int): number of worker processes, by default the number of
+            CPUs
+        chunk_size(int): number of models sent together to a worker
+        timeout(float): maximum time, in seconds, for each model
+        solver_name(str): solver used in models informed as
+            :class:`~mip.Model` or :class:`~mip.ModelArrays`
+        cancel_token(mip.CancelToken): stops the optimizations, see
+            :meth:`SolvePool.solve_many`
+
+        Other arguments are passed to :meth:`~mip.Model.optimize`.
+
+    :rtype: Iterator[mip.Solution]
+    """
+    with SolvePool(workers, solver_name) as pool:
+        yield from pool.solve_many(models, chunk_size, timeout, **kwargs)
@@ -0,0 +1,509 @@
+"""Benders decomposition of two-stage problems, see :class:`~mip.Benders`"""
+
+import logging
+import multiprocessing
+from time import perf_counter
+from typing import Optional, Sequence, Tuple, Union
+import mip
+from mip.arrays import ModelArrays
+from mip.callbacks import ConstrsGenerator, _original_solution, _add_original_rows
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+
+class BendersSubproblem:
+    """Second stage problem of a Benders decomposition: a linear program,
+    minimizing its cost, whose right hand sides depend on the first stage
+    variables of the master problem. The subproblem is informed with the
+    right hand sides for the first stage variables at zero and the
+    coefficients of the first stage variables in its constraints
+    (``coupling``), so that constraint ``i`` of the subproblem is::
+
+        expr_i + sum(coef * x[j] for (i, j, coef) in coupling) sense_i rhs_i
+
+    where ``x`` are the variables of the master problem.
+
+    Args:
+        model: subproblem, as a :class:`~mip.Model` or
+            :class:`~mip.ModelArrays`. Integer variables are relaxed.
+        coupling: list of tuples (row, var, coef) with the index of a
+            constraint of the subproblem, a variable of the master problem
+            (or its index) and its coefficient in this constraint
+        weight(float): weight of the cost of this subproblem in the
+            objective function of the master problem, e.g., the
+            probability of a scenario
+    """
+
+    def __init__(
+        self,
+        model: Union["mip.Model", ModelArrays],
+        coupling: Sequence[Tuple[int, Union["mip.Var", int], float]],
+        weight: float = 1.0,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use BendersSubproblem"
+            )
+        if isinstance(model, mip.Model):
+            model = ModelArrays.from_model(model)
+        if model.sense != mip.MINIMIZE:
+            raise mip.InvalidParameter("Benders subproblems should be minimized")
+        self.data = model
+        self.weight = weight
+        self.rows = np.array([c[0] for c in coupling], dtype=np.int32)
+        self.cols = np.array(
+            [c[1].idx if isinstance(c[1], mip.Var) else c[1] for c in coupling],
+            dtype=np.int32,
+        )
+        self.coefs = np.array([c[2] for c in coupling], dtype=np.float64)
+        if len(self.rows) and (
+            self.rows.min() < 0 or self.rows.max() >= model.num_rows
+        ):
+            raise mip.InvalidParameter("Invalid constraint index in coupling")
+
+    def rhs(self, x: "np.ndarray") -> "np.ndarray":
+        """right hand sides of the constraints of the subproblem for the
+        values x of the variables of the master problem
+
+        :rtype: numpy.ndarray
+        """
+        return self.data.rhs - np.bincount(
+            self.rows, weights=self.coefs * x[self.cols], minlength=self.data.num_rows
+        )
+
+    def phase1(self) -> ModelArrays:
+        """auxiliary problem minimizing the violation of the constraints of
+        the subproblem, used to generate feasibility cuts
+
+        :rtype: mip.ModelArrays
+        """
+        data = self.data
+        n, nrows = data.num_cols, data.num_rows
+        # one artificial variable per inequality and two per equality
+        art_row, art_coef = [], []
+        for (i, sense) in enumerate(data.senses.tolist()):
+            if sense in (mip.GREATER_OR_EQUAL, mip.EQUAL):
+                art_row.append(i)
+                art_coef.append(1.0)
+            if sense in (mip.LESS_OR_EQUAL, mip.EQUAL):
+                art_row.append(i)
+                art_coef.append(-1.0)
+        art_row = np.array(art_row, dtype=np.int32)
+        na = len(art_row)
+        rows = np.concatenate(
+            (np.repeat(np.arange(nrows), np.diff(data.indptr)), art_row)
+        )
+        indices = np.concatenate((data.indices, n + np.arange(na, dtype=np.int32)))
+        coefs = np.concatenate((data.coefs, art_coef))
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(nrows + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=nrows), out=indptr[1:])
+        return ModelArrays(
+            np.concatenate((np.zeros(n), np.ones(na))),
+            np.concatenate((data.lb, np.zeros(na))),
+            np.concatenate((data.ub, np.full(na, mip.INF))),
+            np.full(n + na, mip.CONTINUOUS),
+            indptr,
+            indices[order],
+            coefs[order],
+            data.senses,
+            data.rhs,
+        )
+
+
+class _SubproblemSolver:
+    """optimizes a subproblem for solutions of the master problem, keeping
+    the models to re-optimize them from the previous basis"""
+
+    def __init__(self, sub: BendersSubproblem, solver_name: str):
+        self.sub = sub
+        self.solver_name = solver_name
+        self.model = self.__create(sub.data)
+        self.phase1 = None
+
+    def __create(self, data: ModelArrays) -> "mip.Model":
+        model = data.to_model(self.solver_name)
+        model.verbose = 0
+        model.persistent_lp = True
+        return model
+
+    def __gradient(self, pi: "np.ndarray"):
+        """gradient of the cost of the subproblem with respect to the first
+        stage variables, as indices and values"""
+        sub = self.sub
+        cols, pos = np.unique(sub.cols, return_inverse=True)
+        return cols, np.bincount(pos, weights=-sub.coefs * pi[sub.rows])
+
+    def solve(self, x: "np.ndarray"):
+        """returns the status, the cost (or the violation of the constraints
+        if infeasible) and its gradient"""
+        rhs = self.sub.rhs(x)
+        model = self.model
+        model.set_rhs(rhs)
+        status = model.optimize(relax=True)
+        if status == mip.OptimizationStatus.OPTIMAL:
+            return (status, model.objective_value) + self.__gradient(model.get_pi())
+        if status != mip.OptimizationStatus.INFEASIBLE:
+            return status, None, None, None
+
+        if self.phase1 is None:
+            self.phase1 = self.__create(self.sub.phase1())
+        self.phase1.set_rhs(rhs)
+        if self.phase1.optimize(relax=True) != mip.OptimizationStatus.OPTIMAL:
+            return mip.OptimizationStatus.ERROR, None, None, None
+        return (status, self.phase1.objective_value) + self.__gradient(
+            self.phase1.get_pi()
+        )
+
+
+def _solve_all(solvers, x: "np.ndarray") -> list:
+    results = []
+    for (k, solver) in solvers:
+        try:
+            results.append((k,) + solver.solve(x))
+        except Exception as e:
+            logger.error("Error optimizing subproblem {}: {}".format(k, e))
+            results.append((k, mip.OptimizationStatus.ERROR, None, None, None))
+    return results
+
+
+def _worker_main(conn, subproblems, solver_name: str):
+    solvers = [(k, _SubproblemSolver(sub, solver_name)) for (k, sub) in subproblems]
+    while True:
+        try:
+            x = conn.recv()
+        except EOFError:
+            break
+        if x is None:
+            break
+        conn.send(_solve_all(solvers, x))
+
+
+class Benders(ConstrsGenerator):
+    """Benders decomposition of two-stage problems: the master problem
+    contains the first stage variables and, for each solution of the master
+    problem, the second stage subproblems (linear programs) are optimized
+    to generate optimality cuts, bounding the cost of the subproblems, and
+    feasibility cuts, removing first stage solutions for which some
+    subproblem is infeasible. Example::
+
+        subs = [BendersSubproblem(build_scenario(s), coupling(s), prob[s])
+                for s in scenarios]
+        with Benders(master, subs, workers=8) as benders:
+            benders.optimize(max_seconds=600)
+
+    Variables for the cost of the subproblems are added to the master
+    problem: one per subproblem in multi-cut mode (attribute
+    :attr:`theta`), with their weights as objective function coefficients,
+    or a single one, bounding their weighted sum, in single-cut mode. Before
+    the branch-and-cut, the linear programming relaxation of the master
+    problem is strengthened with up to ``lp_rounds`` rounds of cuts, added
+    as constraints. In the search, cuts are added as lazy constraints at
+    integer feasible solutions of the master problem.
+
+    In each call the right hand sides of all subproblems are computed with
+    a few array operations and set in bulk (:meth:`~mip.Model.set_rhs`),
+    subproblems are re-optimized starting from their previous basis and cuts
+    are built from their dual values (:meth:`~mip.Model.get_pi`). With
+    ``workers`` > 1, subproblems are distributed among worker processes,
+    where they are kept between calls. Call :meth:`close` (or use the object
+    as a context manager) to terminate the worker processes.
+
+    Args:
+        master(mip.Model): master problem, a minimization problem with the
+            first stage variables
+        subproblems: list of :class:`BendersSubproblem`
+        multi_cut(bool): one cost variable and one optimality cut per
+            subproblem (True) or a single aggregated cut (False)
+        lower_bound(float): lower bound of the cost of each subproblem
+        lp_rounds(int): maximum number of rounds of cuts for the linear
+            programming relaxation of the master problem
+        workers(int): number of worker processes
+        solver_name(str): solver used in the subproblems
+        cut_tol(float): minimum relative violation of an optimality cut
+        start_method(str): start method of the worker processes, see
+            :func:`multiprocessing.get_context`
+
+    Attributes:
+        theta(List[mip.Var]): cost variables added to the master problem
+        calls(int): number of rounds of subproblem optimizations
+        optimality_cuts(int): number of optimality cuts generated
+        feasibility_cuts(int): number of feasibility cuts generated
+        subproblem_time(float): time, in seconds, spent optimizing
+            subproblems, including the communication with worker processes
+    """
+
+    def __init__(
+        self,
+        master: "mip.Model",
+        subproblems: Sequence[BendersSubproblem],
+        multi_cut: bool = True,
+        lower_bound: float = 0.0,
+        lp_rounds: int = 50,
+        workers: int = 1,
+        solver_name: str = "",
+        cut_tol: float = 1e-6,
+        start_method: Optional[str] = None,
+    ):
+        if np is None:
+            raise ModuleNotFoundError("You need to install package numpy to use Benders")
+        if master.sense != mip.MINIMIZE:
+            raise mip.InvalidParameter("The master problem should be minimized")
+        if not subproblems:
+            raise mip.InvalidParameter("At least one subproblem should be informed")
+        super().__init__()
+        self.master = master
+        self.subproblems = list(subproblems)
+        self.multi_cut = multi_cut
+        self.lp_rounds = lp_rounds
+        self.workers = workers
+        self.solver_name = solver_name or master.solver_name
+        self.cut_tol = cut_tol
+        self.start_method = start_method
+
+        if multi_cut:
+            self.theta = [
+                master.add_var("theta({})".format(k), lb=lower_bound, obj=sub.weight)
+                for (k, sub) in enumerate(self.subproblems)
+            ]
+        else:
+            total = sum(sub.weight for sub in self.subproblems)
+            self.theta = [master.add_var("theta", lb=total * lower_bound, obj=1)]
+        if master.num_rows == 0:
+            # CBC cannot re-optimize problems without constraints after cuts
+            # are added, a redundant constraint is included
+            master.add_constr(
+                mip.xsum(self.theta) >= self.theta[0].lb * len(self.theta), "theta_lb"
+            )
+
+        self.calls = 0
+        self.optimality_cuts = 0
+        self.feasibility_cuts = 0
+        self.subproblem_time = 0.0
+
+        self.__solvers = None
+        self.__workers = []
+        self.__error = None
+
+    def __start(self):
+        """creates the subproblem models, in this process or in the workers"""
+        indexed = list(enumerate(self.subproblems))
+        if self.workers <= 1 or len(indexed) == 1:
+            self.__solvers = [
+                (k, _SubproblemSolver(sub, self.solver_name)) for (k, sub) in indexed
+            ]
+            return
+        ctx = multiprocessing.get_context(self.start_method)
+        for w in range(min(self.workers, len(indexed))):
+            conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(child_conn, indexed[w :: self.workers], self.solver_name),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self.__workers.append((conn, process))
+        self.__solvers = []
+
+    def solve_subproblems(self, x) -> list:
+        """optimizes all subproblems for the solution x of the master problem,
+        returning for each one a tuple with its status, its cost (or the
+        violation of its constraints, if infeasible) and the indices and
+        values of its gradient with respect to the variables of the master
+        problem
+
+        Args:
+            x: values of the variables of the master problem, indexed by
+                variable index
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if self.__solvers is None:
+            self.__start()
+        start = perf_counter()
+        results = [None] * len(self.subproblems)
+        if self.__workers:
+            for (conn, _) in self.__workers:
+                conn.send(x)
+            for (conn, process) in self.__workers:
+                try:
+                    found = conn.recv()
+                except EOFError:
+                    raise mip.InterfacingError(
+                        "Benders worker process terminated with exit code {}".format(
+                            process.exitcode
+                        )
+                    )
+                for res in found:
+                    results[res[0]] = res[1:]
+        else:
+            for res in _solve_all(self.__solvers, x):
+                results[res[0]] = res[1:]
+        self.subproblem_time += perf_counter() - start
+        return results
+
+    def separate(self, x):
+        """optimizes the subproblems for the solution x of the master problem
+        and returns the violated optimality cuts and the feasibility cuts in
+        compressed sparse row format: row starts, variable indexes,
+        coefficients, senses and right hand sides
+
+        Args:
+            x: values of the variables of the master problem, indexed by
+                variable index
+        """
+        x = np.asarray(x, dtype=np.float64)
+        self.calls += 1
+        rows = []
+        feasible = True
+        total, gradient = 0.0, np.zeros(len(x))
+        theta = [var.idx for var in self.theta]
+        for (k, (status, value, cols, vals)) in enumerate(self.solve_subproblems(x)):
+            if status == mip.OptimizationStatus.INFEASIBLE:
+                # value + vals (x - xk) <= 0
+                rows.append((cols, vals, mip.LESS_OR_EQUAL, vals @ x[cols] - value))
+                feasible = False
+                self.feasibility_cuts += 1
+            elif status == mip.OptimizationStatus.OPTIMAL:
+                # theta >= value + vals (x - xk)
+                const = value - vals @ x[cols]
+                if not self.multi_cut:
+                    weight = self.subproblems[k].weight
+                    total += weight * const
+                    np.add.at(gradient, cols, weight * vals)
+                elif x[theta[k]] < value - self.cut_tol * max(1.0, abs(value)):
+                    rows.append(
+                        (
+                            np.concatenate(([theta[k]], cols)),
+                            np.concatenate(([1.0], -vals)),
+                            mip.GREATER_OR_EQUAL,
+                            const,
+                        )
+                    )
+                    self.optimality_cuts += 1
+            else:
+                self.__error = "Subproblem {} finished with status {}".format(
+                    k, status.name
+                )
+                logger.error(self.__error)
+        if feasible and not self.multi_cut:
+            value = total + gradient @ x
+            if x[theta[0]] < value - self.cut_tol * max(1.0, abs(value)):
+                cols = np.flatnonzero(gradient)
+                rows.append(
+                    (
+                        np.concatenate(([theta[0]], cols)),
+                        np.concatenate(([1.0], -gradient[cols])),
+                        mip.GREATER_OR_EQUAL,
+                        total,
+                    )
+                )
+                self.optimality_cuts += 1
+
+        indptr = np.zeros(len(rows) + 1, dtype=np.int32)
+        np.cumsum([len(row[0]) for row in rows], out=indptr[1:])
+        return (
+            indptr,
+            np.concatenate([row[0] for row in rows] + [np.zeros(0)]).astype(np.int32),
+            np.concatenate([row[1] for row in rows] + [np.zeros(0)]),
+            np.array([row[2] for row in rows], dtype="U1"),
+            np.array([row[3] for row in rows], dtype=np.float64),
+        )
+
+    def __strengthen(self):
+        """adds cuts for the solutions of the linear programming relaxation
+        of the master problem as constraints. Cuts are not generated in the
+        root node of the search since CBC may discard cuts which are also
+        needed as lazy constraints."""
+        master = self.master
+        persistent = master.persistent_lp
+        master.persistent_lp = True
+        try:
+            for _ in range(self.lp_rounds):
+                if master.optimize(relax=True) != mip.OptimizationStatus.OPTIMAL:
+                    break
+                x = np.fromiter((v.x for v in master.vars), np.float64, master.num_cols)
+                indptr, indices, coefs, senses, rhs = self.separate(x)
+                if self.__error is not None or not len(rhs):
+                    break
+                mvars = master.vars
+                for k in range(len(rhs)):
+                    st, ed = indptr[k], indptr[k + 1]
+                    master.add_constr(
+                        mip.LinExpr(
+                            [mvars[j] for j in indices[st:ed].tolist()],
+                            coefs[st:ed].tolist(),
+                            -rhs[k],
+                            senses[k],
+                        )
+                    )
+        finally:
+            master.persistent_lp = persistent
+
+    def generate_constrs(self, model: "mip.Model"):
+        if self.__error is not None:
+            return
+        x, pre_col_idx = _original_solution(model)
+        indptr, indices, coefs, senses, rhs = self.separate(x)
+        if len(rhs):
+            _add_original_rows(
+                model,
+                pre_col_idx,
+                indptr,
+                indices,
+                coefs,
+                senses,
+                rhs,
+                lazy=not getattr(model, "fractional", True),
+            )
+
+    def optimize(self, **kwargs) -> mip.OptimizationStatus:
+        """optimizes the master problem generating Benders cuts, arguments are
+        passed to :meth:`~mip.Model.optimize`. Raises
+        :class:`~mip.ProgrammingError` if some subproblem is unbounded or
+        cannot be optimized.
+
+        :rtype: mip.OptimizationStatus
+        """
+        self.__error = None
+        master = self.master
+        if self.lp_rounds > 0:
+            self.__strengthen()
+        master.lazy_constrs_generator = self
+        status = master.optimize(**kwargs)
+        if self.__error is not None:
+            raise mip.ProgrammingError(self.__error)
+        return status
+
+    def close(self):
+        """terminates the worker processes"""
+        for (conn, process) in self.__workers:
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+            process.join(1.0)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            conn.close()
+        self.__workers = []
+        self.__solvers = None
+
+    def __enter__(self) -> "Benders":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
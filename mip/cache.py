@@ -0,0 +1,327 @@
+"""Cache of the results of optimizations of identical models, see
+:class:`~mip.SolveCache`"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+from collections import OrderedDict
+from time import perf_counter, time
+from typing import Optional
+import mip
+from mip.arrays import ModelArrays
+from mip.batch import Solution
+from mip.portfolio import SETTINGS, FINAL_STATUS
+
+logger = logging.getLogger(__name__)
+
+# model attributes, besides the data of the model, that change the results
+# of the optimization
+PARAMS = SETTINGS + ("max_seconds", "max_nodes", "max_solutions")
+
+# extensions of the files used as SQLite databases
+SQLITE_EXT = (".db", ".sqlite", ".sqlite3")
+
+
+def fingerprint(model: "mip.Model", params: bool = True) -> str:
+    """Implementation of :meth:`~mip.Model.fingerprint`"""
+    values = None
+    if params:
+        values = {name: getattr(model, name) for name in PARAMS}
+        values["solver_name"] = model.solver_name.upper()
+    return ModelArrays.from_model(model).fingerprint(values)
+
+
+def _has_callbacks(model: "mip.Model") -> bool:
+    return (
+        model.cuts_generator is not None
+        or model.lazy_constrs_generator is not None
+        or model.incumbent_updater is not None
+    )
+
+
+class _MemoryStore:
+    def __init__(self, max_size: Optional[int]):
+        self.max_size = max_size
+        self.items = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = self.items.get(key)
+        if data is not None:
+            self.items.move_to_end(key)
+        return data
+
+    def __touch(self, key: str):
+        # the clock of the file system may only advance every few
+        # milliseconds, so files used in sequence would have the same time
+        # of use: times are set explicitly, increasing in each process
+        used = max(int(time() * 1e9), self.__last_used + 1)
+        self.__last_used = used
+        os.utime(self.__file(key), ns=(used, used))
+
+    def put(self, key: str, data: bytes):
+        self.items[key] = data
+        self.items.move_to_end(key)
+        while self.max_size is not None and len(self.items) > self.max_size:
+            self.items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def clear(self):
+        self.items.clear()
+
+    def close(self):
+        pass
+
+
+class _DirectoryStore:
+    """one file per solution, the modification time of the files is the
+    time of their last use"""
+
+    def __init__(self, path: str, max_size: Optional[int]):
+        self.path = path
+        self.max_size = max_size
+        self.__last_used = 0
+        os.makedirs(path, exist_ok=True)
+
+    def __file(self, key: str) -> str:
+        return os.path.join(self.path, key + ".pkl")
+
+    def __files(self) -> list:
+        return [
+            os.path.join(self.path, f)
+            for f in os.listdir(self.path)
+            if f.endswith(".pkl")
+        ]
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self.__file(key), "rb") as f:
+                data = f.read()
+            self.__touch(key)
+        except OSError:
+            return None
+        return data
+
+    def __touch(self, key: str):
+        # the clock of the file system may only advance every few
+        # milliseconds, so files used in sequence would have the same time
+        # of use: times are set explicitly, increasing in each process
+        used = max(int(time() * 1e9), self.__last_used + 1)
+        self.__last_used = used
+        os.utime(self.__file(key), ns=(used, used))
+
+    def put(self, key: str, data: bytes):
+        # written in a temporary file and renamed, so that other processes
+        # never read partial files
+        tmp = "{}.{}.tmp".format(self.__file(key), os.getpid())
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.__file(key))
+        self.__touch(key)
+        if self.max_size is not None:
+            files = self.__files()
+            if len(files) > self.max_size:
+                files.sort(key=os.path.getmtime)
+                for f in files[: len(files) - self.max_size]:
+                    try:
+                        os.remove(f)
+                    except OSError:
+                        pass
+
+    def __len__(self) -> int:
+        return len(self.__files())
+
+    def clear(self):
+        for f in self.__files():
+            os.remove(f)
+
+    def close(self):
+        pass
+
+
+class _SQLiteStore:
+    """the times of use of the solutions read are only written with the next
+    change of the database, so that reads do not write to the disk"""
+
+    def __init__(self, path: str, max_size: Optional[int]):
+        self.max_size = max_size
+        self.used = {}
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS solutions "
+            "(key TEXT PRIMARY KEY, data BLOB, used REAL)"
+        )
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self.conn.execute(
+            "SELECT data FROM solutions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.used[key] = time()
+        return row[0]
+
+    def __write_used(self):
+        if self.used:
+            self.conn.executemany(
+                "UPDATE solutions SET used = ? WHERE key = ?",
+                [(t, key) for (key, t) in self.used.items()],
+            )
+            self.used.clear()
+
+    def put(self, key: str, data: bytes):
+        self.__write_used()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)", (key, data, time())
+        )
+        if self.max_size is not None:
+            self.conn.execute(
+                "DELETE FROM solutions WHERE key NOT IN "
+                "(SELECT key FROM solutions ORDER BY used DESC LIMIT ?)",
+                (self.max_size,),
+            )
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def clear(self):
+        self.used.clear()
+        self.conn.execute("DELETE FROM solutions")
+        self.conn.commit()
+
+    def close(self):
+        self.__write_used()
+        self.conn.commit()
+        self.conn.close()
+
+
+class SolveCache:
+    """Cache of the results of optimizations, which returns the stored
+    :class:`~mip.Solution` when a model identical to one already optimized
+    is optimized again, e.g., in pipelines in which models are rebuilt from
+    data that did not change::
+
+        cache = SolveCache("solutions.db")
+        sol = cache.optimize(m, max_seconds=60)
+        print(sol.status, sol.objective_value, cache.hits, cache.time_saved)
+
+    Models are identified by their :meth:`~mip.Model.fingerprint`, which
+    includes the solver settings, and by the arguments informed to
+    :meth:`optimize`. Only results that do not depend on limits, i.e., with
+    status OPTIMAL, INFEASIBLE, INT_INFEASIBLE or UNBOUNDED, are stored.
+    Models with callbacks (constraint generators or incumbent updaters)
+    are always optimized, since the results depend on code that is not part
+    of the key.
+
+    Solutions are stored in memory if :code:`path` is None, in a SQLite
+    database if :code:`path` ends with ``.db``, ``.sqlite`` or ``.sqlite3``
+    and otherwise in a directory, with one file per solution. Disk caches
+    are kept between runs and can be shared by processes of the same
+    machine.
+
+    Args:
+        path(str): location of the cache, see above
+        max_size(int): maximum number of solutions stored, the least
+            recently used ones are discarded, None for no limit
+
+    Attributes:
+        hits(int): number of optimizations that returned a stored solution
+        misses(int): number of optimizations performed
+        time_saved(float): sum of the times of the optimizations of the
+            solutions returned from the cache, in seconds
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: Optional[int] = 1000):
+        if path is None:
+            self.__store = _MemoryStore(max_size)
+        elif path.lower().endswith(SQLITE_EXT):
+            self.__store = _SQLiteStore(path, max_size)
+        else:
+            self.__store = _DirectoryStore(path, max_size)
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+
+    def key(self, model: "mip.Model", **kwargs) -> str:
+        """Key of the results of optimizing a model with the arguments
+        informed to :meth:`optimize`
+
+        :rtype: str
+        """
+        h = hashlib.blake2b(model.fingerprint().encode("utf-8"), digest_size=20)
+        h.update(repr(sorted(kwargs.items())).encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Solution]:
+        """Stored solution with a key, None if not found
+
+        :rtype: Optional[mip.Solution]
+        """
+        data = self.__store.get(key)
+        if data is None:
+            return None
+        try:
+            return pickle.loads(data)
+        except Exception:
+            logger.warning("Invalid solution in the cache", exc_info=True)
+            return None
+
+    def put(self, key: str, solution: Solution):
+        """Stores a solution with a key"""
+        self.__store.put(key, pickle.dumps(solution, pickle.HIGHEST_PROTOCOL))
+
+    def optimize(self, model: "mip.Model", **kwargs) -> Solution:
+        """Returns the stored solution of the model, or optimizes it with
+        :meth:`~mip.Model.optimize` and stores its solution. Variable
+        values are indexed by variable index. When the solution comes from
+        the cache the model is not optimized, so that its solution is only
+        available in the returned :class:`~mip.Solution`.
+
+        Arguments are passed to :meth:`~mip.Model.optimize`.
+
+        :rtype: mip.Solution
+        """
+        key = None
+        if not _has_callbacks(model):
+            key = self.key(model, **kwargs)
+            solution = self.get(key)
+            if solution is not None:
+                self.hits += 1
+                self.time_saved += solution.time
+                logger.info("Solution found in the cache, key {}".format(key))
+                return solution
+        self.misses += 1
+        start = perf_counter()
+        model.optimize(**kwargs)
+        solution = Solution.from_model(model)
+        solution.time = perf_counter() - start
+        if key is not None and solution.status in FINAL_STATUS:
+            self.put(key, solution)
+        return solution
+
+    def __len__(self) -> int:
+        return len(self.__store)
+
+    def __contains__(self, key: str) -> bool:
+        return self.__store.get(key) is not None
+
+    def clear(self):
+        """removes all solutions of the cache"""
+        self.__store.clear()
+
+    def close(self):
+        """closes the database of the cache, if any"""
+        self.__store.close()
+
+    def __enter__(self) -> "SolveCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,9 +1,20 @@
 """Classes used in solver callbacks, for a bi-directional communication
 with the solver engine"""
+import logging
+import threading
 from collections import defaultdict
-from typing import List, Tuple
+from time import perf_counter
+from typing import List, Optional, Tuple
 import mip
 
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
 
 class BranchSelector:
     def __init__(self, model: "mip.Model"):
@@ -14,41 +25,169 @@ class BranchSelector:
 
 
 class ColumnsGenerator:
-    """abstract class for implementing columns generators"""
+    """Abstract class for implementing columns generators, called by
+    :class:`~mip.ColumnGeneration` to price new columns for the restricted
+    master problem."""
 
     def __init__(self):
         self.lazy_constraints = False
 
-    def generate_columns(self, model: "mip.Model"):
-        """Method called by the solver engine to generate cuts
-
-           After analyzing the contents of the fractional solution in model
-           variables :meth:`~mip.model.Model.vars`, whose solution values can
-           be queried with the in :meth:`~mip.model.Var.x` method, one or more
-           cuts may be generated and added to the solver engine cut pool with
-           the :meth:`~mip.model.Model.add_cut` method.
+    def generate_columns(
+        self, model: "mip.Model", duals: "np.ndarray" = None
+    ) -> List[Tuple[float, List[int], List[float]]]:
+        """Method called to generate new columns for the restricted master
+        problem, returning the columns found. Each column is a tuple (cost,
+        indices, coefficients) with its coefficient in the objective function,
+        the indexes of the constraints of the master problem where it appears
+        and its coefficients in these constraints, optionally followed by the
+        name of its variable, e.g., (cost, indices, coefficients, name).
+        Only columns with
+        negative reduced cost (positive when maximizing) considering the
+        current duals are added to the master problem, so the generator does
+        not need to check it.
 
         Args:
 
-            model(mip.Model): model for which cuts may be generated. Please note
-                that this model may have fewer variables than the original
-                model due to pre-processing. If you want to generate cuts
-                in terms of the original variables, one alternative is to
-                query variables by their names, checking which ones remain
-                in this pre-processed problem. In this procedure you can
-                query model properties and add cuts
-                (:meth:`~mip.model.Model.add_cut`), but you cannot perform
-                other model modifications, such as add columns.
+            model(mip.Model): restricted master problem, optimized (relaxed) with
+                the current columns. It is None when the generator runs in a
+                worker process (see the ``workers`` option of
+                :class:`~mip.ColumnGeneration`).
+            duals(numpy.ndarray): dual prices of the constraints of the master
+                problem, indexed by constraint index. With dual smoothing these
+                are the smoothed duals, not the ones of the current solution.
         """
         raise NotImplementedError()
 
 
+class GeneratorStats:
+    """Statistics of the calls of a :class:`ConstrsGenerator` as a cut
+    generator in the current optimization, available in
+    :attr:`ConstrsGenerator.stats`.
+
+    Attributes:
+        rounds(int): number of times the generator could have been called,
+            i.e., fractional solutions found in the search
+        calls(int): number of calls of the generator
+        skipped(int): rounds skipped by the scheduling policy
+        time(float): total time spent in the generator, in seconds
+        max_call_time(float): time spent in the slowest call, in seconds
+        cuts(int): number of cuts accepted by the solver
+        failures(int): number of consecutive calls without cuts
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """clears all statistics"""
+        self.rounds = 0
+        self.calls = 0
+        self.skipped = 0
+        self.time = 0.0
+        self.max_call_time = 0.0
+        self.cuts = 0
+        self.failures = 0
+        self._wait = 0
+        self._start = 0.0
+
+    def __str__(self) -> str:
+        return "calls: {} skipped: {} cuts: {} time: {:.3f}s".format(
+            self.calls, self.skipped, self.cuts, self.time
+        )
+
+
 class ConstrsGenerator:
-    """Abstract class for implementing cuts and lazy constraints generators."""
+    """Abstract class for implementing cuts and lazy constraints generators.
+
+    When used as a cuts generator (:attr:`~mip.Model.cuts_generator`), the
+    class attributes below define when the solver engine calls the
+    generator. They can be overridden in subclasses or set per object.
+    Lazy constraints generators are always called, since skipping them
+    could accept infeasible solutions. This policy is currently supported
+    in CBC.
+
+    Attributes:
+        root_only(bool): only generate cuts in the root node
+        frequency(int): outside the root node, generate cuts in one out of
+            every `frequency` fractional solutions found in the search
+        max_seconds(float): time budget, in seconds, for all the calls
+            in one optimization, after which the generator is not called
+            anymore
+        max_seconds_call(float): time budget, in seconds, for each call.
+            Since calls cannot be interrupted, long running generators should
+            check :meth:`time_left` and stop earlier
+        backoff(bool): if enabled, after each call without cuts the number
+            of rounds skipped before the next call is doubled (up to
+            `max_backoff`), returning to every round once cuts are found
+        max_backoff(int): maximum number of rounds skipped by backoff
+    """
+
+    root_only = False
+    frequency = 1
+    max_seconds = mip.INF
+    max_seconds_call = mip.INF
+    backoff = False
+    max_backoff = 64
 
     def __init__(self):
         pass
 
+    @property
+    def stats(self) -> GeneratorStats:
+        """statistics of the calls of this generator (calls, time spent,
+        cuts accepted) in the last optimization
+
+        :rtype: GeneratorStats
+        """
+        if "_stats" not in self.__dict__:
+            self._stats = GeneratorStats()
+        return self._stats
+
+    def time_left(self) -> float:
+        """remaining time, in seconds, for the current call considering
+        :attr:`max_seconds_call` and :attr:`max_seconds`
+
+        :rtype: float
+        """
+        stats = self.stats
+        elapsed = perf_counter() - stats._start
+        return min(
+            self.max_seconds_call - elapsed, self.max_seconds - stats.time - elapsed
+        )
+
+    def _scheduled(self, root: bool) -> bool:
+        """checks if the generator should be called in this round, called by
+        the solver engine for each fractional solution"""
+        stats = self.stats
+        stats.rounds += 1
+        run = stats.time < self.max_seconds
+        if run and not root:
+            run = not self.root_only and (stats.rounds - 1) % self.frequency == 0
+            if run and stats._wait > 0:
+                stats._wait -= 1
+                run = False
+        if run:
+            stats._start = perf_counter()
+        else:
+            stats.skipped += 1
+        return run
+
+    def _register_call(self, cuts: int):
+        """updates statistics after a call that produced `cuts` cuts"""
+        stats = self.stats
+        elapsed = perf_counter() - stats._start
+        stats.calls += 1
+        stats.time += elapsed
+        stats.max_call_time = max(stats.max_call_time, elapsed)
+        stats.cuts += cuts
+        if cuts:
+            stats.failures = 0
+            stats._wait = 0
+        else:
+            stats.failures += 1
+            if self.backoff:
+                stats._wait = min(2 ** stats.failures - 1, self.max_backoff)
+
     def generate_constrs(self, model: "mip.Model"):
         """Method called by the solver engine to generate *cuts* or *lazy constraints*.
 
@@ -80,10 +219,74 @@ class ConstrsGenerator:
                 query model properties and add cuts (:meth:`~mip.Model.add_cut`) or lazy constraints
                 (:meth:`~mip.Model.add_lazy_constr`), but you cannot
                 perform other model modifications, such as add columns.
+                In CBC, its attribute :attr:`context` (a
+                :class:`CallbackContext`) provides the current solution,
+                bounds and integrality of variables as numpy arrays, which
+                is much faster than querying variables one by one.
         """
         raise NotImplementedError()
 
 
+class CallbackContext:
+    """Read-only view of the solver state in a callback, available in the
+    :attr:`context` attribute of the model received by
+    :meth:`~mip.ConstrsGenerator.generate_constrs`. Arrays are indexed by the
+    columns of the (pre-processed) model of the callback and, whenever
+    possible, point directly to the memory of the solver engine, so that no
+    copies are made. These arrays are only valid during the callback call:
+    copy them if you need to keep their contents.
+
+    Attributes:
+        x(numpy.ndarray): values of the variables in the current LP solution
+        lb(numpy.ndarray): lower bounds of the variables in the current node
+        ub(numpy.ndarray): upper bounds of the variables in the current node
+        is_int(numpy.ndarray): boolean mask indicating integer variables
+        integer_tol(float): tolerance used to decide if a value is integral
+        orig_col_idx(numpy.ndarray): index of each column in the original
+            model, -1 for columns created in the pre-processing
+        pre_col_idx(numpy.ndarray): index of each column of the original model
+            in the pre-processed model, -1 for columns removed in the
+            pre-processing
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use CallbackContext"
+            )
+        self.x = None
+        self.lb = None
+        self.ub = None
+        self.is_int = None
+        self.integer_tol = 1e-6
+        self.orig_col_idx = None
+        self.pre_col_idx = None
+
+    def fractionality(self) -> "np.ndarray":
+        """distance of the value of each variable to the nearest integer, zero
+        for continuous variables
+
+        :rtype: numpy.ndarray
+        """
+        frac = np.abs(self.x - np.round(self.x))
+        frac[~self.is_int] = 0.0
+        return frac
+
+    def fractional_idx(self) -> "np.ndarray":
+        """indexes of the integer variables with fractional values in the
+        current LP solution
+
+        :rtype: numpy.ndarray
+        """
+        return np.flatnonzero(self.fractionality() > self.integer_tol)
+
+    def is_fractional(self) -> bool:
+        """checks if at least one integer variable has a fractional value in
+        the current LP solution"""
+        xi = self.x[self.is_int]
+        return bool(np.any(np.abs(xi - np.round(xi)) > self.integer_tol))
+
+
 class CutPool:
     def __init__(self):
         """Stores a list list of different cuts, repeated cuts are discarded.
@@ -117,6 +320,540 @@ class CutPool:
         return self.__cuts
 
 
+def _csr_violation(
+    x: "np.ndarray",
+    indptr: "np.ndarray",
+    indices: "np.ndarray",
+    coefs: "np.ndarray",
+    senses: "np.ndarray",
+    rhs: "np.ndarray",
+    rows: "np.ndarray" = None,
+) -> "np.ndarray":
+    """violation of each constraint stored in CSR arrays by solution x,
+    negative values indicate slack constraints. The row of each non-zero
+    (rows) can be informed to avoid recomputing it."""
+    nrows = len(indptr) - 1
+    if rows is None:
+        rows = np.repeat(np.arange(nrows), np.diff(indptr))
+    act = np.bincount(rows, weights=coefs * x[indices], minlength=nrows)
+    viol = act - rhs
+    viol[senses == mip.GREATER_OR_EQUAL] *= -1.0
+    eq = senses == mip.EQUAL
+    viol[eq] = np.abs(viol[eq])
+    return viol
+
+
+class ManagedCutPool:
+    """Cut pool with a bounded number of cuts, stored in compressed sparse row
+    (CSR) format. In each separation round (:meth:`separate`) the cuts
+    violated by the current solution are ranked by efficacy (violation
+    divided by the euclidean norm of the coefficients) and cuts almost
+    parallel to better cuts already selected in the round are skipped.
+    Cuts that remain slack for more than ``max_age`` consecutive rounds are
+    evicted and, when the pool is full, the oldest and least effective cuts
+    are discarded.
+
+    Cuts can be obtained from :meth:`~mip.Model.generate_cuts` (see
+    :meth:`add_pool`) or from a :class:`ConstrsGenerator`. Variable indexes
+    refer to the model where cuts are checked, so cuts for the pre-processed
+    model of a callback should not be mixed with cuts for the original model.
+
+    Args:
+        max_cuts(int): maximum number of cuts stored
+        max_age(int): maximum number of consecutive rounds a cut may remain
+            slack before being evicted
+        max_round(int): maximum number of cuts selected in each round
+        min_efficacy(float): minimum efficacy of a selected cut
+        max_parallelism(float): maximum cosine between a selected cut and the
+            cuts already selected in the same round
+        slack_tol(float): a cut is slack if its violation is below -slack_tol
+    """
+
+    def __init__(
+        self,
+        max_cuts: int = 4096,
+        max_age: int = 10,
+        max_round: int = 256,
+        min_efficacy: float = 1e-4,
+        max_parallelism: float = 0.98,
+        slack_tol: float = 1e-6,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use ManagedCutPool"
+            )
+        self.max_cuts = max_cuts
+        self.max_age = max_age
+        self.max_round = max_round
+        self.min_efficacy = min_efficacy
+        self.max_parallelism = max_parallelism
+        self.slack_tol = slack_tol
+
+        # number of separation rounds and of evicted cuts
+        self.rounds = 0
+        self.evicted = 0
+
+        self.__indptr = np.zeros(1, dtype=np.int64)
+        self.__indices = np.zeros(0, dtype=np.int32)
+        self.__coefs = np.zeros(0, dtype=np.float64)
+        self.__senses = np.zeros(0, dtype="U1")
+        self.__rhs = np.zeros(0, dtype=np.float64)
+        self.__age = np.zeros(0, dtype=np.int32)
+
+        # keys of stored cuts, to discard repeated cuts
+        self.__keys = []
+        self.__known = set()
+
+        # cuts added since the last round, not yet in the CSR arrays
+        self.__new = []
+
+    def __len__(self) -> int:
+        return len(self.__rhs) + len(self.__new)
+
+    def add(self, cut: "mip.LinExpr") -> bool:
+        """tries to add a cut to the pool, returns true if this is a new cut,
+        false if it is a repeated one
+
+        Args:
+            cut(mip.LinExpr): a constraint
+        """
+        return self.add_row(
+            [var.idx for var in cut.expr.keys()],
+            list(cut.expr.values()),
+            cut.sense,
+            -cut.const,
+        )
+
+    def add_row(self, indices, coefs, sense: str, rhs: float) -> bool:
+        """tries to add a cut informed by the indexes of its variables, their
+        coefficients, its sense and right hand side, returns true if this is
+        a new cut, false if it is a repeated one
+
+        Args:
+            indices: indexes of the variables
+            coefs: coefficients of the variables
+            sense(str): :attr:`~mip.LESS_OR_EQUAL`,
+                :attr:`~mip.GREATER_OR_EQUAL` or :attr:`~mip.EQUAL`
+            rhs(float): right hand side
+        """
+        indices = np.asarray(indices, dtype=np.int32)
+        coefs = np.asarray(coefs, dtype=np.float64)
+        order = np.argsort(indices, kind="stable")
+        indices, coefs = indices[order], coefs[order]
+        key = (
+            sense,
+            round(float(rhs), 9),
+            indices.tobytes(),
+            np.round(coefs, 9).tobytes(),
+        )
+        if key in self.__known:
+            return False
+        self.__known.add(key)
+        self.__new.append((indices, coefs, sense, float(rhs), key))
+        return True
+
+    def add_pool(self, pool: "CutPool") -> int:
+        """adds all cuts of a :class:`CutPool`, such as the ones returned by
+        :meth:`~mip.Model.generate_cuts`, returns the number of new cuts
+
+        Args:
+            pool(CutPool): cuts to be added
+        """
+        return sum(self.add(cut) for cut in pool.cuts)
+
+    def __flush(self):
+        """appends the cuts added since the last round to the CSR arrays"""
+        if not self.__new:
+            return
+        new, self.__new = self.__new, []
+        nz = np.fromiter((len(c[0]) for c in new), np.int64, len(new))
+        self.__indptr = np.concatenate(
+            (self.__indptr, self.__indptr[-1] + np.cumsum(nz))
+        )
+        self.__indices = np.concatenate([self.__indices] + [c[0] for c in new])
+        self.__coefs = np.concatenate([self.__coefs] + [c[1] for c in new])
+        self.__senses = np.concatenate(
+            (self.__senses, np.array([c[2] for c in new], dtype="U1"))
+        )
+        self.__rhs = np.concatenate((self.__rhs, np.array([c[3] for c in new])))
+        self.__age = np.concatenate((self.__age, np.zeros(len(new), np.int32)))
+        self.__keys.extend(c[4] for c in new)
+
+    def __keep(self, mask: "np.ndarray"):
+        """keeps only the cuts indicated in mask"""
+        for i in np.flatnonzero(~mask).tolist():
+            self.__known.discard(self.__keys[i])
+        nz = np.diff(self.__indptr)
+        nzmask = np.repeat(mask, nz)
+        self.__indices = self.__indices[nzmask]
+        self.__coefs = self.__coefs[nzmask]
+        self.__indptr = np.zeros(int(mask.sum()) + 1, dtype=np.int64)
+        np.cumsum(nz[mask], out=self.__indptr[1:])
+        self.__senses = self.__senses[mask]
+        self.__rhs = self.__rhs[mask]
+        self.__age = self.__age[mask]
+        self.__keys = [k for k, m in zip(self.__keys, mask.tolist()) if m]
+        self.evicted += len(mask) - len(self.__rhs)
+
+    def select(self, x) -> "np.ndarray":
+        """performs a separation round for solution x: updates the age of
+        cuts, evicts old cuts and returns the positions of the selected cuts,
+        sorted by decreasing efficacy. The selected cuts can be retrieved with
+        :meth:`rows`.
+
+        Args:
+            x: solution values, indexed by variable index
+
+        :rtype: numpy.ndarray
+        """
+        self.__flush()
+        self.rounds += 1
+        x = np.asarray(x, dtype=np.float64)
+        n = len(self.__rhs)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        indptr, coefs = self.__indptr, self.__coefs
+        viol = _csr_violation(
+            x, indptr, self.__indices, coefs, self.__senses, self.__rhs
+        )
+        slack = viol < -self.slack_tol
+        self.__age[slack] += 1
+        self.__age[~slack] = 0
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=coefs * coefs, minlength=n))
+        norms[norms <= 1e-12] = 1.0
+        eff = viol / norms
+
+        keep = self.__age <= self.max_age
+        if keep.sum() > self.max_cuts:
+            order = np.lexsort((-eff, self.__age))
+            order = order[keep[order]][: self.max_cuts]
+            keep = np.zeros(n, dtype=bool)
+            keep[order] = True
+        if not keep.all():
+            self.__keep(keep)
+            indptr, coefs = self.__indptr, self.__coefs
+            eff, norms = eff[keep], norms[keep]
+
+        cand = np.flatnonzero(eff >= self.min_efficacy)
+        cand = cand[np.argsort(-eff[cand], kind="stable")]
+        if self.max_parallelism >= 1.0:
+            return cand[: self.max_round]
+
+        # greedy selection skipping cuts almost parallel to selected ones
+        indices = self.__indices
+        sign = np.where(self.__senses == mip.GREATER_OR_EQUAL, -1.0, 1.0)
+        dense = np.zeros(max(len(x), int(indices.max(initial=-1)) + 1))
+        selected = []
+        sel_idx, sel_coef, sel_row = [], [], []
+        cat = None
+        for i in cand.tolist():
+            if len(selected) >= self.max_round:
+                break
+            idx = indices[indptr[i] : indptr[i + 1]]
+            a = coefs[indptr[i] : indptr[i + 1]] * (sign[i] / norms[i])
+            if selected:
+                dense[idx] = a
+                par = np.bincount(cat[2], weights=dense[cat[0]] * cat[1]).max()
+                dense[idx] = 0.0
+                if par > self.max_parallelism:
+                    continue
+            sel_idx.append(idx)
+            sel_coef.append(a)
+            sel_row.append(np.full(len(idx), len(selected)))
+            selected.append(i)
+            cat = [np.concatenate(v) for v in (sel_idx, sel_coef, sel_row)]
+
+        return np.array(selected, dtype=np.int64)
+
+    def rows(self, positions):
+        """returns the cuts in the informed positions in CSR format: row
+        starts, variable indexes, coefficients, senses and right hand sides
+
+        Args:
+            positions: positions of cuts in the pool, as returned by
+                :meth:`select`
+        """
+        self.__flush()
+        positions = np.asarray(positions, dtype=np.int64)
+        nz = np.diff(self.__indptr)[positions]
+        indptr = np.zeros(len(positions) + 1, dtype=np.int32)
+        np.cumsum(nz, out=indptr[1:])
+        if len(positions):
+            starts = self.__indptr[positions]
+            nzpos = np.repeat(starts - indptr[:-1], nz) + np.arange(indptr[-1])
+        else:
+            nzpos = np.zeros(0, dtype=np.int64)
+        return (
+            indptr,
+            self.__indices[nzpos],
+            self.__coefs[nzpos],
+            self.__senses[positions],
+            self.__rhs[positions],
+        )
+
+    def separate(self, model: "mip.Model", x=None) -> int:
+        """performs a separation round with the solution of model and adds
+        the selected cuts to it. Inside CBC callbacks cuts are submitted in a
+        single batch. Returns the number of cuts added.
+
+        Args:
+            model(mip.Model): model where cuts will be added
+            x: solution values, if not informed the solution of the model
+                variables is used
+
+        :rtype: int
+        """
+        if x is None:
+            ctx = getattr(model, "context", None)
+            if ctx is not None:
+                x = ctx.x
+            else:
+                x = [var.x if var.x is not None else 0.0 for var in model.vars]
+        positions = self.select(x)
+        if len(positions) == 0:
+            return 0
+
+        indptr, indices, coefs, senses, rhs = self.rows(positions)
+        if hasattr(model, "add_cuts_csr"):
+            return model.add_cuts_csr(
+                indptr, indices, coefs, senses, rhs, min_violation=0.0
+            )
+
+        mvars = model.vars
+        for k in range(len(positions)):
+            st, ed = indptr[k], indptr[k + 1]
+            model.add_cut(
+                mip.LinExpr(
+                    [mvars[j] for j in indices[st:ed].tolist()],
+                    coefs[st:ed].tolist(),
+                    -rhs[k],
+                    senses[k],
+                )
+            )
+        return len(positions)
+
+
+class LazyPool(ConstrsGenerator):
+    """Pool of candidate lazy constraints known in advance, stored as a sparse
+    matrix in compressed sparse row (CSR) format. Whenever the solver finds an
+    integer feasible solution, violated constraints are found with a single
+    sparse matrix-vector product and only these are sent to the solver. Set
+    it as the :attr:`~mip.Model.lazy_constrs_generator` of your model::
+
+        pool = LazyPool()
+        for S in subsets:
+            pool.add(xsum(x[i][j] for i in S for j in S if i != j) <= len(S) - 1)
+        m.lazy_constrs_generator = pool
+
+    Constraints are written in terms of the variables of the original model
+    and are kept in the pool, so the same pool can be used in later
+    optimizations of the model or of other models with the same variables.
+
+    Args:
+        max_constrs(int): maximum number of constraints sent to the solver
+            in each call, the most violated ones are selected; 0 means no
+            limit
+        min_violation(float): minimum violation for a constraint to be sent
+    """
+
+    def __init__(self, max_constrs: int = 0, min_violation: float = 1e-6):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use LazyPool"
+            )
+        self.max_constrs = max_constrs
+        self.min_violation = min_violation
+
+        # number of calls and of constraints sent to the solver
+        self.calls = 0
+        self.added = 0
+
+        self.__indptr = np.zeros(1, dtype=np.int64)
+        self.__indices = np.zeros(0, dtype=np.int32)
+        self.__coefs = np.zeros(0, dtype=np.float64)
+        self.__senses = np.zeros(0, dtype="U1")
+        self.__rhs = np.zeros(0, dtype=np.float64)
+        self.__rows = np.zeros(0, dtype=np.int64)
+
+        # constraints added since the last check
+        self.__new = []
+
+    def __len__(self) -> int:
+        return len(self.__rhs) + sum(len(b[4]) for b in self.__new)
+
+    def add(self, constr: "mip.LinExpr"):
+        """adds a constraint to the pool
+
+        Args:
+            constr(mip.LinExpr): a constraint of the original model
+        """
+        self.add_rows(
+            [0, len(constr.expr)],
+            [var.idx for var in constr.expr.keys()],
+            list(constr.expr.values()),
+            [constr.sense],
+            [-constr.const],
+        )
+
+    def add_rows(self, indptr, indices, coefs, senses, rhs):
+        """adds several constraints to the pool, informed in CSR format
+
+        Args:
+            indptr: start of each row in indices and coefs, with one
+                additional position indicating the end of the last row
+            indices: indexes of the variables of each row, in the original
+                model
+            coefs: coefficients of the variables of each row
+            senses: sense of each row (:attr:`~mip.LESS_OR_EQUAL`,
+                :attr:`~mip.GREATER_OR_EQUAL` or :attr:`~mip.EQUAL`)
+            rhs: right hand side of each row
+        """
+        self.__new.append(
+            (
+                np.asarray(indptr, dtype=np.int64),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(coefs, dtype=np.float64),
+                np.asarray(senses, dtype="U1"),
+                np.asarray(rhs, dtype=np.float64),
+            )
+        )
+
+    def __flush(self):
+        """appends the constraints added since the last check to the CSR
+        arrays"""
+        if not self.__new:
+            return
+        new, self.__new = self.__new, []
+        indptr = [self.__indptr]
+        for b in new:
+            indptr.append(indptr[-1][-1] + b[0][1:] - b[0][0])
+        self.__indptr = np.concatenate(indptr)
+        self.__indices = np.concatenate(
+            [self.__indices] + [b[1][b[0][0] : b[0][-1]] for b in new]
+        )
+        self.__coefs = np.concatenate(
+            [self.__coefs] + [b[2][b[0][0] : b[0][-1]] for b in new]
+        )
+        self.__senses = np.concatenate([self.__senses] + [b[3] for b in new])
+        self.__rhs = np.concatenate([self.__rhs] + [b[4] for b in new])
+        nrows = len(self.__rhs)
+        self.__rows = np.repeat(np.arange(nrows), np.diff(self.__indptr))
+
+    def violated(self, x) -> "np.ndarray":
+        """returns the positions of the constraints violated by solution x,
+        sorted by decreasing violation
+
+        Args:
+            x: solution values, indexed by the variables of the original
+                model
+
+        :rtype: numpy.ndarray
+        """
+        self.__flush()
+        if len(self.__rhs) == 0:
+            return np.zeros(0, dtype=np.int64)
+        viol = _csr_violation(
+            np.asarray(x, dtype=np.float64),
+            self.__indptr,
+            self.__indices,
+            self.__coefs,
+            self.__senses,
+            self.__rhs,
+            self.__rows,
+        )
+        pos = np.flatnonzero(viol >= self.min_violation)
+        pos = pos[np.argsort(-viol[pos], kind="stable")]
+        if self.max_constrs > 0:
+            pos = pos[: self.max_constrs]
+        return pos
+
+    def generate_constrs(self, model: "mip.Model"):
+        self.calls += 1
+        x, pre_col_idx = _original_solution(model)
+        pos = self.violated(x)
+        if len(pos) == 0:
+            return
+
+        starts, ends = self.__indptr[pos], self.__indptr[pos + 1]
+        nz = ends - starts
+        indptr = np.zeros(len(pos) + 1, dtype=np.int32)
+        np.cumsum(nz, out=indptr[1:])
+        nzpos = np.repeat(starts - indptr[:-1], nz) + np.arange(indptr[-1])
+        self.added += _add_original_rows(
+            model,
+            pre_col_idx,
+            indptr,
+            self.__indices[nzpos],
+            self.__coefs[nzpos],
+            self.__senses[pos],
+            self.__rhs[pos],
+            lazy=True,
+        )
+
+
+def _original_solution(model: "mip.Model"):
+    """solution of the callback model in terms of the columns of the original
+    model, columns removed in the pre-processing get value zero. Returns the
+    solution and the mapping of the original columns in the pre-processed
+    model, which is None if not available."""
+    ctx = getattr(model, "context", None)
+    pre_col_idx = getattr(model, "pre_col_idx", None)
+    if ctx is not None and pre_col_idx is not None:
+        pre_col_idx = np.asarray(pre_col_idx)
+        x = np.zeros(len(pre_col_idx))
+        kept = pre_col_idx >= 0
+        x[kept] = ctx.x[pre_col_idx[kept]]
+        return x, pre_col_idx
+
+    x = np.array([var.x if var.x is not None else 0.0 for var in model.vars])
+    return x, None
+
+
+def _add_original_rows(
+    model: "mip.Model", pre_col_idx, indptr, indices, coefs, senses, rhs, lazy
+) -> int:
+    """adds rows written in terms of the original columns to the callback
+    model, rows with columns removed in the pre-processing are discarded.
+    Without column mapping, indices refer to the columns of the callback
+    model. Returns the number of rows added."""
+    indptr = np.asarray(indptr)
+    nrows = len(indptr) - 1
+    if pre_col_idx is not None and hasattr(model, "add_cuts_csr"):
+        nz = np.diff(indptr)
+        indices = pre_col_idx[np.asarray(indices)]
+        removed = np.bincount(
+            np.repeat(np.arange(nrows), nz), weights=(indices < 0), minlength=nrows
+        )
+        ok = removed == 0
+        if not ok.all():
+            nzok = np.repeat(ok, nz)
+            indices, coefs = indices[nzok], np.asarray(coefs)[nzok]
+            indptr = np.zeros(int(ok.sum()) + 1, dtype=np.int32)
+            np.cumsum(nz[ok], out=indptr[1:])
+            senses, rhs = np.asarray(senses)[ok], np.asarray(rhs)[ok]
+        return model.add_cuts_csr(
+            indptr, indices, coefs, senses, rhs, min_violation=0.0
+        )
+
+    mvars = model.vars
+    indices, coefs = np.asarray(indices), np.asarray(coefs)
+    for k in range(nrows):
+        st, ed = indptr[k], indptr[k + 1]
+        row = mip.LinExpr(
+            [mvars[j] for j in indices[st:ed].tolist()],
+            coefs[st:ed].tolist(),
+            -rhs[k],
+            senses[k],
+        )
+        if lazy:
+            model.add_lazy_constr(row)
+        else:
+            model.add_cut(row)
+    return nrows
+
+
 class IncumbentUpdater:
     """To receive notifications whenever a new integer feasible solution is
     found. Optionally a new improved solution can be generated (using some
@@ -143,3 +880,73 @@ class IncumbentUpdater:
         :rtype: List[Tuple[mip.Var, float]]
         """
         raise NotImplementedError()
+
+    def update_incumbent_x(
+        self, objective_value: float, best_bound: float, x: "np.ndarray"
+    ) -> Optional["np.ndarray"]:
+        """method called by the solver when a new integer feasible solution is
+        found, with the solution as an array of values indexed by variable
+        index. It can be overridden instead of :meth:`update_incumbent` to
+        avoid the creation of a list of :class:`~mip.Var` objects at each
+        call. Returns an improved solution, in the same format, or None. The
+        default implementation calls :meth:`update_incumbent`.
+
+        Args:
+            objective_value(float): cost of the new solution found
+            best_bound(float): current lower bound for the optimal solution
+            x(numpy.ndarray): values of all variables in the solution, this
+                array should not be modified
+
+        :rtype: Optional[numpy.ndarray]
+        """
+        mvars = self.model.vars
+        solution = [(mvars[j], x[j]) for j in np.flatnonzero(x).tolist()]
+        improved = self.update_incumbent(objective_value, best_bound, solution)
+        if not improved:
+            return None
+        xi = np.zeros(len(x))
+        for var, value in improved:
+            xi[var.idx] = value
+        return xi
+
+
+class CancelToken:
+    """Requests the interruption of optimizations running in other threads.
+    The token is informed in :meth:`~mip.Model.optimize` and cancelled from
+    any thread, the search then stops as soon as possible, returning the
+    best solution found so far::
+
+        token = CancelToken()
+        Timer(60, token.cancel).start()
+        m.optimize(cancel_token=token)
+
+    The same token can be informed to several optimizations, possibly of
+    different models, to stop all of them at once. A cancelled token remains
+    cancelled until :meth:`reset` is called.
+
+    Args:
+        parent(CancelToken): optional token, cancelling it also cancels
+            this token
+    """
+
+    def __init__(self, parent: Optional["CancelToken"] = None):
+        self.parent = parent
+        self.__event = threading.Event()
+
+    def cancel(self):
+        """requests the interruption of the optimizations using this token"""
+        self.__event.set()
+
+    def reset(self):
+        """clears the cancellation, so that the token can be reused"""
+        self.__event.clear()
+
+    @property
+    def cancelled(self) -> bool:
+        """if the cancellation was requested
+
+        :rtype: bool
+        """
+        if self.parent is not None and self.parent.cancelled:
+            return True
+        return self.__event.is_set()
@@ -1,12 +1,16 @@
 """Python-MIP interface to the COIN-OR Branch-and-Cut solver CBC"""
 
 import logging
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Any, Callable, Dict, List, Tuple, Optional, Union
+from collections.abc import Sequence
 from sys import platform, maxsize
 from os.path import dirname, isfile
 import os
 import multiprocessing as multip
 import numbers
+import tempfile
+import threading
+from time import perf_counter
 from cffi import FFI
 from mip.model import xsum
 import mip
@@ -38,16 +42,33 @@ from mip import (
     LP_Method,
     CutType,
     CutPool,
+    CallbackContext,
 )
+from mip.callbacks import _csr_violation
 
 logger = logging.getLogger(__name__)
-warningMessages = 0
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
 
 ffi = FFI()
 has_cbc = False
 os_is_64_bit = maxsize > 2 ** 32
 INF = float("inf")
-cut_idx = 0
+
+# the branch-and-cut driver of CBC keeps its state in global variables, so
+# calls of Cbc_solve from different threads, even for different models, are
+# serialized. Callbacks may optimize other models in the same thread.
+_solve_lock = threading.RLock()
+
+# models collected by the garbage collector while CBC is solving, e.g., in
+# callbacks, are only deleted when no optimization is running, since
+# deleting them during the branch-and-cut may stall the solver
+_solving = 0
+_pending_deletes = []
 
 # for variables and rows
 MAX_NAME_SIZE = 512
@@ -89,10 +110,15 @@ try:
                 libfile = os.path.join(pathlib, "cbc-c-darwin-x86-64.dylib")
         if not libfile:
             raise NotImplementedError("You operating system/platform is not supported")
+    # the bundled libraries locate their dependencies relative to the
+    # working directory, changed only while loading them, when the import
+    # lock is held
     old_dir = os.getcwd()
     os.chdir(pathlib)
-    cbclib = ffi.dlopen(libfile)
-    os.chdir(old_dir)
+    try:
+        cbclib = ffi.dlopen(libfile)
+    finally:
+        os.chdir(old_dir)
     has_cbc = True
 except Exception as e:
     logger.error("An error occurred while loading the CBC library:\t " "{}\n".format(e))
@@ -164,6 +190,16 @@ if has_cbc:
 
     const double *Cbc_getRowSlack(Cbc_Model *model);
 
+    const int *Cbc_getVectorStarts(Cbc_Model *model);
+
+    const int *Cbc_getIndices(Cbc_Model *model);
+
+    const double *Cbc_getElements(Cbc_Model *model);
+
+    const double *Cbc_getRowLower(Cbc_Model *model);
+
+    const double *Cbc_getRowUpper(Cbc_Model *model);
+
     int Cbc_getColNz(Cbc_Model *model, int col);
 
     int *Cbc_getColIndices(Cbc_Model *model, int col);
@@ -308,6 +344,8 @@ enum DblParam {
 
     int Cbc_getMaximumNodes(Cbc_Model *model);
 
+    int Cbc_getNodeCount(Cbc_Model *model);
+
     void Cbc_setMaximumNodes(Cbc_Model *model, int maxNodes);
 
     int Cbc_getMaximumSolutions(Cbc_Model *model);
@@ -367,9 +405,9 @@ enum DblParam {
 
     const double *Osi_getReducedCost( void *osi );
 
-    const double *Osi_getObjCoefficients();
+    const double *Osi_getObjCoefficients(void *osi);
 
-    double Osi_getObjSense();
+    double Osi_getObjSense(void *osi);
 
     void *Osi_newSolver();
 
@@ -517,12 +555,70 @@ enum DblParam {
     } CGNeighbors;
 
     CGNeighbors CG_conflictingNodes(Cbc_Model *model, void *cgraph, size_t node);
+
+    double Cbc_getRowLB(Cbc_Model *model, int row);
+
+    double Cbc_getRowUB(Cbc_Model *model, int row);
+
+    void *Clp_newModel(void);
+
+    void Clp_deleteModel(void *model);
+
+    void Clp_setLogLevel(void *model, int value);
+
+    void Clp_addRows(void *model, int number, const double *rowLower,
+        const double *rowUpper, const int *rowStarts, const int *columns,
+        const double *elements);
+
+    void Clp_addColumns(void *model, int number, const double *columnLower,
+        const double *columnUpper, const double *objective,
+        const int *columnStarts, const int *rows, const double *elements);
+
+    void Clp_deleteRows(void *model, int number, const int *which);
+
+    void Clp_deleteColumns(void *model, int number, const int *which);
+
+    double *Clp_rowLower(void *model);
+
+    double *Clp_rowUpper(void *model);
+
+    double *Clp_columnLower(void *model);
+
+    double *Clp_columnUpper(void *model);
+
+    double *Clp_objective(void *model);
+
+    void Clp_setOptimizationDirection(void *model, double value);
+
+    int Clp_initialSolve(void *model);
+
+    int Clp_dual(void *model, int ifValuesPass);
+
+    int Clp_primal(void *model, int ifValuesPass);
+
+    int Clp_status(void *model);
+
+    int Clp_numberIterations(void *model);
+
+    double Clp_getObjValue(void *model);
+
+    const double *Clp_getColSolution(void *model);
+
+    const double *Clp_getReducedCost(void *model);
+
+    const double *Clp_getRowPrice(void *model);
+
+    const double *Clp_getRowActivity(void *model);
     """
     )
 
 CHAR_ONE = "{}".format(chr(1)).encode("utf-8")
 CHAR_ZERO = "\0".encode("utf-8")
 
+# computed once: parsing C types inside callbacks of the solver may stall
+DOUBLE_SIZE = ffi.sizeof("double")
+INT_SIZE = ffi.sizeof("int")
+
 DBL_PARAM_PRIMAL_TOL = 0
 DBL_PARAM_DUAL_TOL = 1
 DBL_PARAM_ZERO_TOL = 2
@@ -594,7 +690,13 @@ class SolverCbc(Solver):
 
         # to not add cut generators twice when reoptimizing
         self.added_cut_callback = False
+        self.added_lazy_callback = False
         self.added_inc_callback = False
+        # callbacks registered in CBC, references must be kept while the
+        # model exists
+        self.__cut_callback = None
+        self.__inc_callback = None
+        self.__progr_callback = ffi.NULL
 
         # setting objective sense
         if sense == MAXIMIZE:
@@ -622,11 +724,78 @@ class SolverCbc(Solver):
         self.__obj_bound = None
         self.__num_solutions = 0
 
+        # mapping between columns of the original and of the pre-processed
+        # problem, computed once per optimization
+        self.__orig_col_idx = None
+        self.__pre_col_idx = None
+
+        # model passed to cut callbacks, reused across calls
+        self.__osi_model = None
+        self.__osi_model_cols = 0
+
+        # best solution returned by the incumbent updater in the current
+        # optimization, its objective value and the last bound reported, and
+        # the index of each column name, used in the incumbent callback
+        self.__improved_x = None
+        self.__improved_obj = None
+        self.__improved_used = False
+        self.__cur_bound = -INF
+        self.__col_index = None
+
+        # bounds of the integer columns in the first cut callback call, used
+        # to detect when the search leaves the root node
+        self.__root_bounds = None
+        self.__at_root = True
+
+        # branching priorities and directions of the columns that are not
+        # the default ones, and if priorities were informed to CBC
+        self.__priorities = []
+        self.__priorities_set = False
+
+        # stopping criteria based on the progress of the search: limits,
+        # last incumbent value and the time it was found, time and gap when
+        # the first feasible solution was found, last gap and nodes evaluated
+        # since the last improvement
+        self.__stall = None
+        self.__stall_inc = None
+        self.__stall_first = None
+        self.__stall_gap = INF
+        self.__stall_nodes = 0
+
+        # requests to stop the search from other threads, if the search was
+        # stopped (remaining nodes are pruned) and the bound at that moment
+        self.__interrupted = False
+        self.__cancel_token = None
+
+        # function receiving the progress of the search and number of calls
+        # of the cut callback, an estimate of the number of nodes
+        self.__progress_callback = None
+        self.__nodes = 0
+        self.__stopped = False
+        self.__stop_bound = -INF
+
+        # function returning solutions found outside the search, checked in
+        # each node
+        self.__incumbent_source = None
+
+        # simplex solver of CLP kept in sync with the model when
+        # model.persistent_lp is set, so that optimizations with relax=True
+        # start from the previous basis, if it has a basis to start from, if
+        # columns or the objective function changed since the last
+        # optimization (re-optimized with the primal simplex, otherwise with
+        # the dual simplex) and statistics of each optimization with
+        # relax=True
+        self.__lp = None
+        self.__lp_warm = False
+        self.__lp_primal = False
+        self.__lp_log = []  # type: List[mip.LPSolveInfo]
+
     def __clear_sol(self: "SolverCbc"):
         self.__x = EmptyVarSol(self.model)
         self.__rc = EmptyVarSol(self.model)
         self.__pi = EmptyRowSol(self.model)
         self.__slack = EmptyRowSol(self.model)
+        self.__improved_used = False
         self.__obj_val = None
         self.__obj_bound = None
         self.__num_solutions = 0
@@ -655,6 +824,46 @@ class SolverCbc(Solver):
         cbclib.Cbc_addCol(
             self._model, name.encode("utf-8"), lb, ub, obj, isInt, numnz, vind, vval,
         )
+        if self.__lp is not None:
+            cbclib.Clp_addColumns(
+                self.__lp, 1, [lb], [ub], [obj], [0, numnz], vind, vval
+            )
+            self.__lp_primal = True
+
+    def add_vars_csc(
+        self,
+        obj,
+        lb,
+        ub,
+        var_type: str,
+        indptr,
+        indices,
+        coefs,
+        names: List[str],
+    ):
+        n = len(obj)
+        obj = [float(v) for v in obj]
+        lb = [float(v) for v in lb]
+        ub = [float(v) for v in ub]
+        starts = [int(p) for p in indptr]
+        vind = ffi.new("int[]", [int(i) for i in indices[: starts[n]]])
+        vval = ffi.new("double[]", [float(a) for a in coefs[: starts[n]]])
+        isInt = CHAR_ONE if var_type.upper() in ("B", "I") else CHAR_ZERO
+        for k in range(n):
+            cbclib.Cbc_addCol(
+                self._model,
+                names[k].encode("utf-8"),
+                lb[k],
+                ub[k],
+                obj[k],
+                isInt,
+                starts[k + 1] - starts[k],
+                vind + starts[k],
+                vval + starts[k],
+            )
+        if self.__lp is not None and n:
+            cbclib.Clp_addColumns(self.__lp, n, lb, ub, obj, starts, vind, vval)
+            self.__lp_primal = True
 
     def update_conflict_graph(self: "SolverCbc"):
         cbclib.Cbc_updateConflictGraph(self._model)
@@ -774,6 +983,9 @@ class SolverCbc(Solver):
     def get_objective_const(self) -> numbers.Real:
         return self._objconst
 
+    def set_objective_const(self, const: numbers.Real):
+        self._objconst = const
+
     def get_objective(self) -> LinExpr:
         obj = cbclib.Cbc_getObjCoefficients(self._model)
         if obj == ffi.NULL:
@@ -806,6 +1018,10 @@ class SolverCbc(Solver):
         elif MINIMIZE in (lin_expr.sense, sense):
             cbclib.Cbc_setObjSense(self._model, 1.0)
 
+        if self.__lp is not None:
+            ffi.memmove(cbclib.Clp_objective(self.__lp), c, ffi.sizeof(c))
+            self.__lp_set_sense()
+
     def relax(self):
         for var in self.model.vars:
             if cbclib.Cbc_isInteger(self._model, var.idx):
@@ -854,6 +1070,19 @@ class SolverCbc(Solver):
 
     def var_set_obj(self, var: "Var", value: numbers.Real):
         cbclib.Cbc_setObjCoeff(self._model, var.idx, value)
+        if self.__lp is not None:
+            cbclib.Clp_objective(self.__lp)[var.idx] = value
+            self.__lp_primal = True
+
+    def set_obj(self, idx: List[int], obj: List[numbers.Real]):
+        m, lp = self._model, self.__lp
+        if lp is not None:
+            lp_obj = cbclib.Clp_objective(lp)
+            self.__lp_primal = True
+        for i, value in zip(idx, obj):
+            cbclib.Cbc_setObjCoeff(m, i, value)
+            if lp is not None:
+                lp_obj[i] = value
 
     def generate_cuts(
         self,
@@ -909,16 +1138,7 @@ class SolverCbc(Solver):
         return cp
 
     def optimize(self, relax: bool = False) -> OptimizationStatus:
-        # get name indexes from an osi problem
-        def cbc_get_osi_name_indexes(osi_solver) -> Dict[str, int]:
-            nameIdx = {}
-            n = cbclib.Osi_getNumCols(osi_solver)
-            for i in range(n):
-                cbclib.Osi_getColName(osi_solver, i, self.__name_spacec, MAX_NAME_SIZE)
-                cname = ffi.string(self.__name_spacec).decode("utf-8")
-                nameIdx[cname] = i
-
-            return nameIdx
+        global _solving
 
         # progress callback
         @ffi.callback(
@@ -939,14 +1159,30 @@ class SolverCbc(Solver):
             vint,
             cbData,
         ) -> int:
-            self.__log.append((seconds, (lb, ub)))
+            self.__cur_bound = lb
+            if self.model.store_search_progress_log:
+                self.__log.append((seconds, (lb, ub)))
+            if self.__stall is not None:
+                self.__update_stall(lb, ub)
+            if self.__progress_callback is not None:
+                incumbent = None if abs(ub) >= 1e30 else ub + self._objconst
+                self.__progress_callback(
+                    seconds, lb + self._objconst, incumbent, self.__nodes
+                )
             return -1
 
         # incumbent callback
+        @ffi.callback(
+            """
+            int (void *, double, int, char **, double *, void *)
+        """
+        )
         def cbc_inc_callback(
             cbc_model, obj: numbers.Real, nz: int, colNames, colValues, appData
-        ):
-            return
+        ) -> int:
+            if self.model.incumbent_updater is not None:
+                self.__update_incumbent(obj, nz, colNames, colValues)
+            return 0
 
         # cut callback
         @ffi.callback(
@@ -955,35 +1191,49 @@ class SolverCbc(Solver):
         """
         )
         def cbc_cut_callback(osi_solver, osi_cuts, app_data):
-            if (
-                osi_solver == ffi.NULL
-                or osi_cuts == ffi.NULL
-                or (
-                    self.model.cuts_generator is None
-                    and self.model.lazy_constrs_generator is None
-                )
-            ):
+            if osi_solver == ffi.NULL or osi_cuts == ffi.NULL:
                 return
+            self.__nodes += 1
+            if self.__stopped or self.__stop_search():
+                self.__make_node_infeasible(osi_solver)
+                return
+            if self.__incumbent_source is not None:
+                self.__import_incumbent()
             if Osi_isProvenOptimal(osi_solver) != CHAR_ONE:
                 return
+            if self.__improved_obj is not None and self.__prune_node(osi_solver):
+                return
+            if (
+                self.model.cuts_generator is None
+                and self.model.lazy_constrs_generator is None
+            ):
+                return
+
+            osi_model = self.__osi_model
+            if osi_model is None or self.__osi_model_cols != Osi_getNumCols(osi_solver):
+                osi_model = self.__create_callback_model(osi_solver)
+            osi_model.attach(osi_solver, osi_cuts)
 
             # checking if solution is fractional or not
-            nc = Osi_getNumCols(osi_solver)
-            x = Osi_getColSolution(osi_solver)
-            itol = Osi_getIntegerTolerance(osi_solver)
-            fractional = False
-            for j in range(nc):
-                if Osi_isInteger(osi_solver, j):
-                    if abs(x[j] - round(x[j])) > itol:
-                        fractional = True
-                        break
-
-            osi_model = ModelOsi(osi_solver)
-            osi_model._status = osi_model.solver.get_status()
-            osi_model.solver.osi_cutsp = osi_cuts
+            if osi_model.context is not None:
+                fractional = osi_model.context.is_fractional()
+            else:
+                nc = Osi_getNumCols(osi_solver)
+                x = Osi_getColSolution(osi_solver)
+                itol = Osi_getIntegerTolerance(osi_solver)
+                fractional = False
+                for j in range(nc):
+                    if Osi_isInteger(osi_solver, j):
+                        if abs(x[j] - round(x[j])) > itol:
+                            fractional = True
+                            break
+
             osi_model.fractional = fractional
-            if fractional and self.model.cuts_generator:
-                self.model.cuts_generator.generate_constrs(osi_model)
+            gen = self.model.cuts_generator
+            if fractional and gen and gen._scheduled(self.__is_root(osi_solver)):
+                ncuts = cbclib.OsiCuts_sizeRowCuts(osi_cuts)
+                gen.generate_constrs(osi_model)
+                gen._register_call(cbclib.OsiCuts_sizeRowCuts(osi_cuts) - ncuts)
             if (not fractional) and self.model.lazy_constrs_generator:
                 self.model.lazy_constrs_generator.generate_constrs(osi_model)
 
@@ -994,48 +1244,70 @@ class SolverCbc(Solver):
 
         if relax:
             self.__clear_sol()
-            res = Cbc_solveLinearProgram(self._model)
-            if res == 0:
-                self.__x = cbclib.Cbc_getColSolution(self._model)
-                self.__rc = cbclib.Cbc_getReducedCost(self._model)
-                self.__pi = cbclib.Cbc_getRowPrice(self._model)
-                self.__slack = cbclib.Cbc_getRowSlack(self._model)
-                self.__obj_val = cbclib.Cbc_getObjValue(self._model) + self._objconst
-                self.__obj_bound = self.__obj_val
-                self.__num_solutions = 1
-
-                return OptimizationStatus.OPTIMAL
-            if res == 2:
-                return OptimizationStatus.UNBOUNDED
-            if res == 3:
-                return OptimizationStatus.INFEASIBLE
-            return OptimizationStatus.ERROR
+            begin = perf_counter()
+            warm, iterations = False, None
+            if self.model.persistent_lp and hasattr(cbclib, "Clp_newModel"):
+                warm = self.__lp_warm
+                status, iterations = self.__optimize_lp()
+            else:
+                self.__drop_lp()
+                status = self.__optimize_relaxation()
+            self.__lp_log.append(
+                mip.LPSolveInfo(
+                    perf_counter() - begin, warm, iterations, status, self.__obj_val
+                )
+            )
+            return status
 
-        # adding cut generators
+        # adding cut generators, only once: generators remain registered
+        # in CBC for the next optimizations
         m = self.model
-        if m.cuts_generator is not None:
+        if self.__cut_callback is None:
+            self.__cut_callback = cbc_cut_callback
+        # besides the cut generator, the cut callback is where requests to
+        # stop the search are checked and where nodes are pruned with the
+        # solutions of the incumbent updater. It is registered only when one
+        # of these features is used, since it slows down the search.
+        stop_checks = (
+            self.__interrupted
+            or self.__stall is not None
+            or self.__cancel_token is not None
+        )
+        if not self.added_cut_callback and (
+            m.cuts_generator is not None
+            or m.incumbent_updater is not None
+            or self.__incumbent_source is not None
+            or self.__progress_callback is not None
+            or stop_checks
+        ):
             atSol = CHAR_ZERO
             cbclib.Cbc_addCutCallback(
                 self._model,
-                cbc_cut_callback,
+                self.__cut_callback,
                 "UserCuts".encode("utf-8"),
                 ffi.NULL,
                 1,
                 atSol,
             )
+            self.added_cut_callback = True
         if m.lazy_constrs_generator is not None:
             atSol = CHAR_ONE
             cbc_set_parameter(self, "preprocess", "off")
             cbc_set_parameter(self, "clqstr", "off")
             cbc_set_parameter(self, "heur", "off")
-            cbclib.Cbc_addCutCallback(
-                self._model,
-                cbc_cut_callback,
-                "LazyConstraints".encode("utf-8"),
-                ffi.NULL,
-                1,
-                atSol,
-            )
+            # solutions found in strong branching are not checked against
+            # lazy constraints, and the search may end without the optimum
+            cbc_set_parameter(self, "strong", "0")
+            if not self.added_lazy_callback:
+                cbclib.Cbc_addCutCallback(
+                    self._model,
+                    self.__cut_callback,
+                    "LazyConstraints".encode("utf-8"),
+                    ffi.NULL,
+                    1,
+                    atSol,
+                )
+                self.added_lazy_callback = True
         else:
             # no lazy constraints, more freedom to change parameters
             if self.model.preprocess == 0:
@@ -1049,7 +1321,8 @@ class SolverCbc(Solver):
             cbc_set_parameter(self, "passf", "50")
             cbc_set_parameter(self, "proximity", "on")
         if self.emphasis == SearchEmphasis.OPTIMALITY:
-            cbc_set_parameter(self, "strong", "10")
+            if m.lazy_constrs_generator is None:
+                cbc_set_parameter(self, "strong", "10")
             cbc_set_parameter(self, "trust", "20")
             cbc_set_parameter(self, "lagomory", "endonly")
             cbc_set_parameter(self, "latwomir", "endonly")
@@ -1083,8 +1356,30 @@ class SolverCbc(Solver):
 
         cbc_set_parameter(self, "maxSavedSolutions", "10")
 
-        if self.model.store_search_progress_log:
-            cbclib.Cbc_addProgrCallback(self._model, cbc_progress_callback, ffi.NULL)
+        if m.incumbent_updater is not None:
+            if np is None:
+                raise ModuleNotFoundError(
+                    "You need to install package numpy to use IncumbentUpdater"
+                )
+            if not self.added_inc_callback:
+                self.__inc_callback = cbc_inc_callback
+                cbclib.Cbc_addIncCallback(self._model, self.__inc_callback, ffi.NULL)
+                self.added_inc_callback = True
+
+        # besides the log, the progress callback tracks the bound and the
+        # incumbent used to stop the search and by the incumbent updater. It
+        # is removed when not needed, since CBC keeps it for the next
+        # optimizations.
+        if (
+            m.store_search_progress_log
+            or m.incumbent_updater is not None
+            or self.__progress_callback is not None
+            or stop_checks
+        ):
+            self.__progr_callback = cbc_progress_callback
+        else:
+            self.__progr_callback = ffi.NULL
+        cbclib.Cbc_addProgrCallback(self._model, self.__progr_callback, ffi.NULL)
 
         if self.model.integer_tol >= 0.0:
             cbclib.Cbc_setDblParam(
@@ -1119,8 +1414,185 @@ class SolverCbc(Solver):
         )
 
         self.__clear_sol()
-        cbclib.Cbc_solve(self._model)
+        self.__orig_col_idx = None
+        self.__pre_col_idx = None
+        self.__osi_model = None
+        self.__improved_x = None
+        self.__improved_obj = None
+        self.__improved_used = False
+        self.__cur_bound = -INF
+        self.__col_index = None
+        self.__root_bounds = None
+        self.__at_root = True
+        self.__stall_inc = None
+        self.__stall_first = None
+        self.__stall_nodes = 0
+        self.__stopped = False
+        self.__stop_bound = -INF
+        self.__nodes = 0
+        if m.cuts_generator is not None:
+            m.cuts_generator.stats.reset()
+
+        # CBC keeps the name of the priorities file for the next
+        # optimizations, so an empty file is used to clear priorities
+        priorities_file = None
+        if self.__priorities or self.__priorities_set:
+            priorities_file = self.__write_priorities()
+        try:
+            with _solve_lock:
+                _solving += 1
+                try:
+                    cbclib.Cbc_solve(self._model)
+                finally:
+                    _solving -= 1
+                    if not _solving:
+                        while _pending_deletes:
+                            cbclib.Cbc_deleteModel(_pending_deletes.pop())
+        finally:
+            # interruptions requested during this optimization are consumed
+            self.__interrupted = False
+            if priorities_file is not None:
+                os.remove(priorities_file)
+
+        status = self.__read_solution()
+        if self.__stopped:
+            status = self.__stopped_status(status)
+        if self.__improved_x is not None:
+            status = self.__use_improved_solution(status)
+
+        return status
+
+    def __write_priorities(self) -> str:
+        """writes the branching priorities and directions in a temporary file
+        read by CBC. Returns the file name."""
+        # the C interface of CBC only reads priorities from a file, there is
+        # no call to inform them directly
+        fd, file_name = tempfile.mkstemp(prefix="mip-priorities-", suffix=".csv")
+        with os.fdopen(fd, "w") as f:
+            f.write("number,priority,direction\n")
+            for (j, priority, direction) in self.__priorities:
+                f.write("{},{},{}\n".format(j, priority, "DNU"[direction + 1]))
+        cbc_set_parameter(self, "priorityIn", file_name)
+        self.__priorities_set = True
+        return file_name
+
+    def __optimize_relaxation(self) -> OptimizationStatus:
+        """solves the linear programming relaxation from scratch"""
+        res = Cbc_solveLinearProgram(self._model)
+        if res == 0:
+            self.__x = cbclib.Cbc_getColSolution(self._model)
+            self.__rc = cbclib.Cbc_getReducedCost(self._model)
+            self.__pi = cbclib.Cbc_getRowPrice(self._model)
+            self.__slack = cbclib.Cbc_getRowSlack(self._model)
+            # CBC does not always compute slacks of linear programs
+            if self.__slack == ffi.NULL:
+                self.__slack = _RowSlack(
+                    self._model, cbclib.Cbc_getRowActivity(self._model)
+                )
+            self.__obj_val = cbclib.Cbc_getObjValue(self._model) + self._objconst
+            self.__obj_bound = self.__obj_val
+            self.__num_solutions = 1
 
+            return OptimizationStatus.OPTIMAL
+        if res == 2:
+            return OptimizationStatus.INFEASIBLE
+        if res == 3:
+            return OptimizationStatus.UNBOUNDED
+        return OptimizationStatus.ERROR
+
+    def __lp_add_rows(self, first: int, last: int):
+        """adds rows first, ..., last - 1 of the model to the persistent
+        linear programming solver"""
+        m = self._model
+        starts, idx, coefs = [0], [], []
+        for i in range(first, last):
+            nz = cbclib.Cbc_getRowNz(m, i)
+            idx.extend(ffi.unpack(cbclib.Cbc_getRowIndices(m, i), nz))
+            coefs.extend(ffi.unpack(cbclib.Cbc_getRowCoeffs(m, i), nz))
+            starts.append(len(idx))
+        lower = [cbclib.Cbc_getRowLB(m, i) for i in range(first, last)]
+        upper = [cbclib.Cbc_getRowUB(m, i) for i in range(first, last)]
+        cbclib.Clp_addRows(self.__lp, last - first, lower, upper, starts, idx, coefs)
+
+    def __lp_set_sense(self):
+        cbclib.Clp_setOptimizationDirection(
+            self.__lp, cbclib.Cbc_getObjSense(self._model)
+        )
+        self.__lp_primal = True
+
+    def __load_lp(self):
+        """creates the persistent linear programming solver with the current
+        contents of the model"""
+        m, n = self._model, self.num_cols()
+        self.__lp = cbclib.Clp_newModel()
+        cbclib.Clp_addColumns(
+            self.__lp,
+            n,
+            cbclib.Cbc_getColLower(m),
+            cbclib.Cbc_getColUpper(m),
+            cbclib.Cbc_getObjCoefficients(m),
+            ffi.new("int[]", n + 1),
+            ffi.NULL,
+            ffi.NULL,
+        )
+        self.__lp_add_rows(0, self.num_rows())
+        self.__lp_set_sense()
+        self.__lp_warm = False
+
+    def __drop_lp(self):
+        if self.__lp is not None:
+            cbclib.Clp_deleteModel(self.__lp)
+            self.__lp = None
+            self.__lp_warm = False
+
+    def __optimize_lp(self) -> Tuple[OptimizationStatus, Optional[int]]:
+        """solves the linear programming relaxation with the persistent
+        solver, starting from the basis of the previous optimization if
+        possible. Returns the status and the number of iterations, if
+        known."""
+        if self.__lp is None:
+            self.__load_lp()
+        lp = self.__lp
+        cbclib.Clp_setLogLevel(lp, 1 if self.__verbose else 0)
+        iterations = None
+        if self.__lp_warm:
+            if self.__lp_primal:
+                cbclib.Clp_primal(lp, 0)
+            else:
+                cbclib.Clp_dual(lp, 0)
+            iterations = cbclib.Clp_numberIterations(lp)
+        else:
+            # the solution of the initial solve, obtained after presolve, is
+            # cleaned up with the primal simplex, leaving a basis that the
+            # dual simplex can start from
+            cbclib.Clp_initialSolve(lp)
+            cbclib.Clp_primal(lp, 0)
+        self.__lp_primal = False
+
+        # 0: optimal, 1: primal infeasible, 2: dual infeasible, 3 and above:
+        # stopped by limits or errors
+        res = cbclib.Clp_status(lp)
+        self.__lp_warm = res in (0, 1, 2)
+        if res == 0:
+            n, nr = self.num_cols(), self.num_rows()
+            self.__x = ffi.unpack(cbclib.Clp_getColSolution(lp), n)
+            self.__rc = ffi.unpack(cbclib.Clp_getReducedCost(lp), n)
+            self.__pi = ffi.unpack(cbclib.Clp_getRowPrice(lp), nr)
+            self.__slack = _RowSlack(
+                self._model, ffi.unpack(cbclib.Clp_getRowActivity(lp), nr)
+            )
+            self.__obj_val = cbclib.Clp_getObjValue(lp) + self._objconst
+            self.__obj_bound = self.__obj_val
+            self.__num_solutions = 1
+            return OptimizationStatus.OPTIMAL, iterations
+        if res == 1:
+            return OptimizationStatus.INFEASIBLE, iterations
+        if res == 2:
+            return OptimizationStatus.UNBOUNDED, iterations
+        return OptimizationStatus.ERROR, iterations
+
+    def __read_solution(self) -> OptimizationStatus:
+        """queries the status and the solution of the last optimization"""
         if cbclib.Cbc_isAbandoned(self._model):
             return OptimizationStatus.ERROR
 
@@ -1143,6 +1615,8 @@ class SolverCbc(Solver):
             return OptimizationStatus.OPTIMAL
 
         if cbclib.Cbc_isProvenInfeasible(self._model):
+            if self.model.lazy_constrs_generator is not None and self.__carried():
+                return OptimizationStatus.OPTIMAL
             return OptimizationStatus.INFEASIBLE
 
         if cbclib.Cbc_isContinuousUnbounded(self._model):
@@ -1163,6 +1637,346 @@ class SolverCbc(Solver):
 
         return OptimizationStatus.NO_SOLUTION_FOUND
 
+    def __carried(self) -> bool:
+        """CBC starts each optimization with the best solution of the
+        previous one as incumbent. With lazy constraints this solution
+        prunes the search but is not reported, so that a search that finds
+        no better solution ends as infeasible. If CBC keeps this solution and
+        it is still feasible, it is optimal: it becomes the solution of this
+        optimization and True is returned."""
+        m = self._model
+        ptr = cbclib.Cbc_bestSolution(m)
+        if np is None or ptr == ffi.NULL or not cbclib.Cbc_numberSavedSolutions(m):
+            return False
+        n = self.num_cols()
+        x = _double_array(ptr, n)
+        tol = max(self.model.infeas_tol, 1e-6) * 10
+        lb = _double_array(cbclib.Cbc_getColLower(m), n)
+        ub = _double_array(cbclib.Cbc_getColUpper(m), n)
+        if (x < lb - tol).any() or (x > ub + tol).any():
+            return False
+        ints = [j for j in range(n) if cbclib.Cbc_isInteger(m, j)]
+        if ints and np.abs(x[ints] - np.round(x[ints])).max() > tol:
+            return False
+        activity = self.__row_activity(x)
+        if self.__row_violation(activity) > tol:
+            return False
+        gen = self.model.lazy_constrs_generator
+        if isinstance(gen, mip.LazyPool) and len(gen.violated(x)):
+            return False
+
+        obj = _double_array(cbclib.Cbc_getObjCoefficients(m), n)
+        self.__x = ptr
+        self.__slack = _RowSlack(m, activity)
+        self.__obj_val = float(obj @ x) + self._objconst
+        self.__obj_bound = self.__obj_val
+        self.__num_solutions = 1
+        return True
+
+    def __row_activity(self, x: "np.ndarray") -> "np.ndarray":
+        """activities of the rows in solution x, computed with a single
+        product with the constraint matrix, which CBC stores by columns"""
+        m, n = self._model, self.num_cols()
+        starts = np.frombuffer(
+            ffi.buffer(cbclib.Cbc_getVectorStarts(m), (n + 1) * INT_SIZE),
+            dtype=np.int32,
+        )
+        nz = int(starts[-1])
+        if nz == 0:
+            return np.zeros(self.num_rows())
+        rows = np.frombuffer(
+            ffi.buffer(cbclib.Cbc_getIndices(m), nz * INT_SIZE), dtype=np.int32
+        )
+        coefs = _double_array(cbclib.Cbc_getElements(m), nz)
+        values = coefs * np.repeat(np.asarray(x, dtype=np.float64), np.diff(starts))
+        return np.bincount(rows, weights=values, minlength=self.num_rows())
+
+    def __row_violation(self, activity: "np.ndarray") -> numbers.Real:
+        """largest violation of the bounds of the rows by their activities"""
+        nr = self.num_rows()
+        if nr == 0:
+            return 0.0
+        lower = _double_array(cbclib.Cbc_getRowLower(self._model), nr)
+        upper = _double_array(cbclib.Cbc_getRowUpper(self._model), nr)
+        return max(0.0, float(np.max(lower - activity)), float(np.max(activity - upper)))
+
+    def __is_better(self, obj1: numbers.Real, obj2: numbers.Real) -> bool:
+        """checks if objective value obj1 is better than obj2"""
+        tol = 1e-6 * max(1.0, abs(obj2))
+        if cbclib.Cbc_getObjSense(self._model) < 0.0:
+            return obj1 > obj2 + tol
+        return obj1 < obj2 - tol
+
+    def __update_incumbent(self, obj: numbers.Real, nz: int, col_names, col_values):
+        """calls the incumbent updater with a new solution found by CBC,
+        which is informed by its non-zero values and column names. Names are
+        mapped to column indexes with a dictionary built once per
+        optimization."""
+        n = self.num_cols()
+        if self.__col_index is None:
+            self.__col_index = {
+                self.var_get_name(j).encode("utf-8"): j for j in range(n)
+            }
+        col_index = self.__col_index
+        idx = np.fromiter(
+            (col_index[ffi.string(col_names[k])] for k in range(nz)), np.int64, nz
+        )
+        x = np.zeros(n)
+        x[idx] = _double_array(col_values, nz)
+        x.flags.writeable = False
+
+        updater = self.model.incumbent_updater
+        obj += self._objconst
+        xi = updater.update_incumbent_x(obj, self.__cur_bound + self._objconst, x)
+        if xi is None:
+            return
+
+        xi = np.array(xi, dtype=np.float64)
+        c = _double_array(cbclib.Cbc_getObjCoefficients(self._model), n)
+        obj_i = float(c @ xi) + self._objconst
+        best = obj if self.__improved_obj is None else self.__improved_obj
+        if self.__is_better(obj_i, best):
+            self.__improved_x = xi
+            self.__improved_obj = obj_i
+
+    def __import_incumbent(self):
+        """receives a solution found outside this search, e.g., in other
+        processes, which is used as the solutions of the incumbent updater:
+        nodes that cannot improve it are pruned and it is returned if better
+        than the solutions found by CBC"""
+        solution = self.__incumbent_source()
+        if solution is None:
+            return
+        obj, x = solution
+        if self.__improved_obj is None or self.__is_better(obj, self.__improved_obj):
+            self.__improved_x = np.asarray(x, dtype=np.float64)
+            self.__improved_obj = obj
+
+    def __prune_node(self, osi_solver) -> bool:
+        """prunes the current node if its linear programming relaxation is
+        not better than the best solution produced by the incumbent updater.
+        CBC does not accept solutions during the search, so the node is pruned
+        by making it infeasible with inconsistent bounds."""
+        obj = cbclib.Osi_getObjValue(osi_solver) + self._objconst
+        if self.__is_better(obj, self.__improved_obj):
+            return False
+        self.__make_node_infeasible(osi_solver)
+        return True
+
+    def __make_node_infeasible(self, osi_solver):
+        """prunes the current node from the cut callback. The C interface has
+        no call for this, so the node is made infeasible with inconsistent
+        bounds in its first column: lower bound 1 and upper bound 0, which
+        are inconsistent whatever the original bounds and type of the column.
+        CBC restores the bounds of the columns for the next nodes, so other
+        nodes are not affected."""
+        cbclib.Osi_setColLower(osi_solver, 0, 1.0)
+        cbclib.Osi_setColUpper(osi_solver, 0, 0.0)
+
+    def __update_stall(self, lb: numbers.Real, ub: numbers.Real):
+        """records the time and the gap when the incumbent solution is
+        improved, called from the progress callback"""
+        if max(abs(lb), abs(ub)) >= 1e30:
+            return
+        gap = abs(ub - lb) / max(abs(ub), 1e-10)
+        now = perf_counter()
+        if self.__stall_first is None:
+            self.__stall_first = (now, gap)
+        if self.__stall_inc is None or ub != self.__stall_inc[0]:
+            self.__stall_inc = (ub, now)
+            self.__stall_nodes = 0
+        self.__stall_gap = gap
+
+    def __stop_search(self) -> bool:
+        """checks if the search should be stopped, called in each node from
+        the cut callback. Once stopped, all remaining nodes are pruned."""
+        token = self.__cancel_token
+        if self.__interrupted or (token is not None and token.cancelled):
+            reason = "Search interrupted"
+        elif self.__stall is not None:
+            reason = self.__stall_reason()
+            if reason is None:
+                return False
+        else:
+            return False
+        logger.info(reason)
+        self.__stopped = True
+        # bounds reported after this point consider the pruned nodes
+        self.__stop_bound = self.__cur_bound
+        return True
+
+    def __stopped_status(self, status: OptimizationStatus) -> OptimizationStatus:
+        """status of a search stopped before its end: CBC reports the status
+        considering that the remaining nodes were pruned"""
+        if status == OptimizationStatus.OPTIMAL:
+            bound = self.__stop_bound + self._objconst
+            if abs(bound - self.__obj_val) > 1e-6 * max(1.0, abs(self.__obj_val)):
+                self.__obj_bound = bound
+                return OptimizationStatus.FEASIBLE
+        elif status in (
+            OptimizationStatus.INFEASIBLE,
+            OptimizationStatus.INT_INFEASIBLE,
+        ):
+            return OptimizationStatus.NO_SOLUTION_FOUND
+        return status
+
+    def __stall_reason(self) -> Optional[str]:
+        """checks the stopping criteria based on the progress of the search,
+        returning the reason to stop or None. There are no stopping criteria
+        before the first feasible solution is found."""
+        if self.__stall_inc is None:
+            return None
+        self.__stall_nodes += 1
+        max_seconds, max_nodes, min_rate = self.__stall
+        now = perf_counter()
+        if now - self.__stall_inc[1] >= max_seconds:
+            reason = "{:.2f} seconds".format(now - self.__stall_inc[1])
+        elif self.__stall_nodes >= max_nodes:
+            reason = "{} nodes".format(self.__stall_nodes)
+        else:
+            first_time, first_gap = self.__stall_first
+            elapsed = now - first_time
+            if min_rate <= 0.0 or elapsed < 1.0 or self.__stall_gap <= 0.0:
+                return None
+            if (first_gap - self.__stall_gap) / elapsed >= min_rate:
+                return None
+            return "Search stopped: gap improvement rate below {}".format(min_rate)
+        return "Search stopped: incumbent not improved in {}".format(reason)
+
+    def __use_improved_solution(self, status: OptimizationStatus) -> OptimizationStatus:
+        """replaces the solution found by CBC with the solution produced by
+        the incumbent updater, if it is better and feasible. CBC reports
+        infeasibility if the complete search was pruned by this solution,
+        which is then optimal."""
+        if status not in (
+            OptimizationStatus.OPTIMAL,
+            OptimizationStatus.FEASIBLE,
+            OptimizationStatus.NO_SOLUTION_FOUND,
+            OptimizationStatus.INFEASIBLE,
+            OptimizationStatus.INT_INFEASIBLE,
+        ):
+            return status
+        if self.__obj_val is not None and not self.__is_better(
+            self.__improved_obj, self.__obj_val
+        ):
+            return status
+
+        x = self.__improved_x
+        activity = self.__row_activity(x)
+        tol = max(self.model.infeas_tol, 1e-6) * 10
+        if self.__row_violation(activity) > tol:
+            logger.warning(
+                "Solution produced by the incumbent updater is infeasible, "
+                "discarding it."
+            )
+            return status
+
+        self.__x = x
+        self.__slack = _RowSlack(self._model, activity)
+        self.__rc = EmptyVarSol(self.model)
+        self.__pi = EmptyRowSol(self.model)
+        self.__obj_val = self.__improved_obj
+        self.__num_solutions = self.__num_solutions + 1
+        self.__improved_used = True
+        if status in (
+            OptimizationStatus.OPTIMAL,
+            OptimizationStatus.INFEASIBLE,
+            OptimizationStatus.INT_INFEASIBLE,
+        ) or (
+            self.__obj_bound is not None
+            and not self.__is_better(self.__obj_bound, self.__obj_val)
+        ):
+            self.__obj_bound = self.__obj_val
+            return OptimizationStatus.OPTIMAL
+
+        return OptimizationStatus.FEASIBLE
+
+    def __update_col_mapping(self, osi_solver):
+        """computes the mapping between columns of the original problem and
+        columns of the pre-processed problem available in callbacks. Names are
+        queried only here, once per optimization."""
+        n_orig = self.num_cols()
+        n_pre = Osi_getNumCols(osi_solver)
+        namep = self.__name_spacec
+        orig_col_idx = [-1] * n_pre
+        pre_col_idx = [-1] * n_orig
+        for j in range(n_pre):
+            cbclib.Osi_getColName(osi_solver, j, namep, MAX_NAME_SIZE)
+            jo = cbclib.Cbc_getColNameIndex(self._model, namep)
+            if 0 <= jo < n_orig:
+                orig_col_idx[j] = jo
+                pre_col_idx[jo] = j
+
+        if np is not None:
+            orig_col_idx = np.array(orig_col_idx, dtype=np.int32)
+            pre_col_idx = np.array(pre_col_idx, dtype=np.int32)
+
+        self.__orig_col_idx = orig_col_idx
+        self.__pre_col_idx = pre_col_idx
+
+    def __is_root(self, osi_solver) -> bool:
+        """checks if the cut callback is still processing the root node. The
+        C interface does not inform the current node, so the root node is
+        considered finished when the bounds of some integer column are
+        tightened with respect to the ones in the first call, which happens
+        after branching or reduced cost fixing."""
+        if not self.__at_root:
+            return False
+        ctx = self.__osi_model.context
+        if ctx is not None:
+            lb, ub = ctx.lb[ctx.is_int], ctx.ub[ctx.is_int]
+            if self.__root_bounds is None:
+                self.__root_bounds = (lb.copy(), ub.copy())
+            elif (lb > self.__root_bounds[0]).any() or (
+                ub < self.__root_bounds[1]
+            ).any():
+                self.__at_root = False
+            return self.__at_root
+
+        n = Osi_getNumCols(osi_solver)
+        lbp = cbclib.Osi_getColLower(osi_solver)
+        ubp = cbclib.Osi_getColUpper(osi_solver)
+        cols = [j for j in range(n) if Osi_isInteger(osi_solver, j)]
+        lb, ub = [lbp[j] for j in cols], [ubp[j] for j in cols]
+        if self.__root_bounds is None:
+            self.__root_bounds = (lb, ub)
+        elif any(v > r for v, r in zip(lb, self.__root_bounds[0])) or any(
+            v < r for v, r in zip(ub, self.__root_bounds[1])
+        ):
+            self.__at_root = False
+        return self.__at_root
+
+    def __create_callback_model(self, osi_solver) -> "ModelOsi":
+        """creates the model passed to cut callbacks, which is reused in
+        all calls of the same optimization. Data that does not change during
+        the search (column mapping and integrality) is computed only here."""
+        self.__update_col_mapping(osi_solver)
+        osi_model = ModelOsi(osi_solver)
+        osi_model.orig_col_idx = self.__orig_col_idx
+        osi_model.pre_col_idx = self.__pre_col_idx
+        # pre-processing keeps the objective function coefficients of the
+        # remaining columns
+        orig_obj = cbclib.Cbc_getObjCoefficients(self._model)
+        if all(jo >= 0 for jo in self.__orig_col_idx):
+            osi_model.solver.set_objective_data(
+                [orig_obj[int(jo)] for jo in self.__orig_col_idx],
+                self.get_objective_sense(),
+            )
+        if np is not None:
+            n = Osi_getNumCols(osi_solver)
+            ctx = CallbackContext()
+            ctx.is_int = np.array(
+                [Osi_isInteger(osi_solver, j) != 0 for j in range(n)], dtype=bool
+            )
+            ctx.integer_tol = Osi_getIntegerTolerance(osi_solver)
+            ctx.orig_col_idx = self.__orig_col_idx
+            ctx.pre_col_idx = self.__pre_col_idx
+            osi_model.context = ctx
+        self.__osi_model = osi_model
+        self.__osi_model_cols = Osi_getNumCols(osi_solver)
+        self.__root_bounds = None
+        return osi_model
+
     def get_objective_sense(self) -> str:
         obj = cbclib.Cbc_getObjSense(self._model)
         if obj < 0.0:
@@ -1179,6 +1993,8 @@ class SolverCbc(Solver):
             raise ValueError(
                 "Unknown sense: {}, use {} or {}".format(sense, MAXIMIZE, MINIMIZE)
             )
+        if self.__lp is not None:
+            self.__lp_set_sense()
 
     def get_objective_value(self) -> numbers.Real:
         # return
@@ -1206,6 +2022,9 @@ class SolverCbc(Solver):
     def get_log(self,) -> List[Tuple[numbers.Real, Tuple[numbers.Real, numbers.Real]]]:
         return self.__log
 
+    def get_lp_log(self) -> List["mip.LPSolveInfo"]:
+        return self.__lp_log
+
     def get_objective_bound(self) -> numbers.Real:
         return self.__obj_bound
 
@@ -1218,11 +2037,19 @@ class SolverCbc(Solver):
         return self.__num_solutions
 
     def get_objective_value_i(self, i: int) -> numbers.Real:
+        if self.__improved_used:
+            if i == 0:
+                return self.__obj_val
+            i -= 1
         return cbclib.Cbc_savedSolutionObj(self._model, i) + self._objconst
 
     def var_get_xi(self, var: "Var", i: int) -> numbers.Real:
         # model status is *already checked* Var xi property
         # (returns None if no solution available)
+        if self.__improved_used:
+            if i == 0:
+                return self.__x[var.idx]
+            i -= 1
         return cbclib.Cbc_savedSolution(self._model, i)[var.idx]
 
     def var_get_rc(self, var: Var) -> numbers.Real:
@@ -1235,12 +2062,36 @@ class SolverCbc(Solver):
 
     def var_set_lb(self, var: "Var", value: numbers.Real):
         cbclib.Cbc_setColLower(self._model, var.idx, value)
+        if self.__lp is not None:
+            cbclib.Clp_columnLower(self.__lp)[var.idx] = value
 
     def var_get_ub(self, var: "Var") -> numbers.Real:
         return cbclib.Cbc_getColUB(self._model, var.idx)
 
     def var_set_ub(self, var: "Var", value: numbers.Real):
         cbclib.Cbc_setColUpper(self._model, var.idx, value)
+        if self.__lp is not None:
+            cbclib.Clp_columnUpper(self.__lp)[var.idx] = value
+
+    def set_bounds(
+        self,
+        idx: List[int],
+        lb: Optional[List[numbers.Real]],
+        ub: Optional[List[numbers.Real]],
+    ):
+        m, lp = self._model, self.__lp
+        if lb is not None:
+            col_lb = cbclib.Clp_columnLower(lp) if lp is not None else None
+            for i, value in zip(idx, lb):
+                cbclib.Cbc_setColLower(m, i, value)
+                if lp is not None:
+                    col_lb[i] = value
+        if ub is not None:
+            col_ub = cbclib.Clp_columnUpper(lp) if lp is not None else None
+            for i, value in zip(idx, ub):
+                cbclib.Cbc_setColUpper(m, i, value)
+                if lp is not None:
+                    col_ub[i] = value
 
     def var_get_name(self, idx: int) -> str:
         namep = self.__name_space
@@ -1258,6 +2109,19 @@ class SolverCbc(Solver):
 
     def constr_set_rhs(self, idx: int, rhs: numbers.Real):
         cbclib.Cbc_setRowRHS(self._model, idx, rhs)
+        if self.__lp is not None:
+            cbclib.Clp_rowLower(self.__lp)[idx] = cbclib.Cbc_getRowLB(self._model, idx)
+            cbclib.Clp_rowUpper(self.__lp)[idx] = cbclib.Cbc_getRowUB(self._model, idx)
+
+    def set_rhs(self, idx: List[int], rhs: List[numbers.Real]):
+        m, lp = self._model, self.__lp
+        if lp is not None:
+            row_lb, row_ub = cbclib.Clp_rowLower(lp), cbclib.Clp_rowUpper(lp)
+        for i, value in zip(idx, rhs):
+            cbclib.Cbc_setRowRHS(m, i, value)
+            if lp is not None:
+                row_lb[i] = cbclib.Cbc_getRowLB(m, i)
+                row_ub[i] = cbclib.Cbc_getRowUB(m, i)
 
     def var_get_obj(self, var: Var) -> numbers.Real:
         return cbclib.Cbc_getColObj(self._model, var.idx)
@@ -1313,6 +2177,37 @@ class SolverCbc(Solver):
         namestr = name.encode("utf-8")
         mp = self._model
         cbclib.Cbc_addRow(mp, namestr, numnz, self.iidx, self.dvec, sense, rhs)
+        if self.__lp is not None:
+            self.__lp_add_rows(self.num_rows() - 1, self.num_rows())
+
+    def add_constrs_csr(
+        self, indptr, indices, coefs, senses, rhs, names: List[str],
+    ):
+        m, first = len(rhs), self.num_rows()
+        if np is not None:
+            starts = np.asarray(indptr, dtype=np.int32).tolist()
+            indices = np.ascontiguousarray(indices[: starts[m]], dtype=np.int32)
+            coefs = np.ascontiguousarray(coefs[: starts[m]], dtype=np.float64)
+            rind = ffi.cast("int *", ffi.from_buffer(indices))
+            rval = ffi.cast("double *", ffi.from_buffer(coefs))
+            rhs = np.asarray(rhs, dtype=np.float64).tolist()
+        else:
+            starts = [int(p) for p in indptr]
+            rind = ffi.new("int[]", [int(j) for j in indices[: starts[m]]])
+            rval = ffi.new("double[]", [float(a) for a in coefs[: starts[m]]])
+            rhs = [float(b) for b in rhs]
+        for k in range(m):
+            cbclib.Cbc_addRow(
+                self._model,
+                names[k].encode("utf-8"),
+                starts[k + 1] - starts[k],
+                rind + starts[k],
+                rval + starts[k],
+                str(senses[k]).encode("utf-8"),
+                rhs[k],
+            )
+        if self.__lp is not None and m:
+            self.__lp_add_rows(first, first + m)
 
     def add_lazy_constr(self: "Solver", lin_expr: LinExpr):
         # collecting linear expression data
@@ -1335,8 +2230,7 @@ class SolverCbc(Solver):
         cbclib.Cbc_addSOS(self._model, 1, starts, idx, w, sos_type)
 
     def add_cut(self, lin_expr: LinExpr):
-        global cut_idx
-        name = "cut{}".format(cut_idx)
+        name = "cut{}".format(self.num_rows())
         self.add_constr(lin_expr, name)
 
     def write(self, file_path: str):
@@ -1363,6 +2257,7 @@ class SolverCbc(Solver):
         ):
             raise MipBaseException("CBC not compiled with bzip2 support")
 
+        self.__drop_lp()
         fpstr = file_path.encode("utf-8")
         if ".mps" in file_path.lower():
             cbclib.Cbc_readMps(self._model, fpstr)
@@ -1396,6 +2291,32 @@ class SolverCbc(Solver):
     def num_nz(self) -> int:
         return cbclib.Cbc_getNumElements(self._model)
 
+    def get_arrays(self) -> Tuple[list, ...]:
+        m = self._model
+        n, nr = self.num_cols(), self.num_rows()
+        obj = ffi.unpack(cbclib.Cbc_getObjCoefficients(m), n) if n else []
+        lb = ffi.unpack(cbclib.Cbc_getColLower(m), n) if n else []
+        ub = ffi.unpack(cbclib.Cbc_getColUpper(m), n) if n else []
+        var_type = [CONTINUOUS] * n
+        if cbclib.Cbc_getNumIntegers(m):
+            for j in range(n):
+                if cbclib.Cbc_isInteger(m, j):
+                    binary = abs(lb[j]) <= 1e-15 and abs(ub[j] - 1.0) <= 1e-15
+                    var_type[j] = BINARY if binary else INTEGER
+
+        senses = {b"E": EQUAL, b"L": LESS_OR_EQUAL, b"G": GREATER_OR_EQUAL}
+        indptr, indices, coefs = [0] * (nr + 1), [], []
+        row_sense, rhs = [], []
+        for i in range(nr):
+            nz = cbclib.Cbc_getRowNz(m, i)
+            if nz:
+                indices.extend(ffi.unpack(cbclib.Cbc_getRowIndices(m, i), nz))
+                coefs.extend(ffi.unpack(cbclib.Cbc_getRowCoeffs(m, i), nz))
+            indptr[i + 1] = len(indices)
+            row_sense.append(senses[cbclib.Cbc_getRowSense(m, i).upper()])
+            rhs.append(cbclib.Cbc_getRowRHS(m, i))
+        return obj, lb, ub, var_type, indptr, indices, coefs, row_sense, rhs
+
     def get_cutoff(self) -> numbers.Real:
         return cbclib.Cbc_getCutoff(self._model)
 
@@ -1461,6 +2382,72 @@ class SolverCbc(Solver):
         if max_sol != INF:
             self.set_max_solutions(max_sol)
 
+    def set_stall_limits(
+        self,
+        max_seconds_same_incumbent: numbers.Real = INF,
+        max_nodes_same_incumbent: int = maxsize,
+        min_gap_improvement_rate: numbers.Real = 0.0,
+    ):
+        if (
+            max_seconds_same_incumbent >= INF
+            and max_nodes_same_incumbent >= maxsize
+            and min_gap_improvement_rate <= 0.0
+        ):
+            self.__stall = None
+        else:
+            self.__stall = (
+                max_seconds_same_incumbent,
+                max_nodes_same_incumbent,
+                min_gap_improvement_rate,
+            )
+
+    def interrupt(self):
+        self.__interrupted = True
+
+    def set_cancel_token(self, token: Optional["mip.CancelToken"]):
+        self.__cancel_token = token
+
+    def set_branch_priorities(
+        self, priorities: Optional[List[int]], directions: Optional[List[int]]
+    ):
+        self.__priorities = []
+        if priorities is None:
+            return
+        if directions is None:
+            directions = [0] * len(priorities)
+        for (j, (priority, direction)) in enumerate(zip(priorities, directions)):
+            direction = (direction > 0) - (direction < 0)
+            if priority != 1000 or direction != 0:
+                self.__priorities.append((j, int(priority), direction))
+
+    def set_progress_callback(
+        self, callback: Optional[Callable[[float, float, Optional[float], int], None]]
+    ):
+        self.__progress_callback = callback
+
+    def set_incumbent_source(
+        self, source: Optional[Callable[[], Optional[Tuple[float, "np.ndarray"]]]]
+    ):
+        self.__incumbent_source = source
+
+    def set_solution(
+        self,
+        x: Optional[List[float]],
+        objective_value: Optional[float],
+        objective_bound: Optional[float],
+        slack: Optional[List[float]] = None,
+    ):
+        self.__clear_sol()
+        if x is not None:
+            self.__x = x
+            self.__obj_val = objective_value
+            self.__num_solutions = 1
+            # the solution is returned instead of the solution pool of CBC
+            self.__improved_used = True
+            if slack is not None:
+                self.__slack = slack
+        self.__obj_bound = objective_bound
+
     def get_emphasis(self) -> SearchEmphasis:
         return self.emphasis
 
@@ -1473,13 +2460,21 @@ class SolverCbc(Solver):
     def remove_constrs(self, constrs: List[int]):
         idx = ffi.new("int[]", constrs)
         cbclib.Cbc_deleteRows(self._model, len(constrs), idx)
+        if self.__lp is not None:
+            cbclib.Clp_deleteRows(self.__lp, len(constrs), idx)
 
     def remove_vars(self, varsList: List[int]):
         idx = ffi.new("int[]", varsList)
         cbclib.Cbc_deleteCols(self._model, len(varsList), idx)
+        if self.__lp is not None:
+            cbclib.Clp_deleteColumns(self.__lp, len(varsList), idx)
 
     def __del__(self):
-        cbclib.Cbc_deleteModel(self._model)
+        self.__drop_lp()
+        if _solving:
+            _pending_deletes.append(self._model)
+        else:
+            cbclib.Cbc_deleteModel(self._model)
 
     def get_problem_name(self) -> str:
         namep = self.__name_space
@@ -1501,6 +2496,69 @@ class SolverCbc(Solver):
     def constr_get_slack(self, constr: Constr) -> Optional[numbers.Real]:
         return self.__slack[constr.idx]
 
+    def get_x(self) -> Optional["np.ndarray"]:
+        if isinstance(self.__x, EmptyVarSol) or not self.__num_solutions:
+            return None
+        if isinstance(self.__x, Sequence):
+            return np.array(self.__x, dtype=np.float64)
+        return np.array(_double_array(self.__x, self.num_cols()))
+
+    def get_pi(self) -> Optional["np.ndarray"]:
+        if isinstance(self.__pi, EmptyRowSol):
+            return None
+        if isinstance(self.__pi, Sequence):
+            return np.array(self.__pi, dtype=np.float64)
+        return np.array(_double_array(self.__pi, self.num_rows()))
+
+
+class _RowSlack(Sequence):
+    """slacks of the constraints of a CBC model computed from their
+    activities when accessed"""
+
+    def __init__(self, cbc_model, activity):
+        self.__model = cbc_model
+        self.__activity = activity
+
+    def __len__(self) -> int:
+        return cbclib.Cbc_getNumRows(self.__model)
+
+    def __getitem__(self, i: int) -> numbers.Real:
+        act = self.__activity[i]
+        rhs = cbclib.Cbc_getRowRHS(self.__model, i)
+        sense = cbclib.Cbc_getRowSense(self.__model, i).decode("utf-8").upper()
+        if sense == "L":
+            return rhs - act
+        if sense == "G":
+            return act - rhs
+        return -abs(act - rhs)
+
+
+def _double_array(ptr, n: int) -> "np.ndarray":
+    """read-only numpy array pointing to n doubles starting at ptr, no copy
+    is made"""
+    if ptr == ffi.NULL:
+        return np.zeros(n)
+    arr = np.frombuffer(ffi.buffer(ptr, n * DOUBLE_SIZE), dtype=np.float64)
+    arr.flags.writeable = False
+    return arr
+
+
+def _cuts_to_csr(cuts: List[LinExpr]):
+    """stores linear constraints in compressed sparse row arrays: row starts,
+    column indexes, coefficients, senses and right hand sides"""
+    nz = [len(cut.expr) for cut in cuts]
+    indptr = np.zeros(len(cuts) + 1, dtype=np.int32)
+    np.cumsum(nz, out=indptr[1:])
+    indices = np.fromiter(
+        (var.idx for cut in cuts for var in cut.expr.keys()), np.int32, indptr[-1]
+    )
+    coefs = np.fromiter(
+        (coef for cut in cuts for coef in cut.expr.values()), np.float64, indptr[-1]
+    )
+    senses = np.array([cut.sense for cut in cuts], dtype="U1")
+    rhs = np.fromiter((-cut.const for cut in cuts), np.float64, len(cuts))
+    return indptr, indices, coefs, senses, rhs
+
 
 class ModelOsi(Model):
     def __init__(self, osi_ptr):
@@ -1517,6 +2575,15 @@ class ModelOsi(Model):
         # if a fractional solution is being processed
         self.fractional = True
 
+        # numpy views of the solver state, filled when used in callbacks
+        self.context = None
+
+        # for each column of this (pre-processed) model, the index of the
+        # column in the original model, and for each column of the original
+        # model, the index of the column here (-1 if removed)
+        self.orig_col_idx = None
+        self.pre_col_idx = None
+
         if existing_solver:
             self._status = self.solver.get_status()
         else:
@@ -1536,6 +2603,77 @@ class ModelOsi(Model):
         self.__gap = INF
         self.__store_search_progress_log = False
 
+    def attach(self, osi_ptr, osi_cuts=ffi.NULL):
+        """binds this model to the solver and cut pool of the current
+        callback call, so that the same model object can be reused in all
+        calls"""
+        self.solver.attach(osi_ptr)
+        self.solver.osi_cutsp = osi_cuts
+        self._status = self.solver.get_status()
+        ctx = self.context
+        if ctx is not None:
+            n = self.solver.num_cols()
+            ctx.x = _double_array(cbclib.Osi_getColSolution(osi_ptr), n)
+            ctx.lb = _double_array(cbclib.Osi_getColLower(osi_ptr), n)
+            ctx.ub = _double_array(cbclib.Osi_getColUpper(osi_ptr), n)
+
+    def __iadd__(self, other) -> "ModelOsi":
+        if isinstance(other, CutPool):
+            self.add_cuts(other)
+            return self
+        return super().__iadd__(other)
+
+    def add_cuts(self, cuts: Union[CutPool, List[LinExpr]]) -> int:
+        """Adds several cuts (or lazy constraints, when processing an integer
+        solution) at once: cuts are converted to CSR arrays and submitted with
+        :meth:`~ModelOsi.add_cuts_csr`. Returns the number of violated cuts
+        submitted to the solver.
+
+        Args:
+            cuts(Union[mip.CutPool, List[mip.LinExpr]]): violated inequalities
+
+        :rtype: int
+        """
+        if isinstance(cuts, CutPool):
+            cuts = cuts.cuts
+        if np is None:
+            return super().add_cuts(cuts)
+        if not cuts:
+            return 0
+        return self.add_cuts_csr(*_cuts_to_csr(cuts))
+
+    def add_cuts_csr(
+        self,
+        indptr,
+        indices,
+        coefs,
+        senses,
+        rhs,
+        min_violation: numbers.Real = 1e-5,
+    ) -> int:
+        """Adds several cuts (or lazy constraints) stored in compressed sparse
+        row format. Violations are computed for all rows at once and only
+        rows violated by more than ``min_violation`` are submitted. Returns
+        the number of rows submitted.
+
+        Args:
+            indptr: array with the start of each row in ``indices`` and
+                ``coefs``, with one additional position indicating the end of
+                the last row
+            indices: indexes of the variables of each row
+            coefs: coefficients of the variables of each row
+            senses: sense of each row (:attr:`~mip.LESS_OR_EQUAL`,
+                :attr:`~mip.GREATER_OR_EQUAL` or :attr:`~mip.EQUAL`)
+            rhs: right hand side of each row
+            min_violation(numbers.Real): minimum violation of a row in the
+                current solution to be submitted
+
+        :rtype: int
+        """
+        return self.solver.add_cuts_csr(
+            indptr, indices, coefs, senses, rhs, min_violation
+        )
+
     def add_constr(self, lin_expr: LinExpr, name: str = "") -> "Constr":
         if self.fractional:
             self.add_cut(lin_expr)
@@ -1544,6 +2682,30 @@ class ModelOsi(Model):
         self.add_lazy_constr(lin_expr)
         return None
 
+    def translate(self, ref) -> Union[List[Any], Dict[Any, Any], "mip.Var"]:
+        """Translates references of variables/containers of variables of the
+        original model to references of variables in this pre-processed
+        model, using the index mapping computed by the solver. Variables
+        removed in the pre-processing are translated to None.
+
+        :rtype: Union[List[Any], Dict[Any, Any], mip.Var]
+        """
+        if self.pre_col_idx is None:
+            return super().translate(ref)
+
+        if isinstance(ref, Var):
+            j = int(self.pre_col_idx[ref.idx])
+            return Var(self, j) if j >= 0 else None
+        if isinstance(ref, list):
+            if ref and np is not None and all(isinstance(el, Var) for el in ref):
+                idx = self.pre_col_idx[np.fromiter((v.idx for v in ref), np.int32)]
+                return [Var(self, j) if j >= 0 else None for j in idx.tolist()]
+            return [self.translate(el) for el in ref]
+        if isinstance(ref, dict):
+            return {key: self.translate(value) for key, value in ref.items()}
+
+        return ref
+
 
 class SolverOsi(Solver):
     """Interface for the OsiSolverInterface, the generic solver interface of
@@ -1578,7 +2740,24 @@ class SolverOsi(Solver):
         self.__rc = EmptyVarSol(model)
         self.__pi = EmptyRowSol(model)
         self.__obj_val = None
+        # objective function informed by set_objective_data
+        self.__obj_coefs = None
+        self.__obj_sense = None
+
+        if cbclib.Osi_isProvenOptimal(self.osi):
+            self.__x = cbclib.Osi_getColSolution(self.osi)
+            self.__rc = cbclib.Osi_getReducedCost(self.osi)
+            self.__pi = cbclib.Osi_getRowPrice(self.osi)
+            self.__obj_val = cbclib.Osi_getObjValue(self.osi)
 
+    def attach(self, osi_ptr):
+        """points this interface to another (not owned) Osi solver object,
+        updating the references to its solution"""
+        if self.owns_solver:
+            cbclib.Osi_deleteSolver(self.osi)
+            self.owns_solver = False
+        self.osi = osi_ptr
+        self.__clear_sol()
         if cbclib.Osi_isProvenOptimal(self.osi):
             self.__x = cbclib.Osi_getColSolution(self.osi)
             self.__rc = cbclib.Osi_getReducedCost(self.osi)
@@ -1652,8 +2831,7 @@ class SolverOsi(Solver):
 
             OsiCuts_addGlobalRowCut(self.osi_cutsp, numnz, cind, cval, sense, rhs)
         else:
-            global cut_idx
-            name = "cut{}".format(cut_idx)
+            name = "cut{}".format(self.num_rows())
             self.add_constr(lin_expr, name)
 
     def add_lazy_constr(self, lin_expr: LinExpr):
@@ -1673,17 +2851,62 @@ class SolverOsi(Solver):
 
             OsiCuts_addGlobalRowCut(self.osi_cutsp, numnz, cind, cval, sense, rhs)
         else:
-            global cut_idx
-            name = "cut{}".format(cut_idx)
+            name = "cut{}".format(self.num_rows())
             self.add_constr(lin_expr, name)
 
+    def add_cuts_csr(
+        self,
+        indptr,
+        indices,
+        coefs,
+        senses,
+        rhs,
+        min_violation: numbers.Real = 1e-5,
+    ) -> int:
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to add cuts in CSR format"
+            )
+        indptr = np.ascontiguousarray(indptr, dtype=np.int32)
+        indices = np.ascontiguousarray(indices, dtype=np.int32)
+        coefs = np.ascontiguousarray(coefs, dtype=np.float64)
+        senses = np.asarray(senses, dtype="U1")
+        rhs = np.ascontiguousarray(rhs, dtype=np.float64)
+        nrows = len(indptr) - 1
+        if nrows <= 0:
+            return 0
+
+        if self.osi_cutsp != ffi.NULL:
+            x = _double_array(cbclib.Osi_getColSolution(self.osi), self.num_cols())
+            viol = _csr_violation(x, indptr, indices, coefs, senses, rhs)
+            rows = np.flatnonzero(viol >= min_violation)
+        else:
+            rows = np.arange(nrows)
+
+        pind = ffi.cast("int *", ffi.from_buffer(indices))
+        pcoef = ffi.cast("double *", ffi.from_buffer(coefs))
+        starts = indptr.tolist()
+        bsenses = [sense.encode("utf-8") for sense in senses.tolist()]
+        brhs = rhs.tolist()
+        for i in rows.tolist():
+            st = starts[i]
+            nz = starts[i + 1] - st
+            if self.osi_cutsp != ffi.NULL:
+                OsiCuts_addGlobalRowCut(
+                    self.osi_cutsp, nz, pind + st, pcoef + st, bsenses[i], brhs[i]
+                )
+            else:
+                cbclib.Osi_addRow(
+                    self.osi, b"", nz, pind + st, pcoef + st, bsenses[i], brhs[i]
+                )
+
+        return len(rows)
+
     def get_objective_bound(self) -> numbers.Real:
         raise NotImplementedError("Not available in OsiSolver")
 
     def get_objective(self) -> LinExpr:
-        obj = cbclib.Osi_getObjCoefficients(self.osi)
-        if obj == ffi.NULL:
-            raise ParameterNotAvailable("Error getting objective function coefficients")
+        obj = self.__objective_coefs()
         return (
             xsum(
                 obj[j] * self.model.vars[j]
@@ -1745,6 +2968,8 @@ class SolverOsi(Solver):
         return 0
 
     def get_objective_sense(self) -> str:
+        if self.__obj_sense is not None:
+            return self.__obj_sense
         objs = cbclib.Osi_getObjSense(self.osi)
         if objs <= -0.5:
             return MAXIMIZE
@@ -1834,6 +3059,48 @@ class SolverOsi(Solver):
     def num_int(self) -> int:
         return cbclib.Osi_getNumIntegers(self.osi)
 
+    def get_arrays(self) -> Tuple[list, ...]:
+        osi = self.osi
+        n, nr = self.num_cols(), self.num_rows()
+        lb = ffi.unpack(cbclib.Osi_getColLower(osi), n) if n else []
+        ub = ffi.unpack(cbclib.Osi_getColUpper(osi), n) if n else []
+        var_type = [CONTINUOUS] * n
+        for j in range(n):
+            if cbclib.Osi_isInteger(osi, j):
+                binary = abs(lb[j]) <= 1e-15 and abs(ub[j] - 1.0) <= 1e-15
+                var_type[j] = BINARY if binary else INTEGER
+
+        senses = {b"E": EQUAL, b"L": LESS_OR_EQUAL, b"G": GREATER_OR_EQUAL}
+        indptr, indices, coefs = [0] * (nr + 1), [], []
+        row_sense, rhs = [], []
+        for i in range(nr):
+            nz = cbclib.Osi_getRowNz(osi, i)
+            if nz:
+                indices.extend(ffi.unpack(cbclib.Osi_getRowIndices(osi, i), nz))
+                coefs.extend(ffi.unpack(cbclib.Osi_getRowCoeffs(osi, i), nz))
+            indptr[i + 1] = len(indices)
+            row_sense.append(senses[cbclib.Osi_getRowSense(osi, i).upper()])
+            rhs.append(cbclib.Osi_getRowRHS(osi, i))
+        obj = list(self.__objective_coefs()) if n else []
+        return obj, lb, ub, var_type, indptr, indices, coefs, row_sense, rhs
+
+    def set_objective_data(self, obj: List[numbers.Real], sense: str):
+        """informs the objective function coefficients and sense of the Osi
+        solver, used when the library does not export
+        Osi_getObjCoefficients and Osi_getObjSense"""
+        self.__obj_coefs, self.__obj_sense = obj, sense
+
+    def __objective_coefs(self) -> list:
+        if self.__obj_coefs is not None:
+            return self.__obj_coefs
+        try:
+            obj = cbclib.Osi_getObjCoefficients(self.osi)
+        except AttributeError:
+            obj = ffi.NULL
+        if obj == ffi.NULL:
+            raise ParameterNotAvailable("Error getting objective function coefficients")
+        return ffi.unpack(obj, self.num_cols())
+
     def get_emphasis(self) -> SearchEmphasis:
         raise NotImplementedError("Not available in OsiSolver")
 
@@ -1957,10 +3224,7 @@ class SolverOsi(Solver):
         cbclib.Osi_setColUpper(self.osi, var.idx, value)
 
     def var_get_obj(self, var: "Var") -> numbers.Real:
-        obj = cbclib.Osi_getObjCoefficients(self.osi)
-        if obj == ffi.NULL:
-            raise ParameterNotAvailable("Error getting objective function coefficients")
-        return obj[var.idx]
+        return self.__objective_coefs()[var.idx]
 
     def var_set_obj(self, var: "Var", value: numbers.Real):
         cbclib.Osi_setObjCoef(self.osi, var.idx, value)
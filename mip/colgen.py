@@ -0,0 +1,351 @@
+"""Column generation for restricted master problems, see
+:class:`~mip.ColumnGeneration`"""
+
+import logging
+import multiprocessing
+from time import perf_counter
+from typing import List, Optional, Sequence, Union
+import mip
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+# state of the worker processes, filled by _init_worker
+_worker = {}
+
+
+def _init_worker(generators):
+    _worker["generators"] = generators
+
+
+def _run_generator(k: int, duals: "np.ndarray") -> list:
+    return list(_worker["generators"][k].generate_columns(None, duals) or [])
+
+
+class ColumnGeneration:
+    """Column generation driver: optimizes the linear programming relaxation
+    of a restricted master problem, sends its dual prices to one or more
+    :class:`~mip.ColumnsGenerator` objects and adds the columns with
+    negative reduced cost (positive when maximizing) that they return, until
+    no such column is found. Example, for a cutting stock problem::
+
+        class Pricing(ColumnsGenerator):
+            def generate_columns(self, model, duals):
+                ...  # solves a knapsack problem with profits duals
+                return [(1, items, quantities)]
+
+        cg = ColumnGeneration(master, Pricing())
+        cg.optimize()
+
+    The master problem is re-optimized from the basis of the previous
+    optimization (see :attr:`~mip.Model.persistent_lp`) and the columns of
+    each round are added in a single batch with
+    :meth:`~mip.Model.add_vars_csc`. The initial columns of the master
+    problem must make it feasible, e.g., with artificial variables.
+
+    Columns added by the driver that remain with value zero for more than
+    ``max_age`` consecutive rounds are removed from the master problem and
+    kept in a pool. In each round, before calling the generators, columns of
+    the pool with negative reduced cost are added back to the master problem.
+
+    With dual smoothing (``smoothing`` > 0), the generators receive a convex
+    combination of the duals sent in the previous round and the current
+    duals, which reduces the oscillation of the dual prices. If no column
+    with negative reduced cost for the current duals is found with smoothed
+    duals (a mispricing), the generators are called again with the current
+    duals.
+
+    Several generators, e.g., one per pricing subproblem, can be called in
+    parallel in a pool of ``workers`` processes. In this case the generators
+    must be picklable and receive None instead of the master problem: each
+    process keeps its own copy of the generators, whose changes are not seen
+    by the other processes. Call :meth:`close` (or use the object as a
+    context manager) to terminate the worker processes.
+
+    Args:
+        master(mip.Model): restricted master problem
+        generators: a :class:`~mip.ColumnsGenerator` or a list of them
+        max_age(int): maximum number of consecutive rounds with value zero
+            before a column is removed from the master problem
+        max_pool(int): maximum number of columns kept in the pool, the
+            oldest ones are discarded
+        smoothing(float): dual smoothing factor, in [0, 1), zero disables it
+        workers(int): number of worker processes for the generators
+        var_type(str): type of the new variables, CONTINUOUS ("C") or
+            INTEGER ("I"), useful to optimize the final master problem as a
+            mixed integer program
+        rc_tol(float): tolerance for the reduced cost of new columns
+        start_method(str): start method of the worker processes, see
+            :func:`multiprocessing.get_context`
+
+    Attributes:
+        iterations(int): number of optimizations of the master problem
+        added(int): number of columns added by the generators
+        reused(int): number of columns added back from the pool
+        pruned(int): number of columns removed from the master problem
+        mispricings(int): number of rounds in which the smoothed duals did
+            not produce columns
+        pricing_time(float): time spent in the generators, in seconds
+    """
+
+    def __init__(
+        self,
+        master: "mip.Model",
+        generators: Union["mip.ColumnsGenerator", Sequence["mip.ColumnsGenerator"]],
+        max_age: int = 50,
+        max_pool: int = 10000,
+        smoothing: float = 0.0,
+        workers: int = 1,
+        var_type: str = mip.CONTINUOUS,
+        rc_tol: float = 1e-6,
+        start_method: Optional[str] = None,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use ColumnGeneration"
+            )
+        if not 0.0 <= smoothing < 1.0:
+            raise mip.InvalidParameter("Smoothing factor should be in [0, 1)")
+        if isinstance(generators, mip.ColumnsGenerator):
+            generators = [generators]
+        self.master = master
+        self.generators = list(generators)
+        self.max_age = max_age
+        self.max_pool = max_pool
+        self.smoothing = smoothing
+        self.workers = workers
+        self.var_type = var_type
+        self.rc_tol = rc_tol
+        self.start_method = start_method
+        master.persistent_lp = True
+
+        self.iterations = 0
+        self.added = 0
+        self.reused = 0
+        self.pruned = 0
+        self.mispricings = 0
+        self.pricing_time = 0.0
+
+        # columns added to the master problem, their data as (cost, indices,
+        # coefficients, name) and number of rounds with value zero
+        self.__vars = []
+        self.__data = []
+        self.__age = np.zeros(0, dtype=np.int64)
+        # columns removed from the master problem
+        self.__pool = []
+        self.__center = None
+        self.__procs = None
+
+    @property
+    def columns(self) -> List["mip.Var"]:
+        """variables added to the master problem by the generators and still
+        in it
+
+        :rtype: List[mip.Var]
+        """
+        return list(self.__vars)
+
+    @property
+    def pool_size(self) -> int:
+        """number of columns removed from the master problem and kept in the
+        pool
+
+        :rtype: int
+        """
+        return len(self.__pool)
+
+    def optimize(
+        self, max_iterations: int = 10000, max_seconds: float = mip.INF
+    ) -> mip.OptimizationStatus:
+        """optimizes the master problem until no column with negative reduced
+        cost is found, returning :attr:`~mip.OptimizationStatus.OPTIMAL`. If
+        a limit is reached first, returns
+        :attr:`~mip.OptimizationStatus.FEASIBLE`, and if the master problem
+        cannot be optimized, its status. The solution of the relaxation of
+        the master problem is available in its variables and constraints.
+
+        Args:
+            max_iterations(int): maximum number of optimizations of the master
+                problem in this call
+            max_seconds(float): time limit, in seconds
+
+        :rtype: mip.OptimizationStatus
+        """
+        begin = perf_counter()
+        master = self.master
+        sign = -1.0 if master.sense == mip.MAXIMIZE else 1.0
+        for it in range(max_iterations):
+            status = master.optimize(relax=True)
+            self.iterations += 1
+            if status != mip.OptimizationStatus.OPTIMAL:
+                return status
+            if it + 1 == max_iterations or perf_counter() - begin >= max_seconds:
+                break
+            duals = master.get_pi()
+            self.__prune()
+            columns = self.__from_pool(duals, sign)
+            if columns:
+                self.reused += len(columns)
+            else:
+                columns = self.__price(duals, sign)
+                self.added += len(columns)
+            if not columns:
+                return mip.OptimizationStatus.OPTIMAL
+            self.__add(columns)
+            logger.info(
+                "Column generation round {}: obj {} columns {}".format(
+                    self.iterations, master.objective_value, len(columns)
+                )
+            )
+        return mip.OptimizationStatus.FEASIBLE
+
+    def __price(self, duals: "np.ndarray", sign: float) -> list:
+        """calls the generators, with smoothed duals if enabled, returning
+        the columns with negative reduced cost"""
+        center = self.__center
+        if self.smoothing > 0.0 and center is not None and len(center) == len(duals):
+            smoothed = self.smoothing * center + (1.0 - self.smoothing) * duals
+            columns = self.__improving(self.__generate(smoothed), duals, sign)
+            if columns:
+                self.__center = smoothed
+                return columns
+            self.mispricings += 1
+        self.__center = duals
+        return self.__improving(self.__generate(duals), duals, sign)
+
+    def __generate(self, duals: "np.ndarray") -> list:
+        """calls all generators, in the worker processes if enabled"""
+        start = perf_counter()
+        columns = []
+        if self.workers > 1 and len(self.generators) > 1:
+            if self.__procs is None:
+                ctx = multiprocessing.get_context(self.start_method)
+                self.__procs = ctx.Pool(
+                    min(self.workers, len(self.generators)),
+                    initializer=_init_worker,
+                    initargs=(self.generators,),
+                )
+            results = [
+                self.__procs.apply_async(_run_generator, (k, duals))
+                for k in range(len(self.generators))
+            ]
+            for res in results:
+                columns.extend(res.get())
+        else:
+            for generator in self.generators:
+                columns.extend(generator.generate_columns(self.master, duals) or [])
+        self.pricing_time += perf_counter() - start
+        return columns
+
+    def __improving(self, columns: list, duals: "np.ndarray", sign: float) -> list:
+        """distinct columns with negative reduced cost for duals"""
+        result, keys = [], set()
+        if not columns:
+            return result
+        columns = [
+            (
+                float(c[0]),
+                np.asarray(c[1], dtype=np.int32),
+                np.asarray(c[2], dtype=np.float64),
+                c[3] if len(c) > 3 else "",
+            )
+            for c in columns
+        ]
+        rc = sign * _reduced_costs(columns, duals)
+        for k in np.flatnonzero(rc < -self.rc_tol).tolist():
+            obj, indices, coefs, name = columns[k]
+            order = np.argsort(indices, kind="stable")
+            indices, coefs = indices[order], coefs[order]
+            key = (round(obj, 9), indices.tobytes(), np.round(coefs, 9).tobytes())
+            if key not in keys:
+                keys.add(key)
+                result.append((obj, indices, coefs, name))
+        return result
+
+    def __from_pool(self, duals: "np.ndarray", sign: float) -> list:
+        """removes from the pool and returns the columns with negative reduced
+        cost"""
+        if not self.__pool:
+            return []
+        rc = sign * _reduced_costs(self.__pool, duals)
+        improving = rc < -self.rc_tol
+        if not improving.any():
+            return []
+        columns = [c for (c, imp) in zip(self.__pool, improving.tolist()) if imp]
+        self.__pool = [c for (c, imp) in zip(self.__pool, improving.tolist()) if not imp]
+        return columns
+
+    def __add(self, columns: list):
+        """adds columns to the master problem in a single batch"""
+        indptr = np.zeros(len(columns) + 1, dtype=np.int32)
+        np.cumsum([len(c[1]) for c in columns], out=indptr[1:])
+        new_vars = self.master.add_vars_csc(
+            [c[0] for c in columns],
+            indptr,
+            np.concatenate([c[1] for c in columns]),
+            np.concatenate([c[2] for c in columns]),
+            var_type=self.var_type,
+            names=[c[3] for c in columns],
+        )
+        self.__vars.extend(new_vars)
+        self.__data.extend(columns)
+        self.__age = np.concatenate((self.__age, np.zeros(len(columns), dtype=np.int64)))
+
+    def __prune(self):
+        """moves the columns with value zero for more than max_age rounds to
+        the pool"""
+        if not self.__vars:
+            return
+        x = self.master.get_x()[[var.idx for var in self.__vars]]
+        self.__age += 1
+        self.__age[np.abs(x) > self.rc_tol] = 0
+        old = self.__age > self.max_age
+        if not old.any():
+            return
+        keep = (~old).tolist()
+        self.master.remove([v for (v, k) in zip(self.__vars, keep) if not k])
+        self.__pool.extend(c for (c, k) in zip(self.__data, keep) if not k)
+        if len(self.__pool) > self.max_pool:
+            self.__pool = self.__pool[len(self.__pool) - self.max_pool :]
+        self.__vars = [v for (v, k) in zip(self.__vars, keep) if k]
+        self.__data = [c for (c, k) in zip(self.__data, keep) if k]
+        self.__age = self.__age[~old]
+        self.pruned += int(old.sum())
+
+    def close(self):
+        """terminates the worker processes"""
+        if self.__procs is not None:
+            self.__procs.terminate()
+            self.__procs.join()
+            self.__procs = None
+
+    def __enter__(self) -> "ColumnGeneration":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def _reduced_costs(columns: list, duals: "np.ndarray") -> "np.ndarray":
+    """reduced costs of columns stored as (cost, indices, coefficients,
+    name)"""
+    nz = [len(c[1]) for c in columns]
+    col = np.repeat(np.arange(len(columns)), nz)
+    if sum(nz):
+        indices = np.concatenate([c[1] for c in columns])
+        coefs = np.concatenate([c[2] for c in columns])
+        price = np.bincount(col, weights=coefs * duals[indices], minlength=len(nz))
+    else:
+        price = np.zeros(len(nz))
+    return np.array([c[0] for c in columns], dtype=np.float64) - price
@@ -0,0 +1,713 @@
+"""Decomposition of models whose constraint matrix has independent blocks,
+see :class:`~mip.Components`, or blocks linked by a few constraints, see
+:class:`~mip.BlockStructure`"""
+
+import functools
+import heapq
+import logging
+import multiprocessing
+from time import perf_counter
+from typing import List, Optional, Tuple
+import mip
+from mip.arrays import ModelArrays, _best_bounds
+from mip.batch import Solution, _solve_task, solve_many
+from mip.cache import PARAMS
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+# status of a model built from blocks, the first status in this list found
+# in a block is the status of the model
+STATUS_PRIORITY = (
+    mip.OptimizationStatus.ERROR,
+    mip.OptimizationStatus.INFEASIBLE,
+    mip.OptimizationStatus.INT_INFEASIBLE,
+    mip.OptimizationStatus.UNBOUNDED,
+    mip.OptimizationStatus.NO_SOLUTION_FOUND,
+    mip.OptimizationStatus.OTHER,
+    mip.OptimizationStatus.CUTOFF,
+    mip.OptimizationStatus.FEASIBLE,
+    mip.OptimizationStatus.OPTIMAL,
+)
+
+# maximum number of classes of constraints tested as linking constraints in
+# the detection of block structures
+MAX_CLASSES = 32
+
+
+def _union_find(num_cols: int, indptr, indices) -> "np.ndarray":
+    """connected components of the graph where variables are connected when
+    they appear in the same constraint, computed with a union-find in which
+    all constraints are processed together in each round: the root of each
+    component is linked to the smallest root of the constraints of its
+    variables and paths are compressed until all pointers reach roots.
+    Returns the root (smallest variable index) of the component of each
+    variable."""
+    parent = np.arange(num_cols)
+    size = np.diff(indptr)
+    nonempty = np.flatnonzero(size)
+    if not len(nonempty):
+        return parent
+    starts, size = indptr[nonempty], size[nonempty]
+    while True:
+        root = parent[indices]
+        row_min = np.repeat(np.minimum.reduceat(root, starts), size)
+        linked = parent.copy()
+        np.minimum.at(linked, root, row_min)
+        # roots are only linked to smaller roots, so that there are no cycles
+        while True:
+            compressed = linked[linked]
+            if np.array_equal(compressed, linked):
+                break
+            linked = compressed
+        if np.array_equal(linked, parent):
+            return parent
+        parent = linked
+
+
+def _components(data: ModelArrays) -> tuple:
+    """number of connected components, component of each variable and of
+    each constraint, -1 for variables that do not appear in constraints and
+    for constraints without variables. Components are numbered by their
+    smallest variable."""
+    indptr, indices = data.indptr.astype(np.int64), data.indices.astype(np.int64)
+    root = _union_find(data.num_cols, indptr, indices)
+    used = np.zeros(data.num_cols, dtype=bool)
+    used[indices] = True
+    roots, labels = np.unique(root[used], return_inverse=True)
+    col_labels = np.full(data.num_cols, -1, dtype=np.int64)
+    col_labels[used] = labels
+    size = np.diff(indptr)
+    row_labels = np.full(data.num_rows, -1, dtype=np.int64)
+    row_labels[size > 0] = col_labels[indices[indptr[:-1][size > 0]]]
+    return len(roots), col_labels, row_labels
+
+
+def _split(labels, n: int) -> List["np.ndarray"]:
+    """indices of the elements with each label in range(n)"""
+    order = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[order], np.arange(n + 1))
+    return [order[bounds[k] : bounds[k + 1]] for k in range(n)]
+
+
+def _positions(num_cols: int, cols: List["np.ndarray"]) -> "np.ndarray":
+    """position of each variable in its block"""
+    pos = np.zeros(num_cols, dtype=np.int64)
+    for c in cols:
+        pos[c] = np.arange(len(c))
+    return pos
+
+
+def _row_nz(data: ModelArrays, rows) -> tuple:
+    """start of each of the selected constraints and positions of their
+    non-zeros in the constraint matrix"""
+    start = data.indptr[rows].astype(np.int64)
+    size = data.indptr[rows + 1] - start
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(size, out=indptr[1:])
+    return indptr, np.repeat(start - indptr[:-1], size) + np.arange(indptr[-1])
+
+
+def _submatrix(data: ModelArrays, rows, cols, pos, k: int) -> ModelArrays:
+    """model with the selected constraints and variables, pos is the
+    position of each variable in cols"""
+    indptr, take = _row_nz(data, rows)
+    return ModelArrays(
+        data.obj[cols],
+        data.lb[cols],
+        data.ub[cols],
+        data.var_type[cols],
+        indptr,
+        pos[data.indices[take]],
+        data.coefs[take],
+        data.senses[rows],
+        data.rhs[rows],
+        data.sense,
+        0.0,
+        "{}_{}".format(data.name, k),
+    )
+
+
+def _settings(model: "mip.Model", num_blocks: int) -> dict:
+    """settings of the model copied to the models of its blocks, the
+    absolute gap is split among the blocks"""
+    settings = {name: getattr(model, name) for name in PARAMS}
+    del settings["cutoff"]
+    settings["max_mip_gap_abs"] = model.max_mip_gap_abs / max(num_blocks, 1)
+    return settings
+
+
+def _block_model(data: ModelArrays, settings: dict, solver_name: str) -> "mip.Model":
+    """model of a block, built in the worker processes"""
+    model = data.to_model(solver_name)
+    model.verbose = 0
+    for (name, value) in settings.items():
+        setattr(model, name, value)
+    return model
+
+
+class Components:
+    """Connected components of a model: sets of variables and constraints
+    such that no constraint has variables of two components, found with a
+    union-find over the constraint matrix in the compressed sparse row
+    format (see :class:`~mip.ModelArrays`). When the model has more than
+    one component, e.g., independent regions linked only by the objective
+    function, each component is a block that can be optimized as a
+    separate, smaller, model::
+
+        comps = m.components()
+        print(comps.num_components, [len(c) for c in comps.cols])
+        comps.optimize(workers=4, max_seconds=60)
+        x = comps.solution.x  # indexed by the variables of m
+
+    Variables that do not appear in any constraint are not included in
+    components, their values are the best bounds for the objective
+    function. Constraints without variables are only checked.
+
+    Args:
+        model(mip.Model): model, which is not changed
+
+    Attributes:
+        data(mip.ModelArrays): data of the model
+        num_components(int): number of components
+        col_labels(numpy.ndarray): component of each variable, -1 for
+            variables that do not appear in constraints
+        row_labels(numpy.ndarray): component of each constraint, -1 for
+            constraints without variables
+        cols(List[numpy.ndarray]): variables of each component
+        rows(List[numpy.ndarray]): constraints of each component
+        solution(Optional[mip.Solution]): solution of the last
+            :meth:`optimize`, with values indexed by the variables of the
+            model
+    """
+
+    def __init__(self, model: "mip.Model"):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use Components"
+            )
+        self.model = model
+        self.data = data = ModelArrays.from_model(model)
+        self.solution = None
+
+        self.num_components, self.col_labels, self.row_labels = _components(data)
+
+        self.cols = _split(self.col_labels, self.num_components)
+        self.rows = _split(self.row_labels, self.num_components)
+        self.__pos = _positions(data.num_cols, self.cols)
+
+    def block(self, k: int) -> ModelArrays:
+        """Data of component :code:`k` as a model, with variables ordered as
+        in :code:`cols[k]` and without the objective function constant
+
+        :rtype: mip.ModelArrays
+        """
+        return _submatrix(self.data, self.rows[k], self.cols[k], self.__pos, k)
+
+    def blocks(self) -> List[ModelArrays]:
+        """Data of all components, see :meth:`block`
+
+        :rtype: List[mip.ModelArrays]
+        """
+        return [self.block(k) for k in range(self.num_components)]
+
+    def __free_columns(self):
+        """values of the variables that do not appear in constraints, None
+        if their bounds are infeasible or if the objective function is
+        unbounded"""
+        data = self.data
+        free = np.flatnonzero(self.col_labels < 0)
+        lb, ub = data.lb[free], data.ub[free]
+        # infinite bounds may be returned as the largest float
+        lb = np.where(lb <= -1e30, -mip.INF, lb)
+        ub = np.where(ub >= 1e30, mip.INF, ub)
+        integer = data.var_type[free] != mip.CONTINUOUS
+        lb = np.where(integer, np.ceil(lb - 1e-9), lb)
+        ub = np.where(integer, np.floor(ub + 1e-9), ub)
+        value = _best_bounds(data.obj[free], lb, ub, data.sense)
+        if (lb > ub).any():
+            return free, mip.OptimizationStatus.INFEASIBLE, None
+        if not np.isfinite(value).all():
+            return free, mip.OptimizationStatus.UNBOUNDED, None
+        return free, mip.OptimizationStatus.OPTIMAL, value
+
+    def __empty_rows_feasible(self, tol: float = 1e-9) -> bool:
+        data = self.data
+        empty = self.row_labels < 0
+        rhs, senses = data.rhs[empty], data.senses[empty]
+        return not (
+            ((senses == mip.LESS_OR_EQUAL) & (rhs < -tol)).any()
+            or ((senses == mip.GREATER_OR_EQUAL) & (rhs > tol)).any()
+            or ((senses == mip.EQUAL) & (np.abs(rhs) > tol)).any()
+        )
+
+    def optimize(
+        self,
+        workers: Optional[int] = None,
+        solver_name: str = "",
+        cancel_token: Optional["mip.CancelToken"] = None,
+        **kwargs
+    ) -> mip.OptimizationStatus:
+        """Optimizes the components as separate models, in a pool of worker
+        processes (see :func:`~mip.solve_many`), and stores the combined
+        solution in :attr:`solution`. The models of the components have the
+        settings of the model, such as :attr:`~mip.Model.max_mip_gap`.
+        The status is OPTIMAL only if all components are solved to
+        optimality, otherwise it is the worst status of the components,
+        e.g., INFEASIBLE if any component is infeasible. The solution
+        found and the objective bound are the sums of the solutions and
+        bounds of the components.
+
+        Args:
+            workers(int): number of worker processes, by default the number
+                of CPUs. With one worker the components are optimized in
+                this process
+            solver_name(str): solver used in the components, by default the
+                solver of the model
+            cancel_token(mip.CancelToken): stops the optimization when
+                cancelled. With one worker the component being optimized
+                returns the best solution found so far, otherwise the
+                components being optimized are terminated. Components not
+                optimized have no solution, so that the status is
+                NO_SOLUTION_FOUND
+
+            Other arguments are passed to :meth:`~mip.Model.optimize` in
+            each component, except :code:`max_seconds`, which is the time
+            limit of the whole optimization: with one worker each component
+            receives the time left divided by the number of components left,
+            otherwise the time limit is divided by the number of components
+            optimized by each worker.
+
+        :rtype: mip.OptimizationStatus
+        """
+        data = self.data
+        free, status, value = self.__free_columns()
+        if not self.__empty_rows_feasible():
+            status = mip.OptimizationStatus.INFEASIBLE
+        if status != mip.OptimizationStatus.OPTIMAL:
+            self.solution = Solution(status=status)
+            return status
+
+        solver_name = solver_name or self.model.solver_name
+        settings = _settings(self.model, self.num_components)
+        tasks = [
+            functools.partial(_block_model, block, settings, solver_name)
+            for block in self.blocks()
+        ]
+        workers = min(workers or multiprocessing.cpu_count(), len(tasks))
+        max_seconds = kwargs.pop("max_seconds", mip.INF)
+        results = [None] * len(tasks)
+        if workers <= 1:
+            deadline = perf_counter() + max_seconds
+            for (k, task) in enumerate(tasks):
+                if cancel_token is not None and cancel_token.cancelled:
+                    break
+                left = max(deadline - perf_counter(), 0.0) / (len(tasks) - k)
+                results[k] = _solve_task(
+                    k,
+                    task,
+                    mip.INF,
+                    dict(kwargs, max_seconds=left, cancel_token=cancel_token),
+                )
+        else:
+            kwargs["max_seconds"] = max_seconds * workers / len(tasks)
+            for sol in solve_many(
+                tasks,
+                workers,
+                solver_name=solver_name,
+                cancel_token=cancel_token,
+                **kwargs
+            ):
+                results[sol.index] = sol
+        results = [
+            Solution(k, mip.OptimizationStatus.NO_SOLUTION_FOUND) if sol is None else sol
+            for (k, sol) in enumerate(results)
+        ]
+        for sol in results:
+            if sol.failed:
+                logger.warning(
+                    "Optimization of component {} failed: {}".format(
+                        sol.index, sol.error
+                    )
+                )
+
+        statuses = {sol.status for sol in results}
+        status = next(s for s in STATUS_PRIORITY if s in statuses)
+        self.solution = Solution(status=status, time=sum(s.time for s in results))
+        const = float(data.obj[free] @ value) + data.objective_const
+        if all(sol.x is not None for sol in results):
+            x = np.zeros(data.num_cols)
+            x[free] = value
+            for (cols, sol) in zip(self.cols, results):
+                x[cols] = sol.x
+            self.solution.x = x
+            self.solution.num_solutions = 1
+            self.solution.objective_value = float(data.obj @ x + data.objective_const)
+        if all(sol.objective_bound is not None for sol in results):
+            self.solution.objective_bound = const + sum(
+                sol.objective_bound for sol in results
+            )
+        return status
+
+    def slack(self, x) -> "np.ndarray":
+        """Slacks of the constraints of the model for a solution, negative
+        for violated constraints
+
+        Args:
+            x: values of the variables
+
+        :rtype: numpy.ndarray
+        """
+        data = self.data
+        rows = np.repeat(np.arange(data.num_rows), np.diff(data.indptr))
+        act = np.bincount(
+            rows, weights=data.coefs * x[data.indices], minlength=data.num_rows
+        )
+        return np.where(
+            data.senses == mip.LESS_OR_EQUAL,
+            data.rhs - act,
+            np.where(
+                data.senses == mip.GREATER_OR_EQUAL,
+                act - data.rhs,
+                -np.abs(act - data.rhs),
+            ),
+        )
+
+
+class BlockStructure:
+    """Bordered block-diagonal structure of the constraint matrix: blocks of
+    variables and constraints, such that each constraint of a block has only
+    variables of its block, and linking constraints, with variables of
+    several blocks. When the linking constraints are relaxed, e.g., in a
+    Lagrangian relaxation or in a Dantzig-Wolfe decomposition, the blocks
+    can be optimized as separate models::
+
+        bbd = m.detect_blocks()
+        print(bbd.num_blocks, len(bbd.linking_rows), bbd.score)
+        for sub in bbd.submodels():
+            sub.optimize()
+
+    The structure is detected partitioning the hypergraph where variables
+    are vertices and constraints are hyperedges:
+
+    * candidate sets of linking constraints are the densest constraints, in
+      increasing numbers, and the classes of constraints with the same
+      number of non-zeros and sense, up to :code:`max_linking`;
+    * for each candidate, the blocks are the connected components of the
+      remaining constraints (see :class:`~mip.Components`). When
+      :code:`num_blocks` is informed, components are merged in this number
+      of blocks with balanced numbers of non-zeros;
+    * the best partition is refined moving variables that are the only
+      ones of their block in a linking constraint to the other block of the
+      constraint, while the score improves.
+
+    The score is the fraction of the constraint matrix outside the border,
+    i.e., the linking constraints, and outside the blocks, considering the
+    area of each block as its number of constraints times its number of
+    variables. It is zero for a single block and close to one for many
+    small blocks with few linking constraints.
+
+    Args:
+        model(mip.Model): model, which is not changed
+        num_blocks(Optional[int]): number of blocks, by default the number
+            of blocks of the best partition found
+        max_linking(float): maximum fraction of the constraints that are
+            linking constraints
+        max_rounds(int): maximum number of rounds of refinement
+
+    Attributes:
+        data(mip.ModelArrays): data of the model
+        num_blocks(int): number of blocks, one if no structure was found
+        col_labels(numpy.ndarray): block of each variable
+        row_labels(numpy.ndarray): block of each constraint, -1 for linking
+            constraints and constraints without variables
+        cols(List[numpy.ndarray]): variables of each block
+        rows(List[numpy.ndarray]): constraints of each block
+        linking_rows(numpy.ndarray): linking constraints
+        score(float): quality of the structure, see above
+        row_perm(numpy.ndarray): constraints ordered by block, followed by
+            the linking constraints and by constraints without variables
+        col_perm(numpy.ndarray): variables ordered by block
+    """
+
+    def __init__(
+        self,
+        model: "mip.Model",
+        num_blocks: Optional[int] = None,
+        max_linking: float = 0.2,
+        max_rounds: int = 10,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use BlockStructure"
+            )
+        if num_blocks is not None and num_blocks < 2:
+            raise mip.InvalidParameter("num_blocks should be at least two")
+        self.model = model
+        self.data = data = ModelArrays.from_model(model)
+        self.__indices = data.indices.astype(np.int64)
+        self.__size = np.diff(data.indptr.astype(np.int64))
+        self.__nz_rows = np.repeat(np.arange(data.num_rows), self.__size)
+        self.__nonempty = np.flatnonzero(self.__size)
+
+        best = np.zeros(data.num_cols, dtype=np.int64)
+        best_score = self.__score(best)
+        for removed in self.__candidates(max_linking):
+            labels = self.__partition(removed, num_blocks)
+            if labels is None:
+                continue
+            score = self.__score(labels)
+            if score > best_score:
+                best, best_score = labels, score
+        if num_blocks is not None and best.max(initial=0) == 0:
+            logger.info("No structure with {} blocks found".format(num_blocks))
+        self.__set(self.__refine(best, num_blocks, max_rounds))
+
+    def __candidates(self, max_linking: float) -> List["np.ndarray"]:
+        """candidate sets of linking constraints"""
+        size, senses = self.__size, self.data.senses
+        limit = int(max_linking * self.data.num_rows)
+        candidates = []
+        # densest constraints, the numbers of constraints removed grow
+        # geometrically and constraints with the same size are kept together
+        order = np.argsort(-size, kind="stable")
+        levels = np.unique(size[size > 0])[::-1]
+        last = 0
+        for t in np.searchsorted(-size[order], -levels, side="right").tolist():
+            if t > limit:
+                break
+            if t >= 1.25 * last:
+                candidates.append(order[:t])
+                last = t
+        # classes of constraints, by size and sense
+        key = size * 3 + np.unique(senses, return_inverse=True)[1]
+        classes, inv, count = np.unique(key, return_inverse=True, return_counts=True)
+        valid = np.flatnonzero((count <= limit) & (classes >= 3))
+        for c in valid[np.argsort(-count[valid], kind="stable")][:MAX_CLASSES]:
+            candidates.append(np.flatnonzero(inv == c))
+        return candidates
+
+    def __partition(self, removed, num_blocks: Optional[int]):
+        """blocks of the variables when the removed constraints are linking
+        constraints, None if there are not enough blocks"""
+        data, size = self.data, self.__size
+        keep = np.ones(data.num_rows, dtype=bool)
+        keep[removed] = False
+        indptr = np.zeros(data.num_rows + 1, dtype=np.int64)
+        np.cumsum(np.where(keep, size, 0), out=indptr[1:])
+        indices = self.__indices[keep[self.__nz_rows]]
+        root = _union_find(data.num_cols, indptr, indices)
+        used = np.zeros(data.num_cols, dtype=bool)
+        used[indices] = True
+        roots, comp = np.unique(root[used], return_inverse=True)
+        if len(roots) < (num_blocks or 2):
+            return None
+
+        labels = np.full(data.num_cols, -1, dtype=np.int64)
+        nb = len(roots)
+        if num_blocks is not None and nb > num_blocks:
+            # largest components first, each one in the block with the
+            # smallest number of non-zeros
+            weight = np.bincount(root[indices], minlength=data.num_cols)[roots]
+            block = np.empty(nb, dtype=np.int64)
+            load = [(0, b) for b in range(num_blocks)]
+            for c in np.argsort(-weight, kind="stable").tolist():
+                w, b = heapq.heappop(load)
+                block[c] = b
+                heapq.heappush(load, (w + int(weight[c]), b))
+            comp, nb = block[comp], num_blocks
+        labels[used] = comp
+        # variables only in linking constraints are spread in the smallest
+        # blocks
+        free = np.flatnonzero(~used)
+        if len(free):
+            smallest = np.argsort(np.bincount(comp, minlength=nb), kind="stable")
+            labels[free] = smallest[np.arange(len(free)) % nb]
+        return labels
+
+    def __classify(self, labels):
+        """block of each constraint (-1 for linking constraints and
+        constraints without variables) and linking constraints"""
+        data, nonempty = self.data, self.__nonempty
+        row_labels = np.full(data.num_rows, -1, dtype=np.int64)
+        linking = np.zeros(data.num_rows, dtype=bool)
+        if len(nonempty):
+            nz_labels = labels[self.__indices]
+            starts = data.indptr[nonempty]
+            lo = np.minimum.reduceat(nz_labels, starts)
+            hi = np.maximum.reduceat(nz_labels, starts)
+            linking[nonempty] = lo != hi
+            row_labels[nonempty] = np.where(lo == hi, lo, -1)
+        return row_labels, linking
+
+    def __score(self, labels) -> Tuple[float, int]:
+        """score of a partition and, to break ties, the number of linking
+        constraints with negative sign"""
+        m, n = self.data.num_rows, self.data.num_cols
+        if not m or not n:
+            return 0.0, 0
+        row_labels, linking = self.__classify(labels)
+        nb = int(labels.max()) + 1
+        rows = np.bincount(row_labels[row_labels >= 0], minlength=nb)
+        cols = np.bincount(labels, minlength=nb)
+        num_linking = int(linking.sum())
+        area = num_linking * n + (rows * cols).sum()
+        return 1.0 - float(area) / (m * n), -num_linking
+
+    def __moves(self, labels):
+        """variables that are the only ones of their blocks in linking
+        constraints with two blocks and the blocks where they should be
+        moved to, so that more constraints become internal to blocks than
+        the number of constraints that become linking constraints"""
+        rows, cols = self.__nz_rows, self.__indices
+        nb = int(labels.max()) + 1
+        lab = labels[cols]
+        uniq, inv, count = np.unique(
+            rows * nb + lab, return_inverse=True, return_counts=True
+        )
+        urows = uniq // nb
+        blocks = np.bincount(urows, minlength=self.data.num_rows)[rows]
+        other = np.bincount(urows, weights=uniq % nb, minlength=self.data.num_rows)
+        other = other[rows].astype(np.int64) - lab
+        size = self.__size[rows]
+        # in constraints with two variables only one of them is moved
+        movable = (blocks == 2) & (count[inv] == 1) & ((size > 2) | (lab > other))
+        if not movable.any():
+            return None
+        cost = np.bincount(cols[(blocks == 1) & (size > 1)], minlength=len(labels))
+        pairs, gain = np.unique(
+            cols[movable] * nb + other[movable], return_counts=True
+        )
+        pcols, pblocks = pairs // nb, pairs % nb
+        net = gain - cost[pcols]
+        order = np.lexsort((-net, pcols))
+        first = order[np.r_[True, pcols[order][1:] != pcols[order][:-1]]]
+        first = first[net[first] > 0]
+        if not len(first):
+            return None
+        return pcols[first], pblocks[first]
+
+    def __refine(self, labels, num_blocks: Optional[int], max_rounds: int):
+        if not len(labels) or labels.max() < 1:
+            return labels
+        score = self.__score(labels)
+        for r in range(max_rounds):
+            moves = self.__moves(labels)
+            if moves is None:
+                break
+            new_labels = labels.copy()
+            new_labels[moves[0]] = moves[1]
+            if num_blocks is not None and len(np.unique(new_labels)) < num_blocks:
+                break
+            new_score = self.__score(new_labels)
+            if new_score <= score:
+                break
+            labels, score = new_labels, new_score
+        # blocks left without variables are removed
+        return np.unique(labels, return_inverse=True)[1].astype(np.int64)
+
+    def __set(self, labels):
+        data = self.data
+        self.num_blocks = int(labels.max()) + 1 if len(labels) else 0
+        self.col_labels = labels
+        self.row_labels, linking = self.__classify(labels)
+        self.linking_rows = np.flatnonzero(linking)
+        self.cols = _split(labels, self.num_blocks)
+        self.rows = _split(self.row_labels, self.num_blocks)
+        self.score = self.__score(labels)[0]
+        empty = np.flatnonzero(self.__size == 0)
+        self.row_perm = np.concatenate(self.rows + [self.linking_rows, empty])
+        self.col_perm = np.argsort(labels, kind="stable")
+        self.__pos = _positions(data.num_cols, self.cols)
+
+    @property
+    def block_sizes(self) -> List[Tuple[int, int]]:
+        """number of constraints and of variables of each block
+
+        :rtype: List[Tuple[int, int]]
+        """
+        return [(len(r), len(c)) for (r, c) in zip(self.rows, self.cols)]
+
+    def block(self, k: int) -> ModelArrays:
+        """Data of block :code:`k` as a model, without the linking
+        constraints, with variables ordered as in :code:`cols[k]` and
+        without the objective function constant
+
+        :rtype: mip.ModelArrays
+        """
+        return _submatrix(self.data, self.rows[k], self.cols[k], self.__pos, k)
+
+    def blocks(self) -> List[ModelArrays]:
+        """Data of all blocks, see :meth:`block`
+
+        :rtype: List[mip.ModelArrays]
+        """
+        return [self.block(k) for k in range(self.num_blocks)]
+
+    def submodels(self, solver_name: str = "") -> List["mip.Model"]:
+        """Models of the blocks, see :meth:`block`
+
+        Args:
+            solver_name(str): solver of the models, by default the solver of
+                the model
+
+        :rtype: List[mip.Model]
+        """
+        solver_name = solver_name or self.model.solver_name
+        return [b.to_model(solver_name) for b in self.blocks()]
+
+    def linking(self) -> Tuple["np.ndarray", ...]:
+        """Linking constraints in the compressed sparse row format, with
+        indices of the variables of the model. Returns the arrays
+        :code:`(indptr, indices, coefs, senses, rhs)`.
+
+        :rtype: Tuple[numpy.ndarray, ...]
+        """
+        data, rows = self.data, self.linking_rows
+        indptr, take = _row_nz(data, rows)
+        return (
+            indptr,
+            data.indices[take].astype(np.int64),
+            data.coefs[take],
+            data.senses[rows],
+            data.rhs[rows],
+        )
+
+
+def optimize_components(
+    model: "mip.Model", cancel_token: Optional["mip.CancelToken"] = None, **kwargs
+) -> Optional[Solution]:
+    """Implementation of :code:`decompose=True` in
+    :meth:`~mip.Model.optimize`: optimizes the components of the model and
+    loads their combined solution in the solver. Returns None if the model
+    should be optimized as a whole."""
+    if model.cuts_generator is not None or model.lazy_constrs_generator is not None:
+        logger.info("Models with constraint generators are not decomposed")
+        return None
+    if model.solver_name.upper() != mip.CBC:
+        logger.info("Decomposition is currently supported only in CBC")
+        return None
+    comps = Components(model)
+    if comps.num_components <= 1:
+        logger.info("Model has a single component")
+        return None
+    comps.optimize(cancel_token=cancel_token, **kwargs)
+    solution = comps.solution
+    logger.info(
+        "Model decomposed in {} components, status {}".format(
+            comps.num_components, solution.status.name
+        )
+    )
+    slack = None if solution.x is None else comps.slack(solution.x).tolist()
+    model.solver.set_solution(
+        None if solution.x is None else solution.x.tolist(),
+        solution.objective_value,
+        solution.objective_bound,
+        slack,
+    )
+    return solution
@@ -0,0 +1,556 @@
+"""Lagrangian relaxation with subgradient optimization of the multipliers,
+see :class:`~mip.LagrangianRelaxation`"""
+
+import logging
+import multiprocessing
+from time import perf_counter
+from typing import Callable, Optional, Sequence, Union
+import mip
+from mip.arrays import ModelArrays
+from mip.decompose import _components, _positions, _row_nz, _settings, _split
+from mip.decompose import _block_model, _submatrix
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+# methods to update the multipliers
+METHODS = ("polyak", "volume")
+
+
+class _BlockSolver:
+    """optimizes a block of the relaxed problem for new objective function
+    coefficients, keeping its model between iterations"""
+
+    def __init__(self, data: ModelArrays, cols, settings: dict, solver_name: str):
+        self.cols = cols
+        self.model = _block_model(data, settings, solver_name)
+        # the pre-processing of CBC may crash when the same model is
+        # optimized again, and blocks are optimized in every iteration
+        self.model.preprocess = 0
+
+    def solve(self, cost: "np.ndarray"):
+        """returns the status, the cost of the solution, a bound for the
+        cost and the values of the variables"""
+        model = self.model
+        cost = cost[self.cols]
+        model.set_obj(cost)
+        status = model.optimize()
+        if status not in (
+            mip.OptimizationStatus.OPTIMAL,
+            mip.OptimizationStatus.FEASIBLE,
+        ):
+            return status, None, None, None
+        x = np.fromiter((v.x for v in model.vars), np.float64, model.num_cols)
+        value = float(cost @ x)
+        # the cost of the solution is only a bound if the gap is closed
+        return status, value, min(value, model.objective_bound), x
+
+
+def _solve_all(solvers, cost: "np.ndarray") -> list:
+    results = []
+    for (k, solver) in solvers:
+        try:
+            results.append((k,) + solver.solve(cost))
+        except Exception as e:
+            logger.error("Error optimizing block {}: {}".format(k, e))
+            results.append((k, mip.OptimizationStatus.ERROR, None, None, None))
+    return results
+
+
+def _worker_main(conn, blocks, settings: dict, solver_name: str):
+    solvers = [
+        (k, _BlockSolver(data, cols, settings, solver_name))
+        for (k, (data, cols)) in blocks
+    ]
+    while True:
+        try:
+            cost = conn.recv()
+        except EOFError:
+            break
+        if cost is None:
+            break
+        conn.send(_solve_all(solvers, cost))
+
+
+class LagrangianRelaxation:
+    """Lagrangian relaxation of a set of constraints of a model: the dualized
+    constraints are moved to the objective function, weighted by
+    multipliers, and the relaxed problem, with the other constraints, gives
+    a bound for the optimal cost of the model (a lower bound when
+    minimizing) for any valid multipliers. Multipliers are optimized with
+    the subgradient method to find the best bound. Example, dualizing the
+    constraints that assign each job to one machine, so that the relaxed
+    problem has one knapsack problem per machine::
+
+        lr = LagrangianRelaxation(m, assignment_constrs)
+        lr.optimize(max_iterations=300)
+        print(lr.bound, lr.incumbent)
+
+    Constraint :code:`a x <= b` with multiplier :code:`u >= 0` adds
+    :code:`u (a x - b)` to the objective function when minimizing and
+    subtracts it when maximizing, constraints :code:`a x >= b` have
+    multipliers :code:`u <= 0` and equality constraints have free
+    multipliers. In each iteration the objective function coefficients of
+    all variables are computed with a few array operations and set in bulk
+    (:meth:`~mip.Model.set_obj`) in the models of the relaxed problem,
+    which are kept between iterations. The relaxed problem is decomposed in
+    its connected components (see :class:`~mip.Components`), optimized as
+    separate models, in worker processes with ``workers`` > 1. Variables
+    that appear only in dualized constraints are set to their best bounds,
+    so their bounds must be finite. Call :meth:`close` (or use the object
+    as a context manager) to terminate the worker processes.
+
+    Multipliers are updated with one of the methods:
+
+    * ``"polyak"``: subgradient steps with length :code:`step * (target -
+      L) / |g|^2`, where :code:`L` is the value of the relaxation,
+      :code:`g` its subgradient (the violation of the dualized constraints)
+      and :code:`target` the cost of the best solution found or, if none
+      was found, an estimate slightly worse than the bound;
+    * ``"volume"``: the volume algorithm, where the direction is the
+      violation of an average of the solutions of the relaxed problem and
+      the multipliers only move when the bound improves. The average,
+      :attr:`primal_average`, approximates a solution of the linear
+      programming relaxation.
+
+    The step factor is halved when the bound does not improve for
+    ``patience`` iterations. Solutions of the relaxed problem that satisfy
+    the dualized constraints, and solutions produced by ``heuristic``, are
+    stored as :attr:`incumbent`. The heuristic receives the solution of the
+    relaxed problem, indexed by the variables of the model, and returns a
+    feasible solution or None, e.g., repairing the violated constraints.
+
+    Args:
+        model(mip.Model): model, which is not changed
+        constrs: constraints to dualize, as :class:`~mip.Constr` or indices,
+            by default the linking constraints found by
+            :meth:`~mip.Model.detect_blocks`
+        method(str): method to update the multipliers, see above
+        step(float): initial step factor
+        patience(int): number of iterations without improvement of the
+            bound before the step factor is halved
+        alpha(float): weight of the last solution in the average of the
+            volume algorithm
+        target(Optional[float]): estimate of the optimal cost, used in the
+            step length until a solution is found
+        heuristic: function that receives the solution of the relaxed
+            problem and returns a feasible solution or None
+        workers(int): number of worker processes for the blocks
+        solver_name(str): solver used in the relaxed problem, by default the
+            solver of the model
+        start_method(str): start method of the worker processes, see
+            :func:`multiprocessing.get_context`
+
+    Attributes:
+        rows(numpy.ndarray): indices of the dualized constraints
+        multipliers(numpy.ndarray): current multipliers
+        best_multipliers(numpy.ndarray): multipliers of the best bound
+        bound(float): best bound found
+        x(Optional[numpy.ndarray]): solution of the relaxed problem in the
+            last iteration
+        subgradient(Optional[numpy.ndarray]): violation of the dualized
+            constraints by :attr:`x`
+        primal_average(Optional[numpy.ndarray]): average of the solutions of
+            the relaxed problem, in the volume algorithm
+        incumbent(Optional[float]): cost of the best feasible solution found
+        incumbent_x(Optional[numpy.ndarray]): best feasible solution found
+        iterations(int): number of optimizations of the relaxed problem
+        num_blocks(int): number of blocks of the relaxed problem
+        log(mip.ProgressLog): lower and upper bounds in each iteration
+    """
+
+    def __init__(
+        self,
+        model: "mip.Model",
+        constrs: Optional[Sequence[Union["mip.Constr", int]]] = None,
+        method: str = "polyak",
+        step: float = 2.0,
+        patience: int = 10,
+        alpha: float = 0.1,
+        target: Optional[float] = None,
+        heuristic: Optional[Callable[["np.ndarray"], Optional["np.ndarray"]]] = None,
+        workers: int = 1,
+        solver_name: str = "",
+        start_method: Optional[str] = None,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use LagrangianRelaxation"
+            )
+        if method not in METHODS:
+            raise mip.InvalidParameter("Invalid method {}".format(method))
+        if not 0.0 < alpha <= 1.0:
+            raise mip.InvalidParameter("alpha should be in (0, 1]")
+        self.model = model
+        self.method = method
+        self.step = step
+        self.patience = patience
+        self.alpha = alpha
+        self.target = target
+        self.heuristic = heuristic
+        self.workers = workers
+        self.solver_name = solver_name or model.solver_name
+        self.start_method = start_method
+        self.__sign = -1.0 if model.sense == mip.MAXIMIZE else 1.0
+
+        if constrs is None:
+            rows = model.detect_blocks().linking_rows
+        else:
+            rows = [c.idx if isinstance(c, mip.Constr) else c for c in constrs]
+        self.rows = np.unique(np.asarray(rows, dtype=np.int64))
+        self.data = data = ModelArrays.from_model(model)
+        if len(self.rows) and (self.rows[0] < 0 or self.rows[-1] >= data.num_rows):
+            raise mip.InvalidParameter("Invalid constraint index")
+
+        # dualized constraints, with one row index per non-zero
+        indptr, take = _row_nz(data, self.rows)
+        self.__nz_rows = np.repeat(np.arange(len(self.rows)), np.diff(indptr))
+        self.__nz_cols = data.indices[take].astype(np.int64)
+        self.__nz_coefs = data.coefs[take]
+        self.__rhs = data.rhs[self.rows]
+        senses = data.senses[self.rows]
+        # multipliers of constraints <= are non-negative and of constraints
+        # >= are non-positive, when minimizing
+        self.__nonneg = senses == mip.LESS_OR_EQUAL
+        self.__nonpos = senses == mip.GREATER_OR_EQUAL
+
+        # relaxed problem, minimizing, and its blocks
+        keep = np.ones(data.num_rows, dtype=bool)
+        keep[self.rows] = False
+        rest = np.flatnonzero(keep)
+        rindptr, rtake = _row_nz(data, rest)
+        self.__relaxed = relaxed = ModelArrays(
+            self.__sign * data.obj,
+            data.lb,
+            data.ub,
+            data.var_type,
+            rindptr,
+            data.indices[rtake],
+            data.coefs[rtake],
+            data.senses[rest],
+            data.rhs[rest],
+            mip.MINIMIZE,
+            0.0,
+            data.name,
+        )
+        self.num_blocks, col_labels, row_labels = _components(relaxed)
+        self.__cols = _split(col_labels, self.num_blocks)
+        self.__block_rows = _split(row_labels, self.num_blocks)
+        self.__free = np.flatnonzero(col_labels < 0)
+        lb, ub = data.lb[self.__free], data.ub[self.__free]
+        if (lb <= -1e30).any() or (ub >= 1e30).any():
+            raise mip.InvalidParameter(
+                "Variables that appear only in dualized constraints should have "
+                "finite bounds"
+            )
+        integer = data.var_type[self.__free] != mip.CONTINUOUS
+        self.__free_lb = np.where(integer, np.ceil(lb - 1e-9), lb)
+        self.__free_ub = np.where(integer, np.floor(ub + 1e-9), ub)
+
+        self.multipliers = np.zeros(len(self.rows))
+        self.best_multipliers = self.multipliers.copy()
+        self.bound = -mip.INF * self.__sign
+        self.x = None
+        self.subgradient = None
+        self.primal_average = None
+        self.incumbent = None
+        self.incumbent_x = None
+        self.iterations = 0
+        self.log = mip.ProgressLog()
+        self.log.instance = model.name
+        self.log.settings = method
+
+        self.__solvers = None
+        self.__workers = []
+        self.__start_time = None
+
+    def __start(self):
+        """creates the models of the blocks, in this process or in the
+        workers"""
+        settings = _settings(self.model, self.num_blocks)
+        pos = _positions(self.data.num_cols, self.__cols)
+        blocks = [
+            (k, (_submatrix(self.__relaxed, rows, cols, pos, k), cols))
+            for (k, (rows, cols)) in enumerate(zip(self.__block_rows, self.__cols))
+        ]
+        if self.workers <= 1 or len(blocks) <= 1:
+            self.__solvers = [
+                (k, _BlockSolver(data, cols, settings, self.solver_name))
+                for (k, (data, cols)) in blocks
+            ]
+            return
+        ctx = multiprocessing.get_context(self.start_method)
+        for w in range(min(self.workers, len(blocks))):
+            conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(child_conn, blocks[w :: self.workers], settings, self.solver_name),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self.__workers.append((conn, process))
+        self.__solvers = []
+
+    def __solve_blocks(self, cost: "np.ndarray") -> list:
+        results = [None] * self.num_blocks
+        if self.__workers:
+            for (conn, _) in self.__workers:
+                conn.send(cost)
+            for (conn, process) in self.__workers:
+                try:
+                    found = conn.recv()
+                except EOFError:
+                    raise mip.InterfacingError(
+                        "Lagrangian worker process terminated with exit code {}".format(
+                            process.exitcode
+                        )
+                    )
+                for res in found:
+                    results[res[0]] = res[1:]
+        else:
+            for res in _solve_all(self.__solvers, cost):
+                results[res[0]] = res[1:]
+        return results
+
+    def violation(self, x) -> "np.ndarray":
+        """Subgradient of the relaxation for a solution of the relaxed
+        problem: :code:`a x - b` for each dualized constraint
+
+        Args:
+            x: values of the variables, indexed by variable index
+
+        :rtype: numpy.ndarray
+        """
+        x = np.asarray(x, dtype=np.float64)
+        act = np.bincount(
+            self.__nz_rows,
+            weights=self.__nz_coefs * x[self.__nz_cols],
+            minlength=len(self.rows),
+        )
+        return act - self.__rhs
+
+    def evaluate(self, multipliers) -> tuple:
+        """Optimizes the relaxed problem for the multipliers, returning the
+        bound, in the sense of the model, and the solution of the relaxed
+        problem. Returns None as the solution if the relaxed problem, and
+        therefore the model, is infeasible.
+
+        Args:
+            multipliers: multipliers of the dualized constraints, in the
+                order of :attr:`rows`
+
+        :rtype: Tuple[float, Optional[numpy.ndarray]]
+        """
+        lam = np.asarray(multipliers, dtype=np.float64)
+        if self.__solvers is None:
+            self.__start()
+        # objective function of the relaxed problem, minimizing
+        cost = self.__relaxed.obj + np.bincount(
+            self.__nz_cols,
+            weights=self.__nz_coefs * lam[self.__nz_rows],
+            minlength=self.data.num_cols,
+        )
+        x = np.zeros(self.data.num_cols)
+        free, c = self.__free, cost[self.__free]
+        x[free] = np.where(c < 0, self.__free_ub, self.__free_lb)
+        value = float(c @ x[free]) - float(lam @ self.__rhs)
+        for (k, (status, block_value, block_bound, block_x)) in enumerate(
+            self.__solve_blocks(cost)
+        ):
+            if status in (
+                mip.OptimizationStatus.INFEASIBLE,
+                mip.OptimizationStatus.INT_INFEASIBLE,
+            ):
+                return self.__sign * mip.INF, None
+            if block_x is None:
+                raise mip.ProgrammingError(
+                    "Block {} finished with status {}".format(k, status.name)
+                )
+            x[self.__cols[k]] = block_x
+            value += block_bound
+        self.iterations += 1
+        return self.__sign * (value + self.__sign * self.data.objective_const), x
+
+    def __feasible(self, x, tol: float = 1e-6) -> bool:
+        """checks all constraints, bounds and integrality"""
+        data = self.data
+        if (x < data.lb - tol).any() or (x > data.ub + tol).any():
+            return False
+        integer = data.var_type != mip.CONTINUOUS
+        if (np.abs(x[integer] - np.round(x[integer])) > tol).any():
+            return False
+        rows = np.repeat(np.arange(data.num_rows), np.diff(data.indptr))
+        act = np.bincount(
+            rows, weights=data.coefs * x[data.indices], minlength=data.num_rows
+        )
+        tol = tol * np.maximum(1.0, np.abs(data.rhs))
+        return not (
+            ((data.senses == mip.LESS_OR_EQUAL) & (act > data.rhs + tol)).any()
+            or ((data.senses == mip.GREATER_OR_EQUAL) & (act < data.rhs - tol)).any()
+            or ((data.senses == mip.EQUAL) & (np.abs(act - data.rhs) > tol)).any()
+        )
+
+    def __update_incumbent(self, x: "np.ndarray"):
+        value = float(self.data.obj @ x) + self.data.objective_const
+        if self.incumbent is None or self.__sign * value < self.__sign * self.incumbent:
+            self.incumbent, self.incumbent_x = value, x
+
+    def __project(self, lam: "np.ndarray") -> "np.ndarray":
+        lam = lam.copy()
+        lam[self.__nonneg] = np.maximum(lam[self.__nonneg], 0.0)
+        lam[self.__nonpos] = np.minimum(lam[self.__nonpos], 0.0)
+        return lam
+
+    def gap(self) -> float:
+        """relative gap between the cost of the best solution found and the
+        bound
+
+        :rtype: float
+        """
+        if self.incumbent is None or abs(self.bound) == mip.INF:
+            return mip.INF
+        return abs(self.incumbent - self.bound) / max(abs(self.incumbent), 1e-10)
+
+    def optimize(
+        self,
+        max_iterations: int = 1000,
+        max_seconds: float = mip.INF,
+        gap_tol: float = 1e-4,
+        min_step: float = 1e-4,
+    ) -> mip.OptimizationStatus:
+        """Optimizes the multipliers, starting from the current ones, until
+        the bound and the best solution found are within :code:`gap_tol`,
+        the subgradient is zero, the step factor falls below
+        :code:`min_step` or a limit is reached. Returns OPTIMAL if the gap
+        was closed, FEASIBLE if a feasible solution was found,
+        NO_SOLUTION_FOUND otherwise and INFEASIBLE if the relaxed problem is
+        infeasible.
+
+        Args:
+            max_iterations(int): maximum number of iterations in this call
+            max_seconds(float): time limit, in seconds
+            gap_tol(float): relative gap to stop
+            min_step(float): minimum step factor
+
+        :rtype: mip.OptimizationStatus
+        """
+        begin = perf_counter()
+        if self.__start_time is None:
+            self.__start_time = begin
+        sign = self.__sign
+        # bounds and multipliers are handled as in a maximization of the
+        # bound of a minimization problem
+        center = self.multipliers.copy()
+        center_value = -mip.INF
+        best = sign * self.bound
+        direction = None
+        theta, stalled = self.step, 0
+        lam = center
+        for _ in range(max_iterations):
+            value, x = self.evaluate(lam)
+            if x is None:
+                self.bound = value
+                return mip.OptimizationStatus.INFEASIBLE
+            value = sign * value
+            g = self.violation(x)
+            self.x, self.subgradient = x, g
+            if best == -mip.INF or value > best + 1e-9 * max(1.0, abs(best)):
+                best, stalled = value, 0
+                self.bound, self.best_multipliers = sign * value, lam.copy()
+            else:
+                stalled += 1
+                if stalled >= self.patience:
+                    theta, stalled = theta / 2, 0
+
+            # solutions of the relaxed problem that satisfy the dualized
+            # constraints are feasible
+            if self.__feasible(x):
+                self.__update_incumbent(x)
+            if self.heuristic is not None:
+                hx = self.heuristic(x.copy())
+                if hx is not None:
+                    hx = np.asarray(hx, dtype=np.float64)
+                    if self.__feasible(hx):
+                        self.__update_incumbent(hx)
+                    else:
+                        logger.warning("Discarding infeasible solution of the heuristic")
+            ub = sign * mip.INF if self.incumbent is None else self.incumbent
+            bounds = (self.bound, ub) if sign > 0 else (ub, self.bound)
+            self.log.log.append((perf_counter() - self.__start_time, bounds))
+
+            if self.method == "volume":
+                if direction is None:
+                    self.primal_average, direction = x, g
+                else:
+                    a = self.alpha
+                    self.primal_average = a * x + (1 - a) * self.primal_average
+                    direction = a * g + (1 - a) * direction
+                if value >= center_value:
+                    center, center_value = lam, value
+            else:
+                center, center_value, direction = lam, value, g
+            self.multipliers = center
+
+            if self.gap() <= gap_tol:
+                return mip.OptimizationStatus.OPTIMAL
+            # components of the direction that leave the valid region are
+            # discarded
+            d = np.where(self.__nonneg & (center <= 0) & (direction < 0), 0.0, direction)
+            d = np.where(self.__nonpos & (center >= 0) & (d > 0), 0.0, d)
+            norm = float(d @ d)
+            if norm <= 1e-18 or theta < min_step:
+                break
+            if perf_counter() - begin >= max_seconds:
+                break
+            if self.incumbent is not None:
+                target = sign * self.incumbent
+            elif self.target is not None:
+                target = sign * self.target
+            else:
+                target = center_value + 0.05 * max(1.0, abs(center_value))
+            length = theta * max(target - center_value, 1e-6 * max(1.0, abs(target)))
+            length /= norm
+            lam = self.__project(center + length * d)
+            logger.info(
+                "Lagrangian iteration {}: bound {} step {}".format(
+                    self.iterations, self.bound, length
+                )
+            )
+        if self.incumbent is not None:
+            if self.gap() <= gap_tol:
+                return mip.OptimizationStatus.OPTIMAL
+            return mip.OptimizationStatus.FEASIBLE
+        return mip.OptimizationStatus.NO_SOLUTION_FOUND
+
+    def close(self):
+        """terminates the worker processes"""
+        for (conn, process) in self.__workers:
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+            process.join(1.0)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            conn.close()
+        self.__workers = []
+        self.__solvers = None
+
+    def __enter__(self) -> "LagrangianRelaxation":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
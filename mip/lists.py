@@ -1,5 +1,5 @@
 from collections.abc import Sequence
-from typing import List
+from typing import List, Optional
 import numbers
 import mip
 
@@ -46,6 +46,38 @@ class VarList(Sequence):
         self.__vars.append(new_var)
         return new_var
 
+    def add_csc(
+        self,
+        obj,
+        indptr,
+        indices,
+        coefs,
+        lb,
+        ub,
+        var_type: str = mip.CONTINUOUS,
+        names: Optional[List[str]] = None,
+    ) -> List["mip.Var"]:
+        n, first = len(obj), len(self.__vars)
+        if var_type == mip.BINARY:
+            lb, ub = 0.0, 1.0
+        if isinstance(lb, numbers.Real):
+            lb = [lb] * n
+        if isinstance(ub, numbers.Real):
+            ub = [ub] * n
+        if names is None:
+            names = [""] * n
+        elif len(names) != n:
+            raise mip.InvalidParameter(
+                "{} names informed for {} variables".format(len(names), n)
+            )
+        names = [name or "var({})".format(first + k) for (k, name) in enumerate(names)]
+        self.__model.solver.add_vars_csc(
+            obj, lb, ub, var_type, indptr, indices, coefs, names
+        )
+        new_vars = [mip.Var(self.__model, first + k) for k in range(n)]
+        self.__vars.extend(new_vars)
+        return new_vars
+
     def __getitem__(self: "VarList", key):
         if isinstance(key, str):
             return self.__model.var_by_name(key)
@@ -145,6 +177,37 @@ class ConstrList(Sequence):
         self.__constrs.append(new_constr)
         return new_constr
 
+    def add_csr(
+        self,
+        indptr,
+        indices,
+        coefs,
+        senses,
+        rhs,
+        names: Optional[List[str]] = None,
+    ) -> List["mip.Constr"]:
+        m, first = len(rhs), len(self.__constrs)
+        if len(senses) != m or len(indptr) != m + 1:
+            raise mip.InvalidParameter(
+                "Invalid dimensions of the constraint arrays: {} senses, {} "
+                "right hand sides and {} row starts".format(
+                    len(senses), m, len(indptr)
+                )
+            )
+        if names is None:
+            names = [""] * m
+        elif len(names) != m:
+            raise mip.InvalidParameter(
+                "{} names informed for {} constraints".format(len(names), m)
+            )
+        names = [
+            name or "constr({})".format(first + k) for (k, name) in enumerate(names)
+        ]
+        self.__model.solver.add_constrs_csr(indptr, indices, coefs, senses, rhs, names)
+        new_constrs = [mip.Constr(self.__model, first + k) for k in range(m)]
+        self.__constrs.extend(new_constrs)
+        return new_constrs
+
     def __len__(self) -> int:
         return len(self.__constrs)
 
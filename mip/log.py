@@ -1,3 +1,8 @@
+import asyncio
+from typing import NamedTuple, Optional
+from mip.constants import OptimizationStatus
+
+
 class ProgressLog:
     """Class to store the improvement of lower
     and upper bounds over time during the search.
@@ -63,3 +68,105 @@ class ProgressLog:
             (s, (l, b)) = (float(cols[0]), (float(cols[1]), float(cols[2])))
             self.log.append((s, (l, b)))
         f.close()
+
+
+class ProgressEvent(
+    NamedTuple(
+        "ProgressEvent",
+        [
+            ("time", float),
+            ("bound", float),
+            ("incumbent", Optional[float]),
+            ("nodes", int),
+        ],
+    )
+):
+    """Progress of the search, produced when the bound or the best solution
+    is improved
+
+    Attributes:
+        time(float): processing time, in seconds
+        bound(float): best bound of the objective function
+        incumbent(Optional[float]): cost of the best solution found, None if
+            no feasible solution was found yet
+        nodes(int): estimate of the number of nodes of the search tree
+            evaluated so far
+    """
+
+    __slots__ = ()
+
+
+class ProgressStream:
+    """Asynchronous iterator over the :class:`~mip.ProgressEvent` of an
+    optimization started with :meth:`~mip.Model.optimize_async`. Iteration
+    ends when the optimization finishes::
+
+        progress = ProgressStream()
+        task = asyncio.ensure_future(m.optimize_async(progress=progress))
+        async for event in progress:
+            print(event.time, event.bound, event.incumbent)
+        status = await task
+
+    A stream can be used in only one optimization and must be created in
+    the event loop where the optimization is awaited.
+    """
+
+    def __init__(self):
+        self.__queue = asyncio.Queue()
+        self.__loop = None
+        self.__closed = False
+
+    def _open(self, loop: asyncio.AbstractEventLoop):
+        if self.__loop is not None:
+            raise ValueError("ProgressStream already used in an optimization")
+        self.__loop = loop
+
+    def _put(self, seconds: float, bound: float, incumbent: Optional[float], nodes: int):
+        """adds an event, called from the thread running the solver"""
+        event = ProgressEvent(seconds, bound, incumbent, nodes)
+        self.__loop.call_soon_threadsafe(self.__queue.put_nowait, event)
+
+    def _close(self):
+        """signals the end of the optimization, called in the event loop"""
+        self.__queue.put_nowait(None)
+
+    def __aiter__(self) -> "ProgressStream":
+        return self
+
+    async def __anext__(self) -> ProgressEvent:
+        if self.__closed:
+            raise StopAsyncIteration
+        event = await self.__queue.get()
+        if event is None:
+            self.__closed = True
+            raise StopAsyncIteration
+        return event
+
+
+class LPSolveInfo(
+    NamedTuple(
+        "LPSolveInfo",
+        [
+            ("time", float),
+            ("warm_start", bool),
+            ("iterations", Optional[int]),
+            ("status", OptimizationStatus),
+            ("objective_value", Optional[float]),
+        ],
+    )
+):
+    """Statistics of an optimization of the linear programming relaxation,
+    stored in :attr:`~mip.Model.lp_solve_log`
+
+    Attributes:
+        time(float): wall time of the optimization, in seconds
+        warm_start(bool): if the optimization started from the basis of the
+            previous one, see :attr:`~mip.Model.persistent_lp`
+        iterations(Optional[int]): number of simplex iterations, only
+            available in optimizations started from a previous basis
+        status(mip.OptimizationStatus): status of the optimization
+        objective_value(Optional[float]): cost of the optimal solution,
+            None if no optimal solution was found
+    """
+
+    __slots__ = ()
@@ -1,7 +1,10 @@
+import asyncio
+import functools
 import logging
+from concurrent.futures import Executor
 from os import environ
 from os.path import isfile
-from typing import List, Tuple, Optional, Union, Dict, Any
+from typing import List, Tuple, Optional, Union, Dict, Any, Sequence
 import numbers
 import mip
 
@@ -24,6 +27,13 @@ class Model:
     To check how models are created please see the
     :ref:`examples <chapExamples>` included.
 
+    Different models can be built and optimized in different threads. A
+    model should not be accessed from several threads at the same time,
+    except for :meth:`~mip.Model.interrupt`. In CBC the branch-and-cut
+    search of only one model runs at a time in each process, the other
+    threads wait for it: use processes to solve several MIPs in parallel.
+    Linear programs are solved concurrently.
+
     Attributes:
         vars(mip.VarList): list of problem variables (:class:`~mip.Var`)
         constrs(mip.ConstrList): list of constraints (:class:`~mip.Constr`)
@@ -117,9 +127,11 @@ class Model:
         self.__preprocess = -1
         self.__cuts_generator = None
         self.__lazy_constrs_generator = None
+        self.__incumbent_updater = None
         self.__start = None
         self.__threads = 0
         self.__lp_method = mip.LP_Method.AUTO
+        self.__persistent_lp = False
         self.__n_cols = 0
         self.__n_rows = 0
         self.__gap = mip.INF
@@ -281,6 +293,150 @@ class Model:
 
         return np.array(_add_tensor(self, shape, name, **kwargs)).view(mip.LinExprTensor)
 
+    def add_vars_csc(
+        self: "Model",
+        obj,
+        indptr,
+        indices,
+        coefs,
+        lb=0.0,
+        ub=mip.INF,
+        var_type: str = mip.CONTINUOUS,
+        names: Optional[List[str]] = None,
+    ) -> List["mip.Var"]:
+        """Creates several variables whose columns, i.e., their coefficients in
+        the existing constraints, are stored in compressed sparse column
+        format, returning their references. All columns are sent to the solver
+        engine in a single batch, which is much faster than adding them one by
+        one with :meth:`add_var` when many columns are generated, e.g., in
+        column generation.
+
+        Args:
+            obj: coefficient of each variable in the objective function
+            indptr: array with the start of each column in ``indices`` and
+                ``coefs``, with one additional position indicating the end of
+                the last column
+            indices: indexes of the constraints of each column
+            coefs: coefficients of each column in its constraints
+            lb: lower bound of all variables or a list with the lower bound of
+                each variable
+            ub: upper bound of all variables or a list with the upper bound of
+                each variable
+            var_type (str): CONTINUOUS ("C"), BINARY ("B") or INTEGER ("I")
+            names: names of the variables, variables without names (None or
+                empty) are named var(i), where i is the variable index
+
+        :rtype: List[mip.Var]
+        """
+        return self.vars.add_csc(obj, indptr, indices, coefs, lb, ub, var_type, names)
+
+    def set_rhs(self: "Model", rhs, idx=None):
+        """Changes the right hand side of several constraints at once, much
+        faster than setting :attr:`~mip.Constr.rhs` of each constraint, e.g.,
+        when a model is optimized many times with different right hand
+        sides. When the linear programming relaxation is persistent
+        (:attr:`persistent_lp`), the next optimization starts from the
+        previous basis.
+
+        Args:
+            rhs: new right hand sides
+            idx: indexes of the constraints, by default all constraints of
+                the model, in order
+        """
+        if idx is None:
+            idx = range(self.num_rows)
+        if np is not None:
+            if isinstance(idx, np.ndarray):
+                idx = idx.tolist()
+            if isinstance(rhs, np.ndarray):
+                rhs = rhs.tolist()
+        if len(idx) != len(rhs):
+            raise mip.InvalidParameter(
+                "{} right hand sides informed for {} constraints".format(
+                    len(rhs), len(idx)
+                )
+            )
+        self.solver.set_rhs(idx, rhs)
+
+    def set_obj(self: "Model", obj, idx=None):
+        """Changes the objective function coefficients of several variables at
+        once. When the linear programming relaxation is persistent
+        (:attr:`persistent_lp`), the next optimization starts from the
+        previous basis.
+
+        Args:
+            obj: new objective function coefficients
+            idx: indexes of the variables, by default all variables of the
+                model, in order
+        """
+        idx, (obj,) = self.__bulk_args(idx, self.num_cols, obj)
+        self.solver.set_obj(idx, obj)
+
+    def set_bounds(self: "Model", lb=None, ub=None, idx=None):
+        """Changes the lower and/or upper bounds of several variables at
+        once. When the linear programming relaxation is persistent
+        (:attr:`persistent_lp`), the next optimization starts from the
+        previous basis.
+
+        Args:
+            lb: new lower bounds, None to keep the current ones
+            ub: new upper bounds, None to keep the current ones
+            idx: indexes of the variables, by default all variables of the
+                model, in order
+        """
+        idx, (lb, ub) = self.__bulk_args(idx, self.num_cols, lb, ub)
+        self.solver.set_bounds(idx, lb, ub)
+
+    def __bulk_args(self: "Model", idx, size: int, *values) -> Tuple[List[int], list]:
+        """converts the arguments of the bulk modification methods to lists,
+        checking their lengths"""
+        if idx is None:
+            idx = range(size)
+        elif np is not None and isinstance(idx, np.ndarray):
+            idx = idx.tolist()
+        result = []
+        for v in values:
+            if np is not None and isinstance(v, np.ndarray):
+                v = v.tolist()
+            if v is not None and len(v) != len(idx):
+                raise mip.InvalidParameter(
+                    "{} values informed for {} positions".format(len(v), len(idx))
+                )
+            result.append(v)
+        return idx, result
+
+    def get_x(self: "Model") -> Optional["np.ndarray"]:
+        """Values (:attr:`~mip.Var.x`) of all variables in the best solution
+        found, as a numpy array indexed by variable index, or None if no
+        solution is available.
+
+        :rtype: Optional[numpy.ndarray]
+        """
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use get_x"
+            )
+        x = self.solver.get_x()
+        if x is None:
+            return None
+        return np.asarray(x, dtype=np.float64)
+
+    def get_pi(self: "Model") -> Optional["np.ndarray"]:
+        """Dual values (:attr:`~mip.Constr.pi`) of all constraints in the last
+        optimization, as a numpy array indexed by constraint index, or None
+        if they are not available.
+
+        :rtype: Optional[numpy.ndarray]
+        """
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use get_pi"
+            )
+        pi = self.solver.get_pi()
+        if pi is None:
+            return None
+        return np.asarray(pi, dtype=np.float64)
+
     def add_constr(
         self: "Model", lin_expr: "mip.LinExpr", name: str = ""
     ) -> "mip.Constr":
@@ -324,6 +480,39 @@ class Model:
             )
         return self.constrs.add(lin_expr, name)
 
+    def add_constrs_csr(
+        self: "Model",
+        indptr,
+        indices,
+        coefs,
+        senses,
+        rhs,
+        names: Optional[List[str]] = None,
+    ) -> List["mip.Constr"]:
+        """Creates several constraints stored in compressed sparse row format,
+        returning their references. Constraint :code:`i` is
+        :code:`sum(coefs[k] * x[indices[k]]) senses[i] rhs[i]`, for :code:`k`
+        in :code:`range(indptr[i], indptr[i + 1])`. Rows are sent to the
+        solver engine without creating linear expressions, which is much
+        faster than adding them one by one with :meth:`add_constr`.
+
+        Args:
+            indptr: array with the start of each row in ``indices`` and
+                ``coefs``, with one additional position indicating the end of
+                the last row
+            indices: indexes of the variables of each row
+            coefs: coefficients of the variables in each row
+            senses: sense of each constraint: LESS_OR_EQUAL ("<"),
+                GREATER_OR_EQUAL (">") or EQUAL ("=")
+            rhs: right hand side of each constraint
+            names: names of the constraints, constraints without names (None
+                or empty) are named constr(i), where i is the constraint
+                index
+
+        :rtype: List[mip.Constr]
+        """
+        return self.constrs.add_csr(indptr, indices, coefs, senses, rhs, names)
+
     def add_lazy_constr(self: "Model", expr: "mip.LinExpr"):
         """Adds a lazy constraint
 
@@ -401,6 +590,7 @@ class Model:
         self.__cuts = 1
         self.__cuts_generator = None
         self.__lazy_constrs_generator = None
+        self.__incumbent_updater = None
         self.__start = []
         self._status = mip.OptimizationStatus.LOADED
         self.__threads = 0
@@ -511,6 +701,11 @@ class Model:
         max_nodes: int = mip.INF,
         max_solutions: int = mip.INF,
         relax: bool = False,
+        max_seconds_same_incumbent: float = mip.INF,
+        max_nodes_same_incumbent: int = mip.INF,
+        min_gap_improvement_rate: float = 0.0,
+        cancel_token: Optional["mip.CancelToken"] = None,
+        decompose: bool = False,
     ) -> mip.OptimizationStatus:
         """ Optimizes current model
 
@@ -521,6 +716,15 @@ class Model:
 
             m.optimize(max_seconds=300)
 
+        To stop the search when the best solution was not improved in the
+        last 60 seconds::
+
+            m.optimize(max_seconds_same_incumbent=60)
+
+        The optimization can be interrupted from another thread cancelling
+        a :class:`~mip.CancelToken` informed in :code:`cancel_token` or,
+        in this case, calling :meth:`~mip.Model.interrupt`.
+
         Args:
             max_seconds (float): Maximum runtime in seconds (default: inf)
             max_nodes (float): Maximum number of nodes (default: inf)
@@ -528,6 +732,29 @@ class Model:
             relax (bool): if true only the linear programming relaxation will
                 be solved, i.e. integrality constraints will be temporarily
                 discarded.
+            max_seconds_same_incumbent (float): Maximum runtime in seconds
+                since the last improvement of the best solution (default: inf)
+            max_nodes_same_incumbent (float): Maximum number of nodes
+                evaluated since the last improvement of the best solution
+                (default: inf)
+            min_gap_improvement_rate (float): the search stops if the average
+                reduction of the relative gap per second, since the first
+                feasible solution was found, falls below this value
+                (default: 0, disabled)
+
+            These last three criteria are only checked after a feasible
+            solution is found and are currently supported only in CBC.
+
+            cancel_token (mip.CancelToken): the search stops when this
+                token is cancelled, currently supported only in CBC.
+            decompose (bool): if the model has independent blocks, see
+                :meth:`components`, each block is optimized as a separate
+                model in a pool of worker processes and the solutions of the
+                blocks are combined in the solution of this model. The time
+                limit is divided among the blocks, the other limits apply to
+                each block, see :meth:`~mip.Components.optimize`. Models
+                with constraint generators are optimized as a whole.
+                Currently supported only in CBC.
 
         Returns:
             optimization status, which can be OPTIMAL(0), ERROR(-1),
@@ -548,11 +775,31 @@ class Model:
 
         if self.__threads != 0:
             self.solver.set_num_threads(self.__threads)
-        # self.solver.set_callbacks(branch_selector,
-        # incumbent_updater, lazy_constrs_generator)
         self.solver.set_processing_limits(max_seconds, max_nodes, max_solutions)
-
-        self._status = self.solver.optimize(relax)
+        self.solver.set_stall_limits(
+            max_seconds_same_incumbent,
+            max_nodes_same_incumbent,
+            min_gap_improvement_rate,
+        )
+        self.solver.set_cancel_token(cancel_token)
+
+        solution = None
+        if decompose:
+            solution = mip.decompose.optimize_components(
+                self,
+                max_seconds=max_seconds,
+                max_nodes=max_nodes,
+                max_solutions=max_solutions,
+                relax=relax,
+                max_seconds_same_incumbent=max_seconds_same_incumbent,
+                max_nodes_same_incumbent=max_nodes_same_incumbent,
+                min_gap_improvement_rate=min_gap_improvement_rate,
+                cancel_token=cancel_token,
+            )
+        if solution is None:
+            self._status = self.solver.optimize(relax)
+        else:
+            self._status = solution.status
         # has a solution and is a MIP
         if self.num_solutions and self.num_int > 0:
             best = self.objective_value
@@ -568,6 +815,345 @@ class Model:
 
         return self._status
 
+    async def optimize_async(
+        self: "Model",
+        progress: Optional["mip.ProgressStream"] = None,
+        executor: Optional[Executor] = None,
+        **kwargs
+    ) -> mip.OptimizationStatus:
+        """Optimizes current model in a thread, without blocking the event
+        loop. The solver releases the Python interpreter lock while it runs,
+        so other tasks proceed normally::
+
+            status = await m.optimize_async(max_seconds=300)
+
+        If the task awaiting this coroutine is cancelled, the search is
+        interrupted and the cancellation is propagated after the solver
+        returns, so that the model can be safely used again.
+
+        Args:
+            progress (mip.ProgressStream): stream that receives the
+                :class:`~mip.ProgressEvent` of the search, currently
+                supported only in CBC
+            executor (concurrent.futures.Executor): executor where the
+                optimization runs, by default the executor of the event loop
+
+            Other arguments are the same of :meth:`optimize`.
+
+        :rtype: mip.OptimizationStatus
+        """
+        loop = asyncio.get_event_loop()
+        token = mip.CancelToken(kwargs.pop("cancel_token", None))
+        if progress is not None:
+            progress._open(loop)
+            self.solver.set_progress_callback(progress._put)
+        future = loop.run_in_executor(
+            executor, functools.partial(self.optimize, cancel_token=token, **kwargs)
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            token.cancel()
+            # the model is only released when the solver returns
+            await asyncio.wait([future])
+            raise
+        finally:
+            if progress is not None:
+                self.solver.set_progress_callback(None)
+                progress._close()
+
+    def optimize_portfolio(
+        self: "Model",
+        configs: Sequence[Dict[str, Any]],
+        workers: Optional[int] = None,
+        solver_name: str = "",
+        grace: float = 5.0,
+        **kwargs
+    ) -> "mip.PortfolioResult":
+        """Optimizes copies of this model with different settings in parallel
+        processes. The running time of the search often varies a lot with
+        settings such as the random seed, the search emphasis or the cut
+        generation, so that a portfolio of configurations can be much faster
+        than any single configuration::
+
+            result = m.optimize_portfolio(
+                [{"seed": s} for s in range(4)] + [{"emphasis": 1, "cuts": 2}],
+                max_seconds=600,
+            )
+            print(result.status, result.objective_value, result.config)
+
+        The processes share the best solution found: when a configuration
+        finds a solution, the others use it to prune their search trees and
+        return it if they do not find a better one. All processes stop as
+        soon as one of them finishes the search or when the gap between the
+        best solution and the best bound of all processes is within
+        :attr:`max_mip_gap` or :attr:`max_mip_gap_abs`.
+
+        Models are sent to the processes as :class:`~mip.ModelArrays`, so
+        callbacks such as cut generators are not used. This model is not
+        changed, the best solution is returned in a
+        :class:`~mip.PortfolioResult` with values indexed by variable index.
+        Currently the sharing of solutions is supported only in CBC.
+
+        Args:
+            configs (Sequence[Dict[str, Any]]): configurations, dictionaries
+                with values of model attributes such as :attr:`seed`,
+                :attr:`emphasis`, :attr:`cuts`, :attr:`preprocess` and
+                :attr:`lp_method`. Attributes not informed have the values
+                of this model
+            workers (int): maximum number of configurations running at the
+                same time, by default the number of CPUs. Other
+                configurations start when one finishes without solving the
+                problem, e.g., due to :code:`max_nodes`
+            solver_name (str): solver used in the processes, by default the
+                solver of this model
+            grace (float): time, in seconds, for processes to stop after the
+                portfolio finishes or reaches :code:`max_seconds`, before
+                being terminated
+
+            Other arguments are passed to :meth:`optimize` in each process.
+
+        :rtype: mip.PortfolioResult
+        """
+        return mip.portfolio.optimize_portfolio(
+            self, configs, workers, solver_name, grace, **kwargs
+        )
+
+    def sweep(
+        self: "Model",
+        rhs_matrix=None,
+        obj_matrix=None,
+        bounds: Optional[Tuple] = None,
+        rhs_idx=None,
+        var_idx=None,
+        relax: bool = False,
+        workers: int = 1,
+        solver_name: str = "",
+        start_method: Optional[str] = None,
+        **kwargs
+    ) -> "mip.SweepResult":
+        """Optimizes this model for many scenarios of right hand sides,
+        objective function coefficients and/or variable bounds, e.g., in
+        capacity planning or sensitivity analysis::
+
+            # one row of demands per scenario
+            res = m.sweep(rhs_matrix=demands, rhs_idx=[c.idx for c in dem])
+            for k in range(len(res)):
+                print(k, res.status[k], res.objective_value[k])
+
+        Scenarios are optimized in order and only the values that differ
+        from the previous scenario are sent to the solver, in bulk (see
+        :meth:`set_rhs`, :meth:`set_obj` and :meth:`set_bounds`). Linear
+        programs (or relaxations, with :code:`relax=True`) are re-optimized
+        from the basis of the previous scenario (see :attr:`persistent_lp`)
+        and mixed integer programs use the solution of the previous
+        scenario as initial solution (:attr:`start`), so that sequences of
+        similar scenarios are solved much faster than independent models.
+        The original values of the model are restored at the end.
+
+        With :code:`workers > 1`, consecutive groups of scenarios are
+        optimized in worker processes, each with a copy of this model built
+        from its :class:`~mip.ModelArrays`, so that callbacks such as cut
+        generators are not used in this case.
+
+        Args:
+            rhs_matrix: right hand sides, with one row per scenario and one
+                column per constraint in :code:`rhs_idx`
+            obj_matrix: objective function coefficients, with one row per
+                scenario and one column per variable in :code:`var_idx`
+            bounds: tuple :code:`(lb_matrix, ub_matrix)` with lower and upper
+                bounds of the variables in :code:`var_idx`, one row per
+                scenario, any of them can be None
+            rhs_idx: indexes of the constraints in the columns of
+                :code:`rhs_matrix`, by default all constraints
+            var_idx: indexes of the variables in the columns of
+                :code:`obj_matrix` and :code:`bounds`, by default all variables
+            relax (bool): if True, the linear programming relaxation of the
+                model is optimized
+            workers (int): number of worker processes
+            solver_name (str): solver used in the worker processes, by
+                default the solver of this model
+            start_method (str): start method of the worker processes, see
+                :func:`multiprocessing.get_context`
+
+            Other arguments are passed to :meth:`optimize`.
+
+        :rtype: mip.SweepResult
+        """
+        return mip.sweep.sweep(
+            self,
+            rhs_matrix,
+            obj_matrix,
+            bounds,
+            rhs_idx,
+            var_idx,
+            relax,
+            workers,
+            solver_name,
+            start_method,
+            **kwargs
+        )
+
+    def presolve(
+        self: "Model", dual: Optional[bool] = None, max_passes: int = 20
+    ) -> "mip.Presolve":
+        """Presolves this model in numpy arrays, returning a
+        :class:`~mip.Presolve` with the presolved model and the mapping of
+        its solutions to this model. Unlike the pre-processing of the solver
+        engine, which is disabled when a lazy constraints generator is set,
+        this presolve remains valid with lazy constraints. This model is not
+        changed::
+
+            pre = m.presolve()
+            pre.optimize()
+            print(pre.solution.objective_value, pre.solution.x)
+
+        Args:
+            dual (bool): if dual reductions should be applied, by default
+                only when there is no lazy constraints generator
+            max_passes (int): maximum number of passes of reductions
+
+        :rtype: mip.Presolve
+        """
+        return mip.presolve.Presolve(self, dual, max_passes)
+
+    def components(self: "Model") -> "mip.Components":
+        """Finds the connected components of the model, i.e., independent
+        blocks of variables and constraints that are linked only by the
+        objective function, see :class:`~mip.Components`. Models with more
+        than one component can be optimized with
+        :code:`optimize(decompose=True)`::
+
+            comps = m.components()
+            if comps.num_components > 1:
+                m.optimize(decompose=True)
+
+        :rtype: mip.Components
+        """
+        return mip.decompose.Components(self)
+
+    def detect_blocks(
+        self: "Model",
+        num_blocks: Optional[int] = None,
+        max_linking: float = 0.2,
+        max_rounds: int = 10,
+    ) -> "mip.BlockStructure":
+        """Detects a bordered block-diagonal structure in the constraint
+        matrix: blocks of variables and constraints linked by a few linking
+        constraints, as required by Dantzig-Wolfe decompositions and
+        Lagrangian relaxations, see :class:`~mip.BlockStructure`::
+
+            bbd = m.detect_blocks()
+            print(bbd.num_blocks, bbd.block_sizes, bbd.score)
+            print([m.constrs[i].name for i in bbd.linking_rows])
+
+        Args:
+            num_blocks (Optional[int]): number of blocks, by default the
+                number of blocks of the best structure found
+            max_linking (float): maximum fraction of the constraints that
+                are linking constraints
+            max_rounds (int): maximum number of rounds of refinement of the
+                blocks
+
+        :rtype: mip.BlockStructure
+        """
+        return mip.decompose.BlockStructure(self, num_blocks, max_linking, max_rounds)
+
+    def propagate_bounds(
+        self: "Model", max_rounds: int = 10, apply: bool = True
+    ) -> "mip.BoundPropagation":
+        """Tightens the bounds of the variables with feasibility-based bound
+        propagation over the constraint matrix and detects coefficients of
+        binary variables, e.g., big-M constants, that can be reduced, see
+        :class:`~mip.BoundPropagation`. Can be called before the
+        optimization or in cuts generators at the root node, where tightened
+        bounds and strengthened constraints are added as cuts::
+
+            prop = m.propagate_bounds()
+            if prop.status == OptimizationStatus.INFEASIBLE:
+                print("infeasible")
+            print(prop.tightened_bounds, prop.coefs_reduced)
+
+        Args:
+            max_rounds (int): maximum number of rounds of propagation
+            apply (bool): if the tightened bounds should be applied to the
+                model, see :meth:`~mip.BoundPropagation.apply`
+
+        :rtype: mip.BoundPropagation
+        """
+        return mip.propagation.propagate_bounds(self, max_rounds, apply)
+
+    def fingerprint(self: "Model", params: bool = True) -> str:
+        """Hash of the variables, constraints and objective function of the
+        model and, optionally, of the settings that change the results of
+        the optimization, such as :attr:`seed`, :attr:`cuts`,
+        :attr:`max_mip_gap` and :attr:`max_seconds`. Models with the same
+        data have the same fingerprint, regardless of names and of the order
+        of the terms of the constraints, in any process. The data is read
+        from the solver in bulk, see :meth:`~mip.ModelArrays.fingerprint`.
+        Used by :class:`~mip.SolveCache` to identify models already
+        optimized.
+
+        Args:
+            params (bool): if the settings should be included
+
+        :rtype: str
+        """
+        return mip.cache.fingerprint(self, params)
+
+    def interrupt(self: "Model"):
+        """Stops the optimization of this model running in another thread.
+        The search stops as soon as possible and :meth:`optimize` returns
+        the best solution found so far, with status FEASIBLE, or
+        NO_SOLUTION_FOUND if no feasible solution was found. This method is
+        thread-safe. If called while the model is not being optimized, the
+        next optimization is interrupted.
+
+        Currently supported only in CBC, where the interruption is checked
+        in the nodes of the search tree: the pre-processing and the
+        solution of the linear programming relaxation of the root node are
+        not interrupted. Checking for interruptions slows down the search,
+        so it is only done in optimizations started with a
+        :code:`cancel_token`, see :meth:`optimize`, or with
+        :meth:`optimize_async`, or after this method was called.
+        """
+        self.solver.interrupt()
+
+    def set_branch_priorities(
+        self: "Model",
+        priorities: Optional[List[int]],
+        directions: Optional[List[int]] = None,
+    ):
+        """Sets the branching priorities of the variables, used in the next
+        optimizations: when several integer variables have fractional values
+        in the solution of a node, the one with the smallest priority is
+        selected for branching. Variables have priority 1000 by default.
+
+        Args:
+            priorities(Optional[List[int]]): priority of each variable,
+                indexed by the variable index, or None to remove the
+                priorities set before
+            directions(Optional[List[int]]): branch explored first for each
+                variable: 1 for the up branch, -1 for the down branch or 0
+                to let the solver decide (default)
+
+        Currently supported only in CBC.
+        """
+        if priorities is not None:
+            if len(priorities) != self.num_cols:
+                raise mip.InvalidParameter(
+                    "{} priorities informed for {} variables".format(
+                        len(priorities), self.num_cols
+                    )
+                )
+            if directions is not None and len(directions) != self.num_cols:
+                raise mip.InvalidParameter(
+                    "{} directions informed for {} variables".format(
+                        len(directions), self.num_cols
+                    )
+                )
+        self.solver.set_branch_priorities(priorities, directions)
+
     def read(self: "Model", path: str):
         """Reads a MIP model or an initial feasible solution.
 
@@ -784,6 +1370,38 @@ class Model:
     def lp_method(self: "Model", lpm: mip.LP_Method):
         self.__lp_method = lpm
 
+    @property
+    def persistent_lp(self: "Model") -> bool:
+        """If True, the linear programming relaxation solved in
+        :meth:`~mip.Model.optimize` with :code:`relax=True` is kept in a
+        simplex solver that receives the changes made in the model, so that
+        the next optimization starts from the basis of the previous one
+        instead of solving the problem from scratch: after new constraints,
+        bound or right hand side changes the dual simplex is used and after
+        new variables or objective function changes the primal simplex is
+        used. Useful in algorithms that solve a sequence of similar linear
+        programs, e.g., column generation and cutting planes. Default False,
+        currently supported only in CBC. Statistics of each optimization are
+        stored in :attr:`~mip.Model.lp_solve_log`.
+
+        :rtype: bool
+        """
+        return self.__persistent_lp
+
+    @persistent_lp.setter
+    def persistent_lp(self: "Model", persistent: bool):
+        self.__persistent_lp = persistent
+
+    @property
+    def lp_solve_log(self: "Model") -> List["mip.LPSolveInfo"]:
+        """Wall time, use of the previous basis, number of simplex iterations
+        and result of each optimization of the linear programming relaxation
+        (:code:`relax=True`) of this model, currently stored only in CBC.
+
+        :rtype: List[mip.LPSolveInfo]
+        """
+        return self.solver.get_lp_log()
+
     @property
     def threads(self: "Model") -> int:
         r"""number of threads to be used when solving the problem.
@@ -954,6 +1572,25 @@ class Model:
     ):
         self.__lazy_constrs_generator = lazy_constrs_generator
 
+    @property
+    def incumbent_updater(self: "Model") -> Optional["mip.IncumbentUpdater"]:
+        """An :class:`~mip.IncumbentUpdater` object that is notified whenever
+        the solver finds a new integer feasible solution, and that may return
+        an improved solution (produced, for example, by a local search
+        heuristic). Improved solutions are used to prune the search tree and
+        are returned as the final solution when better than the ones found by
+        the solver. Currently supported only in CBC.
+
+        :rtype: Optional[mip.IncumbentUpdater]
+        """
+        return self.__incumbent_updater
+
+    @incumbent_updater.setter
+    def incumbent_updater(
+        self: "Model", incumbent_updater: Optional["mip.IncumbentUpdater"]
+    ):
+        self.__incumbent_updater = incumbent_updater
+
     @property
     def emphasis(self: "Model") -> "mip.SearchEmphasis":
         """defines the main objective of the search, if set to 1 (FEASIBILITY)
@@ -1308,6 +1945,25 @@ class Model:
         """
         self.solver.add_cut(cut)
 
+    def add_cuts(
+        self: "Model", cuts: Union["mip.CutPool", List["mip.LinExpr"]]
+    ) -> int:
+        """Adds several violated inequalities at once, see
+        :meth:`~mip.Model.add_cut`. Inside CBC callbacks all cuts are
+        checked against the current solution and submitted in a single batch,
+        which is much faster than adding them one by one.
+
+        Args:
+            cuts(Union[mip.CutPool, List[mip.LinExpr]]): violated inequalities
+
+        :rtype: int
+        """
+        if isinstance(cuts, mip.CutPool):
+            cuts = cuts.cuts
+        for cut in cuts:
+            self.add_cut(cut)
+        return len(cuts)
+
     def remove(
         self: "Model",
         objects: Union[mip.Var, mip.Constr, List[Union["mip.Var", "mip.Constr"]]],
@@ -0,0 +1,348 @@
+"""Cut separation in a pool of worker processes"""
+import logging
+import multiprocessing
+from collections import deque
+from math import ceil
+from multiprocessing.connection import wait
+from time import perf_counter
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
+import mip
+from mip.callbacks import ConstrsGenerator, _csr_violation
+from mip.callbacks import _original_solution, _add_original_rows
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+    logger.debug("Shared memory not available", exc_info=True)
+
+# a row is informed as (indices, coefficients, sense, rhs)
+Row = Tuple[Sequence[int], Sequence[float], str, float]
+
+
+def _worker_main(conn, separator, data, shm_name: Optional[str], n: int):
+    """runs the separator for the tasks received until the connection is
+    closed. Tasks of call k read the solution in the shared buffer k % 2."""
+    shm, buffers = None, None
+    if shm_name is not None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        buffers = np.ndarray((2, n), dtype=np.float64, buffer=shm.buf)
+        buffers.flags.writeable = False
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+        round_id, tasks, x = msg
+        if x is None:
+            x = buffers[round_id % 2]
+        try:
+            rows = []
+            for task in tasks:
+                rows.extend(separator(x, task, data))
+        except Exception as e:
+            rows = e
+        conn.send((round_id, rows))
+    buffers = None
+    if shm is not None:
+        shm.close()
+
+
+class _Worker:
+    """worker process and the call whose tasks it is running, 0 if idle"""
+
+    def __init__(self, ctx, args: tuple):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn,) + args, daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.round = 0
+
+    def stop(self, force: bool = False):
+        if not force:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                force = True
+            self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+class ParallelConstrsGenerator(ConstrsGenerator):
+    """Runs independent separation routines in a pool of worker processes,
+    so that separators written in pure Python run in parallel. In each call
+    the solution of the callback model is copied to a shared memory buffer
+    read by all workers, the tasks are distributed among them and all
+    violated rows returned until the deadline are sent to the solver in a
+    single batch. Example, with one minimum cut problem per task::
+
+        def separate(x, task, arcs):
+            u, v = task
+            G = nx.DiGraph()
+            for k, (i, j) in enumerate(arcs):
+                G.add_edge(i, j, capacity=x[k])
+            ...
+            return [(indices, coefs, "<", len(S) - 1)]
+
+        gen = ParallelConstrsGenerator(separate, pairs, data=arcs)
+        m.cuts_generator = gen
+        m.optimize()
+        gen.close()
+
+    The separator receives the solution (a read-only numpy array indexed by
+    the variables of the original model, variables removed in the
+    pre-processing have value zero), one task and `data`, and returns a list
+    of rows, each one a tuple (indices, coefficients, sense, rhs), with
+    indices of variables of the original model. Since it is called in other
+    processes, the separator, tasks and data must be picklable: define the
+    separator at module level. Rows with variables removed in the
+    pre-processing and duplicated rows are discarded.
+
+    The pool is created in the first call and kept for the next
+    optimizations, call :meth:`close` (or use the object as a context
+    manager) to terminate the worker processes. Solutions are written
+    alternately in two shared buffers, so that workers whose tasks did not
+    finish until the deadline can go on in the next call, reading the
+    solution of their own call. Workers still running when the call after
+    that starts are terminated and replaced.
+
+    Args:
+        separator: function separator(x, task, data) returning the rows
+            found for one task
+        tasks: list of tasks or a function that receives the solution and
+            returns the tasks of the current call
+        data: data passed to all calls of the separator, sent only once to
+            each worker process
+        processes(int): number of worker processes, by default the number of
+            CPUs
+        timeout(float): maximum time, in seconds, waiting for the results of
+            each call, results arriving later are discarded
+        chunk_size(int): number of tasks sent together to a worker, by
+            default tasks are split in four chunks per process
+        min_violation(float): minimum violation for a row to be sent to the
+            solver
+        start_method(str): start method of the worker processes, see
+            :func:`multiprocessing.get_context`
+    """
+
+    def __init__(
+        self,
+        separator: Callable[[Any, Any, Any], Iterable[Row]],
+        tasks: Union[Sequence[Any], Callable[[Any], Sequence[Any]]],
+        data: Any = None,
+        processes: Optional[int] = None,
+        timeout: float = 1.0,
+        chunk_size: int = 0,
+        min_violation: float = 1e-5,
+        start_method: Optional[str] = None,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use ParallelConstrsGenerator"
+            )
+        self.separator = separator
+        self.tasks = tasks
+        self.data = data
+        self.processes = processes or multiprocessing.cpu_count()
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.min_violation = min_violation
+        self.start_method = start_method
+
+        # number of calls, of task chunks whose results arrived after the
+        # deadline and of rows sent to the solver
+        self.calls = 0
+        self.timeouts = 0
+        self.added = 0
+
+        self.__ctx = None
+        self.__workers = []
+        self.__args = None
+        self.__shm = None
+        self.__x = None
+        self.__n = -1
+        self.__round = 0
+
+    def __start(self, n: int):
+        """creates the worker processes for solutions with n variables"""
+        self.close()
+        shm_name = None
+        if shared_memory is not None:
+            size = 2 * max(n, 1) * 8
+            self.__shm = shared_memory.SharedMemory(create=True, size=size)
+            self.__x = np.ndarray((2, n), dtype=np.float64, buffer=self.__shm.buf)
+            shm_name = self.__shm.name
+        self.__ctx = multiprocessing.get_context(self.start_method)
+        self.__args = (self.separator, self.data, shm_name, n)
+        self.__workers = [
+            _Worker(self.__ctx, self.__args) for _ in range(self.processes)
+        ]
+        self.__n = n
+
+    def __replace(self, i: int):
+        """terminates worker i, whose tasks are lost, and starts a new one"""
+        self.__workers[i].stop(force=True)
+        self.__workers[i] = _Worker(self.__ctx, self.__args)
+
+    def close(self):
+        """terminates the worker processes and releases the shared memory"""
+        for w in self.__workers:
+            w.stop(force=w.round != 0)
+        self.__workers = []
+        if self.__shm is not None:
+            self.__x = None
+            self.__shm.close()
+            self.__shm.unlink()
+            self.__shm = None
+        self.__n = -1
+
+    def __enter__(self) -> "ParallelConstrsGenerator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def separate(self, x) -> List[Row]:
+        """runs the separator for all tasks in the worker processes and
+        returns the distinct rows found until the deadline
+
+        Args:
+            x: solution values, indexed by the variables of the original
+                model
+
+        :rtype: List[Tuple[List[int], List[float], str, float]]
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if len(x) != self.__n:
+            self.__start(len(x))
+        tasks = self.tasks(x) if callable(self.tasks) else self.tasks
+        if not tasks:
+            return []
+
+        # results of previous calls that arrive late are identified by the
+        # round and discarded. Workers still running tasks of the previous
+        # call read the other buffer and receive new tasks when they finish,
+        # workers late by more than one call would read the buffer written
+        # now and are replaced
+        self.__round += 1
+        round_id = self.__round
+        for (i, w) in enumerate(self.__workers):
+            if w.round and (w.round < round_id - 1 or not w.process.is_alive()):
+                self.__replace(i)
+        x_msg = x
+        if self.__x is not None:
+            self.__x[round_id % 2] = x
+            x_msg = None
+        size = self.chunk_size or max(1, ceil(len(tasks) / (4 * self.processes)))
+        chunks = deque(list(tasks[i : i + size]) for i in range(0, len(tasks), size))
+
+        deadline = perf_counter() + min(self.timeout, self.time_left())
+        rows, keys = [], set()
+        running = 0
+        while True:
+            for (i, w) in enumerate(self.__workers):
+                if chunks and not w.round:
+                    if not w.process.is_alive():
+                        self.__replace(i)
+                        w = self.__workers[i]
+                    w.conn.send((round_id, chunks.popleft(), x_msg))
+                    w.round = round_id
+                    running += 1
+            wait_time = deadline - perf_counter()
+            if not (running or chunks) or wait_time <= 0.0:
+                break
+            busy = [w for w in self.__workers if w.round]
+            ready = wait(
+                [w.conn for w in busy] + [w.process.sentinel for w in busy],
+                wait_time,
+            )
+            for (i, w) in enumerate(self.__workers):
+                if not w.round:
+                    continue
+                if w.conn in ready:
+                    try:
+                        result_round, found = w.conn.recv()
+                    except EOFError:
+                        result_round, found = w.round, []
+                        self.__replace(i)
+                    w.round = 0
+                elif w.process.sentinel in ready:
+                    result_round, found = w.round, []
+                    self.__replace(i)
+                else:
+                    continue
+                if result_round != round_id:
+                    continue
+                running -= 1
+                if isinstance(found, Exception):
+                    raise found
+                for row in found:
+                    key = (tuple(row[0]), tuple(row[1]), row[2], row[3])
+                    if key not in keys:
+                        keys.add(key)
+                        rows.append(row)
+        self.timeouts += running + len(chunks)
+        return rows
+
+    def generate_constrs(self, model: "mip.Model"):
+        self.calls += 1
+        x, pre_col_idx = _original_solution(model)
+        rows = self.separate(x)
+        if not rows:
+            return
+
+        indptr = np.zeros(len(rows) + 1, dtype=np.int32)
+        np.cumsum([len(row[0]) for row in rows], out=indptr[1:])
+        indices = np.fromiter(
+            (j for row in rows for j in row[0]), dtype=np.int32, count=indptr[-1]
+        )
+        coefs = np.fromiter(
+            (a for row in rows for a in row[1]), dtype=np.float64, count=indptr[-1]
+        )
+        senses = np.array([row[2] for row in rows], dtype="U1")
+        rhs = np.array([row[3] for row in rows], dtype=np.float64)
+
+        # only violated rows are sent
+        viol = _csr_violation(x, indptr, indices, coefs, senses, rhs)
+        ok = viol >= self.min_violation
+        if not ok.any():
+            return
+        if not ok.all():
+            nz = np.diff(indptr)
+            nzok = np.repeat(ok, nz)
+            indices, coefs = indices[nzok], coefs[nzok]
+            indptr = np.zeros(int(ok.sum()) + 1, dtype=np.int32)
+            np.cumsum(nz[ok], out=indptr[1:])
+            senses, rhs = senses[ok], rhs[ok]
+
+        self.added += _add_original_rows(
+            model,
+            pre_col_idx,
+            indptr,
+            indices,
+            coefs,
+            senses,
+            rhs,
+            lazy=not getattr(model, "fractional", True),
+        )
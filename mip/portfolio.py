@@ -0,0 +1,383 @@
+"""Optimization of copies of a model with different settings in parallel
+processes, see :meth:`~mip.Model.optimize_portfolio`"""
+
+import logging
+import multiprocessing
+import queue
+from collections import deque
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence
+import mip
+from mip.arrays import ModelArrays
+from mip.batch import Solution
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+# model attributes that can be changed in each configuration of a portfolio,
+# the other configurations use the values of the original model
+SETTINGS = (
+    "seed",
+    "emphasis",
+    "cuts",
+    "cut_passes",
+    "clique",
+    "preprocess",
+    "pump_passes",
+    "lp_method",
+    "threads",
+    "cutoff",
+    "max_mip_gap",
+    "max_mip_gap_abs",
+    "integer_tol",
+    "infeas_tol",
+    "opt_tol",
+    "round_int_vars",
+)
+
+# status that finish the portfolio when reported by any configuration
+FINAL_STATUS = (
+    mip.OptimizationStatus.OPTIMAL,
+    mip.OptimizationStatus.INFEASIBLE,
+    mip.OptimizationStatus.INT_INFEASIBLE,
+    mip.OptimizationStatus.UNBOUNDED,
+)
+
+
+class PortfolioResult(Solution):
+    """Result of :meth:`~mip.Model.optimize_portfolio`: the best solution
+    found by all configurations, its status and the configuration that won,
+    i.e., the first one that finished the search or, if the search was
+    stopped, the one that found the best solution.
+
+    Attributes:
+        index(int): index of the winning configuration, -1 if there is none
+        config(Optional[Dict]): winning configuration
+        solutions(List[Optional[mip.Solution]]): results of each
+            configuration, None for configurations that were not started
+    """
+
+    def __init__(
+        self,
+        index: int = -1,
+        status: mip.OptimizationStatus = mip.OptimizationStatus.OTHER,
+        objective_value: Optional[float] = None,
+        objective_bound: Optional[float] = None,
+        x: Optional["np.ndarray"] = None,
+        num_solutions: int = 0,
+        time: float = 0.0,
+        error: Optional[str] = None,
+        config: Optional[Dict] = None,
+        solutions: Optional[List[Optional[Solution]]] = None,
+    ):
+        super().__init__(
+            index,
+            status,
+            objective_value,
+            objective_bound,
+            x,
+            num_solutions,
+            time,
+            error,
+        )
+        self.config = config
+        self.solutions = solutions or []
+
+    def __repr__(self) -> str:
+        return "PortfolioResult(index={}, status={}, objective_value={})".format(
+            self.index, self.status.name, self.objective_value
+        )
+
+
+class _SharedIncumbent:
+    """best solution found by all processes of a portfolio, stored in shared
+    memory together with the configuration that found it. Processes always
+    minimize."""
+
+    def __init__(self, ctx, num_cols: int):
+        self.lock = ctx.Lock()
+        self.version = ctx.Value("l", 0, lock=False)
+        self.owner = ctx.Value("l", -1, lock=False)
+        self.obj = ctx.Value("d", mip.INF, lock=False)
+        self.x = ctx.Array("d", num_cols, lock=False)
+
+    def publish(self, owner: int, obj: float, x: "np.ndarray"):
+        """stores a solution if it is better than the current one"""
+        with self.lock:
+            best = self.obj.value
+            if best < mip.INF and obj >= best - 1e-6 * max(1.0, abs(best)):
+                return
+            self.x[:] = x.tolist()
+            self.obj.value = obj
+            self.owner.value = owner
+            self.version.value += 1
+
+
+class _Publisher(mip.IncumbentUpdater):
+    """sends the solutions found in a process to the other processes"""
+
+    def __init__(self, model: "mip.Model", shared: _SharedIncumbent, owner: int):
+        super().__init__(model)
+        self.shared = shared
+        self.owner = owner
+
+    def update_incumbent_x(
+        self, objective_value: float, best_bound: float, x: "np.ndarray"
+    ) -> Optional["np.ndarray"]:
+        self.shared.publish(self.owner, objective_value, x)
+        return None
+
+
+class _Importer:
+    """incumbent source of the solver, returns the solutions found by the
+    other processes since the last call"""
+
+    def __init__(self, shared: _SharedIncumbent, owner: int):
+        self.shared = shared
+        self.owner = owner
+        self.version = 0
+
+    def __call__(self):
+        shared = self.shared
+        if shared.version.value == self.version:
+            return None
+        with shared.lock:
+            self.version = shared.version.value
+            if shared.owner.value == self.owner:
+                return None
+            return shared.obj.value, np.array(shared.x[:])
+
+
+class _EventToken(mip.CancelToken):
+    """cancel token of a process, cancelled by the main process"""
+
+    def __init__(self, event):
+        super().__init__()
+        self.event = event
+
+    @property
+    def cancelled(self) -> bool:
+        return self.event.is_set()
+
+
+def _run_config(
+    index: int,
+    data: ModelArrays,
+    solver_name: str,
+    settings: dict,
+    start: Optional[list],
+    kwargs: dict,
+    shared: _SharedIncumbent,
+    stop,
+    results,
+):
+    begin = perf_counter()
+    try:
+        model = data.to_model(solver_name)
+        model.verbose = 0
+        for name, value in settings.items():
+            setattr(model, name, value)
+        if start:
+            model.start = [(model.vars[j], value) for (j, value) in start]
+        model.incumbent_updater = _Publisher(model, shared, index)
+        model.solver.set_incumbent_source(_Importer(shared, index))
+        model.solver.set_progress_callback(
+            lambda seconds, bound, incumbent, nodes: results.put(
+                ("progress", index, bound)
+            )
+        )
+        model.optimize(cancel_token=_EventToken(stop), **kwargs)
+        solution = Solution.from_model(model, index)
+    except Exception as e:
+        solution = Solution(
+            index,
+            mip.OptimizationStatus.ERROR,
+            error="{}: {}".format(type(e).__name__, e),
+        )
+    solution.time = perf_counter() - begin
+    results.put(("done", index, solution))
+
+
+def optimize_portfolio(
+    model: "mip.Model",
+    configs: Sequence[Dict],
+    workers: Optional[int] = None,
+    solver_name: str = "",
+    grace: float = 5.0,
+    **kwargs
+) -> PortfolioResult:
+    """see :meth:`mip.Model.optimize_portfolio`"""
+    if np is None:
+        raise ModuleNotFoundError(
+            "You need to install package numpy to use optimize_portfolio"
+        )
+    configs = [dict(config) for config in configs]
+    if not configs:
+        raise mip.InvalidParameter("At least one configuration should be informed")
+    for config in configs:
+        for name in config:
+            if name not in SETTINGS:
+                raise mip.InvalidParameter(
+                    "Setting {} cannot be used in portfolios, use one of: {}".format(
+                        name, ", ".join(SETTINGS)
+                    )
+                )
+    workers = min(workers or multiprocessing.cpu_count(), len(configs))
+    begin = perf_counter()
+    base = {name: getattr(model, name) for name in SETTINGS}
+    start = [(var.idx, value) for (var, value) in model.start or []]
+    data = ModelArrays.from_model(model)
+    # CBC reports the bound of maximization problems in the search progress
+    # with different signs, so all processes minimize
+    maximize = data.sense == mip.MAXIMIZE
+    if maximize:
+        data.obj = -data.obj
+        data.objective_const = -data.objective_const
+        data.sense = mip.MINIMIZE
+    max_seconds = kwargs.get("max_seconds", mip.INF)
+
+    ctx = multiprocessing.get_context()
+    shared = _SharedIncumbent(ctx, model.num_cols)
+    stop = ctx.Event()
+    results = ctx.Queue()
+    waiting = deque(range(len(configs)))
+    running = {}
+    solutions = [None] * len(configs)
+    bounds = {}
+    winner = None
+    gap_reached = False
+    stop_time = None
+
+    def best_bound() -> Optional[float]:
+        known = [b for b in bounds.values() if abs(b) < 1e30]
+        if not known:
+            return None
+        return min(max(known), shared.obj.value)
+
+    try:
+        while waiting or running:
+            while waiting and len(running) < workers and not stop.is_set():
+                k = waiting.popleft()
+                running[k] = ctx.Process(
+                    target=_run_config,
+                    args=(
+                        k,
+                        data,
+                        solver_name or model.solver_name,
+                        dict(base, **configs[k]),
+                        start,
+                        kwargs,
+                        shared,
+                        stop,
+                        results,
+                    ),
+                    daemon=True,
+                )
+                running[k].start()
+            if not running:
+                break
+
+            if stop.is_set():
+                if stop_time is None:
+                    stop_time = perf_counter()
+                elif perf_counter() - stop_time > grace:
+                    break
+            elif perf_counter() - begin > max_seconds + grace:
+                stop.set()
+
+            try:
+                kind, k, value = results.get(timeout=0.1)
+            except queue.Empty:
+                for k, process in list(running.items()):
+                    if not process.is_alive() and process.exitcode != 0:
+                        solutions[k] = Solution(
+                            k,
+                            mip.OptimizationStatus.ERROR,
+                            error="Process terminated with exit code {}".format(
+                                process.exitcode
+                            ),
+                        )
+                        del running[k]
+                continue
+
+            if kind == "progress":
+                bounds[k] = value
+            else:
+                solutions[k] = value
+                running.pop(k).join()
+                logger.info(
+                    "Configuration {} finished with status {}".format(k, value.status)
+                )
+                if value.objective_bound is not None:
+                    bounds[k] = value.objective_bound
+                if winner is None and value.status in FINAL_STATUS:
+                    winner = k
+                    stop.set()
+
+            # the best bound of all processes and the best solution are
+            # compared to stop the search as soon as the gap is closed
+            bound, best = best_bound(), shared.obj.value
+            if (
+                winner is None
+                and not stop.is_set()
+                and bound is not None
+                and best < mip.INF
+            ):
+                gap = abs(best - bound)
+                if gap <= model.max_mip_gap_abs or gap <= model.max_mip_gap * abs(best):
+                    gap_reached = True
+                    stop.set()
+    finally:
+        stop.set()
+        for process in running.values():
+            process.join(grace)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        results.close()
+
+    # best solution, the winner may have finished with a solution found by
+    # other configuration
+    found = [s for s in solutions if s is not None and s.x is not None]
+    best = min(found, key=lambda s: s.objective_value, default=None)
+
+    if winner is not None:
+        status = solutions[winner].status
+    elif gap_reached:
+        status = mip.OptimizationStatus.OPTIMAL
+    elif best is not None:
+        status = mip.OptimizationStatus.FEASIBLE
+    elif all(s is None or s.failed for s in solutions):
+        status = mip.OptimizationStatus.ERROR
+    else:
+        status = mip.OptimizationStatus.NO_SOLUTION_FOUND
+    if winner is None and best is not None:
+        winner = shared.owner.value if shared.owner.value >= 0 else best.index
+
+    result = PortfolioResult(
+        -1 if winner is None else winner,
+        status,
+        time=perf_counter() - begin,
+        config=None if winner is None else configs[winner],
+        solutions=solutions,
+    )
+    if best is not None:
+        result.objective_value = best.objective_value
+        result.x = best.x
+        result.num_solutions = sum(s.num_solutions for s in found)
+        bound = best_bound()
+        if solutions[result.index].status in FINAL_STATUS:
+            bound = solutions[result.index].objective_bound
+        result.objective_bound = best.objective_value if bound is None else bound
+    if maximize:
+        for sol in [result] + solutions:
+            if sol is not None and sol.objective_value is not None:
+                sol.objective_value = -sol.objective_value
+            if sol is not None and sol.objective_bound is not None:
+                sol.objective_bound = -sol.objective_bound
+    return result
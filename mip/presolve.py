@@ -0,0 +1,650 @@
+"""Presolve of models stored in numpy arrays, see :class:`~mip.Presolve`"""
+
+import logging
+from typing import Any, List, Optional
+import mip
+from mip.arrays import ModelArrays, _best_bounds
+from mip.batch import Solution
+from mip.cache import PARAMS
+from mip.callbacks import ConstrsGenerator, _original_solution, _add_original_rows
+from mip.propagation import _Activities, _row_limits, _tighten_bounds
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+# attributes of cut generators copied to the generators of presolved models
+GENERATOR_ATTRS = (
+    "root_only",
+    "frequency",
+    "max_seconds",
+    "max_seconds_call",
+    "backoff",
+    "max_backoff",
+)
+
+
+class Presolve:
+    """Presolve of a model, performed in numpy arrays extracted from the
+    solver (see :class:`~mip.ModelArrays`), which produces a smaller model
+    and keeps the information needed to map its solutions back to the
+    original model (postsolve)::
+
+        pre = m.presolve()
+        print(pre.removed_rows, pre.removed_cols)
+        pre.optimize(max_seconds=60)
+        x = pre.solution.x  # indexed by the variables of m
+
+    The following reductions are applied, in several passes, until no
+    reduction is found:
+
+    * fixed variables are removed, moving their contribution to the right
+      hand sides of the constraints and to the objective function constant;
+    * empty constraints are removed, after checking their feasibility;
+    * constraints with a single variable are converted to bounds;
+    * bounds are tightened using the minimum and maximum activities of the
+      constraints, and constraints that cannot be violated are removed;
+    * duplicate constraints, i.e., with proportional coefficients, are
+      merged;
+    * (dual reductions) duplicate variables, with the same coefficients in
+      the constraints and in the objective function and of the same type,
+      are merged, and variables that do not appear in any constraint are
+      fixed at their best bound.
+
+    Dual reductions can remove solutions that are needed when constraints
+    are added later, so that they are disabled by default when the model
+    has a :attr:`~mip.Model.lazy_constrs_generator`. The presolve is
+    valid for any lazy constraint of the original model otherwise: the
+    cuts and lazy constraints generators of the original model are called
+    in the presolved model with a view of the original model, whose
+    variables have the values of the postsolved solution. Rows added to it
+    with :code:`+=` or :meth:`~mip.Model.add_cut` are written in terms of
+    the variables of the presolved model, so that generators written for
+    the original model do not need to be changed. In this view, variables
+    are obtained with :meth:`~mip.Model.translate` or
+    :attr:`~mip.Model.vars`, as in the pre-processed models of CBC.
+
+    Args:
+        model(mip.Model): model to be presolved, which is not changed
+        dual(bool): if dual reductions should be applied, by default only
+            when the model has no lazy constraints generator
+        max_passes(int): maximum number of passes of reductions
+        tol(float): feasibility tolerance
+
+    Attributes:
+        reduced(mip.ModelArrays): data of the presolved model
+        col_map(numpy.ndarray): index, in the original model, of each
+            variable of the presolved model
+        row_map(numpy.ndarray): index, in the original model, of each
+            constraint of the presolved model. Constraints with lower and
+            upper limits produced by merging duplicate constraints are
+            stored as two constraints
+        status(Optional[mip.OptimizationStatus]): INFEASIBLE if the
+            presolve proved that the model is infeasible, None otherwise
+        fixed_cols(int): number of variables fixed
+        merged_cols(int): number of variables merged with duplicates
+        removed_rows(int): number of constraints removed
+        tightened_bounds(int): number of bounds tightened
+        passes(int): number of passes of reductions
+        solution(Optional[mip.Solution]): solution of the last
+            :meth:`optimize`, with values indexed by the variables of the
+            original model
+    """
+
+    def __init__(
+        self,
+        model: "mip.Model",
+        dual: Optional[bool] = None,
+        max_passes: int = 20,
+        tol: float = 1e-9,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use Presolve"
+            )
+        self.original = model
+        self.dual = model.lazy_constrs_generator is None if dual is None else dual
+        self.max_passes = max_passes
+        self.tol = tol
+        self.status = None
+        self.fixed_cols = 0
+        self.merged_cols = 0
+        self.removed_rows = 0
+        self.tightened_bounds = 0
+        self.passes = 0
+        self.solution = None
+        self.__model = None
+        self.__run(ModelArrays.from_model(model, names=True))
+
+    @property
+    def removed_cols(self) -> int:
+        """number of variables removed
+
+        :rtype: int
+        """
+        return self.fixed_cols + self.merged_cols
+
+    @property
+    def model(self) -> "mip.Model":
+        """presolved model, created in the first access with the solver and
+        the settings of the original model
+
+        :rtype: mip.Model
+        """
+        if self.__model is None:
+            self.__model = self.to_model()
+        return self.__model
+
+    def __run(self, data: ModelArrays):
+        n, m = data.num_cols, data.num_rows
+        self.__n, self.__m = n, m
+        self.__data = data
+        self.__lb, self.__ub = data.lb.copy(), data.ub.copy()
+        # solvers may store infinite bounds as the largest float
+        self.__lb[self.__lb <= -1e30] = -mip.INF
+        self.__ub[self.__ub >= 1e30] = mip.INF
+        self.__obj = data.obj
+        self.__int = data.var_type != mip.CONTINUOUS
+        self.__const = data.objective_const
+        self.__col_on = np.ones(n, dtype=bool)
+        self.__fixed = np.full(n, np.nan)
+        self.__merged = np.zeros(n, dtype=bool)
+        # merged variables (j1, j2, lb1, ub1, t), see postsolve
+        self.__merges = []
+
+        # constraints as lower <= a x <= upper
+        self.__rl, self.__ru = _row_limits(data.senses, data.rhs)
+        self.__row_on = np.ones(m, dtype=bool)
+        self.__rows = np.repeat(np.arange(m), np.diff(data.indptr))
+        self.__cols = data.indices.astype(np.int64)
+        self.__vals = data.coefs
+        self.__nz_on = self.__vals != 0.0
+
+        reductions = [self.__fix_columns, self.__small_rows, self.__tighten]
+        if self.dual:
+            reductions.append(self.__empty_columns)
+        duplicates = [self.__duplicate_rows]
+        if self.dual:
+            duplicates.append(self.__duplicate_columns)
+        for _ in range(self.max_passes):
+            self.passes += 1
+            changed = False
+            for reduction in reductions:
+                changed = reduction() or changed
+                if self.status is not None:
+                    break
+            if not changed and self.status is None:
+                for reduction in duplicates:
+                    changed = reduction() or changed
+            if not changed or self.status is not None:
+                break
+        if self.status is None:
+            self.__fix_columns()
+        self.__build()
+        logger.info(
+            "Presolve removed {} rows and {} columns and tightened {} bounds "
+            "in {} passes".format(
+                self.removed_rows, self.removed_cols, self.tightened_bounds, self.passes
+            )
+        )
+
+    def __infeasible(self, reason: str):
+        logger.info("Presolve: model is infeasible, {}".format(reason))
+        self.status = mip.OptimizationStatus.INFEASIBLE
+
+    def __remove_rows(self, rows: "np.ndarray"):
+        """removes the constraints in the boolean mask rows"""
+        self.__row_on[rows] = False
+        self.__nz_on[rows[self.__rows]] = False
+
+    def __fix_columns(self) -> bool:
+        """removes variables whose bounds are equal"""
+        lb, ub = self.__lb, self.__ub
+        fix = self.__col_on & (ub - lb <= self.tol) & np.isfinite(lb)
+        if not fix.any():
+            return False
+        value = np.where(self.__int, np.round(lb), lb)
+        self.__fixed[fix] = value[fix]
+        self.__col_on[fix] = False
+        nz = self.__nz_on & fix[self.__cols]
+        shift = np.bincount(
+            self.__rows[nz],
+            weights=self.__vals[nz] * value[self.__cols[nz]],
+            minlength=self.__m,
+        )
+        self.__rl -= shift
+        self.__ru -= shift
+        self.__nz_on[nz] = False
+        self.__const += float(self.__obj[fix] @ value[fix])
+        self.fixed_cols += int(fix.sum())
+        return True
+
+    def __update_bounds(
+        self, cols: "np.ndarray", lo: "np.ndarray", hi: "np.ndarray", min_change: float
+    ) -> bool:
+        """tightens the bounds of variables cols, which may be repeated,
+        considering changes larger than min_change, relative to the size of
+        the bound"""
+        changed, infeasible = _tighten_bounds(
+            self.__lb, self.__ub, self.__int, cols, lo, hi, min_change, self.tol * 1e3
+        )
+        self.tightened_bounds += changed
+        if infeasible:
+            self.__infeasible("bounds of variables crossed")
+        return changed > 0
+
+    def __small_rows(self) -> bool:
+        """removes empty constraints and converts constraints with a single
+        variable to bounds"""
+        count = np.bincount(self.__rows[self.__nz_on], minlength=self.__m)
+        empty = self.__row_on & (count == 0)
+        changed = False
+        if empty.any():
+            tol = self.tol * 1e3
+            if (self.__rl[empty] > tol).any() or (self.__ru[empty] < -tol).any():
+                self.__infeasible("empty constraint violated")
+                return True
+            self.__remove_rows(empty)
+            self.removed_rows += int(empty.sum())
+            changed = True
+
+        single = self.__row_on & (count == 1)
+        if single.any():
+            nz = self.__nz_on & single[self.__rows]
+            i, j, a = self.__rows[nz], self.__cols[nz], self.__vals[nz]
+            rl, ru = self.__rl[i] / a, self.__ru[i] / a
+            lo, hi = np.where(a > 0, rl, ru), np.where(a > 0, ru, rl)
+            self.__update_bounds(j, lo, hi, 0.0)
+            self.__remove_rows(single)
+            self.removed_rows += int(single.sum())
+            changed = True
+        return changed
+
+    def __tighten(self) -> bool:
+        """tightens bounds using the activities of the constraints and
+        removes constraints that cannot be violated"""
+        nz = self.__nz_on
+        r, c, a = self.__rows[nz], self.__cols[nz], self.__vals[nz]
+        if not len(r):
+            return False
+        act = _Activities(r, c, a, self.__lb, self.__ub, self.__m)
+        min_act, max_act = act.min_act, act.max_act
+
+        rl, ru, row_on = self.__rl, self.__ru, self.__row_on
+        tol = self.tol * 1e3
+        scale_l = np.maximum(1.0, np.abs(np.where(np.isfinite(rl), rl, 0.0)))
+        scale_u = np.maximum(1.0, np.abs(np.where(np.isfinite(ru), ru, 0.0)))
+        violated = (min_act > ru + tol * scale_u) | (max_act < rl - tol * scale_l)
+        if (row_on & violated).any():
+            self.__infeasible("constraint cannot be satisfied")
+            return True
+        # rows are only removed if satisfied without tolerance
+        satisfied = (min_act >= rl - self.tol * scale_l) & (
+            max_act <= ru + self.tol * scale_u
+        )
+        redundant = row_on & satisfied
+        changed = False
+        if redundant.any():
+            self.__remove_rows(redundant)
+            self.removed_rows += int(redundant.sum())
+            changed = True
+
+        cols, new_lb, new_ub = act.implied_bounds(rl, ru, ~redundant[r])
+        return self.__update_bounds(cols, new_lb, new_ub, 1e-6) or changed
+
+    def __empty_columns(self) -> bool:
+        """fixes variables that appear in no constraint at their best bound"""
+        count = np.bincount(self.__cols[self.__nz_on], minlength=self.__n)
+        empty = self.__col_on & (count == 0)
+        if not empty.any():
+            return False
+        lb, ub = self.__lb, self.__ub
+        value = _best_bounds(self.__obj, lb, ub, self.__data.sense)
+        # unbounded variables are kept, the solver reports the status
+        fix = empty & np.isfinite(value)
+        if not fix.any():
+            return False
+        lb[fix] = ub[fix] = value[fix]
+        return self.__fix_columns()
+
+    def __sorted_nz(self, by_col: bool):
+        """active non-zeros sorted by constraint or by variable, with the
+        start of each constraint or variable"""
+        nz = np.flatnonzero(self.__nz_on)
+        r, c = self.__rows[nz], self.__cols[nz]
+        order = np.lexsort((r, c)) if by_col else np.lexsort((c, r))
+        nz = nz[order]
+        key = self.__cols[nz] if by_col else self.__rows[nz]
+        size = self.__n if by_col else self.__m
+        start = np.searchsorted(key, np.arange(size + 1))
+        return nz, start
+
+    def __duplicate_rows(self) -> bool:
+        """merges constraints with proportional coefficients"""
+        nz, start = self.__sorted_nz(False)
+        cols, vals = self.__cols[nz], self.__vals[nz]
+        rl, ru = self.__rl, self.__ru
+        groups = {}
+        for i in np.flatnonzero(self.__row_on & (np.diff(start) >= 2)).tolist():
+            s, e = start[i], start[i + 1]
+            # normalized so that the first coefficient is one
+            scale = vals[s]
+            key = (cols[s:e].tobytes(), np.round(vals[s:e] / scale, 12).tobytes())
+            lo, hi = rl[i] / scale, ru[i] / scale
+            if scale < 0:
+                lo, hi = hi, lo
+            if key in groups:
+                groups[key][1].append(i)
+                groups[key][2] = max(groups[key][2], lo)
+                groups[key][3] = min(groups[key][3], hi)
+            else:
+                groups[key] = [i, [], lo, hi, scale]
+        removed = np.zeros(self.__m, dtype=bool)
+        for (first, others, lo, hi, scale) in groups.values():
+            if not others:
+                continue
+            if lo > hi + self.tol * 1e3 * max(1.0, abs(lo)):
+                self.__infeasible("duplicate constraints cannot be satisfied")
+                return True
+            hi = max(hi, lo)
+            rl[first], ru[first] = (lo * scale, hi * scale) if scale > 0 else (
+                hi * scale,
+                lo * scale,
+            )
+            removed[others] = True
+        if not removed.any():
+            return False
+        self.__remove_rows(removed)
+        self.removed_rows += int(removed.sum())
+        return True
+
+    def __duplicate_columns(self) -> bool:
+        """merges variables with the same coefficients in the constraints and
+        in the objective function"""
+        nz, start = self.__sorted_nz(True)
+        rows, vals = self.__rows[nz], self.__vals[nz]
+        lb, ub, obj, ints = self.__lb, self.__ub, self.__obj, self.__int
+        groups = {}
+        merged = np.zeros(self.__n, dtype=bool)
+        for j in np.flatnonzero(self.__col_on & (np.diff(start) >= 1)).tolist():
+            s, e = start[j], start[j + 1]
+            key = (rows[s:e].tobytes(), vals[s:e].tobytes(), obj[j], bool(ints[j]))
+            first = groups.setdefault(key, j)
+            if first == j:
+                continue
+            # value of j is kept in a feasible value t when possible
+            t = lb[j] if np.isfinite(lb[j]) else ub[j] if np.isfinite(ub[j]) else 0.0
+            self.__merges.append((first, j, lb[first], ub[first], t))
+            lb[first] += lb[j]
+            ub[first] += ub[j]
+            merged[j] = True
+            self.__merged[[first, j]] = True
+        if not merged.any():
+            return False
+        self.__col_on[merged] = False
+        self.__nz_on[merged[self.__cols]] = False
+        self.merged_cols += int(merged.sum())
+        return True
+
+    def __build(self):
+        """builds the arrays of the presolved model"""
+        data = self.__data
+        self.col_map = np.flatnonzero(self.__col_on)
+        new_idx = np.full(self.__n, -1, dtype=np.int64)
+        new_idx[self.col_map] = np.arange(len(self.col_map))
+        self.__new_idx = new_idx
+
+        # each constraint is written as one or two constraints
+        rl, ru = self.__rl, self.__ru
+        rows = np.flatnonzero(self.__row_on)
+        lower, upper = np.isfinite(rl[rows]), np.isfinite(ru[rows])
+        equal = lower & upper & (rl[rows] == ru[rows])
+        parts = [
+            (rows[equal], mip.EQUAL, rl),
+            (rows[lower & ~equal], mip.GREATER_OR_EQUAL, rl),
+            (rows[upper & ~equal], mip.LESS_OR_EQUAL, ru),
+        ]
+        row_map = np.concatenate([p[0] for p in parts])
+        order = np.argsort(row_map, kind="stable")
+        self.row_map = row_map[order]
+        senses = np.concatenate([[p[1]] * len(p[0]) for p in parts])[order]
+        rhs = np.concatenate([p[2][p[0]] for p in parts])[order]
+
+        nz, start = self.__sorted_nz(False)
+        size = np.diff(start)[self.row_map]
+        indptr = np.zeros(len(self.row_map) + 1, dtype=np.int64)
+        np.cumsum(size, out=indptr[1:])
+        take = np.repeat(start[self.row_map] - indptr[:-1], size) + np.arange(indptr[-1])
+        cols = new_idx[self.__cols[nz[take]]]
+        coefs = self.__vals[nz[take]]
+
+        keep = self.col_map
+        # merged binary variables may have larger bounds
+        var_type = data.var_type[keep].copy()
+        lb, ub = self.__lb[keep], self.__ub[keep]
+        var_type[(var_type == mip.BINARY) & ((lb != 0.0) | (ub != 1.0))] = mip.INTEGER
+        names = data.constr_names
+        self.reduced = ModelArrays(
+            self.__obj[keep],
+            lb,
+            ub,
+            var_type,
+            indptr,
+            cols,
+            coefs,
+            senses.astype("U1"),
+            rhs,
+            data.sense,
+            self.__const,
+            data.name,
+            [data.var_names[j] for j in keep.tolist()],
+            [names[i] for i in self.row_map.tolist()] if names else None,
+        )
+        self.removed_rows = self.__m - len(np.unique(self.row_map))
+
+    def postsolve(self, x) -> "np.ndarray":
+        """Values of the variables of the original model for a solution of
+        the presolved model
+
+        Args:
+            x: values of the variables of the presolved model
+
+        :rtype: numpy.ndarray
+        """
+        result = self.__fixed.copy()
+        result[self.col_map] = x
+        for (j1, j2, lb1, ub1, t) in reversed(self.__merges):
+            value = result[j1]
+            result[j1] = min(max(value - t, lb1), ub1)
+            result[j2] = value - result[j1]
+        return result
+
+    def translate(self, indptr, indices, coefs, senses, rhs):
+        """Writes constraints of the original model, in the compressed sparse
+        row format, in terms of the variables of the presolved model, moving
+        the contribution of fixed variables to the right hand side. Returns
+        the arrays :code:`(indptr, indices, coefs, senses, rhs)` of the
+        translated constraints. Constraints with variables merged in dual
+        reductions cannot be translated.
+
+        :rtype: Tuple[numpy.ndarray, ...]
+        """
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        coefs = np.asarray(coefs, dtype=np.float64)
+        if self.__merged[indices].any():
+            raise mip.ProgrammingError(
+                "Constraints with variables merged in the presolve cannot be "
+                "translated, use dual=False"
+            )
+        nrows = len(indptr) - 1
+        rows = np.repeat(np.arange(nrows), np.diff(indptr))
+        fixed = ~self.__col_on[indices]
+        shift = np.bincount(
+            rows[fixed],
+            weights=coefs[fixed] * self.__fixed[indices[fixed]],
+            minlength=nrows,
+        )
+        kept = ~fixed
+        new_indptr = np.zeros(nrows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[kept], minlength=nrows), out=new_indptr[1:])
+        return (
+            new_indptr,
+            self.__new_idx[indices[kept]],
+            coefs[kept],
+            np.asarray(senses),
+            np.asarray(rhs, dtype=np.float64) - shift,
+        )
+
+    def to_model(self, solver_name: str = "") -> "mip.Model":
+        """Creates the presolved model, with the settings of the original
+        model. Its cuts and lazy constraints generators receive a view of
+        the original model, see above.
+
+        Args:
+            solver_name(str): solver of the new model, by default the solver
+                of the original model
+
+        :rtype: mip.Model
+        """
+        original = self.original
+        model = self.reduced.to_model(solver_name or original.solver_name)
+        model.verbose = original.verbose
+        for name in PARAMS:
+            setattr(model, name, getattr(original, name))
+        if original.cuts_generator is not None:
+            model.cuts_generator = _PresolvedGenerator(self, original.cuts_generator)
+        if original.lazy_constrs_generator is not None:
+            model.lazy_constrs_generator = _PresolvedGenerator(
+                self, original.lazy_constrs_generator
+            )
+        return model
+
+    def optimize(self, **kwargs) -> mip.OptimizationStatus:
+        """Optimizes the presolved model (see :attr:`model`) and stores its
+        solution, mapped to the variables of the original model, in
+        :attr:`solution`. If the presolve proved that the model is
+        infeasible, returns INFEASIBLE without calling the solver.
+
+        Arguments are passed to :meth:`~mip.Model.optimize`.
+
+        :rtype: mip.OptimizationStatus
+        """
+        if self.status is not None:
+            self.solution = Solution(status=self.status)
+            return self.status
+        model = self.model
+        status = model.optimize(**kwargs)
+        self.solution = Solution.from_model(model)
+        if self.solution.x is not None:
+            x = self.postsolve(self.solution.x)
+            data = self.__data
+            self.solution.x = x
+            self.solution.objective_value = float(
+                data.obj @ x + data.objective_const
+            )
+        return status
+
+
+class _PresolvedGenerator(ConstrsGenerator):
+    """calls a generator of the original model in the presolved model"""
+
+    def __init__(self, presolve: Presolve, generator: ConstrsGenerator):
+        super().__init__()
+        self.presolve = presolve
+        self.generator = generator
+        for name in GENERATOR_ATTRS:
+            setattr(self, name, getattr(generator, name))
+
+    def generate_constrs(self, model: "mip.Model"):
+        x, pre_col_idx = _original_solution(model)
+        view = _OriginalModel(self.presolve, model, x, pre_col_idx)
+        self.generator.generate_constrs(view)
+
+
+class _ViewSolver:
+    """solver of the original model with the values of a postsolved
+    solution"""
+
+    def __init__(self, solver: "mip.Solver", x: "np.ndarray"):
+        self.__solver = solver
+        self.__x = x
+
+    def var_get_x(self, var: "mip.Var") -> float:
+        return float(self.__x[var.idx])
+
+    def __getattr__(self, name: str):
+        return getattr(self.__solver, name)
+
+
+class _OriginalModel:
+    """view of the original model in the callbacks of the presolved model,
+    other attributes are read from the callback model"""
+
+    def __init__(self, presolve: Presolve, cb_model: "mip.Model", x, pre_col_idx):
+        self.__presolve = presolve
+        self.__cb_model = cb_model
+        self.__pre_col_idx = pre_col_idx
+        self.solver = _ViewSolver(presolve.original.solver, presolve.postsolve(x))
+        self.__vars = None
+
+    @property
+    def vars(self) -> List["mip.Var"]:
+        if self.__vars is None:
+            self.__vars = [mip.Var(self, j) for j in range(self.num_cols)]
+        return self.__vars
+
+    @property
+    def num_cols(self) -> int:
+        return self.__presolve.original.num_cols
+
+    def translate(self, ref) -> Any:
+        if isinstance(ref, mip.Var):
+            return self.vars[ref.idx]
+        if isinstance(ref, list):
+            return [self.translate(el) for el in ref]
+        if isinstance(ref, dict):
+            return {key: self.translate(value) for (key, value) in ref.items()}
+        return ref
+
+    def var_by_name(self, name: str) -> Optional["mip.Var"]:
+        var = self.__presolve.original.var_by_name(name)
+        return None if var is None else self.vars[var.idx]
+
+    def __add(self, exprs: List["mip.LinExpr"], lazy: bool) -> int:
+        indptr, indices, coefs, senses, rhs = [0], [], [], [], []
+        for expr in exprs:
+            for (var, coef) in expr.expr.items():
+                indices.append(var.idx)
+                coefs.append(coef)
+            indptr.append(len(indices))
+            senses.append(expr.sense)
+            rhs.append(-expr.const)
+        rows = self.__presolve.translate(indptr, indices, coefs, senses, rhs)
+        return _add_original_rows(self.__cb_model, self.__pre_col_idx, *rows, lazy)
+
+    def __iadd__(self, other) -> "_OriginalModel":
+        if isinstance(other, tuple):
+            other = other[0]
+        self.add_constr(other)
+        return self
+
+    def add_constr(self, lin_expr: "mip.LinExpr", name: str = ""):
+        self.__add([lin_expr], not getattr(self.__cb_model, "fractional", True))
+
+    def add_cut(self, cut: "mip.LinExpr"):
+        self.__add([cut], False)
+
+    def add_lazy_constr(self, expr: "mip.LinExpr"):
+        self.__add([expr], True)
+
+    def add_cuts(self, cuts) -> int:
+        cuts = cuts.cuts if isinstance(cuts, mip.CutPool) else list(cuts)
+        return self.__add(cuts, False) if cuts else 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.__cb_model, name)
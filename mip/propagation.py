@@ -0,0 +1,351 @@
+"""Feasibility-based bound propagation over the constraint matrix, see
+:class:`~mip.BoundPropagation`"""
+
+import logging
+from typing import Tuple
+import mip
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+
+class _Activities:
+    """minimum and maximum activities of constraints stored as lists of
+    terms (row, column, coefficient). Activities are split in the sum of
+    the finite contributions and the number of infinite contributions, so
+    that the activity of a constraint without each of its terms can be
+    computed without cancellation"""
+
+    def __init__(self, rows, cols, coefs, lb, ub, num_rows: int):
+        self.rows, self.cols, self.coefs = rows, cols, coefs
+        pos = coefs > 0
+        lo = np.where(pos, coefs * lb[cols], coefs * ub[cols])
+        hi = np.where(pos, coefs * ub[cols], coefs * lb[cols])
+        self.lo_inf, self.hi_inf = np.isinf(lo), np.isinf(hi)
+        self.lo = np.where(self.lo_inf, 0.0, lo)
+        self.hi = np.where(self.hi_inf, 0.0, hi)
+        self.min_fin = np.bincount(rows, weights=self.lo, minlength=num_rows)
+        self.max_fin = np.bincount(rows, weights=self.hi, minlength=num_rows)
+        self.min_inf = np.bincount(rows, weights=self.lo_inf, minlength=num_rows)
+        self.max_inf = np.bincount(rows, weights=self.hi_inf, minlength=num_rows)
+        self.min_act = np.where(self.min_inf > 0, -mip.INF, self.min_fin)
+        self.max_act = np.where(self.max_inf > 0, mip.INF, self.max_fin)
+
+    def implied_bounds(self, rl, ru, terms=None):
+        """bounds of the variable of each term implied by the limits
+        rl <= a x <= ru of its constraint and by the bounds of the other
+        variables, returns the columns of the terms and their implied lower
+        and upper bounds. Bounds with huge values are discarded, since they
+        are numerically unsafe."""
+        r, c, a = self.rows, self.cols, self.coefs
+        lo, hi, lo_inf, hi_inf = self.lo, self.hi, self.lo_inf, self.hi_inf
+        if terms is not None:
+            r, c, a = r[terms], c[terms], a[terms]
+            lo, hi, lo_inf, hi_inf = lo[terms], hi[terms], lo_inf[terms], hi_inf[terms]
+        min_inf, max_inf = self.min_inf[r], self.max_inf[r]
+        res_min = np.where(
+            lo_inf,
+            np.where(min_inf == 1, self.min_fin[r], -mip.INF),
+            np.where(min_inf == 0, self.min_fin[r] - lo, -mip.INF),
+        )
+        res_max = np.where(
+            hi_inf,
+            np.where(max_inf == 1, self.max_fin[r], mip.INF),
+            np.where(max_inf == 0, self.max_fin[r] - hi, mip.INF),
+        )
+        with np.errstate(invalid="ignore"):
+            upper = (ru[r] - res_min) / a
+            lower = (rl[r] - res_max) / a
+        new_lb = np.where(a > 0, lower, upper)
+        new_ub = np.where(a > 0, upper, lower)
+        new_lb[~(np.abs(new_lb) < 1e9)] = -mip.INF
+        new_ub[~(np.abs(new_ub) < 1e9)] = mip.INF
+        return c, new_lb, new_ub
+
+
+def _row_limits(senses, rhs) -> Tuple["np.ndarray", "np.ndarray"]:
+    """constraints as lower <= a x <= upper"""
+    rl = np.where(senses == mip.LESS_OR_EQUAL, -mip.INF, rhs).astype(np.float64)
+    ru = np.where(senses == mip.GREATER_OR_EQUAL, mip.INF, rhs).astype(np.float64)
+    return rl, ru
+
+
+def _tighten_bounds(
+    lb, ub, is_int, cols, lo, hi, min_change: float, tol: float
+) -> Tuple[int, bool]:
+    """tightens, in place, the bounds of variables cols, which may be
+    repeated, considering changes larger than min_change, relative to the
+    size of the bound. Bounds of integer variables are rounded. Returns the
+    number of bounds changed and if bounds crossed by more than tol, which
+    proves infeasibility. Bounds that cross by less than tol are made
+    equal."""
+    new_lb, new_ub = lb.copy(), ub.copy()
+    np.maximum.at(new_lb, cols, lo)
+    np.minimum.at(new_ub, cols, hi)
+    new_lb[is_int] = np.ceil(new_lb[is_int] - 1e-6)
+    new_ub[is_int] = np.floor(new_ub[is_int] + 1e-6)
+    scale_lb = np.maximum(1.0, np.abs(np.where(np.isfinite(lb), lb, 0.0)))
+    scale_ub = np.maximum(1.0, np.abs(np.where(np.isfinite(ub), ub, 0.0)))
+    better_lb = new_lb > lb + min_change * scale_lb
+    better_ub = new_ub < ub - min_change * scale_ub
+    if not (better_lb.any() or better_ub.any()):
+        return 0, False
+    lb[better_lb] = new_lb[better_lb]
+    ub[better_ub] = new_ub[better_ub]
+    infeasible = False
+    crossed = lb > ub
+    if crossed.any():
+        scale = np.maximum(1.0, np.abs(lb[crossed]))
+        infeasible = bool((lb[crossed] - ub[crossed] > tol * scale).any())
+        ub[crossed] = lb[crossed]
+    return int(better_lb.sum() + better_ub.sum()), infeasible
+
+
+class BoundPropagation:
+    """Feasibility-based bound tightening (FBBT): bounds of the variables
+    are tightened using the minimum and maximum activities of the
+    constraints, computed for all constraints at once over the constraint
+    matrix in the compressed sparse row format, for several rounds, until
+    no bound changes::
+
+        prop = m.propagate_bounds(max_rounds=20)
+        print(prop.tightened_bounds, prop.coefs_reduced)
+
+    After the propagation, coefficients of binary variables that are larger
+    than needed in constraints :math:`a x \\leq b` or :math:`a x \\geq b`,
+    such as the big-M in :math:`x \\leq M y`, are detected: if the
+    constraint cannot be violated when the binary variable is at one of its
+    bounds, its coefficient (and possibly the right hand side) can be
+    reduced without removing integer solutions, which tightens the linear
+    programming relaxation. With the bounds obtained in the propagation,
+    :math:`x \\leq M y` becomes :math:`x \\leq u y`, where :math:`u` is the
+    upper bound of :math:`x`. These constraints are available in
+    :meth:`rows`.
+
+    Outside callbacks, :meth:`apply` changes the bounds of the model. Since
+    the solver engine cannot change coefficients of existing constraints,
+    strengthened constraints are not changed. In a cuts generator, the
+    propagation uses the bounds of the current node and :meth:`apply` adds
+    the tightened bounds and the strengthened constraints as cuts, which are
+    only valid for all nodes at the root node, so that it should be used in
+    generators with :attr:`~mip.ConstrsGenerator.root_only` set.
+
+    Args:
+        model(mip.Model): model, or the model of a cuts generator
+        max_rounds(int): maximum number of rounds of propagation
+        min_change(float): minimum change, relative to the size of the bound,
+            for a bound to be updated
+        tol(float): feasibility tolerance
+
+    Attributes:
+        lb(numpy.ndarray): tightened lower bounds of the variables
+        ub(numpy.ndarray): tightened upper bounds of the variables
+        status(Optional[mip.OptimizationStatus]): INFEASIBLE if the
+            propagation proved that the model is infeasible, None otherwise
+        tightened_bounds(int): number of bound changes in the propagation
+        rounds(int): number of rounds of propagation
+        coefs_reduced(int): number of coefficients that can be reduced
+        strengthened(numpy.ndarray): indexes of the constraints with
+            coefficients that can be reduced
+    """
+
+    def __init__(
+        self,
+        model: "mip.Model",
+        max_rounds: int = 10,
+        min_change: float = 1e-6,
+        tol: float = 1e-6,
+    ):
+        if np is None:
+            raise ModuleNotFoundError(
+                "You need to install package numpy to use BoundPropagation"
+            )
+        self.max_rounds = max_rounds
+        self.min_change = min_change
+        self.tol = tol
+        self.status = None
+        self.tightened_bounds = 0
+        self.rounds = 0
+
+        _, lb, ub, var_type, indptr, indices, coefs, senses, rhs = (
+            model.solver.get_arrays()
+        )
+        ctx = getattr(model, "context", None)
+        if ctx is not None:
+            lb, ub = ctx.lb, ctx.ub
+        self.__lb0 = np.array(lb, dtype=np.float64)
+        self.__ub0 = np.array(ub, dtype=np.float64)
+        # solvers may store infinite bounds as the largest float
+        self.__lb0[self.__lb0 <= -1e30] = -mip.INF
+        self.__ub0[self.__ub0 >= 1e30] = mip.INF
+        self.lb, self.ub = self.__lb0.copy(), self.__ub0.copy()
+        self.__int = np.asarray(var_type) != mip.CONTINUOUS
+
+        indptr = np.asarray(indptr, dtype=np.int64)
+        self.__m = len(indptr) - 1
+        self.__rows = np.repeat(np.arange(self.__m), np.diff(indptr))
+        self.__cols = np.asarray(indices, dtype=np.int64)
+        self.__coefs = np.asarray(coefs, dtype=np.float64)
+        self.__rl, self.__ru = _row_limits(np.asarray(senses), np.asarray(rhs))
+        self.__propagate()
+        self.__reduce_coefs()
+
+    def __propagate(self):
+        lb, ub, nz = self.lb, self.ub, self.__coefs != 0.0
+        rl, ru = self.__rl, self.__ru
+        scale_l = np.maximum(1.0, np.abs(np.where(np.isfinite(rl), rl, 0.0)))
+        scale_u = np.maximum(1.0, np.abs(np.where(np.isfinite(ru), ru, 0.0)))
+        for _ in range(self.max_rounds):
+            self.rounds += 1
+            act = _Activities(
+                self.__rows[nz], self.__cols[nz], self.__coefs[nz], lb, ub, self.__m
+            )
+            violated = (act.min_act > ru + self.tol * scale_u) | (
+                act.max_act < rl - self.tol * scale_l
+            )
+            if violated.any():
+                self.__infeasible("constraint cannot be satisfied")
+                return
+            # constraints that cannot be violated do not imply bounds
+            redundant = (act.min_act >= rl) & (act.max_act <= ru)
+            terms = ~redundant[act.rows]
+            nz[np.flatnonzero(nz)[~terms]] = False
+            cols, new_lb, new_ub = act.implied_bounds(rl, ru, terms)
+            changed, infeasible = _tighten_bounds(
+                lb, ub, self.__int, cols, new_lb, new_ub, self.min_change, self.tol
+            )
+            self.tightened_bounds += changed
+            if infeasible:
+                self.__infeasible("bounds of variables crossed")
+                return
+            if not changed:
+                return
+
+    def __infeasible(self, reason: str):
+        logger.info("Bound propagation: model is infeasible, {}".format(reason))
+        self.status = mip.OptimizationStatus.INFEASIBLE
+
+    def __reduce_coefs(self):
+        """reduces coefficients of binary variables in constraints with one
+        finite limit, written as a x <= b. If the constraint is satisfied by
+        any solution with the binary variable at zero (coefficient a_j > 0)
+        or at one (a_j < 0), a_j and b are reduced by d, the difference
+        between b and the maximum activity with the variable at this bound.
+        Since b minus the maximum activity does not change with these
+        reductions, all coefficients of a constraint can be reduced at
+        once."""
+        self.coefs_reduced = 0
+        self.strengthened = np.zeros(0, dtype=np.int64)
+        self.__new_coefs = self.__coefs.copy()
+        self.__new_rhs = np.zeros(0)
+        if self.status is not None or not len(self.__coefs):
+            return
+        lb, ub = self.lb, self.ub
+        rl, ru = self.__rl, self.__ru
+        upper = np.isfinite(ru) & ~np.isfinite(rl)
+        lower = np.isfinite(rl) & ~np.isfinite(ru)
+        # constraints a x >= b are written as -a x <= -b
+        sign = np.where(lower, -1.0, 1.0)
+        b = np.where(lower, -rl, ru)
+        t = np.flatnonzero(self.__coefs != 0.0)
+        r, c = self.__rows[t], self.__cols[t]
+        a = self.__coefs[t] * sign[r]
+        act = _Activities(r, c, a, lb, ub, self.__m)
+        binary = self.__int & (lb == 0.0) & (ub == 1.0)
+        slack = b - act.max_act
+        scale = np.maximum(1.0, np.abs(b))
+        ok = (upper | lower) & (act.max_inf == 0) & (slack < -self.tol * scale)
+        # a_j > 0: d = b - (max_act - a_j), a_j < 0: d = b - (max_act + a_j)
+        d = slack[r] + np.abs(a)
+        reduce = ok[r] & binary[c] & (d > self.tol * scale[r])
+        if not reduce.any():
+            return
+        d[~reduce] = 0.0
+        pos = a > 0
+        shift = np.bincount(r[pos], weights=d[pos], minlength=self.__m)
+        self.__new_coefs[t] = (a - np.sign(a) * d) * sign[r]
+        self.__new_rhs = (b - shift) * sign
+        self.strengthened = np.unique(r[reduce])
+        self.coefs_reduced = int(reduce.sum())
+
+    def rows(self) -> Tuple["np.ndarray", ...]:
+        """Strengthened versions of the constraints :attr:`strengthened`,
+        with reduced coefficients, in the compressed sparse row format.
+        Returns the arrays :code:`(indptr, indices, coefs, senses, rhs)`.
+
+        :rtype: Tuple[numpy.ndarray, ...]
+        """
+        rows = self.strengthened
+        terms = np.isin(self.__rows, rows) & (self.__new_coefs != 0.0)
+        count = np.bincount(self.__rows[terms], minlength=self.__m)[rows]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(count, out=indptr[1:])
+        senses = np.where(
+            np.isfinite(self.__ru[rows]), mip.LESS_OR_EQUAL, mip.GREATER_OR_EQUAL
+        )
+        rhs = self.__new_rhs[rows] if len(rows) else np.zeros(0)
+        return indptr, self.__cols[terms], self.__new_coefs[terms], senses, rhs
+
+    def changed(self) -> "np.ndarray":
+        """indexes of the variables with tightened bounds
+
+        :rtype: numpy.ndarray
+        """
+        return np.flatnonzero((self.lb > self.__lb0) | (self.ub < self.__ub0))
+
+    def apply(self, model: "mip.Model") -> int:
+        """Changes the bounds of the variables of the model to the tightened
+        bounds or, in a cuts generator, adds the tightened bounds and the
+        strengthened constraints that are violated by the current solution
+        as cuts. Nothing is changed if the model is infeasible. Returns the
+        number of bounds changed or of cuts added.
+
+        Args:
+            model(mip.Model): model used in the propagation
+
+        :rtype: int
+        """
+        if self.status is not None:
+            return 0
+        idx = self.changed()
+        if not hasattr(model, "add_cuts_csr"):
+            if len(idx):
+                model.set_bounds(self.lb[idx], self.ub[idx], idx)
+            return len(idx)
+
+        lower = idx[self.lb[idx] > self.__lb0[idx]]
+        upper = idx[self.ub[idx] < self.__ub0[idx]]
+        nb = len(lower) + len(upper)
+        indptr, indices, coefs, senses, rhs = self.rows()
+        return model.add_cuts_csr(
+            np.concatenate((np.arange(nb), indptr + nb)),
+            np.concatenate((lower, upper, indices)),
+            np.concatenate((np.ones(nb), coefs)),
+            np.concatenate(
+                (
+                    np.full(len(lower), mip.GREATER_OR_EQUAL),
+                    np.full(len(upper), mip.LESS_OR_EQUAL),
+                    senses,
+                )
+            ),
+            np.concatenate((self.lb[lower], self.ub[upper], rhs)),
+        )
+
+
+def propagate_bounds(
+    model: "mip.Model", max_rounds: int = 10, apply: bool = True
+) -> BoundPropagation:
+    """Implementation of :meth:`~mip.Model.propagate_bounds`"""
+    prop = BoundPropagation(model, max_rounds)
+    if apply:
+        prop.apply(model)
+    logger.info(
+        "Bound propagation tightened {} bounds in {} rounds, {} coefficients "
+        "can be reduced".format(prop.tightened_bounds, prop.rounds, prop.coefs_reduced)
+    )
+    return prop
@@ -1,7 +1,7 @@
 """This module implements the solver intependent communication layer of
 Python-MIP
 """
-from typing import List, Tuple, Optional, Union
+from typing import Callable, List, Tuple, Optional, Union
 from sys import maxsize
 import numbers
 import mip
@@ -32,9 +32,43 @@ class Solver:
     ):
         pass
 
+    def add_vars_csc(
+        self: "Solver",
+        obj,
+        lb,
+        ub,
+        var_type: str,
+        indptr,
+        indices,
+        coefs,
+        names: List[str],
+    ):
+        constrs = self.model.constrs
+        for k in range(len(obj)):
+            st, ed = int(indptr[k]), int(indptr[k + 1])
+            column = mip.Column(
+                [constrs[int(i)] for i in indices[st:ed]],
+                [float(a) for a in coefs[st:ed]],
+            )
+            self.add_var(obj[k], lb[k], ub[k], var_type, column, names[k])
+
     def add_constr(self: "Solver", lin_expr: "mip.LinExpr", name: str = ""):
         pass
 
+    def add_constrs_csr(
+        self: "Solver", indptr, indices, coefs, senses, rhs, names: List[str],
+    ):
+        mvars = self.model.vars
+        for k in range(len(rhs)):
+            st, ed = int(indptr[k]), int(indptr[k + 1])
+            lin_expr = mip.LinExpr(
+                [mvars[int(j)] for j in indices[st:ed]],
+                [float(a) for a in coefs[st:ed]],
+                const=-float(rhs[k]),
+                sense=str(senses[k]),
+            )
+            self.add_constr(lin_expr, names[k])
+
     def add_lazy_constr(self: "Solver", lin_expr: "mip.LinExpr"):
         pass
 
@@ -77,6 +111,9 @@ class Solver:
     ) -> List[Tuple[numbers.Real, Tuple[numbers.Real, numbers.Real]]]:
         return []
 
+    def get_lp_log(self: "Solver") -> List["mip.LPSolveInfo"]:
+        return []
+
     def get_objective_value_i(self: "Solver", i: int) -> numbers.Real:
         pass
 
@@ -106,6 +143,50 @@ class Solver:
     ):
         pass
 
+    def set_stall_limits(
+        self: "Solver",
+        max_seconds_same_incumbent: numbers.Real = mip.INF,
+        max_nodes_same_incumbent: int = maxsize,
+        min_gap_improvement_rate: numbers.Real = 0.0,
+    ):
+        pass
+
+    def set_cancel_token(self: "Solver", token: Optional["mip.CancelToken"]):
+        pass
+
+    def set_branch_priorities(
+        self: "Solver",
+        priorities: Optional[List[int]],
+        directions: Optional[List[int]] = None,
+    ):
+        pass
+
+    def interrupt(self: "Solver"):
+        pass
+
+    def set_progress_callback(
+        self: "Solver",
+        callback: Optional[Callable[[float, float, Optional[float], int], None]],
+    ):
+        pass
+
+    def set_incumbent_source(
+        self: "Solver",
+        source: Optional[Callable[[], Optional[Tuple[float, List[float]]]]],
+    ):
+        pass
+
+    def set_solution(
+        self: "Solver",
+        x: Optional[List[float]],
+        objective_value: Optional[float],
+        objective_bound: Optional[float],
+        slack: Optional[List[float]] = None,
+    ):
+        """stores a solution computed outside the solver, e.g., by optimizing
+        independent blocks of the model"""
+        raise NotImplementedError("Solution cannot be informed to this solver")
+
     def get_max_seconds(self: "Solver") -> numbers.Real:
         pass
 
@@ -151,6 +232,30 @@ class Solver:
     def num_int(self: "Solver") -> int:
         pass
 
+    def get_arrays(self: "Solver") -> Tuple[list, ...]:
+        """objective function coefficients, bounds and types of the
+        variables, and constraint matrix in CSR format with the senses and
+        right hand sides of the constraints"""
+        model = self.model
+        mvars = model.vars
+        obj = [0.0] * len(mvars)
+        for var, coef in model.objective.expr.items():
+            obj[var.idx] = coef
+        lb = [v.lb for v in mvars]
+        ub = [v.ub for v in mvars]
+        var_type = [v.var_type for v in mvars]
+
+        indptr, indices, coefs, senses, rhs = [0], [], [], [], []
+        for constr in model.constrs:
+            expr = constr.expr
+            for var, coef in expr.expr.items():
+                indices.append(var.idx)
+                coefs.append(coef)
+            indptr.append(len(indices))
+            senses.append(expr.sense)
+            rhs.append(-expr.const)
+        return obj, lb, ub, var_type, indptr, indices, coefs, senses, rhs
+
     def get_emphasis(self: "Solver") -> mip.SearchEmphasis:
         pass
 
@@ -197,12 +302,22 @@ class Solver:
     def constr_set_rhs(self: "Solver", idx: int, rhs: numbers.Real):
         pass
 
+    def set_rhs(self: "Solver", idx: List[int], rhs: List[numbers.Real]):
+        for i, value in zip(idx, rhs):
+            self.constr_set_rhs(i, value)
+
     def constr_get_name(self: "Solver", idx: int) -> str:
         pass
 
     def constr_get_pi(self: "Solver", constr: "mip.Constr") -> numbers.Real:
         pass
 
+    def get_pi(self: "Solver") -> Optional[List[numbers.Real]]:
+        constrs = self.model.constrs
+        if not len(constrs) or constrs[0].pi is None:
+            return None
+        return [constr.pi for constr in constrs]
+
     def constr_get_slack(self: "Solver", constr: "mip.Constr") -> numbers.Real:
         pass
 
@@ -226,12 +341,31 @@ class Solver:
     def var_set_ub(self: "Solver", var: "mip.Var", value: numbers.Real):
         pass
 
+    def set_bounds(
+        self: "Solver",
+        idx: List[int],
+        lb: Optional[List[numbers.Real]],
+        ub: Optional[List[numbers.Real]],
+    ):
+        model_vars = self.model.vars
+        if lb is not None:
+            for i, value in zip(idx, lb):
+                self.var_set_lb(model_vars[i], value)
+        if ub is not None:
+            for i, value in zip(idx, ub):
+                self.var_set_ub(model_vars[i], value)
+
     def var_get_obj(self: "Solver", var: "mip.Var") -> numbers.Real:
         pass
 
     def var_set_obj(self: "Solver", var: "mip.Var", value: numbers.Real):
         pass
 
+    def set_obj(self: "Solver", idx: List[int], obj: List[numbers.Real]):
+        model_vars = self.model.vars
+        for i, value in zip(idx, obj):
+            self.var_set_obj(model_vars[i], value)
+
     def var_get_var_type(self: "Solver", var: "mip.Var") -> str:
         pass
 
@@ -251,6 +385,11 @@ class Solver:
         """Assumes that the solution is available (should be checked
            before calling it"""
 
+    def get_x(self: "Solver") -> Optional[List[numbers.Real]]:
+        if not self.model.num_solutions:
+            return None
+        return [self.var_get_x(var) for var in self.model.vars]
+
     def var_get_xi(self: "Solver", var: "mip.Var", i: int) -> numbers.Real:
         pass
 
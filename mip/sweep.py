@@ -0,0 +1,295 @@
+"""Optimization of a model for many scenarios of right hand sides, objective
+function coefficients and variable bounds, see :meth:`~mip.Model.sweep`"""
+
+import logging
+import multiprocessing
+from time import perf_counter
+from typing import List, Optional, Tuple
+import mip
+from mip.arrays import ModelArrays
+from mip.batch import Solution
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    logger.debug("Numpy not available", exc_info=True)
+
+
+class SweepResult:
+    """Results of :meth:`~mip.Model.sweep`, stacked in arrays whose first
+    dimension is the scenario::
+
+        res = m.sweep(rhs_matrix=demands, rhs_idx=demand_rows)
+        print(res.objective_value.mean(), res.x[:, 0].max())
+
+    :code:`res[k]` returns the :class:`~mip.Solution` of scenario
+    :code:`k`.
+
+    Attributes:
+        status(List[mip.OptimizationStatus]): optimization status of each
+            scenario
+        objective_value(numpy.ndarray): cost of the best solution of each
+            scenario, NaN if no solution was found
+        objective_bound(numpy.ndarray): bound of the objective function in
+            each scenario, NaN if not available
+        x(numpy.ndarray): values of the variables, with one row per scenario,
+            indexed by variable index, NaN if no solution was found
+        pi(Optional[numpy.ndarray]): dual values of the constraints, with one
+            row per scenario, when linear programs are optimized, NaN if
+            not available
+        time(numpy.ndarray): time, in seconds, to update and optimize the
+            model in each scenario
+    """
+
+    def __init__(
+        self,
+        status: List[mip.OptimizationStatus],
+        objective_value: "np.ndarray",
+        objective_bound: "np.ndarray",
+        x: "np.ndarray",
+        pi: Optional["np.ndarray"],
+        time: "np.ndarray",
+    ):
+        self.status = status
+        self.objective_value = objective_value
+        self.objective_bound = objective_bound
+        self.x = x
+        self.pi = pi
+        self.time = time
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def __getitem__(self, k: int) -> Solution:
+        found = not np.isnan(self.objective_value[k])
+        return Solution(
+            k,
+            self.status[k],
+            float(self.objective_value[k]) if found else None,
+            None
+            if np.isnan(self.objective_bound[k])
+            else float(self.objective_bound[k]),
+            self.x[k] if found else None,
+            int(found),
+            float(self.time[k]),
+        )
+
+    def __repr__(self) -> str:
+        return "SweepResult(scenarios={})".format(len(self))
+
+    @classmethod
+    def concatenate(cls, results: List["SweepResult"]) -> "SweepResult":
+        """stacks the results of consecutive groups of scenarios
+
+        :rtype: mip.SweepResult
+        """
+        pi = None
+        if all(r.pi is not None for r in results):
+            pi = np.concatenate([r.pi for r in results])
+        return cls(
+            [s for r in results for s in r.status],
+            np.concatenate([r.objective_value for r in results]),
+            np.concatenate([r.objective_bound for r in results]),
+            np.concatenate([r.x for r in results]),
+            pi,
+            np.concatenate([r.time for r in results]),
+        )
+
+
+class _Scenarios:
+    """scenario data, as float arrays with one row per scenario, and the
+    indexes of the constraints and variables changed"""
+
+    def __init__(self, rhs, obj, lb, ub, rhs_idx, var_idx):
+        self.rhs, self.obj, self.lb, self.ub = rhs, obj, lb, ub
+        self.rhs_idx, self.var_idx = rhs_idx, var_idx
+
+    def __len__(self) -> int:
+        for a in (self.rhs, self.obj, self.lb, self.ub):
+            if a is not None:
+                return a.shape[0]
+        return 0
+
+    def slice(self, first: int, last: int) -> "_Scenarios":
+        return _Scenarios(
+            *(
+                None if a is None else a[first:last]
+                for a in (self.rhs, self.obj, self.lb, self.ub)
+            ),
+            self.rhs_idx,
+            self.var_idx
+        )
+
+
+def _matrix(values, cols: int, what: str) -> Optional["np.ndarray"]:
+    if values is None:
+        return None
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 2 or values.shape[1] != cols:
+        raise mip.InvalidParameter(
+            "{} should have one row per scenario and {} columns".format(what, cols)
+        )
+    return values
+
+
+def _indexes(idx, size: int, what: str) -> "np.ndarray":
+    if idx is None:
+        return np.arange(size)
+    idx = np.asarray(idx, dtype=np.int64)
+    if len(idx) and (idx.min() < 0 or idx.max() >= size):
+        raise mip.InvalidParameter("Invalid {} index".format(what))
+    return idx
+
+
+def _apply(setter, current: "np.ndarray", new: "np.ndarray", idx: "np.ndarray"):
+    """changes only the positions that differ from the current values, which
+    are updated"""
+    changed = np.flatnonzero(current != new)
+    if len(changed):
+        setter(new[changed], idx[changed])
+        current[changed] = new[changed]
+
+
+def _sweep(
+    model: "mip.Model", scenarios: _Scenarios, relax: bool, kwargs: dict
+) -> SweepResult:
+    """optimizes the scenarios in sequence, in this process"""
+    n, m, ns = model.num_cols, model.num_rows, len(scenarios)
+    rhs_idx, var_idx = scenarios.rhs_idx, scenarios.var_idx
+    mvars, mconstrs = model.vars, model.constrs
+    orig_rhs = np.array([mconstrs[i].rhs for i in rhs_idx.tolist()], dtype=np.float64)
+    orig_obj = np.array([mvars[j].obj for j in var_idx.tolist()], dtype=np.float64)
+    orig_lb = np.array([mvars[j].lb for j in var_idx.tolist()], dtype=np.float64)
+    orig_ub = np.array([mvars[j].ub for j in var_idx.tolist()], dtype=np.float64)
+    rhs, obj, lb, ub = orig_rhs.copy(), orig_obj.copy(), orig_lb.copy(), orig_ub.copy()
+    set_rhs, set_obj = model.set_rhs, model.set_obj
+
+    def set_lb(values, idx):
+        model.set_bounds(values, None, idx)
+
+    def set_ub(values, idx):
+        model.set_bounds(None, values, idx)
+
+    # linear programs are re-optimized from the previous basis, mixed integer
+    # programs start from the previous incumbent
+    lp = relax or model.num_int == 0
+    int_vars = [v for v in mvars if v.var_type != mip.CONTINUOUS] if not lp else []
+    persistent, start = model.persistent_lp, model.start
+
+    status = []
+    objective_value = np.full(ns, np.nan)
+    objective_bound = np.full(ns, np.nan)
+    x = np.full((ns, n), np.nan)
+    pi = np.full((ns, m), np.nan) if lp else None
+    times = np.zeros(ns)
+    try:
+        if lp:
+            model.persistent_lp = True
+        for k in range(ns):
+            begin = perf_counter()
+            if scenarios.rhs is not None:
+                _apply(set_rhs, rhs, scenarios.rhs[k], rhs_idx)
+            if scenarios.obj is not None:
+                _apply(set_obj, obj, scenarios.obj[k], var_idx)
+            if scenarios.lb is not None:
+                _apply(set_lb, lb, scenarios.lb[k], var_idx)
+            if scenarios.ub is not None:
+                _apply(set_ub, ub, scenarios.ub[k], var_idx)
+            st = model.optimize(relax=lp, **kwargs)
+            status.append(st)
+            if model.objective_bound is not None:
+                objective_bound[k] = model.objective_bound
+            if model.num_solutions:
+                objective_value[k] = model.objective_value
+                x[k] = model.get_x()
+                if lp:
+                    duals = model.get_pi()
+                    if duals is not None:
+                        pi[k] = duals
+                elif int_vars:
+                    model.start = [(v, x[k, v.idx]) for v in int_vars]
+            times[k] = perf_counter() - begin
+            logger.debug(
+                "Scenario {}: {} {}".format(k, st.name, model.objective_value)
+            )
+    finally:
+        model.persistent_lp = persistent
+        if not lp:
+            model.start = start
+        _apply(set_rhs, rhs, orig_rhs, rhs_idx)
+        _apply(set_obj, obj, orig_obj, var_idx)
+        _apply(set_lb, lb, orig_lb, var_idx)
+        _apply(set_ub, ub, orig_ub, var_idx)
+    return SweepResult(status, objective_value, objective_bound, x, pi, times)
+
+
+def _sweep_worker(
+    data: ModelArrays,
+    solver_name: str,
+    scenarios: _Scenarios,
+    relax: bool,
+    kwargs: dict,
+) -> SweepResult:
+    model = data.to_model(solver_name)
+    model.verbose = 0
+    return _sweep(model, scenarios, relax, kwargs)
+
+
+def sweep(
+    model: "mip.Model",
+    rhs_matrix=None,
+    obj_matrix=None,
+    bounds: Optional[Tuple] = None,
+    rhs_idx=None,
+    var_idx=None,
+    relax: bool = False,
+    workers: int = 1,
+    solver_name: str = "",
+    start_method: Optional[str] = None,
+    **kwargs
+) -> SweepResult:
+    """Implementation of :meth:`~mip.Model.sweep`"""
+    if np is None:
+        raise ModuleNotFoundError("You need to install package numpy to use sweep")
+    rhs_idx = _indexes(rhs_idx, model.num_rows, "constraint")
+    var_idx = _indexes(var_idx, model.num_cols, "variable")
+    lb, ub = bounds if bounds is not None else (None, None)
+    scenarios = _Scenarios(
+        _matrix(rhs_matrix, len(rhs_idx), "rhs_matrix"),
+        _matrix(obj_matrix, len(var_idx), "obj_matrix"),
+        _matrix(lb, len(var_idx), "Lower bounds"),
+        _matrix(ub, len(var_idx), "Upper bounds"),
+        rhs_idx,
+        var_idx,
+    )
+    sizes = {
+        a.shape[0]
+        for a in (scenarios.rhs, scenarios.obj, scenarios.lb, scenarios.ub)
+        if a is not None
+    }
+    if len(sizes) > 1:
+        raise mip.InvalidParameter("All matrices should have the same number of rows")
+    ns = len(scenarios)
+
+    workers = min(workers, ns)
+    if workers <= 1:
+        return _sweep(model, scenarios, relax, kwargs)
+
+    # consecutive scenarios are optimized in the same process, since similar
+    # scenarios are often consecutive and benefit more from the warm start
+    data = ModelArrays.from_model(model)
+    solver_name = solver_name or model.solver_name
+    limits = np.linspace(0, ns, workers + 1).round().astype(int).tolist()
+    ctx = multiprocessing.get_context(start_method)
+    with ctx.Pool(workers) as pool:
+        results = pool.starmap(
+            _sweep_worker,
+            [
+                (data, solver_name, scenarios.slice(first, last), relax, kwargs)
+                for (first, last) in zip(limits[:-1], limits[1:])
+            ],
+        )
+    return SweepResult.concatenate(results)
@@ -0,0 +1,151 @@
+"""Tests for the optimization of many models in worker processes"""
+from functools import partial
+import os
+import pickle
+from threading import Timer
+import time
+import pytest
+from mip import Model, Column, OptimizationStatus, BINARY, INTEGER, CBC, MAXIMIZE
+from mip import ModelArrays, Solution, SolvePool, solve_many, InvalidParameter
+from mip import CancelToken
+from mip_knapsack import build_knapsack
+
+TOL = 1e-4
+
+
+def build_model(n: int, seed: int = 0) -> Model:
+    """knapsack with an integer variable y in the first constraint"""
+    m, x = build_knapsack(n, seed, const=7, names=True)
+    m.add_var("y", ub=3, obj=5, var_type=INTEGER, column=Column([m.constrs[0]], [10]))
+    return m
+
+
+def failing_builder():
+    raise RuntimeError("invalid data")
+
+
+def crashing_builder():
+    os._exit(3)
+
+
+def slow_builder():
+    time.sleep(60)
+
+
+def test_model_arrays():
+    pytest.importorskip("numpy")
+    m = build_model(20)
+    data = pickle.loads(pickle.dumps(ModelArrays.from_model(m, names=True)))
+    assert (data.num_cols, data.num_rows, data.num_nz) == (21, 2, 31)
+    m2 = data.to_model(CBC)
+    m2.verbose = 0
+    assert m2.sense == MAXIMIZE
+    assert abs(m2.objective_const - 7) <= TOL
+    assert m2.var_by_name("y").var_type == INTEGER
+    assert m2.var_by_name("x(3)").var_type == BINARY
+    assert m2.constr_by_name("cap_even") is not None
+    m.optimize()
+    m2.optimize()
+    assert abs(m.objective_value - m2.objective_value) <= TOL
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_add_constrs_csr(persistent: bool):
+    m = Model(sense=MAXIMIZE, solver_name=CBC)
+    m.verbose = 0
+    m.persistent_lp = persistent
+    x = [m.add_var(obj=1) for i in range(3)]
+    m += x[0] <= 1
+    m.optimize(relax=True)
+    constrs = m.add_constrs_csr(
+        [0, 2, 3, 5], [0, 1, 2, 1, 2], [1, 1, 1, 1, -1], ["<", "<", "="], [3, 2, 0],
+        names=["ab", "", "bc"],
+    )
+    assert [c.idx for c in constrs] == [1, 2, 3]
+    assert [c.name for c in constrs] == ["ab", "constr(2)", "bc"]
+    assert constrs[0].expr.expr == {x[0]: 1, x[1]: 1}
+    assert constrs[2].expr.sense == "=" and constrs[2].rhs == 0
+    assert m.optimize(relax=True) == OptimizationStatus.OPTIMAL
+    # x[0] <= 1, x[0] + x[1] <= 3, x[2] <= 2 and x[1] == x[2]
+    assert abs(m.objective_value - 5) <= TOL
+    with pytest.raises(InvalidParameter):
+        m.add_constrs_csr([0, 1], [0], [1], ["<", "<"], [1, 2])
+
+
+def test_model_arrays_invalid():
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        ModelArrays([1, 2], [0, 0], [1, 1], ["C"] * 2, [0, 1], [2], [1.0], ["<"], [1])
+
+
+def test_solve_many():
+    pytest.importorskip("numpy")
+    n_models = 12
+    expected = []
+    for k in range(n_models):
+        m = build_model(20, k)
+        m.optimize()
+        expected.append(m.objective_value)
+
+    # models built in the workers and sent as arrays, in the same call
+    tasks = [partial(build_model, 20, k) for k in range(0, n_models, 2)]
+    tasks = [
+        tasks[k // 2] if k % 2 == 0 else build_model(20, k) for k in range(n_models)
+    ]
+    solutions = list(solve_many(tasks, workers=2, chunk_size=3))
+    assert sorted(s.index for s in solutions) == list(range(n_models))
+    for s in solutions:
+        assert isinstance(s, Solution)
+        assert not s.failed
+        assert s.status == OptimizationStatus.OPTIMAL
+        assert abs(s.objective_value - expected[s.index]) <= TOL
+        assert len(s.x) == 21
+        assert s.time > 0
+
+
+def test_solve_pool_failures():
+    """failures in some tasks do not interrupt the others and the pool can
+    be used again"""
+    pytest.importorskip("numpy")
+    tasks = [
+        partial(build_model, 20, 0),
+        failing_builder,
+        crashing_builder,
+        partial(build_model, 20, 1),
+        slow_builder,
+        partial(build_model, 20, 2),
+    ]
+    with SolvePool(workers=2) as pool:
+        start = time.time()
+        solutions = {s.index: s for s in pool.solve_many(tasks, timeout=1, grace=1)}
+        assert time.time() - start < 30
+        assert sorted(solutions) == list(range(len(tasks)))
+        for i in [0, 3, 5]:
+            assert solutions[i].status == OptimizationStatus.OPTIMAL
+        for i in [1, 2, 4]:
+            assert solutions[i].failed
+            assert solutions[i].status == OptimizationStatus.ERROR
+        assert "invalid data" in solutions[1].error
+        assert "exit code 3" in solutions[2].error
+        assert "Timeout" in solutions[4].error
+
+        solutions = list(pool.solve_many(tasks[:1]))
+        assert solutions[0].status == OptimizationStatus.OPTIMAL
+
+
+def test_solve_pool_cancel():
+    pytest.importorskip("numpy")
+    tasks = [partial(build_model, 20), slow_builder, slow_builder, slow_builder]
+    token = CancelToken()
+    with SolvePool(workers=2) as pool:
+        start = time.time()
+        Timer(1.0, token.cancel).start()
+        solutions = list(pool.solve_many(tasks, cancel_token=token))
+        assert time.time() - start < 30
+        # the slow models are terminated or not optimized
+        assert [s.index for s in solutions] == [0]
+
+        # the pool can be used after the cancellation
+        token.reset()
+        solutions = list(pool.solve_many(tasks[:1], cancel_token=token))
+        assert solutions[0].status == OptimizationStatus.OPTIMAL
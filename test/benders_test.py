@@ -0,0 +1,124 @@
+"""Tests for the Benders decomposition of two-stage problems"""
+import random
+import pytest
+from mip import Model, Benders, BendersSubproblem, xsum, OptimizationStatus
+from mip import InvalidParameter, ProgrammingError, BINARY, CBC, MAXIMIZE, INF
+
+TOL = 1e-4
+
+
+def instance(nf: int, nc: int, ns: int, seed: int):
+    """stochastic capacitated facility location: facilities are opened in the
+    first stage and demands of each scenario are served in the second"""
+    rnd = random.Random(seed)
+    f = [rnd.randint(200, 400) for i in range(nf)]
+    u = [rnd.randint(40, 80) for i in range(nf)]
+    c = [[rnd.randint(1, 20) for j in range(nc)] for i in range(nf)]
+    d = [[rnd.randint(5, 20) for j in range(nc)] for s in range(ns)]
+    return f, u, c, d
+
+
+def scenario(u, c, demand):
+    nf, nc = len(u), len(demand)
+    m = Model(solver_name=CBC)
+    x = [[m.add_var() for j in range(nc)] for i in range(nf)]
+    m.objective = xsum(c[i][j] * x[i][j] for i in range(nf) for j in range(nc))
+    for j in range(nc):
+        m += xsum(x[i][j] for i in range(nf)) >= demand[j]
+    coupling = []
+    for i in range(nf):
+        constr = m.add_constr(xsum(x[i][j] for j in range(nc)) <= 0)
+        coupling.append((constr.idx, i, -u[i]))
+    return m, coupling
+
+
+def extensive(f, u, c, d) -> float:
+    nf, nc, ns = len(f), len(c[0]), len(d)
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    y = [m.add_var(var_type=BINARY) for i in range(nf)]
+    obj = xsum(f[i] * y[i] for i in range(nf))
+    for s in range(ns):
+        x = [[m.add_var() for j in range(nc)] for i in range(nf)]
+        obj = obj + xsum(c[i][j] * x[i][j] / ns for i in range(nf) for j in range(nc))
+        for j in range(nc):
+            m += xsum(x[i][j] for i in range(nf)) >= d[s][j]
+        for i in range(nf):
+            m += xsum(x[i][j] for j in range(nc)) <= u[i] * y[i]
+    m.objective = obj
+    assert m.optimize() == OptimizationStatus.OPTIMAL
+    return m.objective_value
+
+
+@pytest.mark.parametrize("multi_cut", [True, False])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_facility_location(multi_cut: bool, workers: int):
+    pytest.importorskip("numpy")
+    f, u, c, d = instance(5, 12, 4, 0)
+    expected = extensive(f, u, c, d)
+
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    y = [m.add_var(var_type=BINARY, obj=f[i]) for i in range(len(f))]
+    subs = [BendersSubproblem(*scenario(u, c, ds), weight=1 / len(d)) for ds in d]
+    with Benders(m, subs, multi_cut=multi_cut, workers=workers) as benders:
+        assert benders.optimize() == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - expected) <= TOL
+    assert len(benders.theta) == (len(d) if multi_cut else 1)
+    # opening no facility leaves the subproblems infeasible
+    assert benders.feasibility_cuts > 0 and benders.optimality_cuts > 0
+    assert benders.calls > 0 and benders.subproblem_time > 0
+
+    # the subproblems have the cost of the optimal solution
+    x = [v.x for v in m.vars]
+    results = Benders(m, subs).solve_subproblems(x)
+    assert all(r[0] == OptimizationStatus.OPTIMAL for r in results)
+    cost = sum(f[i] * round(y[i].x) for i in range(len(f)))
+    cost += sum(r[1] for r in results) / len(d)
+    assert abs(cost - expected) <= TOL
+
+
+def test_invalid():
+    pytest.importorskip("numpy")
+    sub = Model(solver_name=CBC)
+    z = sub.add_var(lb=-INF)
+    sub.objective = z
+    sub += z <= 0
+    master = Model(solver_name=CBC)
+    master.verbose = 0
+    y = master.add_var(var_type=BINARY)
+    master += y <= 1
+    benders = Benders(master, [BendersSubproblem(sub, [(0, y, 1)])])
+    with pytest.raises(ProgrammingError):
+        benders.optimize()
+
+    with pytest.raises(InvalidParameter):
+        BendersSubproblem(sub, [(1, y, 1)])
+    with pytest.raises(InvalidParameter):
+        Benders(Model(sense=MAXIMIZE, solver_name=CBC), [BendersSubproblem(sub, [])])
+    sub.sense = MAXIMIZE
+    with pytest.raises(InvalidParameter):
+        BendersSubproblem(sub, [])
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_set_rhs(persistent: bool):
+    np = pytest.importorskip("numpy")
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    m.persistent_lp = persistent
+    x = [m.add_var(obj=i + 1) for i in range(3)]
+    for i in range(3):
+        m += x[i] >= 1
+    m += x[0] + x[1] <= 10
+    assert m.get_pi() is None
+    m.optimize(relax=True)
+    assert np.allclose(m.get_pi(), [1, 2, 3, 0])
+    m.set_rhs(np.array([2, 3, 4, 1]))
+    assert [c.rhs for c in m.constrs] == [2, 3, 4, 1]
+    assert m.optimize(relax=True) == OptimizationStatus.INFEASIBLE
+    m.set_rhs([8], idx=[3])
+    assert m.optimize(relax=True) == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - 20) <= TOL
+    with pytest.raises(InvalidParameter):
+        m.set_rhs([1, 2])
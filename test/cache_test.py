@@ -0,0 +1,126 @@
+"""Tests for model fingerprints and the cache of solutions"""
+import pytest
+from mip import Model, xsum, SolveCache, ModelArrays, OptimizationStatus, CBC
+from mip import CONTINUOUS, ConstrsGenerator
+from mip_knapsack import build_knapsack
+
+TOL = 1e-5
+
+
+def knapsack(seed: int = 0, reverse: bool = False, names: bool = False) -> Model:
+    return build_knapsack(15, seed, reverse=reverse, names=names)[0]
+
+
+def test_fingerprint():
+    pytest.importorskip("numpy")
+    m = knapsack()
+    fp = m.fingerprint()
+    assert fp == knapsack().fingerprint()
+    # names and the order of the terms do not matter
+    assert fp == knapsack(reverse=True, names=True).fingerprint()
+    assert fp == ModelArrays.from_model(m).to_model(CBC).fingerprint()
+    assert fp != knapsack(1).fingerprint()
+
+    # changes in the data or in the settings change the fingerprint
+    fingerprints = {fp}
+    m.constrs[0].rhs = 99
+    fingerprints.add(m.fingerprint())
+    m.vars[0].var_type = CONTINUOUS
+    fingerprints.add(m.fingerprint())
+    m.vars[1].lb = 1
+    fingerprints.add(m.fingerprint())
+    m.seed = 7
+    fingerprints.add(m.fingerprint())
+    assert len(fingerprints) == 5
+    assert m.fingerprint(params=False) == m.fingerprint(params=False)
+    assert m.fingerprint(params=False) != m.fingerprint()
+
+
+@pytest.mark.parametrize("path", [None, "cache", "cache.db"])
+def test_cache(path, tmp_path):
+    pytest.importorskip("numpy")
+    if path is not None:
+        path = str(tmp_path / path)
+    expected = knapsack()
+    expected.optimize()
+
+    with SolveCache(path) as cache:
+        sol = cache.optimize(knapsack())
+        assert cache.misses == 1 and cache.hits == 0 and len(cache) == 1
+        assert sol.status == OptimizationStatus.OPTIMAL
+        assert abs(sol.objective_value - expected.objective_value) <= TOL
+
+        m = knapsack(reverse=True)
+        cached = cache.optimize(m)
+        assert cache.hits == 1 and cache.misses == 1
+        assert abs(cache.time_saved - sol.time) <= TOL
+        assert cached.objective_value == sol.objective_value
+        assert (cached.x == sol.x).all()
+        # the model was not optimized
+        assert m.status == OptimizationStatus.LOADED
+
+        # other arguments of optimize are part of the key
+        relaxed = cache.optimize(knapsack(), relax=True)
+        assert cache.misses == 2 and len(cache) == 2
+        assert relaxed.objective_value >= sol.objective_value - TOL
+
+        infeasible = knapsack(2)
+        infeasible += infeasible.vars[0] >= 2
+        assert cache.optimize(infeasible).status == OptimizationStatus.INFEASIBLE
+        assert len(cache) == 3
+
+    if path is not None:
+        # disk caches are kept
+        with SolveCache(path) as cache:
+            assert len(cache) == 3
+            assert cache.optimize(knapsack()).objective_value == sol.objective_value
+            assert cache.hits == 1 and cache.misses == 0
+            cache.clear()
+            assert len(cache) == 0
+
+
+@pytest.mark.parametrize("path", [None, "cache", "cache.sqlite"])
+def test_lru(path, tmp_path):
+    pytest.importorskip("numpy")
+    if path is not None:
+        path = str(tmp_path / path)
+    with SolveCache(path, max_size=2) as cache:
+        keys = [cache.key(knapsack(s)) for s in range(3)]
+        cache.optimize(knapsack(0))
+        cache.optimize(knapsack(1))
+        # uses the first solution, so that the second one is discarded
+        cache.optimize(knapsack(0))
+        cache.optimize(knapsack(2))
+        assert len(cache) == 2
+        assert keys[0] in cache and keys[1] not in cache and keys[2] in cache
+        assert cache.hits == 1 and cache.misses == 3
+
+
+class Cover(ConstrsGenerator):
+    """limits the number of items, changing the optimal solution when used
+    for lazy constraints"""
+
+    def __init__(self, x, limit: int):
+        super().__init__()
+        self.x, self.limit = x, limit
+
+    def generate_constrs(self, model: Model):
+        x = model.translate(self.x)
+        if sum(v.x for v in x) >= self.limit + 1e-4:
+            model += xsum(x) <= self.limit
+
+
+def test_callbacks_not_cached(tmp_path):
+    pytest.importorskip("numpy")
+    with SolveCache(str(tmp_path / "cache.db")) as cache:
+        sol = cache.optimize(knapsack())
+        m = knapsack()
+        m.cuts_generator = Cover(list(m.vars), 3)
+        cache.optimize(m)
+        # generators are not part of the key, so the model is optimized
+        assert cache.misses == 2 and cache.hits == 0 and len(cache) == 1
+
+        m = knapsack()
+        m.lazy_constrs_generator = Cover(list(m.vars), 3)
+        assert cache.optimize(m).objective_value < sol.objective_value - TOL
+        assert cache.misses == 3 and len(cache) == 1
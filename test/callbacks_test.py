@@ -0,0 +1,573 @@
+"""Tests for the CBC callback infrastructure"""
+import os
+from itertools import product, combinations
+import time
+import pytest
+import networkx as nx
+from mip import Model, xsum, OptimizationStatus, BINARY, CBC, MAXIMIZE, MINIMIZE, Var
+from mip import IncumbentUpdater, ParallelConstrsGenerator, CancelToken
+from mip import ConstrsGenerator, CutPool, ManagedCutPool, LazyPool
+from mip_knapsack import build_knapsack
+
+TOL = 1e-4
+
+ARCS = {
+    ("a", "d"): 56,
+    ("d", "a"): 67,
+    ("a", "b"): 49,
+    ("b", "a"): 50,
+    ("d", "b"): 39,
+    ("b", "d"): 37,
+    ("c", "f"): 35,
+    ("f", "c"): 35,
+    ("g", "b"): 35,
+    ("b", "g"): 25,
+    ("a", "c"): 80,
+    ("c", "a"): 99,
+    ("e", "f"): 20,
+    ("f", "e"): 20,
+    ("g", "e"): 38,
+    ("e", "g"): 49,
+    ("g", "f"): 37,
+    ("f", "g"): 32,
+    ("b", "e"): 21,
+    ("e", "b"): 30,
+    ("a", "g"): 47,
+    ("g", "a"): 68,
+    ("d", "c"): 37,
+    ("c", "d"): 52,
+    ("d", "e"): 15,
+    ("e", "d"): 20,
+}
+
+
+def build_tsp(solver: str = CBC, weak: bool = True):
+    """builds the small TSP instance used in mip_test, returns the model and
+    the dictionary of arc variables"""
+    N = sorted(set(i for (i, j) in ARCS))
+    n = len(N)
+    m = Model(solver_name=solver)
+    m.verbose = 0
+
+    x = {a: m.add_var(name="x({},{})".format(a[0], a[1]), var_type=BINARY) for a in ARCS}
+    m.objective = xsum(c * x[a] for a, c in ARCS.items())
+    for i in N:
+        m += xsum(x[a] for a in ARCS if a[0] == i) == 1, "out({})".format(i)
+        m += xsum(x[a] for a in ARCS if a[1] == i) == 1, "in({})".format(i)
+
+    if weak:
+        y = {i: m.add_var(name="y({})".format(i)) for i in N}
+        for (i, j) in ARCS:
+            if N[0] not in [i, j]:
+                m += y[i] - (n + 1) * x[(i, j)] >= y[j] - n
+
+    return m, x
+
+
+class TranslatedSubTourCuts(ConstrsGenerator):
+    """sub-tour elimination cuts written in terms of the original variables,
+    translated with Model.translate"""
+
+    def __init__(self, x):
+        self.x = x
+        self.calls = 0
+        self.names_ok = True
+
+    def find_cuts(self, model: Model):
+        self.calls += 1
+        arcs = list(self.x.keys())
+        xf = model.translate([self.x[a] for a in arcs])
+        for a, v in zip(arcs, xf):
+            if v is not None and v.name != self.x[a].name:
+                self.names_ok = False
+        G = nx.DiGraph()
+        for a, v in zip(arcs, xf):
+            if v is not None:
+                G.add_edge(a[0], a[1], capacity=v.x)
+        cp = CutPool()
+        for (u, v) in product(G.nodes, G.nodes):
+            if u == v:
+                continue
+            val, (S, NS) = nx.minimum_cut(G, u, v)
+            if val <= 0.99:
+                inS = [xf[k] for k, a in enumerate(arcs) if a[0] in S and a[1] in S]
+                inS = [var for var in inS if var is not None]
+                if sum(var.x for var in inS) >= len(S) - 1 + 1e-4:
+                    cp.add(xsum(1.0 * var for var in inS) <= len(S) - 1)
+        return cp
+
+    def generate_constrs(self, model: Model):
+        for cut in self.find_cuts(model).cuts:
+            model += cut
+
+
+def test_col_mapping_translate():
+    m, x = build_tsp()
+    gen = TranslatedSubTourCuts(x)
+    m.cuts_generator = gen
+    m.optimize(max_seconds=10)
+
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - 262) <= TOL
+    assert gen.calls >= 1
+    assert gen.names_ok
+
+
+class ContextChecker(ConstrsGenerator):
+    """checks that the numpy views in the callback context agree with the
+    values queried through the variables"""
+
+    def __init__(self):
+        self.models = set()
+        self.calls = 0
+        self.consistent = True
+
+    def generate_constrs(self, model: Model):
+        self.calls += 1
+        self.models.add(id(model))
+        ctx = model.context
+        n = model.num_cols
+        if len(ctx.x) != n or len(ctx.lb) != n or len(ctx.ub) != n:
+            self.consistent = False
+            return
+        for v in model.vars:
+            if abs(v.x - ctx.x[v.idx]) > TOL or abs(v.lb - ctx.lb[v.idx]) > TOL:
+                self.consistent = False
+            if ctx.is_int[v.idx] != (v.var_type != "C"):
+                self.consistent = False
+        frac = ctx.fractional_idx()
+        if model.fractional != (len(frac) > 0):
+            self.consistent = False
+        for j in frac:
+            if not ctx.is_int[j] or ctx.fractionality()[j] <= ctx.integer_tol:
+                self.consistent = False
+
+
+def test_callback_context():
+    m, x = build_tsp()
+    m.cuts = 0
+    gen = ContextChecker()
+    m.cuts_generator = gen
+    m.optimize(max_seconds=10)
+
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert gen.calls >= 1
+    assert gen.consistent
+    # the same callback model is reused in all calls of an optimization
+    assert len(gen.models) == 1
+
+
+class ArraysRecorder(ConstrsGenerator):
+    """stores the arrays of the pre-processed problem in the first call"""
+
+    def __init__(self):
+        super().__init__()
+        self.arrays = None
+
+    def generate_constrs(self, model: Model):
+        if self.arrays is None:
+            self.arrays = model.solver.get_arrays(), model.sense, model.orig_col_idx
+
+
+@pytest.mark.parametrize("sense", [MINIMIZE, MAXIMIZE])
+def test_callback_arrays_objective(sense):
+    m, x = build_tsp()
+    m.sense = sense
+    if sense == MAXIMIZE:
+        m.objective = xsum(-v.obj * v for v in m.vars)
+    m.cuts_generator = gen = ArraysRecorder()
+    m.optimize(max_seconds=10)
+
+    assert gen.arrays is not None
+    (obj, *_), cb_sense, orig_col_idx = gen.arrays
+    assert cb_sense == sense
+    assert len(obj) == len(orig_col_idx) and any(c != 0.0 for c in obj)
+    for (c, j) in zip(obj, orig_col_idx):
+        assert abs(c - m.vars[int(j)].obj) <= TOL
+
+
+class BatchSubTourCuts(TranslatedSubTourCuts):
+    """submits the sub-tour elimination cuts in a single batch, together with
+    an inequality that is never violated and should be filtered out"""
+
+    def __init__(self, x):
+        super().__init__(x)
+        self.submitted = 0
+        self.generated = 0
+
+    def generate_constrs(self, model: Model):
+        cuts = list(self.find_cuts(model).cuts)
+        xf = [v for v in model.translate(list(self.x.values())) if v is not None]
+        cuts.append(xsum(xf) <= len(xf))
+        self.generated += len(cuts)
+        self.submitted += model.add_cuts(cuts)
+
+
+def test_add_cuts_batch():
+    m, x = build_tsp()
+    gen = BatchSubTourCuts(x)
+    m.cuts_generator = gen
+    m.optimize(max_seconds=10)
+
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - 262) <= TOL
+    assert gen.calls >= 1
+    assert gen.submitted <= gen.generated - gen.calls
+
+
+def test_csr_violation():
+    np = pytest.importorskip("numpy")
+    from mip.callbacks import _csr_violation
+
+    x = np.array([1.0, 0.5, 0.0])
+    indptr = np.array([0, 2, 3, 3, 5])
+    indices = np.array([0, 1, 1, 0, 2])
+    coefs = np.array([1.0, 1.0, 2.0, 1.0, 1.0])
+    senses = np.array(["<", ">", "<", "="])
+    rhs = np.array([1.0, 2.0, -1.0, 0.5])
+    viol = _csr_violation(x, indptr, indices, coefs, senses, rhs)
+    assert np.allclose(viol, [0.5, 1.0, 1.0, 0.5])
+
+
+def test_managed_cut_pool_ranking():
+    np = pytest.importorskip("numpy")
+    pool = ManagedCutPool(max_round=10, max_parallelism=0.99)
+    x = np.array([1.0, 1.0, 0.5])
+    assert pool.add_row([0, 1], [1.0, 1.0], "<", 1.0)  # eff 1/sqrt(2)
+    assert not pool.add_row([1, 0], [1.0, 1.0], "<", 1.0)  # repeated
+    assert pool.add_row([0, 1], [2.0, 2.0], "<", 2.0)  # parallel to first
+    assert pool.add_row([2], [1.0], "<", 0.0)  # eff 0.5
+    assert pool.add_row([0], [1.0], ">", 0.0)  # slack
+    assert len(pool) == 4
+
+    sel = pool.select(x)
+    assert sel.tolist() == [0, 2]
+    indptr, indices, coefs, senses, rhs = pool.rows(sel)
+    assert indptr.tolist() == [0, 2, 3]
+    assert indices.tolist() == [0, 1, 2]
+    assert senses.tolist() == ["<", "<"]
+    assert rhs.tolist() == [1.0, 0.0]
+
+
+def test_managed_cut_pool_aging():
+    np = pytest.importorskip("numpy")
+    pool = ManagedCutPool(max_cuts=2, max_age=2, max_parallelism=1.0)
+    x = np.array([1.0, 0.0])
+    pool.add_row([0], [1.0], "<", 0.0)  # violated
+    pool.add_row([1], [1.0], "<", 1.0)  # slack
+    for _ in range(3):
+        pool.select(x)
+    assert len(pool) == 1
+    assert pool.evicted == 1
+
+    # pool is bounded, keeping the most effective among the youngest cuts
+    pool.add_row([0], [1.0], "<", 0.5)
+    pool.add_row([0], [1.0], "<", 0.9)
+    sel = pool.select(x)
+    assert len(pool) == 2
+    assert pool.rows(sel)[4].tolist() == [0.0, 0.5]
+
+
+class PooledSubTourCuts(TranslatedSubTourCuts):
+    """stores the sub-tour elimination cuts in a managed pool, which is used
+    to select the cuts added in each round"""
+
+    def __init__(self, x):
+        super().__init__(x)
+        self.pool = ManagedCutPool(max_cuts=64, max_round=16)
+        self.added = 0
+
+    def generate_constrs(self, model: Model):
+        for cut in self.find_cuts(model).cuts:
+            self.pool.add(cut)
+        self.added += self.pool.separate(model)
+
+
+def test_managed_cut_pool_callback():
+    m, x = build_tsp()
+    gen = PooledSubTourCuts(x)
+    m.cuts_generator = gen
+    m.optimize(max_seconds=10)
+
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - 262) <= TOL
+    assert len(gen.pool) <= 64
+    assert gen.added <= 16 * gen.pool.rounds
+
+
+def test_lazy_pool():
+    pytest.importorskip("numpy")
+    m, x = build_tsp(weak=False)
+    N = sorted(set(i for (i, j) in ARCS))
+    pool = LazyPool()
+    for k in range(2, len(N)):
+        for S in combinations(N, k):
+            pool.add(xsum(x[a] for a in ARCS if a[0] in S and a[1] in S) <= k - 1)
+    n_rows = len(pool)
+    m.lazy_constrs_generator = pool
+    m.optimize()
+
+    # the solution must be a single tour
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - 262) <= TOL
+    assert 1 <= pool.added < n_rows
+    assert len(pool.violated(m.get_x())) == 0
+
+    # optimizing again, CBC starts from the previous optimal solution
+    m.optimize()
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - 262) <= TOL
+    assert len(pool.violated(m.get_x())) == 0
+
+    # the pool can be reused in models with the same variables
+    m2, x2 = build_tsp(weak=False)
+    m2.lazy_constrs_generator = pool
+    m2.optimize()
+    assert m2.status == OptimizationStatus.OPTIMAL
+    assert abs(m2.objective_value - 262) <= TOL
+    assert len(pool) == n_rows
+    assert len(pool.violated(m2.get_x())) == 0
+
+
+class FixedSolution(IncumbentUpdater):
+    """returns always the same solution"""
+
+    def __init__(self, model, solution):
+        super().__init__(model)
+        self.solution = solution
+        self.calls = 0
+        self.objs = []
+
+    def update_incumbent_x(self, objective_value, best_bound, x):
+        self.calls += 1
+        self.objs.append(objective_value)
+        assert not x.flags.writeable
+        return self.solution
+
+
+def test_incumbent_updater():
+    pytest.importorskip("numpy")
+    m0, _ = build_knapsack(const=7)
+    m0.optimize()
+    best = [v.x for v in m0.vars]
+
+    m, x = build_knapsack(const=7)
+    updater = FixedSolution(m, best)
+    m.incumbent_updater = updater
+    m.optimize()
+    assert updater.calls >= 1
+    assert updater.objs[0] <= m0.objective_value + TOL
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - m0.objective_value) <= TOL
+    assert abs(m.objective_bound - m0.objective_value) <= TOL
+    assert all(abs(v.x - b) <= TOL for v, b in zip(x, best))
+
+    # infeasible solutions are discarded
+    m, x = build_knapsack(const=7)
+    m.incumbent_updater = FixedSolution(m, [1.0] * len(x))
+    m.optimize()
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - m0.objective_value) <= TOL
+    assert sum(v.x for v in x) < len(x)
+
+
+@pytest.mark.parametrize("value", [0.0, 1.0])
+def test_prune_fixed_first_column(value):
+    """nodes are pruned with inconsistent bounds in the first column, which
+    must work even if this column is fixed"""
+    pytest.importorskip("numpy")
+    m0, x0 = build_knapsack(const=7)
+    x0[0].lb = x0[0].ub = value
+    m0.optimize()
+    best = [v.x for v in m0.vars]
+
+    m, x = build_knapsack(const=7)
+    x[0].lb = x[0].ub = value
+    m.preprocess = 0
+    m.incumbent_updater = FixedSolution(m, best)
+    m.optimize()
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - m0.objective_value) <= TOL
+    assert abs(x[0].x - value) <= TOL
+
+    m, x = build_knapsack(const=7)
+    x[0].lb = x[0].ub = value
+    m.preprocess = 0
+    token = CancelToken()
+    token.cancel()
+    m.optimize(cancel_token=token)
+    assert m.status in (
+        OptimizationStatus.FEASIBLE,
+        OptimizationStatus.NO_SOLUTION_FOUND,
+    )
+    if m.num_solutions:
+        assert abs(x[0].x - value) <= TOL
+
+
+class TupleUpdater(IncumbentUpdater):
+    """uses the list based interface and keeps the solution found by CBC"""
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.calls = 0
+
+    def update_incumbent(self, objective_value, best_bound, solution):
+        self.calls += 1
+        assert all(isinstance(var, Var) and abs(val) > 0 for var, val in solution)
+        return None
+
+
+def test_incumbent_updater_list():
+    pytest.importorskip("numpy")
+    m0, _ = build_knapsack(const=7)
+    m0.optimize()
+
+    m, x = build_knapsack(const=7)
+    updater = TupleUpdater(m)
+    m.incumbent_updater = updater
+    m.optimize()
+    assert updater.calls >= 1
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - m0.objective_value) <= TOL
+
+
+class NoCuts(ConstrsGenerator):
+    """generator that never finds cuts, used to check the scheduling policy"""
+
+    def __init__(self, **policy):
+        for key, value in policy.items():
+            setattr(self, key, value)
+        self.left = []
+
+    def generate_constrs(self, model: Model):
+        self.left.append(self.time_left())
+
+
+@pytest.mark.parametrize(
+    "policy", [{}, {"root_only": True}, {"frequency": 3}, {"backoff": True}]
+)
+def test_generator_schedule(policy):
+    m, x = build_knapsack(60, const=7)
+    m.cuts = 0
+    gen = NoCuts(**policy)
+    m.cuts_generator = gen
+    m.optimize(max_nodes=300)
+
+    st = gen.stats
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert st.rounds >= 3
+    assert st.calls + st.skipped == st.rounds
+    assert st.calls == len(gen.left) and st.cuts == 0
+    assert st.failures == st.calls
+    if policy:
+        assert 1 <= st.calls < st.rounds
+    else:
+        assert st.calls == st.rounds
+
+    # statistics refer to the last optimization
+    m.optimize(max_nodes=300)
+    assert gen.stats.rounds == st.rounds
+
+
+def test_generator_time_budget():
+    m, x = build_knapsack(60, const=7)
+    m.cuts = 0
+    gen = NoCuts(max_seconds=0.0)
+    m.cuts_generator = gen
+    m.optimize(max_nodes=300)
+    assert gen.stats.calls == 0 and gen.stats.skipped == gen.stats.rounds
+
+    gen = NoCuts(max_seconds_call=60.0)
+    m.cuts_generator = gen
+    m.optimize(max_nodes=300)
+    assert gen.stats.calls >= 1
+    assert all(0.0 < left <= 60.0 for left in gen.left)
+
+
+def test_generator_stats_cuts():
+    m, x = build_tsp()
+    gen = TranslatedSubTourCuts(x)
+    m.cuts_generator = gen
+    m.optimize(max_seconds=10)
+
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert gen.stats.calls == gen.calls
+    assert gen.stats.cuts >= 1
+    assert gen.stats.time > 0.0
+
+
+def min_cut_separator(x, task, arcs):
+    """sub-tour elimination cut for one pair of nodes, runs in the worker
+    processes of ParallelConstrsGenerator"""
+    G = nx.DiGraph()
+    for k, (i, j) in enumerate(arcs):
+        G.add_edge(i, j, capacity=x[k])
+    val, (S, NS) = nx.minimum_cut(G, task[0], task[1])
+    if val > 0.99:
+        return []
+    idx = [k for k, (i, j) in enumerate(arcs) if i in S and j in S]
+    return [(idx, [1.0] * len(idx), "<", len(S) - 1)]
+
+
+def sleep_separator(x, task, data):
+    """sleeps task seconds and returns a row depending on x[0]"""
+    time.sleep(task)
+    return [([0], [1.0], "<", x[0] - 1.0)]
+
+
+def pid_separator(x, task, data):
+    """sleeps task seconds and returns a row with the process id"""
+    time.sleep(task)
+    return [([0], [1.0], "<", float(os.getpid()))]
+
+
+def test_parallel_generator():
+    pytest.importorskip("numpy")
+    m, x = build_tsp()
+    arcs = list(ARCS.keys())
+    nodes = sorted(set(i for (i, j) in arcs))
+    pairs = [(u, v) for (u, v) in product(nodes, nodes) if u != v]
+    with ParallelConstrsGenerator(
+        min_cut_separator, pairs, data=arcs, processes=2, timeout=30
+    ) as gen:
+        m.cuts_generator = gen
+        m.optimize(max_seconds=60)
+
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - 262) <= TOL
+    assert gen.calls >= 1 and gen.added >= 1
+    assert gen.added == gen.stats.cuts
+
+
+def test_parallel_generator_deadline():
+    pytest.importorskip("numpy")
+    with ParallelConstrsGenerator(
+        sleep_separator, [0.0, 0.0, 2.0], processes=3, timeout=0.5, chunk_size=1
+    ) as gen:
+        # duplicated rows are discarded and late results are ignored
+        rows = gen.separate([3.0])
+        assert rows == [([0], [1.0], "<", 2.0)]
+        assert gen.timeouts == 1
+
+        gen.tasks = [0.0]
+        time.sleep(2.0)
+        rows = gen.separate([5.0])
+        assert rows == [([0], [1.0], "<", 4.0)]
+
+
+def test_parallel_generator_late_workers():
+    pytest.importorskip("numpy")
+    with ParallelConstrsGenerator(
+        pid_separator, [0.0, 3.0], processes=2, timeout=0.5, chunk_size=1
+    ) as gen:
+        start = time.time()
+        assert len(gen.separate([0.0])) == 1
+        assert gen.timeouts == 1
+
+        # the late worker goes on, the other one runs all tasks
+        gen.tasks = [0.0, 0.0]
+        assert len(gen.separate([1.0])) == 1
+        # the late worker is replaced, both workers run tasks
+        assert len(gen.separate([2.0])) == 2
+        assert gen.timeouts == 1
+        assert time.time() - start < 2.5
@@ -0,0 +1,158 @@
+"""Tests for the column generation driver"""
+import random
+import pytest
+from mip import Model, Column, ColumnsGenerator, ColumnGeneration
+from mip import OptimizationStatus, InvalidParameter, CBC, MINIMIZE, MAXIMIZE
+
+TOL = 1e-5
+
+
+def instance(n: int, seed: int):
+    rnd = random.Random(seed)
+    w = [rnd.randint(10, 45) for i in range(n)]
+    b = [rnd.randint(1, 30) for i in range(n)]
+    return w, b
+
+
+def knapsack(w, L: int, profits):
+    """most profitable pattern of items with weights w in a bar of length L,
+    returns the quantity of each item"""
+    best = [0.0] * (L + 1)
+    last = [-1] * (L + 1)
+    for c in range(1, L + 1):
+        best[c], last[c] = best[c - 1], -1
+        for i, wi in enumerate(w):
+            if wi <= c and best[c - wi] + profits[i] > best[c] + 1e-12:
+                best[c], last[c] = best[c - wi] + profits[i], i
+    pattern, c = [0] * len(w), L
+    while c > 0:
+        if last[c] == -1:
+            c -= 1
+        else:
+            pattern[last[c]] += 1
+            c -= w[last[c]]
+    return pattern
+
+
+class Pricing(ColumnsGenerator):
+    """patterns for bars of length L, with cost L // 100"""
+
+    def __init__(self, w, L: int, sign: float = 1.0):
+        super().__init__()
+        self.w, self.L, self.sign = w, L, sign
+        self.calls = 0
+
+    def generate_columns(self, model, duals):
+        self.calls += 1
+        pattern = knapsack(self.w, self.L, (self.sign * duals).tolist())
+        items = [i for i in range(len(self.w)) if pattern[i]]
+        cost = self.sign * (self.L // 100)
+        name = "p_" + "_".join(str(q) for q in pattern)
+        return [(cost, items, [pattern[i] for i in items], name)]
+
+
+def build_master(w, b, L: int, sense: str = MINIMIZE) -> Model:
+    sign = 1 if sense == MINIMIZE else -1
+    m = Model(sense=sense, solver_name=CBC)
+    m.verbose = 0
+    for i in range(len(w)):
+        m.add_constr(m.add_var(obj=sign * (L // 100)) * (L // w[i]) >= b[i])
+    return m
+
+
+def reference(w, b, L: int) -> float:
+    """optimum of the relaxation computed adding one column at a time"""
+    m = build_master(w, b, L)
+    while True:
+        m.optimize(relax=True)
+        duals = [c.pi for c in m.constrs]
+        pattern = knapsack(w, L, duals)
+        if sum(duals[i] * q for i, q in enumerate(pattern)) <= L // 100 + 1e-9:
+            return m.objective_value
+        m.add_var(obj=L // 100, column=Column(m.constrs, pattern))
+
+
+@pytest.mark.parametrize("sense", [MINIMIZE, MAXIMIZE])
+@pytest.mark.parametrize("smoothing", [0.0, 0.5])
+@pytest.mark.parametrize("max_age", [1, 20])
+def test_cutting_stock(sense: str, smoothing: float, max_age: int):
+    pytest.importorskip("numpy")
+    w, b = instance(15, 0)
+    expected = reference(w, b, 100)
+    sign = 1 if sense == MINIMIZE else -1
+    m = build_master(w, b, 100, sense)
+    pricing = Pricing(w, 100, sign)
+    cg = ColumnGeneration(m, pricing, max_age=max_age, smoothing=smoothing)
+    assert cg.optimize() == OptimizationStatus.OPTIMAL
+    assert abs(sign * m.objective_value - expected) <= TOL
+    assert m.num_cols == len(w) + len(cg.columns)
+    assert cg.added > 0 and cg.iterations >= 2
+    assert cg.added + cg.reused - cg.pruned == len(cg.columns)
+    # variables are named by the generator
+    assert all(v.name.startswith("p_") for v in cg.columns)
+    if max_age == 1:
+        assert cg.pruned > 0
+    assert pricing.calls >= cg.iterations - 1 - cg.reused
+    if smoothing == 0.0:
+        assert cg.mispricings == 0 and pricing.calls <= cg.iterations
+    # the master problem was re-optimized from the previous basis
+    assert all(info.warm_start for info in m.lp_solve_log[1:])
+
+    # no new columns if called again
+    added = cg.added
+    assert cg.optimize() == OptimizationStatus.OPTIMAL
+    assert cg.added == added
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_several_generators(workers: int):
+    """bars of two lengths, with one pricing problem for each one"""
+    pytest.importorskip("numpy")
+    w, b = instance(10, 1)
+    m = build_master(w, b, 100)
+    generators = [Pricing(w, 100), Pricing(w, 200)]
+    with ColumnGeneration(m, generators, workers=workers) as cg:
+        assert cg.optimize() == OptimizationStatus.OPTIMAL
+    costs = {round(v.obj) for v in cg.columns}
+    assert costs <= {1, 2}
+    single = build_master(w, b, 100)
+    ColumnGeneration(single, Pricing(w, 100)).optimize()
+    # longer bars can only reduce the cost
+    assert m.objective_value <= single.objective_value + TOL
+    duals = [c.pi for c in m.constrs]
+    for g in generators:
+        pattern = knapsack(w, g.L, duals)
+        assert sum(duals[i] * q for i, q in enumerate(pattern)) <= g.L // 100 + TOL
+
+
+def test_limits_and_parameters():
+    pytest.importorskip("numpy")
+    w, b = instance(15, 2)
+    m = build_master(w, b, 100)
+    cg = ColumnGeneration(m, Pricing(w, 100))
+    assert cg.optimize(max_iterations=2) == OptimizationStatus.FEASIBLE
+    assert cg.iterations == 2
+    with pytest.raises(InvalidParameter):
+        ColumnGeneration(m, Pricing(w, 100), smoothing=1.0)
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_add_vars_csc(persistent: bool):
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    m.persistent_lp = persistent
+    x = [m.add_var(obj=10) for i in range(3)]
+    for i in range(3):
+        m.add_constr(x[i] >= i + 1)
+    m.optimize(relax=True)
+    new_vars = m.add_vars_csc(
+        [1, 2, 3], [0, 2, 2, 3], [0, 1, 2], [1, 1, 1], ub=[5, 5, 1], names=["a", "", "c"]
+    )
+    assert [v.idx for v in new_vars] == [3, 4, 5]
+    assert [v.name for v in new_vars] == ["a", "var(4)", "c"]
+    assert m.num_cols == 6 and new_vars[2].ub == 1
+    assert new_vars[0].column.coeffs == [1, 1] and not new_vars[1].column.constrs
+    assert m.optimize(relax=True) == OptimizationStatus.OPTIMAL
+    # new_vars[0] covers c[0] and c[1], c[2] also needs x[2]
+    assert abs(m.objective_value - 25) <= TOL
+    assert abs(new_vars[0].x - 2) <= TOL and abs(x[2].x - 2) <= TOL
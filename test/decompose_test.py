@@ -0,0 +1,201 @@
+"""Tests for the decomposition of models in connected components and the
+detection of block structures"""
+import random
+import pytest
+import networkx as nx
+from mip import Model, xsum, OptimizationStatus, InvalidParameter, CancelToken
+from mip import BINARY, INTEGER, CBC, MAXIMIZE
+from mip_knapsack import knapsack_data
+
+TOL = 1e-5
+
+
+def knapsacks(n: int = 3, items: int = 12, seed: int = 0) -> Model:
+    """independent knapsack problems, a variable without constraints and an
+    empty constraint"""
+    m = Model(sense=MAXIMIZE, solver_name=CBC)
+    m.verbose = 0
+    for k in range(n):
+        w, p = knapsack_data(items, seed + k)
+        x = [m.add_var(var_type=BINARY, obj=p[i]) for i in range(items)]
+        m += xsum(w[i] * x[i] for i in range(items)) <= sum(w) // 3
+        # the first items of each knapsack are linked
+        m += x[0] + x[1] <= 1
+    m.add_var(var_type=INTEGER, ub=4.5, obj=2)
+    m.objective_const = 10
+    return m
+
+
+def test_components():
+    pytest.importorskip("numpy")
+    m = knapsacks()
+    m += xsum([]) <= 1
+    comps = m.components()
+    assert comps.num_components == 3
+    assert [len(c) for c in comps.cols] == [12, 12, 12]
+    assert [len(r) for r in comps.rows] == [2, 2, 2]
+    assert comps.col_labels[-1] == -1 and comps.row_labels[-1] == -1
+    assert comps.col_labels[:12].tolist() == [0] * 12
+    block = comps.block(1)
+    assert block.num_cols == 12 and block.num_rows == 2
+    assert block.indices.max() == 11
+
+    # components of a random sparse matrix
+    rnd = random.Random(1)
+    m = Model(solver_name=CBC)
+    x = [m.add_var() for i in range(200)]
+    G = nx.Graph()
+    for i in range(120):
+        cols = rnd.sample(range(200), rnd.randint(1, 3))
+        m += xsum(x[j] for j in cols) <= 1
+        G.add_nodes_from(cols)
+        G.add_edges_from((cols[0], j) for j in cols[1:])
+    comps = m.components()
+    expected = list(nx.connected_components(G))
+    assert comps.num_components == len(expected)
+    assert {frozenset(c.tolist()) for c in comps.cols} == set(map(frozenset, expected))
+    assert (comps.col_labels >= 0).sum() == G.number_of_nodes()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decompose(workers):
+    pytest.importorskip("numpy")
+    expected = knapsacks()
+    expected.optimize()
+
+    m = knapsacks()
+    comps = m.components()
+    assert comps.optimize(workers) == OptimizationStatus.OPTIMAL
+    assert abs(comps.solution.objective_value - expected.objective_value) <= TOL
+    assert abs(comps.solution.objective_bound - expected.objective_value) <= TOL
+    # the variable without constraints is at its best integer bound
+    assert abs(comps.solution.x[-1] - 4) <= TOL
+
+    assert m.optimize(decompose=True) == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - expected.objective_value) <= TOL
+    assert abs(m.objective.x - expected.objective_value) <= TOL
+    assert m.num_solutions == 1 and m.gap <= TOL
+    for c in m.constrs:
+        assert c.slack >= -TOL
+        act = sum(coef * var.x for (var, coef) in c.expr.expr.items())
+        assert abs(c.slack - (-c.expr.const - act)) <= TOL
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decompose_limits(workers):
+    pytest.importorskip("numpy")
+    expected = knapsacks()
+    expected.optimize()
+
+    # the time limit is divided among the components
+    comps = knapsacks().components()
+    assert comps.optimize(workers, max_seconds=30) == OptimizationStatus.OPTIMAL
+    assert abs(comps.solution.objective_value - expected.objective_value) <= TOL
+
+    # components are not optimized after the cancellation
+    token = CancelToken()
+    token.cancel()
+    status = comps.optimize(workers, cancel_token=token)
+    assert status == OptimizationStatus.NO_SOLUTION_FOUND
+    assert comps.solution.x is None
+
+    m = knapsacks()
+    status = m.optimize(decompose=True, cancel_token=token)
+    assert status == OptimizationStatus.NO_SOLUTION_FOUND
+    assert m.num_solutions == 0
+
+
+def test_infeasible():
+    pytest.importorskip("numpy")
+    m = knapsacks()
+    x = m.vars[0]
+    m += x >= 1
+    m += m.vars[1] >= 1
+    assert m.optimize(decompose=True) == OptimizationStatus.INFEASIBLE
+    assert m.num_solutions == 0
+
+    m = knapsacks()
+    m.add_var(lb=-10, obj=-1)
+    m.add_var(obj=1)
+    assert m.components().optimize(1) == OptimizationStatus.UNBOUNDED
+
+
+def linked_knapsacks(dense: bool, n: int = 4, items: int = 10, seed: int = 0):
+    """knapsack blocks with three constraints each, linked by two constraints
+    with all variables (dense) or by one constraint for each item with the
+    item of each block"""
+    rnd = random.Random(seed)
+    m = Model(sense=MAXIMIZE, solver_name=CBC)
+    m.verbose = 0
+    x = []
+    for k in range(n):
+        x.append(
+            [m.add_var(var_type=BINARY, obj=rnd.randint(1, 20)) for i in range(items)]
+        )
+        for r in range(3):
+            m += xsum(rnd.randint(1, 9) * v for v in x[k]) <= 20
+    if dense:
+        m += xsum(v for xk in x for v in xk) <= 10
+        m += xsum(rnd.randint(1, 3) * v for xk in x for v in xk) <= 20
+    else:
+        for i in range(items):
+            m += xsum(x[k][i] for k in range(n)) <= 1
+    return m
+
+
+def check_structure(m: Model, bbd):
+    """checks that constraints of blocks have only variables of their blocks
+    and that linking constraints have variables of several blocks"""
+    assert sorted(bbd.row_perm.tolist()) == list(range(m.num_rows))
+    assert sorted(bbd.col_perm.tolist()) == list(range(m.num_cols))
+    for c in m.constrs:
+        blocks = {bbd.col_labels[v.idx] for v in c.expr.expr}
+        if c.idx in bbd.linking_rows.tolist():
+            assert len(blocks) > 1
+        else:
+            assert blocks == {bbd.row_labels[c.idx]}
+    area = len(bbd.linking_rows) * m.num_cols
+    area += sum(r * c for (r, c) in bbd.block_sizes)
+    assert abs(bbd.score - (1 - area / (m.num_rows * m.num_cols))) <= TOL
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_detect_blocks(dense):
+    pytest.importorskip("numpy")
+    m = linked_knapsacks(dense)
+    bbd = m.detect_blocks(max_linking=0.5)
+    check_structure(m, bbd)
+    assert bbd.num_blocks == 4 and bbd.block_sizes == [(3, 10)] * 4
+    linking = list(range(12, m.num_rows))
+    assert bbd.linking_rows.tolist() == linking
+    indptr, indices, coefs, senses, rhs = bbd.linking()
+    assert len(rhs) == len(linking) and indptr[-1] == len(indices)
+    assert indices.tolist() == [v.idx for i in linking for v in m.constrs[i].expr.expr]
+
+    # the blocks, without the linking constraints, are a relaxation
+    m.optimize()
+    bound = 0
+    for (k, sub) in enumerate(bbd.submodels()):
+        sub.verbose = 0
+        assert sub.optimize() == OptimizationStatus.OPTIMAL
+        assert sub.num_cols == 10 and sub.num_rows == 3
+        bound += sub.objective_value
+    assert bound >= m.objective_value - TOL
+
+    bbd = m.detect_blocks(num_blocks=2, max_linking=0.5)
+    check_structure(m, bbd)
+    assert bbd.block_sizes == [(6, 20)] * 2
+    assert bbd.linking_rows.tolist() == linking
+
+
+def test_no_structure():
+    pytest.importorskip("numpy")
+    m = Model(solver_name=CBC)
+    x = [m.add_var() for i in range(5)]
+    m += xsum(x) <= 3
+    m += x[0] + x[4] >= 1
+    bbd = m.detect_blocks()
+    assert bbd.num_blocks == 1 and not len(bbd.linking_rows)
+    assert bbd.score == 0.0
+    with pytest.raises(InvalidParameter):
+        m.detect_blocks(num_blocks=1)
@@ -0,0 +1,102 @@
+"""Tests for the Lagrangian relaxation of models with linking constraints"""
+import random
+import pytest
+from mip import Model, xsum, OptimizationStatus, InvalidParameter
+from mip import LagrangianRelaxation, BINARY, CBC, MAXIMIZE, MINIMIZE
+
+TOL = 1e-5
+
+
+def assignment(sense: str = MAXIMIZE, jobs: int = 12, machines: int = 3, seed=0):
+    """generalized assignment problem, returns the model and the constraints
+    that assign each job to at most one machine"""
+    rnd = random.Random(seed)
+    m = Model(sense=sense, solver_name=CBC)
+    m.verbose = 0
+    s = 1 if sense == MAXIMIZE else -1
+    x = [
+        [m.add_var(var_type=BINARY, obj=s * rnd.randint(5, 30)) for j in range(jobs)]
+        for i in range(machines)
+    ]
+    for i in range(machines):
+        w = [rnd.randint(5, 25) for j in range(jobs)]
+        m += xsum(w[j] * x[i][j] for j in range(jobs)) <= sum(w) // machines
+    constrs = [
+        m.add_constr(xsum(x[i][j] for i in range(machines)) <= 1) for j in range(jobs)
+    ]
+    m.objective_const = s * 5
+    return m, constrs
+
+
+def repair(x):
+    """keeps only the first machine of each job"""
+    x = x.round().reshape(3, -1)
+    x[1:] *= x[0] < 0.5
+    x[2] *= x[1] < 0.5
+    return x.ravel()
+
+
+@pytest.mark.parametrize("method", ["polyak", "volume"])
+def test_lagrangian(method):
+    pytest.importorskip("numpy")
+    m, constrs = assignment()
+    m.optimize(relax=True)
+    lp = m.objective_const + sum(v.obj * v.x for v in m.vars)
+    m.optimize()
+    opt = m.objective_value
+
+    m, constrs = assignment()
+    lr = LagrangianRelaxation(m, constrs, method=method, heuristic=repair)
+    assert lr.num_blocks == 3 and lr.rows.tolist() == [c.idx for c in constrs]
+    status = lr.optimize(max_iterations=100)
+    assert status in (OptimizationStatus.OPTIMAL, OptimizationStatus.FEASIBLE)
+    assert opt - TOL <= lr.bound <= lp + TOL
+    assert lr.incumbent <= opt + TOL
+    value = m.objective_const + lr.incumbent_x @ [v.obj for v in m.vars]
+    assert abs(value - lr.incumbent) <= TOL
+    # multipliers of constraints <= are non-negative
+    assert (lr.best_multipliers >= 0).all()
+    bound, x = lr.evaluate(lr.best_multipliers)
+    assert abs(bound - lr.bound) <= TOL
+    assert len(lr.log.log) == lr.iterations - 1
+    upper = [ub for (t, (lb, ub)) in lr.log.log]
+    assert abs(upper[-1] - lr.bound) <= TOL
+    assert all(a >= b - TOL for (a, b) in zip(upper, upper[1:]))
+    lr.close()
+
+    # the same problem, minimizing
+    m, constrs = assignment(MINIMIZE)
+    with LagrangianRelaxation(m, constrs, method=method) as mlr:
+        mlr.optimize(max_iterations=20)
+        lr = LagrangianRelaxation(assignment()[0], constrs, method=method)
+        lr.optimize(max_iterations=20)
+        assert abs(mlr.bound + lr.bound) <= TOL
+        assert abs(mlr.log.log[-1][1][0] + lr.log.log[-1][1][1]) <= TOL
+
+
+def test_workers():
+    pytest.importorskip("numpy")
+    m, constrs = assignment()
+    lr = LagrangianRelaxation(m, constrs)
+    lr.optimize(max_iterations=10)
+    with LagrangianRelaxation(m, constrs, workers=2) as plr:
+        plr.optimize(max_iterations=10)
+        assert abs(plr.bound - lr.bound) <= TOL
+        assert (abs(plr.multipliers - lr.multipliers) <= TOL).all()
+
+
+def test_invalid():
+    pytest.importorskip("numpy")
+    m, constrs = assignment()
+    with pytest.raises(InvalidParameter):
+        LagrangianRelaxation(m, constrs, method="bundle")
+    # variable only in a dualized constraint, without upper bound
+    y = m.add_var()
+    m += m.vars[0] + y <= 1
+    with pytest.raises(InvalidParameter):
+        LagrangianRelaxation(m, [m.constrs[-1]])
+
+    m, constrs = assignment()
+    m += m.vars[0] + m.vars[1] >= 3
+    lr = LagrangianRelaxation(m, constrs)
+    assert lr.optimize() == OptimizationStatus.INFEASIBLE
@@ -0,0 +1,135 @@
+"""Tests for the re-optimization of linear programs starting from the basis
+of the previous optimization"""
+from os.path import join
+import pytest
+from mip import Model, xsum, Column, OptimizationStatus, CBC, MINIMIZE, MAXIMIZE, INF
+
+TOL = 1e-6
+
+DATA_DIR = join("test", "data")
+
+
+def build(sense: str) -> Model:
+    m = Model(sense=sense, solver_name=CBC)
+    m.verbose = 0
+    x = [m.add_var(ub=4) for i in range(4)]
+    m.objective = xsum(c * x[i] for (i, c) in enumerate([1, 2, 3, 1])) + 5
+    if sense == MINIMIZE:
+        m += x[0] + x[1] + x[2] >= 2
+    else:
+        m += x[0] + x[1] + x[2] <= 5
+    m += x[1] + x[3] == 3
+    m += x[0] - x[2] <= 1
+    return m
+
+
+def changes(m: Model):
+    """changes applied to the model between optimizations"""
+    x = m.vars
+    maximizing = m.sense == MAXIMIZE
+
+    def new_bound():
+        x[3].ub = 1
+
+    def new_constr():
+        m.add_constr(x[0] + x[3] <= 3)
+
+    def new_var():
+        m.add_var(obj=2 if maximizing else -2, ub=1, column=Column([m.constrs[1]], [1]))
+
+    def new_rhs():
+        m.constrs[2].rhs = 0.5 if maximizing else -1
+
+    def new_obj():
+        x[0].obj = 5 if maximizing else -1
+
+    def removal():
+        m.remove([m.constrs[0], x[2]])
+
+    def new_objective():
+        m.objective = xsum(m.vars) + 1
+        m.add_constr(xsum(m.vars) >= 1.5)
+
+    return [new_bound, new_constr, new_var, new_rhs, new_obj, removal, new_objective]
+
+
+@pytest.mark.parametrize("sense", [MINIMIZE, MAXIMIZE])
+def test_persistent_lp(sense: str):
+    """the persistent linear programming solver follows the changes in the
+    model, producing the same results of optimizations from scratch"""
+    m = build(sense)
+    m.persistent_lp = True
+    scratch = build(sense)
+    for change, scratch_change in [(None, None)] + list(
+        zip(changes(m), changes(scratch))
+    ):
+        if change is not None:
+            change()
+            scratch_change()
+        status = m.optimize(relax=True)
+        assert status == scratch.optimize(relax=True)
+        if status != OptimizationStatus.OPTIMAL:
+            assert m.objective_value is None
+            continue
+        assert abs(m.objective_value - scratch.objective_value) <= TOL
+        x = [v.x for v in m.vars]
+        obj = m.objective_const + sum(v.obj * x[v.idx] for v in m.vars)
+        assert abs(obj - m.objective_value) <= TOL
+        for constr in m.constrs:
+            expr = constr.expr
+            lhs = expr.const + sum(c * x[var.idx] for (var, c) in expr.expr.items())
+            slack = {"<": -lhs, ">": lhs, "=": -abs(lhs)}[expr.sense]
+            assert abs(constr.slack - slack) <= TOL
+
+    log = m.lp_solve_log
+    assert len(log) == len(changes(m)) + 1
+    assert not log[0].warm_start and log[0].iterations is None
+    assert all(info.warm_start and info.iterations >= 0 for info in log[1:])
+    assert all(info.time >= 0 for info in log)
+    assert [info.status for info in log] == [
+        info.status for info in scratch.lp_solve_log
+    ]
+    assert not any(info.warm_start for info in scratch.lp_solve_log)
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_lp_status(persistent: bool):
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    m.persistent_lp = persistent
+    x = m.add_var(lb=-INF)
+    m.objective = x
+    c = m.add_constr(x <= 1)
+    assert m.optimize(relax=True) == OptimizationStatus.UNBOUNDED
+    x.lb = 0
+    assert m.optimize(relax=True) == OptimizationStatus.OPTIMAL
+    assert abs(c.slack - 1) <= TOL and abs(c.pi) <= TOL
+    c.rhs = -1
+    assert m.optimize(relax=True) == OptimizationStatus.INFEASIBLE
+    c.rhs = 2
+    x.lb = 1
+    assert m.optimize(relax=True) == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - 1) <= TOL
+
+
+def test_persistent_lp_new_rows():
+    """constraints cutting the solution of the relaxation of lseu, the
+    relaxation is re-optimized from the previous basis"""
+    m = Model(solver_name=CBC)
+    m.read(join(DATA_DIR, "lseu.mps.gz"))
+    m.verbose = 0
+    m.persistent_lp = True
+    assert m.optimize(relax=True) == OptimizationStatus.OPTIMAL
+    bound = m.objective_value
+    for _ in range(5):
+        support = [v for v in m.vars if v.x >= 0.1]
+        m += xsum(support) <= sum(v.x for v in support) - 0.1
+        assert m.optimize(relax=True) == OptimizationStatus.OPTIMAL
+        assert m.objective_value >= bound - TOL
+        bound = m.objective_value
+        assert m.lp_solve_log[-1].warm_start
+
+    scratch = m.copy()
+    scratch.verbose = 0
+    assert scratch.optimize(relax=True) == OptimizationStatus.OPTIMAL
+    assert abs(scratch.objective_value - bound) <= 1e-4
@@ -0,0 +1,41 @@
+"""Creates multi-dimensional knapsack instances with fixed data, used in the
+tests of optimizations in threads, worker processes and caches"""
+from mip import Model, xsum, BINARY, CBC, MAXIMIZE
+
+
+def knapsack_data(n: int, seed: int = 0):
+    """weights and profits of n items"""
+    w = [(17 * i + seed) % 89 + 10 for i in range(n)]
+    p = [w[i] + (31 * i + seed) % 23 for i in range(n)]
+    return w, p
+
+
+def build_knapsack(
+    n: int = 40,
+    seed: int = 0,
+    dims: int = 2,
+    const: float = 0.0,
+    names: bool = False,
+    reverse: bool = False,
+    solver_name: str = CBC,
+):
+    """Creates a knapsack model with n items and dims capacity constraints:
+    all items, items with even indexes and every third item starting at
+    the second one. Constraints are named cap, cap_even and cap_third and,
+    if names is True, variables are named x(i). With reverse the terms of
+    the expressions are added in reverse order. Returns the model and its
+    variables."""
+    w, p = knapsack_data(n, seed)
+    m = Model(sense=MAXIMIZE, solver_name=solver_name)
+    m.verbose = 0
+    x = [
+        m.add_var("x({})".format(i) if names else "", var_type=BINARY)
+        for i in range(n)
+    ]
+    order = list(reversed(range(n))) if reverse else list(range(n))
+    m.objective = xsum(p[i] * x[i] for i in order) + const
+    caps = [("cap", 0, 1, 3), ("cap_even", 0, 2, 5), ("cap_third", 1, 3, 7)]
+    for (name, first, step, div) in caps[:dims]:
+        items = [i for i in order if i >= first and (i - first) % step == 0]
+        m += xsum(w[i] * x[i] for i in items) <= sum(w) // div, name
+    return m, x
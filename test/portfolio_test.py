@@ -0,0 +1,68 @@
+"""Tests for the optimization of portfolios of configurations"""
+from os.path import join
+import pytest
+from mip import Model, OptimizationStatus, CBC
+from mip import InvalidParameter
+from mip_knapsack import build_knapsack
+
+TOL = 1e-4
+
+DATA_DIR = join("test", "data")
+
+
+def read_lseu() -> Model:
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    m.read(join(DATA_DIR, "lseu.mps.gz"))
+    return m
+
+
+@pytest.mark.parametrize("build", [read_lseu, lambda: build_knapsack(40, const=10)[0]])
+def test_portfolio(build):
+    pytest.importorskip("numpy")
+    m = build()
+    m.optimize()
+    expected = m.objective_value
+
+    m = build()
+    configs = [{"seed": 1}, {"seed": 2, "emphasis": 1}, {"cuts": 0, "preprocess": 0}]
+    result = m.optimize_portfolio(configs, workers=2)
+    assert result.status == OptimizationStatus.OPTIMAL
+    assert abs(result.objective_value - expected) <= TOL
+    assert abs(result.objective_bound - expected) <= TOL
+    assert result.config == configs[result.index]
+    assert result.solutions[result.index].status == OptimizationStatus.OPTIMAL
+    obj = sum(coef * result.x[var.idx] for var, coef in m.objective.expr.items())
+    assert abs(obj + m.objective_const - expected) <= TOL
+    # the model is not changed
+    assert m.status == OptimizationStatus.LOADED
+
+
+def test_portfolio_invalid_setting():
+    pytest.importorskip("numpy")
+    m = read_lseu()
+    with pytest.raises(InvalidParameter):
+        m.optimize_portfolio([{"seed": 1}, {"cuts_generator": None}])
+    with pytest.raises(InvalidParameter):
+        m.optimize_portfolio([])
+
+
+def test_incumbent_source():
+    """a solution informed by the incumbent source is used to prune the
+    search and returned if it is not improved"""
+    np = pytest.importorskip("numpy")
+    m = read_lseu()
+    m.optimize()
+    solution = (m.objective_value, np.array([v.x for v in m.vars]))
+
+    m = read_lseu()
+    calls = []
+
+    def source():
+        calls.append(1)
+        return solution if len(calls) == 1 else None
+
+    m.solver.set_incumbent_source(source)
+    assert m.optimize() == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - solution[0]) <= TOL
+    assert calls
@@ -0,0 +1,170 @@
+"""Tests for the presolve of models in numpy arrays"""
+from itertools import product
+import pytest
+import networkx as nx
+from mip import Model, xsum, Presolve, ConstrsGenerator, ProgrammingError
+from mip import OptimizationStatus, BINARY, INTEGER, CBC, MAXIMIZE, MINIMIZE
+
+TOL = 1e-5
+
+ARCS = {
+    (0, 1): 12,
+    (1, 0): 14,
+    (0, 2): 30,
+    (2, 0): 28,
+    (1, 2): 9,
+    (2, 1): 11,
+    (1, 3): 25,
+    (3, 1): 22,
+    (2, 3): 7,
+    (3, 2): 8,
+    (3, 4): 16,
+    (4, 3): 15,
+    (4, 0): 19,
+    (0, 4): 21,
+    (2, 4): 33,
+    (4, 2): 30,
+}
+
+
+def build(sense: str = MINIMIZE) -> Model:
+    """small model with a fixed variable, a constraint with a single
+    variable, duplicate constraints and duplicate variables"""
+    m = Model(sense=sense, solver_name=CBC)
+    m.verbose = 0
+    x = [m.add_var(name="x{}".format(i), var_type=INTEGER, ub=10) for i in range(4)]
+    y = m.add_var(name="y", lb=2, ub=2)
+    z = [m.add_var(name="z{}".format(i), ub=4, obj=1) for i in range(2)]
+    c = [3, -2, 5, 4] if sense == MINIMIZE else [-3, 2, -5, -4]
+    m.objective = xsum(c[i] * x[i] for i in range(4)) + 2 * y + z[0] + z[1]
+    m += x[0] + x[1] + x[2] + y >= 7, "cover"
+    m += 2 * x[0] + 2 * x[1] + 2 * x[2] + 2 * y >= 9, "cover2"
+    m += 3 * x[1] - x[2] + z[0] + z[1] <= 12, "cap"
+    m += x[3] >= 2, "single"
+    m += x[0] - x[3] + z[0] + z[1] >= 1, "link"
+    return m
+
+
+def check(m: Model, pre: Presolve):
+    """checks that the postsolved solution is feasible and optimal in the
+    original model"""
+    m.optimize()
+    assert pre.optimize() == m.status == OptimizationStatus.OPTIMAL
+    x = pre.solution.x
+    assert len(x) == m.num_cols
+    for c in m.constrs:
+        act = sum(coef * x[v.idx] for (v, coef) in c.expr.expr.items())
+        rhs = -c.expr.const
+        assert c.expr.sense != "<" or act <= rhs + TOL
+        assert c.expr.sense != ">" or act >= rhs - TOL
+        assert c.expr.sense != "=" or abs(act - rhs) <= TOL
+    for v in m.vars:
+        assert v.lb - TOL <= x[v.idx] <= v.ub + TOL
+    obj = m.objective_const + sum(v.obj * x[v.idx] for v in m.vars)
+    assert abs(obj - m.objective.x) <= TOL
+    assert abs(pre.solution.objective_value - obj) <= TOL
+
+
+@pytest.mark.parametrize("sense", [MINIMIZE, MAXIMIZE])
+def test_presolve(sense):
+    pytest.importorskip("numpy")
+    m = build(sense)
+    pre = m.presolve()
+    assert pre.status is None
+    # y is fixed, the duplicate z variables are merged and x[3] >= 2 and
+    # one of the cover constraints are removed
+    assert pre.fixed_cols >= 1 and pre.merged_cols == 1
+    assert pre.removed_rows >= 2 and pre.tightened_bounds >= 1
+    assert pre.reduced.num_cols == m.num_cols - pre.removed_cols
+    assert pre.reduced.num_rows < m.num_rows
+    assert len(pre.col_map) == pre.model.num_cols
+    assert m.var_by_name("y").idx not in pre.col_map.tolist()
+    check(m, pre)
+    # the original model is not changed
+    assert m.num_cols == 7 and m.num_rows == 5
+
+
+def test_primal_only():
+    pytest.importorskip("numpy")
+    m = build()
+    pre = m.presolve(dual=False)
+    assert pre.merged_cols == 0
+    check(m, pre)
+    # rows of the original model are translated to the presolved model
+    y, z0, x0 = m.var_by_name("y"), m.var_by_name("z0"), m.var_by_name("x0")
+    indptr, indices, coefs, senses, rhs = pre.translate(
+        [0, 3], [x0.idx, y.idx, z0.idx], [1.0, 2.0, 1.0], ["<"], [10.0]
+    )
+    assert indptr.tolist() == [0, 2]
+    assert pre.col_map[indices].tolist() == [x0.idx, z0.idx]
+    assert abs(rhs[0] - 6.0) <= TOL
+
+    pre = m.presolve()
+    with pytest.raises(ProgrammingError):
+        pre.translate([0, 1], [z0.idx], [1.0], ["<"], [1.0])
+
+
+def test_infeasible():
+    pytest.importorskip("numpy")
+    m = build()
+    x = m.var_by_name("x3")
+    m += x <= 1
+    pre = m.presolve()
+    assert pre.status == OptimizationStatus.INFEASIBLE
+    assert pre.optimize() == OptimizationStatus.INFEASIBLE
+    assert pre.solution.x is None
+
+
+class SubTours(ConstrsGenerator):
+    """sub-tour elimination constraints written for the original model"""
+
+    def __init__(self, x):
+        super().__init__()
+        self.x = x
+        self.calls = 0
+
+    def generate_constrs(self, model: Model):
+        self.calls += 1
+        arcs = list(self.x.keys())
+        xf = model.translate([self.x[a] for a in arcs])
+        G = nx.DiGraph()
+        for a, v in zip(arcs, xf):
+            G.add_edge(a[0], a[1], capacity=v.x)
+        for (u, v) in product(G.nodes, G.nodes):
+            if u == v:
+                continue
+            val, (S, NS) = nx.minimum_cut(G, u, v)
+            if val <= 0.99:
+                model += xsum(self.x[a] for a in arcs if a[0] in S and a[1] in S) <= (
+                    len(S) - 1
+                )
+                return
+
+
+def test_lazy_constraints():
+    pytest.importorskip("numpy")
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    x = {a: m.add_var(var_type=BINARY) for a in ARCS}
+    m.objective = xsum(c * x[a] for a, c in ARCS.items())
+    for i in range(5):
+        m += xsum(x[a] for a in ARCS if a[0] == i) == 1
+        m += xsum(x[a] for a in ARCS if a[1] == i) == 1
+    # fixed arcs are moved to the right hand side of the lazy constraints
+    x[2, 4].ub = 0
+    x[3, 4].lb = 1
+    m.lazy_constrs_generator = SubTours(x)
+    m.optimize()
+    assert m.status == OptimizationStatus.OPTIMAL
+    expected = m.objective_value
+
+    pre = m.presolve()
+    assert not pre.dual and pre.fixed_cols >= 2
+    m.lazy_constrs_generator.calls = 0
+    assert pre.optimize() == OptimizationStatus.OPTIMAL
+    assert abs(pre.solution.objective_value - expected) <= TOL
+    assert m.lazy_constrs_generator.calls > 0
+    # the solution is a tour
+    arcs = [a for a in ARCS if pre.solution.x[x[a].idx] >= 0.99]
+    G = nx.DiGraph(arcs)
+    assert len(arcs) == 5 and nx.is_strongly_connected(G)
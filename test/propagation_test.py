@@ -0,0 +1,134 @@
+"""Tests for the bound propagation and the reduction of big-M coefficients"""
+import random
+import pytest
+from mip import Model, xsum, LinExpr, ConstrsGenerator, OptimizationStatus
+from mip import BINARY, INTEGER, CBC
+
+TOL = 1e-5
+
+
+def facility_location(seed: int = 0, big_m: float = 1000) -> Model:
+    """facility location with demands d and constraints x[i][j] <= M y[i],
+    x[i][j] is bounded by d[j] only after the propagation"""
+    rnd = random.Random(seed)
+    nf, nc = 6, 15
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    y = [m.add_var(var_type=BINARY, obj=rnd.randint(100, 300)) for i in range(nf)]
+    x = [[m.add_var(obj=rnd.randint(1, 30)) for j in range(nc)] for i in range(nf)]
+    d = [rnd.randint(5, 20) for j in range(nc)]
+    for j in range(nc):
+        m += xsum(x[i][j] for i in range(nf)) == d[j]
+    for i in range(nf):
+        for j in range(nc):
+            m += x[i][j] <= big_m * y[i]
+    return m
+
+
+def test_propagation():
+    pytest.importorskip("numpy")
+    m = facility_location()
+    expected = facility_location()
+    expected.optimize()
+    # infinite bounds may be returned as the largest float
+    ub = [min(v.ub, 1e30) for v in m.vars]
+    prop = m.propagate_bounds(apply=False)
+    assert prop.status is None and prop.rounds >= 1
+    # upper bounds of all x variables
+    assert prop.tightened_bounds >= 6 * 15 and len(prop.changed()) == 6 * 15
+    assert [min(v.ub, 1e30) for v in m.vars] == ub
+    # all big-M coefficients can be reduced
+    assert prop.coefs_reduced == 6 * 15 and len(prop.strengthened) == 6 * 15
+
+    assert m.propagate_bounds().tightened_bounds == prop.tightened_bounds
+    for j in prop.changed().tolist():
+        assert abs(m.vars[j].ub - prop.ub[j]) <= TOL
+    # the strengthened constraints are x[i][j] <= d[j] y[i]
+    indptr, indices, coefs, senses, rhs = prop.rows()
+    for k, i in enumerate(prop.strengthened.tolist()):
+        constr = m.constrs[i]
+        row = LinExpr(
+            [m.vars[j] for j in indices[indptr[k] : indptr[k + 1]].tolist()],
+            coefs[indptr[k] : indptr[k + 1]].tolist(),
+            -rhs[k],
+            senses[k],
+        )
+        y = [var for var in row.expr if var.var_type == BINARY]
+        x = [var for var in row.expr if var.var_type != BINARY]
+        assert len(y) == len(x) == 1 and abs(constr.expr.expr[y[0]]) == 1000
+        # the coefficient of y is reduced to the upper bound of x
+        assert abs(abs(row.expr[y[0]]) - x[0].ub) <= TOL
+        m += row
+
+    m.optimize(relax=True)
+    relaxation = m.objective_value
+    base = facility_location()
+    base.optimize(relax=True)
+    assert relaxation >= base.objective_value + 1
+    m.optimize()
+    assert abs(m.objective_value - expected.objective_value) <= TOL
+
+
+def test_integer_bounds():
+    pytest.importorskip("numpy")
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    x = m.add_var(var_type=INTEGER)
+    y = m.add_var(var_type=INTEGER)
+    z = m.add_var(lb=-10)
+    m += 2 * x + 3 * y <= 7
+    m += z - x >= 0
+    prop = m.propagate_bounds()
+    assert (x.lb, x.ub, y.ub) == (0, 3, 2)
+    assert abs(z.lb) <= TOL
+    assert prop.coefs_reduced == 0 and len(prop.rows()[0]) == 1
+
+    m += x + y >= 6
+    prop = m.propagate_bounds()
+    assert prop.status == OptimizationStatus.INFEASIBLE
+    assert prop.apply(m) == 0
+
+
+class RootPropagation(ConstrsGenerator):
+    """adds the tightened bounds and strengthened constraints as cuts"""
+
+    root_only = True
+
+    def __init__(self):
+        super().__init__()
+        self.reduced = 0
+
+    def generate_constrs(self, model: Model):
+        self.reduced += model.propagate_bounds().coefs_reduced
+
+
+class MaxOpen(ConstrsGenerator):
+    """lazy constraint limiting the number of open facilities"""
+
+    def __init__(self, y, limit: int):
+        super().__init__()
+        self.y, self.limit = y, limit
+
+    def generate_constrs(self, model: Model):
+        y = model.translate(self.y)
+        if sum(v.x for v in y) >= self.limit + 0.5:
+            model += xsum(y) <= self.limit
+
+
+def test_root_cuts():
+    pytest.importorskip("numpy")
+    expected = facility_location(1)
+    y = [v for v in expected.vars if v.var_type == BINARY]
+    expected += xsum(y) <= 2
+    expected.optimize()
+
+    m = facility_location(1)
+    y = [v for v in m.vars if v.var_type == BINARY]
+    # lazy constraints disable the pre-processing, so that big-M
+    # coefficients remain in the root node
+    m.lazy_constrs_generator = MaxOpen(y, 2)
+    m.cuts_generator = RootPropagation()
+    m.optimize()
+    assert m.status == OptimizationStatus.OPTIMAL
+    assert abs(m.objective_value - expected.objective_value) <= TOL
+    assert m.cuts_generator.reduced > 0 and m.cuts_generator.stats.cuts > 0
@@ -1,11 +1,15 @@
 """Set of tests for solving the LP relaxation"""
 
+import asyncio
 from glob import glob
 from os import environ
 import json
 from itertools import product
+from threading import Thread, Timer
+from time import time
 import pytest
-from mip import CBC, GUROBI, OptimizationStatus
+from mip import CBC, GUROBI, OptimizationStatus, CancelToken, InvalidParameter
+from mip import ProgressStream
 from mip_rcpsp import create_mip
 
 INSTS = glob("./data/rcpsp*.json") + glob("./test/data/rcpsp*.json")
@@ -121,3 +125,160 @@ def test_rcpsp_mipstart(solver: str, instance: str):
     assert mip.status in [OptimizationStatus.FEASIBLE, 
                           OptimizationStatus.OPTIMAL]
     assert abs(mip.objective_value - z_ub) <= TOL
+
+
+@pytest.mark.parametrize("instance", [i for i in INSTS if "rcpsp-5-" in i][:3])
+def test_rcpsp_branch_priorities(instance: str):
+    """tests that branching priorities do not change the optimal solution"""
+    with open(instance, "r") as finst:
+        data = json.load(finst)
+    args = [data[k] for k in ["J", "d", "S", "c", "r", "EST"]]
+    mip = create_mip(CBC, *args, False)
+    mip.verbose = 0
+    mip.optimize()
+    assert mip.status == OptimizationStatus.OPTIMAL
+    z = mip.objective_value
+
+    # earliest times first, exploring the down branch first
+    mip = create_mip(CBC, *args, False)
+    mip.verbose = 0
+    t = [int(v.name.split(",")[1][:-1]) for v in mip.vars]
+    mip.set_branch_priorities([1 + tv for tv in t], [-1] * len(t))
+    mip.optimize()
+    assert mip.status == OptimizationStatus.OPTIMAL
+    assert abs(mip.objective_value - z) <= TOL
+
+    # priorities removed
+    mip.set_branch_priorities(None)
+    mip.optimize()
+    assert mip.status == OptimizationStatus.OPTIMAL
+    assert abs(mip.objective_value - z) <= TOL
+
+    with pytest.raises(InvalidParameter):
+        mip.set_branch_priorities(t[1:])
+
+
+@pytest.mark.parametrize(
+    "limit",
+    [
+        {"max_seconds_same_incumbent": 1.0},
+        {"max_nodes_same_incumbent": 50},
+        {"min_gap_improvement_rate": 0.05},
+    ],
+)
+def test_rcpsp_stall_limits(limit):
+    """tests stopping criteria based on the progress of the search in an
+    instance that is not solved quickly"""
+    instance = [i for i in INSTS if i.endswith("rcpsp-10-3.json")][0]
+    with open(instance, "r") as finst:
+        data = json.load(finst)
+    args = [data[k] for k in ["J", "d", "S", "c", "r", "EST"]]
+    mip = create_mip(CBC, *args, False)
+    mip.verbose = 0
+    start = time()
+    mip.optimize(max_seconds=120, **limit)
+    assert time() - start < 100
+    assert mip.status == OptimizationStatus.FEASIBLE
+    assert data["z_relax"] - TOL <= mip.objective_bound
+    assert mip.objective_bound < mip.objective_value - TOL
+    assert mip.objective_value >= data["z_ub"] - TOL
+
+    # limits are not kept for the next optimization
+    mip.optimize(max_nodes=0)
+    assert mip.status == OptimizationStatus.FEASIBLE
+
+
+@pytest.mark.parametrize("mode", ["interrupt", "token"])
+def test_rcpsp_interrupt(mode):
+    """stops, from another thread, the optimization of an instance that is
+    not solved quickly"""
+    instance = [i for i in INSTS if i.endswith("rcpsp-10-3.json")][0]
+    with open(instance, "r") as finst:
+        data = json.load(finst)
+    args = [data[k] for k in ["J", "d", "S", "c", "r", "EST"]]
+    mip = create_mip(CBC, *args, False)
+    mip.verbose = 0
+    token = CancelToken()
+    if mode == "interrupt":
+        # interruptions are only checked in optimizations with a token
+        kwargs = {"max_seconds": 120, "cancel_token": token}
+        thread = Thread(target=mip.optimize, kwargs=kwargs)
+        start = time()
+        thread.start()
+        thread.join(5)
+        mip.interrupt()
+        thread.join()
+    else:
+        Timer(5, token.cancel).start()
+        start = time()
+        mip.optimize(max_seconds=120, cancel_token=token)
+    assert time() - start < 30
+    assert mip.status in (
+        OptimizationStatus.FEASIBLE,
+        OptimizationStatus.NO_SOLUTION_FOUND,
+    )
+    if mip.status == OptimizationStatus.FEASIBLE:
+        assert data["z_relax"] - TOL <= mip.objective_bound
+        assert mip.objective_bound < mip.objective_value - TOL
+        assert mip.objective_value >= data["z_ub"] - TOL
+
+    # a cancelled token remains cancelled until reset
+    if mode == "token":
+        start = time()
+        mip.optimize(max_seconds=120, cancel_token=token)
+        assert time() - start < 30
+        assert token.cancelled
+        token.reset()
+        assert not token.cancelled
+
+
+def test_rcpsp_optimize_async():
+    """optimizes in a thread, streaming the progress of the search, and
+    interrupts the search when the task is cancelled"""
+    instance = [i for i in INSTS if i.endswith("rcpsp-10-3.json")][0]
+    with open(instance, "r") as finst:
+        data = json.load(finst)
+    args = [data[k] for k in ["J", "d", "S", "c", "r", "EST"]]
+    mip = create_mip(CBC, *args, False)
+    mip.verbose = 0
+
+    async def ticker(ticks):
+        while True:
+            await asyncio.sleep(0.1)
+            ticks.append(time())
+
+    async def run():
+        ticks = []
+        tick_task = asyncio.ensure_future(ticker(ticks))
+        progress = ProgressStream()
+        task = asyncio.ensure_future(mip.optimize_async(progress, max_seconds=5))
+        events = []
+        async for event in progress:
+            events.append(event)
+        status = await task
+        # the event loop was not blocked by the solver
+        assert len(ticks) >= 20
+        assert status == OptimizationStatus.FEASIBLE
+        assert events
+        assert all(e1.time <= e2.time for (e1, e2) in zip(events, events[1:]))
+        assert abs(events[-1].incumbent - mip.objective_value) <= TOL
+        assert all(e.bound <= mip.objective_value + TOL for e in events)
+
+        task = asyncio.ensure_future(mip.optimize_async(max_seconds=120))
+        await asyncio.sleep(3)
+        start = time()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert time() - start < 30
+        assert mip.status in (
+            OptimizationStatus.FEASIBLE,
+            OptimizationStatus.NO_SOLUTION_FOUND,
+        )
+        tick_task.cancel()
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
@@ -0,0 +1,146 @@
+"""Tests for the optimization of scenarios with Model.sweep"""
+import random
+import pytest
+from mip import Model, xsum, OptimizationStatus, InvalidParameter, CBC
+from mip_knapsack import build_knapsack
+
+TOL = 1e-5
+
+
+def transportation(seed: int = 0):
+    """plants with capacities (first rows) and customers with demands (last
+    rows)"""
+    rnd = random.Random(seed)
+    P, C = 4, 8
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    x = [[m.add_var(obj=rnd.randint(1, 20)) for j in range(C)] for i in range(P)]
+    for i in range(P):
+        m.add_constr(xsum(x[i]) <= 100)
+    for j in range(C):
+        m.add_constr(xsum(x[i][j] for i in range(P)) >= 30)
+    return m
+
+
+def knapsack(seed: int = 0):
+    return build_knapsack(20, seed, dims=1)[0]
+
+
+def reference(build, rhs=None, obj=None, lb=None, ub=None, rhs_idx=None):
+    """objective values computed with a new model for each scenario"""
+    result = []
+    ns = len(next(a for a in (rhs, obj, lb, ub) if a is not None))
+    for k in range(ns):
+        m = build()
+        cidx = rhs_idx if rhs_idx is not None else range(m.num_rows)
+        for (i, j) in enumerate(cidx):
+            if rhs is not None:
+                m.constrs[j].rhs = rhs[k][i]
+        for j in range(m.num_cols):
+            if obj is not None:
+                m.vars[j].obj = obj[k][j]
+            if lb is not None:
+                m.vars[j].lb = lb[k][j]
+            if ub is not None:
+                m.vars[j].ub = ub[k][j]
+        if m.optimize() == OptimizationStatus.OPTIMAL:
+            result.append(m.objective_value)
+        else:
+            result.append(None)
+    return result
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_lp_rhs_and_obj(workers: int):
+    np = pytest.importorskip("numpy")
+    rnd = random.Random(1)
+    m = transportation()
+    ns = 12
+    # capacities of the plants change, the last scenario is infeasible
+    rhs = [[rnd.randint(60, 120) for i in range(4)] for k in range(ns - 1)]
+    rhs.append([10] * 4)
+    obj = [[rnd.randint(1, 20) for j in range(m.num_cols)] for k in range(ns)]
+    expected = reference(transportation, rhs=rhs, obj=obj, rhs_idx=range(4))
+    m.optimize()
+    base = m.objective_value
+
+    res = m.sweep(rhs_matrix=rhs, obj_matrix=obj, rhs_idx=range(4), workers=workers)
+    assert len(res) == ns and res.x.shape == (ns, m.num_cols)
+    assert res.status[-1] == OptimizationStatus.INFEASIBLE
+    assert np.isnan(res.objective_value[-1]) and res[ns - 1].x is None
+    for k in range(ns - 1):
+        assert res.status[k] == OptimizationStatus.OPTIMAL
+        assert abs(res.objective_value[k] - expected[k]) <= TOL
+        assert abs(res.x[k] @ np.array(obj[k]) - expected[k]) <= TOL
+        assert res[k].objective_value == res.objective_value[k]
+        # duals of the capacity and demand constraints
+        assert res.pi[k, :4].max() <= TOL and res.pi[k, 4:].min() >= -TOL
+
+    if workers == 1:
+        # scenarios after the first one started from the previous basis
+        assert all(info.warm_start for info in m.lp_solve_log[1:])
+    # the original model is restored
+    assert not m.persistent_lp
+    assert [c.rhs for c in m.constrs[:4]] == [100] * 4
+    m.optimize()
+    assert abs(m.objective_value - base) <= TOL
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_mip_bounds(workers: int):
+    np = pytest.importorskip("numpy")
+    m = knapsack()
+    n = m.num_cols
+    # each scenario fixes one item in and one item out of the knapsack
+    lb = np.zeros((n - 1, n))
+    ub = np.ones((n - 1, n))
+    for k in range(n - 1):
+        lb[k, k] = 1
+        ub[k, k + 1] = 0
+    expected = reference(knapsack, lb=lb, ub=ub)
+    res = m.sweep(bounds=(lb, ub), workers=workers)
+    assert res.pi is None
+    for k in range(n - 1):
+        assert res.status[k] == OptimizationStatus.OPTIMAL
+        assert abs(res.objective_value[k] - expected[k]) <= TOL
+        assert res.x[k, k] >= 1 - TOL and res.x[k, k + 1] <= TOL
+    assert all(v.lb == 0 and v.ub == 1 for v in m.vars)
+    assert m.start is None
+
+    # relaxation
+    res = m.sweep(bounds=(lb, None), relax=True)
+    assert res.pi is not None
+    assert all(res.objective_value >= np.array(expected) - TOL)
+
+
+def test_invalid():
+    pytest.importorskip("numpy")
+    m = transportation()
+    with pytest.raises(InvalidParameter):
+        m.sweep(rhs_matrix=[[1, 2]])
+    with pytest.raises(InvalidParameter):
+        m.sweep(rhs_matrix=[[1] * 4], rhs_idx=[0, 1, 2, 100])
+    with pytest.raises(InvalidParameter):
+        m.sweep(rhs_matrix=[[1] * 4] * 2, obj_matrix=[[1] * 32], rhs_idx=range(4))
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_set_obj_and_bounds(persistent: bool):
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    m.persistent_lp = persistent
+    x = [m.add_var(ub=10) for i in range(3)]
+    m.add_constr(xsum(x) >= 5)
+    m.set_obj([1, 2, 3])
+    assert [v.obj for v in x] == [1, 2, 3]
+    m.optimize(relax=True)
+    assert abs(m.objective_value - 5) <= TOL
+    m.set_bounds(ub=[2, 2], idx=[0, 1])
+    m.optimize(relax=True)
+    assert abs(m.objective_value - 2 - 4 - 3) <= TOL
+    m.set_obj([-1], idx=[2])
+    m.set_bounds(lb=[1, 1, 1])
+    m.optimize(relax=True)
+    assert abs(m.objective_value - 1 - 2 + 10) <= TOL
+    with pytest.raises(InvalidParameter):
+        m.set_bounds(lb=[1, 1])
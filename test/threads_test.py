@@ -0,0 +1,67 @@
+"""Stress tests for the optimization of independent models in parallel
+threads"""
+from concurrent.futures import ThreadPoolExecutor
+from os.path import join
+import pytest
+from mip import Model, OptimizationStatus, CBC
+from mip import ConstrsGenerator
+from mip_knapsack import build_knapsack
+
+INSTANCES = ["egout.mps.gz", "flugpl.mps.gz", "khb05250.mps.gz", "lseu.mps.gz"]
+
+DATA_DIR = join("test", "data")
+
+
+def solve_file(file_name: str, relax: bool = False):
+    m = Model(solver_name=CBC)
+    m.verbose = 0
+    m.read(join(DATA_DIR, file_name))
+    status = m.optimize(max_seconds=60, relax=relax)
+    return status, round(m.objective_value, 6)
+
+
+class ModelChecker(ConstrsGenerator):
+    """checks that each callback receives the model being optimized in the
+    same thread"""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.calls = 0
+        self.wrong = 0
+
+    def generate_constrs(self, model: Model, depth: int = 0, npass: int = 0):
+        self.calls += 1
+        if model.num_cols > self.n:
+            self.wrong += 1
+
+
+def solve_knapsack(n: int):
+    m, x = build_knapsack(n, dims=3)
+    m.cuts_generator = ModelChecker(n)
+    status = m.optimize(max_seconds=60)
+    return status, round(m.objective_value, 6), m.cuts_generator
+
+
+@pytest.mark.parametrize("relax", [False, True])
+def test_concurrent_solves(relax: bool):
+    """solves the same instances sequentially and in parallel threads,
+    several times, results must be the same"""
+    threads = 4
+    expected = [solve_file(f, relax) for f in INSTANCES]
+    assert all(s == OptimizationStatus.OPTIMAL for (s, _) in expected)
+    with ThreadPoolExecutor(threads) as executor:
+        for rep in range(3):
+            relaxes = [relax] * len(INSTANCES) * threads
+            results = list(executor.map(solve_file, INSTANCES * threads, relaxes))
+            assert results == expected * threads
+
+
+def test_concurrent_callbacks():
+    """Python callbacks of models optimized in parallel threads"""
+    sizes = [30, 40, 50, 60] * 2
+    expected = {n: solve_knapsack(n)[:2] for n in set(sizes)}
+    with ThreadPoolExecutor(4) as executor:
+        for (n, (status, obj, gen)) in zip(sizes, executor.map(solve_knapsack, sizes)):
+            assert (status, obj) == expected[n]
+            assert gen.calls > 0
+            assert gen.wrong == 0